@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+端到端爬取基准测试（本地 Discuz 替身 + SQLite/MySQL，不访问线上站点）
+
+启动 benchmarks.discuz_server 的替身服务器，把 BoniuCrawler 指向它，
+完整运行 crawl_paginated_and_store（列表 → 详情 → 图片/头像 → 入库），
+报告帖子/秒、请求/秒、CPU 时间、峰值 RSS 与各阶段耗时分布。
+翻译会调用外部接口，基准中始终关闭。
+
+用法示例：
+  python -m benchmarks.crawl_bench --pages 3 --threads-per-page 20 --latency 0.02
+  python -m benchmarks.crawl_bench --error-rate 0.05 --rate 5 --json result.json
+  python -m benchmarks.crawl_bench --db mysql   # 使用 DB_* 环境变量指向的 MySQL
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.discuz_server import DiscuzFixtures, DiscuzStandInServer  # noqa: E402
+
+
+def peak_rss_mb() -> Optional[float]:
+    """进程峰值常驻内存（MB）；不支持的平台返回None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def configure(base_url: str, rate: float, retry_delay: float) -> None:
+    """在创建爬虫前调整全局设置与共享组件"""
+    from src.crawler.config.settings import get_settings
+    from src.crawler.utils import circuit_breaker, rate_limiter
+    from src.crawler.utils.metrics import get_metrics
+
+    settings = get_settings()
+    settings.boniu.base_url = base_url
+    settings.rate_limit.initial_rate = rate
+    settings.rate_limit.max_rate = rate
+    settings.rate_limit.min_rate = min(settings.rate_limit.min_rate, rate)
+    settings.rate_limit.jitter = 0.0
+    settings.crawler.retry_delay = retry_delay
+    # 重新创建全局限速器/熔断器，使上面的设置生效
+    rate_limiter._rate_limiter = None
+    circuit_breaker._registry = None
+    get_metrics().reset()
+
+
+def run_benchmark(
+    pages: int = 3,
+    threads_per_page: int = 20,
+    images_per_thread: int = 2,
+    content_kb: int = 8,
+    image_kb: int = 30,
+    fids: Optional[List[int]] = None,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    rate: float = 1000.0,
+    retry_delay: float = 0.05,
+    db: str = "sqlite",
+    seed: int = 0,
+    image_dir: Optional[str] = None,
+    detail_workers: int = 1,
+    parse_workers: int = 0,
+    reply_workers: int = 0,
+) -> Dict[str, Any]:
+    """
+    运行一次端到端基准
+
+    Args:
+        pages: 替身站点每个版块的列表页数
+        threads_per_page: 每页帖子数
+        images_per_thread: 每个帖子的图片数
+        content_kb: 帖子正文大小（KB）
+        image_kb: 图片大小（KB）
+        fids: 要爬取的版块ID，默认 [89]
+        latency: 服务端响应延迟（秒）
+        error_rate: 服务端返回 503 的概率
+        rate: 每主机限速（请求/秒）
+        retry_delay: 重试退避基准延迟（秒）
+        db: sqlite（内存替身）或 mysql（DB_* 环境变量）
+        seed: 错误注入随机种子
+        image_dir: 图片保存目录，默认临时目录（结束后删除）
+        detail_workers: 详情页抓取线程数（settings.sites.detail_workers）
+        parse_workers: HTML 解析进程数（settings.crawler.parse_workers，0 表示在抓取线程中解析；
+            cpu_time 只统计主进程）
+        reply_workers: 大于 0 时开启回复分页抓取（settings.replies），为每帖回复页的并发抓取线程数
+
+    Returns:
+        基准结果字典
+    """
+    fixtures = DiscuzFixtures(pages, threads_per_page, images_per_thread, content_kb, image_kb)
+    with DiscuzStandInServer(fixtures, latency=latency, error_rate=error_rate, seed=seed) as server, \
+            tempfile.TemporaryDirectory(prefix="boniu_bench_") as tmp_dir:
+        os.environ["BONIU_IMG_BASE_PATH"] = image_dir or tmp_dir
+        configure(server.url, rate, retry_delay)
+        from src.crawler.config.settings import get_settings
+        get_settings().sites.detail_workers = detail_workers
+        get_settings().crawler.parse_workers = parse_workers
+        get_settings().replies.enabled = reply_workers > 0
+        get_settings().replies.workers = max(1, reply_workers)
+        from src.crawler.utils.parse_pool import close_parse_pool
+
+        from src.crawler.sites.boniu import crawler as crawler_module
+
+        store = None
+        patched = {}
+        if db == "sqlite":
+            from benchmarks.sqlite_db import BONIU_REPLY_TABLE, SQLiteStandIn
+            store = SQLiteStandIn()
+            patched = {"fetch_all": crawler_module.fetch_all, "executemany": crawler_module.executemany}
+            crawler_module.fetch_all = store.fetch_all
+            crawler_module.executemany = store.executemany
+        try:
+            crawler = crawler_module.BoniuCrawler()
+            crawler.translator = None
+            crawler.enable_translation = False
+            crawler.fids = list(fids or [89])
+
+            cpu_started = time.process_time()
+            wall_started = time.perf_counter()
+            stats = crawler.crawl_paginated_and_store(max_pages=pages + 1)
+            elapsed = time.perf_counter() - wall_started
+            cpu_time = time.process_time() - cpu_started
+
+            snapshot = crawler.metrics.requests_snapshot()
+            client_requests = sum(snapshot["requests"].values())
+            posts = stats["total_posts"]
+            result = {
+                "posts": posts,
+                "stored": store.count() if store is not None else None,
+                "replies": store.count(BONIU_REPLY_TABLE) if store is not None else None,
+                "elapsed": round(elapsed, 4),
+                "posts_per_sec": round(posts / elapsed, 2) if elapsed else 0.0,
+                "requests": client_requests,
+                "requests_per_sec": round(client_requests / elapsed, 2) if elapsed else 0.0,
+                "server_requests": server.requests,
+                "server_errors": server.errors,
+                "bytes_received": sum(snapshot["bytes"].values()),
+                "cpu_time": round(cpu_time, 4),
+                "cpu_utilization": round(cpu_time / elapsed, 3) if elapsed else 0.0,
+                "peak_rss_mb": round(peak_rss_mb() or 0.0, 1),
+                "stages": crawler.metrics.summary()["stages"],
+                "stage_lines": crawler.metrics.format_summary(),
+            }
+            # 关闭长连接，让替身服务器的处理线程随之退出
+            crawler.session.close()
+            crawler.image_downloader.session.close()
+            return result
+        finally:
+            close_parse_pool()
+            for name, func in patched.items():
+                setattr(crawler_module, name, func)
+            if store is not None:
+                store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BoniuCrawler 端到端离线基准测试")
+    parser.add_argument("--pages", type=int, default=3, help="每个版块的列表页数（默认3）")
+    parser.add_argument("--threads-per-page", type=int, default=20, help="每页帖子数（默认20）")
+    parser.add_argument("--images-per-thread", type=int, default=2, help="每个帖子的图片数（默认2）")
+    parser.add_argument("--content-kb", type=int, default=8, help="帖子正文大小KB（默认8）")
+    parser.add_argument("--image-kb", type=int, default=30, help="图片大小KB（默认30）")
+    parser.add_argument("--fids", default="89", help="版块ID，逗号分隔（默认89）")
+    parser.add_argument("--latency", type=float, default=0.0, help="服务端响应延迟秒数（默认0）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="服务端返回503的概率（默认0）")
+    parser.add_argument("--rate", type=float, default=1000.0, help="每主机限速，请求/秒（默认1000，即基本不限速）")
+    parser.add_argument("--retry-delay", type=float, default=0.05, help="重试退避基准延迟秒数（默认0.05）")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite", help="入库目标（默认sqlite内存替身）")
+    parser.add_argument("--seed", type=int, default=0, help="错误注入随机种子")
+    parser.add_argument("--detail-workers", type=int, default=1, help="详情页抓取线程数（默认1）")
+    parser.add_argument("--parse-workers", type=int, default=0, help="HTML 解析进程数（默认0，在抓取线程中解析）")
+    parser.add_argument("--reply-workers", type=int, default=0, help="开启回复分页抓取，每帖回复页并发线程数（默认0，只抓主楼）")
+    parser.add_argument("--json", dest="json_path", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        pages=args.pages,
+        threads_per_page=args.threads_per_page,
+        images_per_thread=args.images_per_thread,
+        content_kb=args.content_kb,
+        image_kb=args.image_kb,
+        fids=[int(f) for f in args.fids.split(",") if f.strip()],
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate=args.rate,
+        retry_delay=args.retry_delay,
+        db=args.db,
+        seed=args.seed,
+        detail_workers=args.detail_workers,
+        parse_workers=args.parse_workers,
+        reply_workers=args.reply_workers,
+    )
+
+    print("=" * 60)
+    print(f"帖子数: {result['posts']} (入库 {result['stored'] if result['stored'] is not None else '-'}"
+          f"，回复 {result['replies'] if result['replies'] is not None else '-'})")
+    print(f"耗时: {result['elapsed']:.2f}s  帖子/秒: {result['posts_per_sec']:.2f}")
+    print(f"请求数: {result['requests']} (服务端 {result['server_requests']}, 注入错误 {result['server_errors']})"
+          f"  请求/秒: {result['requests_per_sec']:.2f}")
+    print(f"CPU时间: {result['cpu_time']:.2f}s (利用率 {result['cpu_utilization']:.0%})"
+          f"  峰值RSS: {result['peak_rss_mb']:.1f}MB  接收字节: {result['bytes_received']}")
+    print("-" * 60)
+    for line in result["stage_lines"]:
+        print(line)
+
+    if args.json_path:
+        payload = {k: v for k, v in result.items() if k != "stage_lines"}
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
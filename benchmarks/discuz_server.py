@@ -0,0 +1,302 @@
+"""本地 Discuz 论坛替身服务器
+
+按 Discuz X 的页面结构生成列表页、帖子详情页、附件图片与头像，
+供基准测试在不访问线上站点的情况下端到端运行 BoniuCrawler。
+支持配置每个版块的页数、每页帖子数、响应延迟与错误率（返回 503）。
+
+页面由 DiscuzFixtures 生成；如需使用录制的真实页面，可继承它并覆盖
+list_page/thread_page/image 方法。
+"""
+
+import gzip
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+import re
+
+_CONTENT_SENTENCE = "这是一段用于基准测试的帖子正文，包含支付渠道、游戏API与云服务等常见话题。"
+
+
+class DiscuzFixtures:
+    """合成的 Discuz 页面夹具（输出确定，只依赖参数）"""
+
+    def __init__(
+        self,
+        pages: int = 3,
+        threads_per_page: int = 20,
+        images_per_thread: int = 2,
+        content_kb: int = 8,
+        image_kb: int = 30,
+        posts_per_page: int = 10,
+    ):
+        """
+        初始化夹具
+
+        Args:
+            pages: 每个版块的列表页数，超出后返回空列表页
+            threads_per_page: 每个列表页的帖子数
+            images_per_thread: 每个帖子正文中的附件图片数
+            content_kb: 帖子正文大小（KB，近似）
+            image_kb: 每张图片大小（KB）
+            posts_per_page: 帖子详情每页楼层数（含主楼），回复数超出时分页
+        """
+        self.pages = pages
+        self.threads_per_page = threads_per_page
+        self.images_per_thread = images_per_thread
+        self.content_kb = content_kb
+        self.image_kb = image_kb
+        self.posts_per_page = posts_per_page
+        self.replies: Dict[int, int] = {}  # 帖子ID -> 新增回复数（回复数与最后回复时间随之变化）
+        self.revisions: Dict[int, int] = {}  # 帖子ID -> 主楼编辑次数（正文随之变化）
+        self.views: Dict[int, int] = {}  # 帖子ID -> 新增浏览数
+        self.essence: Set[int] = set()  # 精华帖ID（列表页标题后带精华图标）
+
+    def add_reply(self, tid: int, count: int = 1) -> None:
+        """模拟新回复：列表页回复数增加，最后回复时间推后"""
+        self.replies[tid] = self.replies.get(tid, 0) + count
+
+    def edit(self, tid: int) -> None:
+        """模拟编辑主楼：正文变化（列表页信号不变）"""
+        self.revisions[tid] = self.revisions.get(tid, 0) + 1
+
+    def add_views(self, tid: int, count: int = 1) -> None:
+        """模拟浏览：只有列表页浏览数变化"""
+        self.views[tid] = self.views.get(tid, 0) + count
+
+    def set_essence(self, tid: int) -> None:
+        """将帖子设为精华"""
+        self.essence.add(tid)
+
+    def reply_count(self, tid: int) -> int:
+        return tid % 30 + self.replies.get(tid, 0)
+
+    def view_count(self, tid: int) -> int:
+        return tid % 900 + 5 * self.replies.get(tid, 0) + self.views.get(tid, 0)
+
+    def last_post_time(self, tid: int) -> str:
+        return (datetime(2026, 10, 19, 12, 0) + timedelta(minutes=self.replies.get(tid, 0))).strftime("%Y-%m-%d %H:%M")
+
+    def thread_id(self, fid: int, page: int, index: int) -> int:
+        return fid * 100000 + (page - 1) * self.threads_per_page + index + 1
+
+    def home_page(self) -> str:
+        return "<html><head><meta charset=\"utf-8\"><title>论坛首页</title></head><body><div id=\"hd\"></div></body></html>"
+
+    def list_page(self, fid: int, page: int) -> str:
+        """版块列表页（与 Discuz forumdisplay 的表格结构一致）"""
+        rows = []
+        if 1 <= page <= self.pages:
+            for i in range(self.threads_per_page):
+                tid = self.thread_id(fid, page, i)
+                uid = 1000 + tid % 50
+                digest = '<img src="static/image/common/digest_1.gif" alt="精华 1" />' if tid in self.essence else ""
+                rows.append(
+                    f'<tbody id="normalthread_{tid}"><tr>'
+                    f'<td class="icn"><a href="thread-{tid}-1-1.html" title="新窗口打开">'
+                    f'<img src="static/image/common/folder_common.gif" /></a></td>'
+                    f'<th class="common"><em>[<a href="forum.php?mod=forumdisplay&fid={fid}&typeid=1">支付渠道</a>]</em> '
+                    f'<a href="thread-{tid}-1-1.html" onclick="atarget(this)" class="s xst">基准测试帖子 {tid}</a>{digest}</th>'
+                    f'<td class="by"><cite><img src="uc_server/data/avatar/000/00/{uid}_avatar_small.jpg" class="author-avatar" />'
+                    f'<a href="space-uid-{uid}.html" c="1">用户{uid}</a></cite>'
+                    f'<em><span title="2026-10-19"><span title="2026-10-19 12:00">2026-10-19</span></span></em></td>'
+                    f'<td class="num"><a href="thread-{tid}-1-1.html" class="xi2">{self.reply_count(tid)}</a><em>{self.view_count(tid)}</em></td>'
+                    f'<td class="by"><cite><a href="space-username-reply.html">回复者</a></cite>'
+                    f'<em><a href="forum.php?mod=redirect&tid={tid}&goto=lastpost#lastpost">'
+                    f'<span title="{self.last_post_time(tid)}">{self.last_post_time(tid)}</span></a></em></td>'
+                    f'</tr></tbody>'
+                )
+        return (
+            "<html><head><meta charset=\"utf-8\"><title>版块</title></head><body>"
+            '<div id="threadlist"><table summary="forum_' + str(fid) + '" id="threadlisttableid">'
+            + "".join(rows)
+            + "</table></div></body></html>"
+        )
+
+    def thread_pages(self, tid: int) -> int:
+        """帖子总页数（主楼与回复按每页 posts_per_page 楼分页）"""
+        return (self.reply_count(tid) + self.posts_per_page) // self.posts_per_page
+
+    def _reply(self, tid: int, floor: int) -> str:
+        pid, uid = tid * 1000 + floor, 2000 + floor % 50
+        posted = (datetime(2026, 10, 19, 12, 0) + timedelta(minutes=floor - 1)).strftime("%Y-%m-%d %H:%M")
+        return (
+            f'<div id="post_{pid}"><table id="pid{pid}"><tr>'
+            f'<td class="pls"><div class="pi"><div class="authi"><a href="space-uid-{uid}.html" class="xw1">用户{uid}</a></div></div></td>'
+            f'<td class="plc"><div class="pi"><strong><a id="postnum{pid}"><em>{floor}</em><sup>#</sup></a></strong>'
+            f'<div class="pti"><div class="authi"><em id="authorposton{pid}">发表于 <span title="{posted}">{posted}</span></em></div></div></div>'
+            f'<div class="pct"><div class="pcb"><div class="t_fsz"><table><tr>'
+            f'<td class="t_f" id="postmessage_{pid}">第 {floor} 楼回复（{tid}）</td>'
+            "</tr></table></div></div></div></td></tr></table></div>"
+        )
+
+    def thread_page(self, tid: int, page: int = 1) -> str:
+        """帖子详情页（主楼正文位于 td.t_f#postmessage_<pid>，回复按楼层分页，超出总页数时返回最后一页）"""
+        pages = self.thread_pages(tid)
+        page = min(max(page, 1), pages)
+        floors = range((page - 1) * self.posts_per_page + 1, min(page * self.posts_per_page, self.reply_count(tid) + 1) + 1)
+        replies = "".join(self._reply(tid, floor) for floor in floors if floor > 1)
+        pager = ""
+        if pages > 1:
+            links = "".join(
+                f"<strong>{n}</strong>" if n == page else f'<a href="thread-{tid}-{n}-1.html">{n}</a>'
+                for n in range(1, min(pages, 10) + 1)
+            )
+            pager = (
+                f'<div class="pgs mtm mbm cl"><div class="pg">{links}'
+                f'<a href="thread-{tid}-{pages}-1.html" class="last">... {pages}</a>'
+                f'<label><input type="text" name="custompage" class="px" size="2" value="{page}" />'
+                f'<span title="共 {pages} 页"> / {pages} 页</span></label></div></div>'
+            )
+        if page > 1:
+            return (
+                "<html><head><meta http-equiv=\"Content-Type\" content=\"text/html; charset=utf-8\" /></head><body>"
+                f'{pager}<div id="postlist">{replies}</div>{pager}</body></html>'
+            )
+        pid = tid * 10
+        repeats = max(1, self.content_kb * 1024 // len(_CONTENT_SENTENCE.encode("utf-8")))
+        paragraphs = "<br />\r\n".join(f"{_CONTENT_SENTENCE}（{tid}-{n}）" for n in range(repeats))
+        if self.revisions.get(tid):
+            paragraphs += f"<br />\r\n本帖最后修订（第 {self.revisions[tid]} 次）"
+        images = "".join(
+            f'<ignore_js_op><img id="aimg_{tid}{k}" aid="{tid}{k}" src="static/image/common/none.gif" '
+            f'zoomfile="data/attachment/forum/202610/19/{tid}_{k}.jpg" '
+            f'file="data/attachment/forum/202610/19/{tid}_{k}.jpg" class="zoom" width="600" /></ignore_js_op>'
+            for k in range(self.images_per_thread)
+        )
+        return (
+            "<html><head><meta http-equiv=\"Content-Type\" content=\"text/html; charset=utf-8\" /></head><body>"
+            f'{pager}<div id="postlist"><div id="post_{pid}"><table id="pid{pid}"><tr>'
+            f'<td class="plc"><div class="pct"><div class="pcb"><div class="t_fsz"><table><tr>'
+            f'<td class="t_f" id="postmessage_{pid}">{paragraphs}{images}</td>'
+            f"</tr></table></div></div></div></td></tr></table></div>{replies}</div>{pager}</body></html>"
+        )
+
+    def image(self, path: str) -> bytes:
+        """按路径生成确定内容的图片字节"""
+        seed = sum(path.encode("utf-8")) % 251
+        return bytes([0xFF, 0xD8, 0xFF, 0xE0]) + bytes((seed + i) % 256 for i in range(self.image_kb * 1024))
+
+
+class DiscuzStandInServer:
+    """在后台线程中运行的 Discuz 替身 HTTP 服务器"""
+
+    def __init__(
+        self,
+        fixtures: Optional[DiscuzFixtures] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        初始化服务器
+
+        Args:
+            fixtures: 页面夹具
+            latency: 每个请求的响应延迟（秒）
+            error_rate: 返回 503 的概率（0-1）
+            seed: 错误注入的随机种子
+            host: 监听地址
+            port: 监听端口，0 表示随机端口
+        """
+        self.fixtures = fixtures or DiscuzFixtures()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.paths: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _route(self, raw_path: str) -> Tuple[int, str, bytes]:
+        parsed = urlparse(raw_path)
+        path = parsed.path
+        query = parse_qs(parsed.query)
+        html = None
+        if path in ("/", "/index.php", "/forum.php") and query.get("mod", [""])[0] != "forumdisplay":
+            html = self.fixtures.home_page()
+        elif path == "/forum.php":
+            html = self.fixtures.list_page(int(query.get("fid", ["0"])[0]), int(query.get("page", ["1"])[0]))
+        else:
+            match = re.match(r"^/forum-(\d+)-(\d+)\.html$", path)
+            if match:
+                html = self.fixtures.list_page(int(match.group(1)), int(match.group(2)))
+            match = re.match(r"^/thread-(\d+)-(\d+)-\d+\.html$", path)
+            if match:
+                html = self.fixtures.thread_page(int(match.group(1)), int(match.group(2)))
+        if html is not None:
+            return 200, "text/html; charset=utf-8", html.encode("utf-8")
+        if path.startswith(("/data/attachment/", "/uc_server/")):
+            return 200, "image/jpeg", self.fixtures.image(path)
+        return 404, "text/html; charset=utf-8", b"<html><body>404</body></html>"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头与响应体分两次写出，关闭 Nagle 避免与延迟 ACK 叠加出 40ms 停顿
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                    server.paths[self.path.split("?")[0]] = server.paths.get(self.path.split("?")[0], 0) + 1
+                    failed = server.error_rate > 0 and server._rng.random() < server.error_rate
+                    if failed:
+                        server.errors += 1
+                if failed:
+                    status, content_type, body = 503, "text/html; charset=utf-8", b"<html>busy</html>"
+                else:
+                    status, content_type, body = server._route(self.path)
+                headers = {"Content-Type": content_type}
+                if content_type.startswith("text/") and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body, compresslevel=5)
+                    headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "DiscuzStandInServer":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="discuz-standin", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "DiscuzStandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,133 @@
+"""本地 HTTP/2（h2c，明文先验知识模式）测试服务器
+
+仅用于基准测试：对任意路径返回固定大小的 HTML 响应，可配置响应延迟。
+依赖 ``h2`` 包（随 ``httpx[http2]`` 安装）。
+"""
+
+import asyncio
+import threading
+from typing import Dict, Optional
+
+import h2.config
+import h2.connection
+import h2.events
+
+
+class _H2Protocol(asyncio.Protocol):
+    """单个 HTTP/2 连接的处理协议"""
+
+    def __init__(self, body: bytes, latency: float):
+        self.body = body
+        self.latency = latency
+        self.conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        self.transport = None
+        self.pending: Dict[int, bytes] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data: bytes):
+        try:
+            events = self.conn.receive_data(data)
+        except Exception:
+            self.transport.close()
+            return
+        for event in events:
+            if isinstance(event, h2.events.RequestReceived):
+                loop = asyncio.get_event_loop()
+                loop.call_later(self.latency, self._respond, event.stream_id)
+            elif isinstance(event, h2.events.WindowUpdated):
+                self._flush()
+            elif isinstance(event, h2.events.StreamReset):
+                self.pending.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    def _respond(self, stream_id: int):
+        if self.transport.is_closing():
+            return
+        self.conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "text/html; charset=utf-8"),
+            ("content-length", str(len(self.body))),
+        ])
+        self.pending[stream_id] = self.body
+        self._flush()
+
+    def _flush(self):
+        """按流量控制窗口发送待发数据"""
+        for stream_id in list(self.pending):
+            data = self.pending[stream_id]
+            try:
+                window = self.conn.local_flow_control_window(stream_id)
+            except Exception:
+                self.pending.pop(stream_id, None)
+                continue
+            while data and window > 0:
+                size = min(window, len(data), self.conn.max_outbound_frame_size)
+                self.conn.send_data(stream_id, data[:size])
+                data = data[size:]
+                window -= size
+            if data:
+                self.pending[stream_id] = data
+            else:
+                self.pending.pop(stream_id)
+                self.conn.end_stream(stream_id)
+        self.transport.write(self.conn.data_to_send())
+
+
+class H2TestServer:
+    """在后台线程中运行的 h2c 测试服务器"""
+
+    def __init__(self, body: bytes, latency: float = 0.05, host: str = "127.0.0.1", port: int = 0):
+        self.body = body
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self.connections = 0  # 已建立的连接数（验证多路复用）
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            self._loop.create_server(self._protocol, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def _protocol(self) -> _H2Protocol:
+        self.connections += 1
+        return _H2Protocol(self.body, self.latency)
+
+    def start(self) -> "H2TestServer":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
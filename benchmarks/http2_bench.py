@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+HTTP/1.1 与 HTTP/2 传输基准测试（本地服务器，不访问线上站点）
+
+分别启动本地 HTTP/1.1 服务器与 h2c 服务器（相同的响应体和延迟），
+用相同并发度拉取 N 个“详情页”，对比吞吐与耗时。
+
+用法示例：
+  python -m benchmarks.http2_bench --requests 200 --concurrency 16 --latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.crawler.utils.http2 import Http2Session, http2_available  # noqa: E402
+from src.crawler.utils.http_client import HttpClientRegistry  # noqa: E402
+
+
+def _make_h1_server(body: bytes, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _run(session, base_url: str, total: int, concurrency: int) -> dict:
+    def fetch(i: int) -> int:
+        resp = session.request("GET", f"{base_url}/thread-{i}-1-1.html", timeout=30)
+        size = len(resp.content)
+        resp.close()
+        return size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sizes = list(pool.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "elapsed": elapsed,
+        "req_per_sec": total / elapsed if elapsed else 0.0,
+        "bytes": sum(sizes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/1.1 vs HTTP/2 本地基准测试")
+    parser.add_argument("--requests", type=int, default=200, help="请求总数（默认200）")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发数（默认16）")
+    parser.add_argument("--latency", type=float, default=0.05, help="服务端响应延迟秒数（默认0.05）")
+    parser.add_argument("--body-kb", type=int, default=60, help="响应体大小KB（默认60，近似详情页）")
+    args = parser.parse_args()
+
+    if not http2_available():
+        print("未安装 httpx[http2]，无法运行 HTTP/2 基准")
+        sys.exit(1)
+
+    from benchmarks.h2_server import H2TestServer
+
+    body = (b"<html><body>" + b"x" * (args.body_kb * 1024) + b"</body></html>")
+    registry = HttpClientRegistry(pool_maxsize=args.concurrency, dns_cache_ttl=0)
+
+    h1_server = _make_h1_server(body, args.latency)
+    try:
+        h1_url = f"http://127.0.0.1:{h1_server.server_address[1]}"
+        h1 = _run(registry.create_session(), h1_url, args.requests, args.concurrency)
+    finally:
+        h1_server.shutdown()
+
+    with H2TestServer(body, latency=args.latency) as h2_server:
+        session = Http2Session(registry.create_session(), max_connections=1, http1=False)
+        try:
+            h2 = _run(session, h2_server.url, args.requests, args.concurrency)
+        finally:
+            session.close()
+
+    print(f"{'传输':<10}{'请求数':>8}{'耗时(s)':>10}{'请求/秒':>10}{'连接数':>8}")
+    print(f"{'HTTP/1.1':<10}{h1['requests']:>8}{h1['elapsed']:>10.2f}{h1['req_per_sec']:>10.1f}{args.concurrency:>8}")
+    print(f"{'HTTP/2':<10}{h2['requests']:>8}{h2['elapsed']:>10.2f}{h2['req_per_sec']:>10.1f}{1:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+解析热点微基准（不访问网络）
+
+对 CPU 热点 ``_parse_post_row``、``_fetch_post_content``（仅解析部分，请求被替换为
+返回夹具 HTML）、``clean_text`` 与 ``extract_links_from_html`` 分别测量吞吐
+（次/秒，取多轮中最快一轮，与 timeit 一致，受机器抖动影响最小）与单次调用的峰值内存分配（tracemalloc），并与保存的
+基线比较，吞吐下降或分配增长超过容差时以非零状态退出。
+
+夹具优先使用 ``prd_test/run_prd_test.py`` 录制的页面（归档在 prd_test/archive，
+详情页需加 ``--threads N``；也可用 --fixtures 指定爬虫的原始响应归档目录，如 data/archive/boniu，
+或存放 list_*.html 与 thread_*.html 的目录），没有录制页面时使用 benchmarks.discuz_server 生成的合成页面。
+
+用法示例：
+  python -m benchmarks.parsers                     # 运行并与基线比较
+  python -m benchmarks.parsers --save-baseline     # 运行并更新基线
+  python -m benchmarks.parsers --fixtures data/archive/boniu --tolerance 0.3
+"""
+
+import argparse
+import gc
+import glob
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from benchmarks.discuz_server import DiscuzFixtures  # noqa: E402
+from src.crawler.config.settings import RepliesConfig  # noqa: E402
+from src.crawler.sites.boniu.crawler import BoniuCrawler  # noqa: E402
+from src.crawler.sites.spec import load_site_spec  # noqa: E402
+from src.crawler.utils.archive import INDEX_LOG, PageArchive  # noqa: E402
+from src.crawler.utils.metrics import StageMetrics  # noqa: E402
+from src.crawler.utils.parser import clean_text, extract_links_from_html  # noqa: E402
+
+DEFAULT_FIXTURES_DIR = os.path.join(PROJECT_ROOT, "prd_test", "archive")
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baselines", "parsers.json")
+BASE_URL = "https://bbs.boniu123.cc"
+
+
+def load_fixtures(directory: Optional[str] = None) -> Dict[str, Any]:
+    """
+    加载解析夹具
+
+    Args:
+        directory: 原始响应归档目录或录制页面目录，默认 prd_test/archive
+
+    Returns:
+        {"source": "recorded"/"synthetic", "list_pages": [html], "thread_pages": [html]}
+    """
+    directory = directory or DEFAULT_FIXTURES_DIR
+
+    def read_all(pattern: str) -> List[str]:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            if html.strip():
+                pages.append(html)
+        return pages
+
+    if os.path.exists(os.path.join(directory, INDEX_LOG)):
+        list_pages, thread_pages = _read_archive(directory)
+    else:
+        list_pages = read_all("list_*.html")
+        thread_pages = read_all("thread_*.html")
+    if list_pages and thread_pages:
+        return {"source": "recorded", "list_pages": list_pages, "thread_pages": thread_pages}
+
+    synthetic = DiscuzFixtures(pages=1, threads_per_page=30, images_per_thread=3, content_kb=8)
+    return {
+        "source": "synthetic",
+        "list_pages": list_pages or [synthetic.list_page(89, 1)],
+        "thread_pages": thread_pages or [synthetic.thread_page(synthetic.thread_id(89, 1, i)) for i in range(3)],
+    }
+
+
+def offline_crawler() -> BoniuCrawler:
+    """创建不连接数据库、不发请求的 BoniuCrawler（crawl_url 由调用方替换）"""
+    crawler = BoniuCrawler.__new__(BoniuCrawler)
+    logger = logging.getLogger("benchmarks.parsers.crawler")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    crawler.logger = logger
+    crawler.spec = load_site_spec("boniu")
+    crawler.base_url = BASE_URL
+    crawler.forum_url = f"{BASE_URL}/forum.php?mod=forumdisplay&fid=89&page=1"
+    crawler.metrics = StageMetrics()
+    crawler.username_avatar_map = {}
+    crawler.parse_pool = None
+    crawler.archive = None
+    crawler.replies = RepliesConfig()  # 只解析主楼
+    return crawler
+
+
+def _read_archive(directory: str):
+    """从原始响应归档读取列表页（URL 带 fid）与详情页（带帖子ID）"""
+    spec = load_site_spec("boniu")
+    list_pages: List[str] = []
+    thread_pages: List[str] = []
+    with PageArchive(directory) as archive:
+        for record in archive.records():
+            if record.status >= 400 or not record.body.strip():
+                continue
+            if record.key:
+                thread_pages.append(record.text)
+            elif spec.group("fid", record.url):
+                list_pages.append(record.text)
+    return list_pages, thread_pages
+
+
+def build_cases(fixtures: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """
+    构造各基准用例；每个用例为一次“操作”
+
+    Returns:
+        {用例名: 无参可调用}
+    """
+    crawler = offline_crawler()
+    rows = [row for html in fixtures["list_pages"] for row in BeautifulSoup(html, "html.parser").find_all("tr")]
+    thread_pages = fixtures["thread_pages"]
+    thread_texts = [BeautifulSoup(html, "html.parser").get_text() for html in thread_pages]
+    list_pages = fixtures["list_pages"]
+
+    def parse_post_rows():
+        return [crawler._parse_post_row(row) for row in rows]
+
+    def fetch_post_content():
+        results = []
+        for html in thread_pages:
+            crawler.crawl_url = lambda url, stage=None, _html=html: _html
+            results.append(crawler._fetch_post_content(f"{BASE_URL}/thread-1-1-1.html"))
+        return results
+
+    def clean_texts():
+        return [clean_text(text) for text in thread_texts]
+
+    def extract_links():
+        return [extract_links_from_html(html, BASE_URL) for html in list_pages]
+
+    return {
+        "parse_post_row": parse_post_rows,
+        "fetch_post_content": fetch_post_content,
+        "clean_text": clean_texts,
+        "extract_links_from_html": extract_links,
+    }
+
+
+def measure(func: Callable[[], Any], min_time: float = 0.2, rounds: int = 5) -> Dict[str, Any]:
+    """
+    测量吞吐与峰值分配
+
+    先校准每轮循环次数使一轮耗时约为 min_time，再运行 rounds 轮取最快一轮；
+    峰值分配在单独一次 tracemalloc 调用中测量（不影响计时），测量期间关闭
+    循环垃圾回收，使结果不受回收时机影响。
+
+    Args:
+        func: 被测操作
+        min_time: 每轮最短耗时（秒）
+        rounds: 轮数
+
+    Returns:
+        {"ops_per_sec", "mean_ms", "stddev_ms", "rounds", "loops", "alloc_peak_bytes"}
+    """
+    func()  # 预热
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        duration = time.perf_counter() - started
+        if duration >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if duration <= 0 else max(2, min(10, int(min_time / duration) + 1))
+
+    per_op: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_op.append((time.perf_counter() - started) / loops)
+
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if gc_enabled:
+            gc.enable()
+
+    best = min(per_op)
+    return {
+        "ops_per_sec": round(1.0 / best, 2) if best > 0 else 0.0,
+        "mean_ms": round(statistics.mean(per_op) * 1000, 4),
+        "stddev_ms": round(statistics.pstdev(per_op) * 1000, 4),
+        "rounds": rounds,
+        "loops": loops,
+        "alloc_peak_bytes": max(peak - baseline, 0),
+    }
+
+
+def run_suite(
+    fixtures: Dict[str, Any],
+    min_time: float = 0.2,
+    rounds: int = 5,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    运行全部用例
+
+    Args:
+        fixtures: load_fixtures 的返回值
+        min_time: 每轮最短耗时（秒）
+        rounds: 轮数
+        only: 仅运行指定用例
+
+    Returns:
+        {"source", "python", "machine", "cases": {用例名: measure 结果}}
+    """
+    cases = build_cases(fixtures)
+    results = {}
+    for name, func in cases.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(func, min_time=min_time, rounds=rounds)
+    return {
+        "source": fixtures["source"],
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """
+    与基线比较
+
+    Args:
+        current: 本次结果
+        baseline: 基线结果
+        tolerance: 容差（0.25 表示吞吐下降或分配增长超过25%视为回归）
+
+    Returns:
+        回归描述列表（为空表示无回归）
+    """
+    regressions = []
+    for name, now in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        if base["ops_per_sec"] and now["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: 吞吐 {now['ops_per_sec']:.2f}/s 低于基线 {base['ops_per_sec']:.2f}/s"
+                f"（{now['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%}）"
+            )
+        if base["alloc_peak_bytes"] and now["alloc_peak_bytes"] > base["alloc_peak_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: 峰值分配 {now['alloc_peak_bytes']}B 高于基线 {base['alloc_peak_bytes']}B"
+                f"（{now['alloc_peak_bytes'] / base['alloc_peak_bytes'] - 1:+.0%}）"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="解析热点微基准")
+    parser.add_argument("--fixtures", help="原始响应归档或录制页面目录（默认 prd_test/archive，无页面时使用合成夹具）")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="回归容差（默认0.25）")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最短耗时秒数（默认0.2）")
+    parser.add_argument("--rounds", type=int, default=5, help="轮数（默认5）")
+    parser.add_argument("--only", nargs="*", help="仅运行指定用例")
+    parser.add_argument("--json", dest="json_path", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    result = run_suite(fixtures, min_time=args.min_time, rounds=args.rounds, only=args.only)
+
+    print(f"夹具来源: {result['source']}（列表页 {len(fixtures['list_pages'])} 个，详情页 {len(fixtures['thread_pages'])} 个）")
+    print(f"{'用例':<26}{'次/秒':>12}{'平均ms':>12}{'标准差ms':>12}{'峰值分配KB':>14}")
+    for name, r in result["cases"].items():
+        print(f"{name:<26}{r['ops_per_sec']:>12.2f}{r['mean_ms']:>12.3f}{r['stddev_ms']:>12.3f}"
+              f"{r['alloc_peak_bytes'] / 1024:>14.1f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"基线已保存: {os.path.relpath(args.baseline, PROJECT_ROOT)}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("未找到基线，跳过比较（使用 --save-baseline 生成）")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("source") != result["source"]:
+        print(f"提示: 基线夹具来源为 {baseline.get('source')}，与本次 {result['source']} 不同，比较仅供参考")
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("检测到性能回归:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"与基线相比无回归（容差 {args.tolerance:.0%}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""MySQL 的 SQLite 替身
+
+提供与 ``src.crawler.utils.db`` 相同签名的 ``fetch_all``/``executemany``，
+把爬虫使用的 MySQL 方言（``%s`` 占位符、``NOW()``、``ON DUPLICATE KEY UPDATE``、
+反引号标识符）改写为 SQLite 语句，使基准测试无需 MySQL 即可完整走完入库流程。
+"""
+
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+BONIU_POST_TABLE = "ims_mdkeji_im_boniu_forum_post"
+BONIU_REPLY_TABLE = "ims_mdkeji_im_boniu_forum_reply"
+
+_POST_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {BONIU_POST_TABLE} (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  forum_post_id TEXT UNIQUE,
+  title TEXT, url TEXT, user_id TEXT, username TEXT, avatar_url TEXT,
+  publish_time TEXT, reply_count INTEGER, view_count INTEGER, last_reply_time TEXT, images TEXT, category TEXT,
+  is_sticky INTEGER, is_essence INTEGER, crawl_time TEXT, fid INTEGER, is_crawl INTEGER,
+  content TEXT, uniacid INTEGER,
+  title_zh TEXT, content_zh TEXT, title_en TEXT, content_en TEXT,
+  content_summary TEXT, content_summary_en TEXT, content_summary_zh TEXT, content_hash TEXT,
+  updated_at TEXT
+)
+"""
+
+_REPLY_TABLE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {BONIU_REPLY_TABLE} (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  forum_reply_id TEXT UNIQUE,
+  forum_post_id TEXT, floor INTEGER, user_id TEXT, username TEXT,
+  publish_time TEXT, content TEXT, crawl_time TEXT, uniacid INTEGER
+)
+"""
+
+# 各表 ON DUPLICATE KEY UPDATE 对应的唯一键列
+_CONFLICT_KEYS = {BONIU_POST_TABLE: "forum_post_id", BONIU_REPLY_TABLE: "forum_reply_id"}
+_INSERT_TABLE_RE = re.compile(r"INSERT\s+INTO\s+`?(\w+)`?", re.I)
+
+_UPSERT_RE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.I)
+_VALUES_REF_RE = re.compile(r"VALUES\(\s*(\w+)\s*\)", re.I)
+
+
+def translate_sql(sql: str, conflict_key: str = "forum_post_id") -> str:
+    """
+    将 MySQL 方言改写为 SQLite
+
+    Args:
+        sql: MySQL 语句
+        conflict_key: ON DUPLICATE KEY UPDATE 对应的唯一键列
+
+    Returns:
+        SQLite 语句
+    """
+    sql = sql.replace("`", "").replace("%s", "?")
+    sql = re.sub(r"NOW\(\)", "CURRENT_TIMESTAMP", sql, flags=re.I)
+    if _UPSERT_RE.search(sql):
+        sql = _UPSERT_RE.sub(f"ON CONFLICT({conflict_key}) DO UPDATE SET", sql)
+        sql = _VALUES_REF_RE.sub(r"excluded.\1", sql)
+    return sql
+
+
+class SQLiteStandIn:
+    """线程安全的 SQLite 数据库替身"""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        初始化数据库并建表
+
+        Args:
+            path: 数据库文件路径，默认内存库
+        """
+        self.path = path
+        self.statements = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(_POST_TABLE_DDL)
+        self._conn.execute(_REPLY_TABLE_DDL)
+        self._conn.commit()
+
+    def fetch_all(self, sql: str, params: Optional[Sequence[Any]] = None) -> Iterable[Dict[str, Any]]:
+        """执行 SELECT 并以字典形式返回行"""
+        with self._lock:
+            self.statements += 1
+            rows = self._conn.execute(translate_sql(sql), tuple(params or ())).fetchall()
+        return [dict(row) for row in rows]
+
+    def executemany(self, sql: str, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """批量执行写入语句，返回影响行数"""
+        if not rows:
+            return 0
+        with self._lock:
+            self.statements += 1
+            table = _INSERT_TABLE_RE.match(sql.strip())
+            conflict_key = _CONFLICT_KEYS.get(table.group(1), "forum_post_id") if table else "forum_post_id"
+            cursor = self._conn.executemany(translate_sql(sql, conflict_key), rows)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def count(self, table: str = BONIU_POST_TABLE) -> int:
+        """统计表行数"""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
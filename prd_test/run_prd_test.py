@@ -4,13 +4,15 @@
 
 功能：
 - 直接请求指定 fid 与 page 的列表页
-- 保存原始 HTML 到 prd_test/outputs
-- 使用站点解析逻辑解析帖子列表，保存 JSON 结果
+- 所有响应（URL、状态码、响应头、耗时、HTML）写入原始响应归档 prd_test/archive
+- 使用站点解析逻辑解析帖子列表，保存 JSON 结果到 prd_test/outputs
 - 支持备用静态路径 forum-<fid>-<page>.html 测试
+- 可选抓取前 N 个帖子的详情页（归档后供 benchmarks.parsers 作为录制夹具）
 
 用法示例：
   python prd_test/run_prd_test.py --fid 89 --page 1
   python prd_test/run_prd_test.py --fid 89 --page 1 --alt
+  python prd_test/run_prd_test.py --fid 89 --page 1 --threads 5
 """
 
 import argparse
@@ -27,6 +29,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from src.crawler.sites.boniu.crawler import BoniuCrawler, _extract_text  # type: ignore
+from src.crawler.utils.archive import PageArchive  # type: ignore
 
 
 def ensure_dir(path: str) -> None:
@@ -51,12 +54,15 @@ def main():
     parser.add_argument("--fid", type=int, required=True, help="论坛 fid")
     parser.add_argument("--page", type=int, default=1, help="页码，默认1")
     parser.add_argument("--alt", action="store_true", help="使用备用静态路径 forum-<fid>-<page>.html")
+    parser.add_argument("--threads", type=int, default=0, help="额外抓取并归档前 N 个帖子的详情页，默认0")
     args = parser.parse_args()
 
     out_dir = os.path.join(PROJECT_ROOT, "prd_test", "outputs")
     ensure_dir(out_dir)
+    archive_dir = os.path.join(PROJECT_ROOT, "prd_test", "archive")
 
     crawler = BoniuCrawler()
+    crawler.archive = PageArchive(archive_dir)
     # 降低日志噪音
     try:
         import logging
@@ -76,16 +82,7 @@ def main():
     html = _extract_text(result)
 
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    html_path = os.path.join(out_dir, f"list_fid{args.fid}_p{args.page}{'_alt' if args.alt else ''}_{ts}.html")
     json_path = os.path.join(out_dir, f"parsed_fid{args.fid}_p{args.page}{'_alt' if args.alt else ''}_{ts}.json")
-    meta_path = os.path.join(out_dir, f"meta_fid{args.fid}_p{args.page}{'_alt' if args.alt else ''}_{ts}.json")
-
-    # 保存HTML
-    try:
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html or "")
-    except Exception:
-        pass
 
     # 解析
     posts = []
@@ -96,20 +93,17 @@ def main():
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump({"count": len(posts), "posts": posts}, f, ensure_ascii=False, indent=2)
 
-    # 保存元信息
-    meta = {
-        "request_url": url,
-        "status_code": getattr(result, "status_code", None),
-        "data_length": len(html or ""),
-        "time": ts,
-        "headers": dict(crawler.session.headers or {}),
-    }
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
-
-    print(f"已保存 HTML: {os.path.relpath(html_path, PROJECT_ROOT)}")
+    # 抓取详情页（响应写入归档）
+    thread_ids = []
+    for post in posts[:max(args.threads, 0)]:
+        if post.get("url") and _extract_text(crawler.crawl_url(post["url"])):
+            thread_ids.append(post.get("id"))
+    crawler.archive.close()
+
+    print(f"列表页 {url}: 状态码 {getattr(result, 'status_code', None)}，长度 {len(html or '')}")
     print(f"已保存解析 JSON: {os.path.relpath(json_path, PROJECT_ROOT)} (count={len(posts)})")
-    print(f"已保存元信息: {os.path.relpath(meta_path, PROJECT_ROOT)}")
+    print(f"响应已归档: {os.path.relpath(archive_dir, PROJECT_ROOT)}（详情页 {len(thread_ids)} 个）")
+    print(f"查看: python main.py archive --env dev --archive {os.path.relpath(archive_dir, PROJECT_ROOT)} --get <URL或帖子ID>")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,21 @@
+-- 为 ims_mdkeji_im_boniu_crawler_log 表添加阶段耗时指标字段
+-- 添加时间: 2026-10-19
+
+-- 添加 metrics 字段（JSON 文本：elapsed 与各阶段 count/total/mean/min/p50/p95/p99/max/bytes）
+ALTER TABLE `ims_mdkeji_im_boniu_crawler_log` 
+ADD COLUMN `metrics` text COMMENT '阶段耗时指标JSON（各阶段次数、总耗时、p50/p95/p99、字节数）' 
+AFTER `message`;
+
+-- 查询最近执行的详情抓取与入库耗时（MySQL 5.7+）
+-- SELECT 
+--   id,
+--   start_time,
+--   JSON_EXTRACT(metrics, '$.stages.detail_fetch.p95') AS detail_fetch_p95,
+--   JSON_EXTRACT(metrics, '$.stages.db_insert.total') AS db_insert_total,
+--   JSON_EXTRACT(metrics, '$.stages.politeness_sleep.total') AS sleep_total
+-- FROM ims_mdkeji_im_boniu_crawler_log 
+-- ORDER BY start_time DESC 
+-- LIMIT 10;
+
+-- 验证字段是否添加成功
+-- DESCRIBE `ims_mdkeji_im_boniu_crawler_log`;
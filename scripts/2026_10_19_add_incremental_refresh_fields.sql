@@ -0,0 +1,18 @@
+-- 为 ims_mdkeji_im_boniu_forum_post 表添加增量刷新字段
+-- 添加时间: 2026-10-19
+
+-- 添加 last_reply_time 字段（列表页的最后回复时间，与 reply_count 一同判断帖子是否有更新）
+ALTER TABLE `ims_mdkeji_im_boniu_forum_post` 
+ADD COLUMN `last_reply_time` datetime DEFAULT NULL COMMENT '最后回复时间（列表页）' 
+AFTER `view_count`;
+
+-- 添加 content_hash 字段（正文 SHA-1，重新抓取后正文未变时只更新回复信号）
+ALTER TABLE `ims_mdkeji_im_boniu_forum_post` 
+ADD COLUMN `content_hash` char(40) DEFAULT NULL COMMENT '正文SHA-1哈希' 
+AFTER `content_summary_zh`;
+
+-- 已有记录的 content_hash 可保持为空：增量刷新时按库中正文计算，更新后写入
+-- UPDATE `ims_mdkeji_im_boniu_forum_post` SET `content_hash` = SHA1(`content`) WHERE `content_hash` IS NULL;
+
+-- 验证字段是否添加成功
+-- DESCRIBE `ims_mdkeji_im_boniu_forum_post`;
@@ -0,0 +1,26 @@
+-- 创建 ims_mdkeji_im_boniu_forum_reply 表（帖子回复，REPLIES__ENABLED=true 时按帖子分页抓取写入）
+-- 添加时间: 2026-10-19
+
+CREATE TABLE IF NOT EXISTS `ims_mdkeji_im_boniu_forum_reply` (
+  `id` int(11) NOT NULL AUTO_INCREMENT COMMENT '主键ID',
+  `forum_reply_id` bigint(20) NOT NULL COMMENT '回复ID（Discuz pid）',
+  `forum_post_id` bigint(20) NOT NULL COMMENT '帖子ID（Discuz tid）',
+  `floor` int(11) NOT NULL DEFAULT 0 COMMENT '楼层（主楼为1，不写入本表）',
+  `user_id` bigint(20) DEFAULT NULL COMMENT '回复者UID',
+  `username` varchar(100) DEFAULT NULL COMMENT '回复者用户名',
+  `publish_time` datetime DEFAULT NULL COMMENT '回复时间',
+  `content` text COMMENT '回复内容',
+  `crawl_time` datetime DEFAULT NULL COMMENT '抓取时间',
+  `uniacid` int(11) NOT NULL DEFAULT 1,
+  `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uk_forum_reply_id` (`forum_reply_id`),
+  KEY `idx_forum_post_floor` (`forum_post_id`, `floor`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='论坛帖子回复表';
+
+-- 查询某个帖子的回复（按楼层）
+-- SELECT floor, username, publish_time, content 
+-- FROM `ims_mdkeji_im_boniu_forum_reply` 
+-- WHERE forum_post_id = 123456 
+-- ORDER BY floor;
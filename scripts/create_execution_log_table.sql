@@ -13,6 +13,7 @@ CREATE TABLE IF NOT EXISTS `ims_mdkeji_im_boniu_crawler_log` (
   `pages` int(11) NOT NULL DEFAULT 2 COMMENT '爬取页数',
   `posts_count` int(11) NOT NULL DEFAULT 0 COMMENT '本次爬取的帖子数量',
   `message` text COMMENT '执行消息或错误信息',
+  `metrics` text COMMENT '阶段耗时指标JSON（各阶段次数、总耗时、p50/p95/p99、字节数）',
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
   `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
   PRIMARY KEY (`id`),
@@ -3,12 +3,13 @@
 import argparse
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
-from ..crawler.sites.boniu.crawler import BoniuCrawler
-from ..crawler.utils.storage import save_data
-from ..scheduler.execution_logger import get_execution_logger
+# 爬虫、数据库、存储等依赖较重，只在 crawl 子命令中导入，
+# translate --stats、--help 等短命令无需加载（见 tests/unit/test_import_time.py）
+from ..crawler.utils.profiling import PROFILE_MODES, profile_session
 
 
 def ensure_dir(path: str) -> None:
@@ -16,6 +17,9 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+DEFAULT_OUTPUT = "data/{site}_forum_posts.jsonl"
+
+
 def run(
     mode: str = "db",
     output: Optional[str] = None,
@@ -23,98 +27,405 @@ def run(
     overwrite: bool = False,
     fid: Optional[int] = None,
     post_id: Optional[int] = None,
+    http2: bool = False,
+    sites: Optional[List[str]] = None,
+    refresh: bool = False,
+    time_budget: Optional[float] = None,
+    request_budget: Optional[int] = None,
 ) -> None:
-    """运行博牛爬虫
+    """运行站点爬虫
 
     Args:
-        mode: 运行模式，db=分页入库；json=仅抓取并保存为 JSON，默认为db
-        output: 当 mode=json 时的输出文件路径
+        mode: 运行模式，db=分页入库；json=同样的完整抓取流程，结果流式写入文件，默认为db
+        output: 当 mode=json 时的输出文件路径（.jsonl/.json/.csv/.parquet，{site} 替换为站点名，
+            默认 data/{site}_forum_posts.jsonl）
         pages: 最大爬取页数，默认为2
         overwrite: 是否覆盖数据库中已存在的记录，默认为False
-        fid: 仅抓取指定的版块ID（fid）
-        post_id: 仅抓取指定的帖子ID（thread id），用于快速调试
+        fid: 仅抓取指定的版块ID（fid），仅限单个站点
+        post_id: 仅抓取指定的帖子ID（thread id），用于快速调试，仅限单个站点
+        http2: 是否启用 HTTP/2 传输（需安装 httpx[http2]，不可用时回退 HTTP/1.1）
+        sites: 要运行的站点，默认取 settings.sites.enabled，仍为空时运行全部已发现站点
+        refresh: 增量刷新（仅 db 模式）：重新抓取列表页回复数或最后回复时间有变化的已有帖子
+        time_budget: 每个站点本次运行的时长上限（秒），默认取 settings.schedule.time_budget
+        request_budget: 每个站点本次运行的页面请求数上限，默认取 settings.schedule.request_budget；
+            设置任一预算时详情按优先级分数从高到低抓取，预算耗尽即停止
     """
+    from ..crawler.config.settings import get_settings
+    from ..crawler.sites.registry import get_site_registry
+    from ..crawler.sites.runner import SiteRunner, close_crawler
+    from ..crawler.utils.exporter import MetricsExporter
+    from ..crawler.utils.metrics import get_metrics
+    from ..scheduler.execution_logger import get_execution_logger
+
+    settings = get_settings()
+    if http2:
+        settings.http_client.http2 = True
+    if time_budget is not None:
+        settings.schedule.time_budget = time_budget
+    if request_budget is not None:
+        settings.schedule.request_budget = request_budget
+
+    try:
+        plugins = get_site_registry().select(sites or settings.sites.enabled or None)
+    except KeyError as e:
+        print(f"错误: {e.args[0]}")
+        sys.exit(2)
+    output = output or DEFAULT_OUTPUT
+    if refresh and (mode != "db" or overwrite):
+        print("错误: --refresh 只能用于 db 模式，且不能与 --overwrite 同时使用")
+        sys.exit(2)
+    if len(plugins) > 1:
+        if fid is not None or post_id is not None:
+            print("错误: --fid/--post-id 只能用于单个站点（用 --site 指定）")
+            sys.exit(2)
+        if mode == "json" and "{site}" not in output:
+            print("错误: 多站点文件模式的 --output 需包含 {site} 占位符")
+            sys.exit(2)
+
     # 获取执行日志记录器
     # 检查是否在定时任务环境中运行
     execution_type = os.getenv('EXECUTION_TYPE', 'manual')
     execution_logger = get_execution_logger(execution_type=execution_type)
     
     # 构建执行命令和参数
-    import sys
     command = " ".join(sys.argv)
     parameters = {
         "mode": mode,
         "pages": pages,
         "overwrite": overwrite,
+        "refresh": refresh,
+        "time_budget": settings.schedule.time_budget,
+        "request_budget": settings.schedule.request_budget,
         "fid": fid,
         "post_id": post_id,
-        "output": output
+        "output": output,
+        "http2": http2,
+        "sites": [plugin.name for plugin in plugins],
     }
     
+    # 指标导出（settings.metrics 配置了 textfile_dir/http_port 时生效）
+    exporter = MetricsExporter.from_settings("boniu_crawler")
+    
     # 使用执行上下文管理器记录日志
-    with execution_logger.execution_context(pages=pages, command=command, parameters=parameters):
-        crawler = BoniuCrawler()
-        # 覆盖 fid 列表（若提供）
-        if fid is not None:
-            crawler.fids = [fid]
-
-        # 若提供 post_id，则直接抓取该帖子详情，保存到 data/debug 后返回
-        if post_id is not None:
-            from pathlib import Path
-            thread_url = f"https://bbs.boniu123.cc/thread-{post_id}-1-1.html"
-            content, images = crawler._fetch_post_content(thread_url)
-            debug_dir = Path("data/debug")
-            debug_dir.mkdir(parents=True, exist_ok=True)
-            (debug_dir / f"thread_{post_id}_clean.txt").write_text(content or "", encoding="utf-8")
-            import json as _json
-            (debug_dir / f"thread_{post_id}_images.json").write_text(
-                _json.dumps(images or [], ensure_ascii=False, indent=2), encoding="utf-8"
-            )
-            print(f"已保存: {debug_dir}/thread_{post_id}_clean.txt")
-            print(f"已保存: {debug_dir}/thread_{post_id}_images.json")
-            return
-            
-        if mode == "db":
-            print(f"开始分页抓取并保存到数据库... (最大页数: {pages}, 覆盖模式: {overwrite})")
-            stats_info = crawler.crawl_paginated_and_store(max_pages=pages, overwrite=overwrite)
-            
-            # 处理返回的统计信息
-            if stats_info is None:
-                total_posts = 0
-                fid_stats = {}
-            else:
-                total_posts = stats_info.get('total_posts', 0)
-                fid_stats = stats_info.get('fid_stats', {})
-            
-            # 构建详细的统计消息
-            fid_details = []
-            for fid, count in fid_stats.items():
-                fid_details.append(f"fid={fid} {count}条")
-            
-            if fid_details:
-                message = f"任务执行成功，共处理 {total_posts} 个帖子，其中，{', '.join(fid_details)}"
+    with exporter, execution_logger.execution_context(pages=pages, command=command, parameters=parameters):
+        if len(plugins) == 1:
+            crawler = plugins[0].create(use_db=(mode == "db"))
+            execution_logger.attach_metrics(crawler.metrics)
+            exporter.bind_crawler(crawler)
+            # 覆盖 fid 列表（若提供）
+            if fid is not None:
+                crawler.fids = [fid]
+
+            # 若提供 post_id，则直接抓取该帖子详情（原始响应写入归档）后返回
+            if post_id is not None:
+                _dump_post(crawler, post_id)
+                return
+
+            if mode == "db":
+                print(f"开始分页抓取并保存到数据库... (最大页数: {pages}, 覆盖模式: {overwrite}, 增量刷新: {refresh})")
+                stats_info = crawler.crawl_paginated_and_store(max_pages=pages, overwrite=overwrite, refresh=refresh)
             else:
-                message = f"任务执行成功，共处理 {total_posts} 个帖子"
-            
-            print(f"分页抓取入库完成，共处理 {total_posts} 个帖子")
-            # 手动更新执行日志中的帖子数量
-            execution_logger.end_execution('success', message, total_posts)
+                stats_info = _crawl_to_file(crawler, output.replace("{site}", plugins[0].name), pages, overwrite)
+            schedule = (stats_info or {}).get('schedule')
+            if schedule and schedule['stopped']:
+                print(f"运行预算已耗尽（{schedule['stopped']}），{schedule['skipped']} 个帖子留待下次运行")
+            fid_stats = (stats_info or {}).get('fid_stats', {})
+            details = [f"fid={fid} {count}条" for fid, count in fid_stats.items()]
+            total_posts = (stats_info or {}).get('total_posts', 0)
+        else:
+            # 多站点：每个站点一个线程，共享限速器、连接池与翻译缓存
+            def task(plugin):
+                crawler = plugin.create(use_db=(mode == "db"))
+                try:
+                    if mode == "db":
+                        return crawler.crawl_paginated_and_store(
+                            max_pages=pages, overwrite=overwrite, refresh=refresh
+                        )
+                    return _crawl_to_file(crawler, output.replace("{site}", plugin.name), pages, overwrite)
+                finally:
+                    close_crawler(crawler)
+
+            print(f"开始并发抓取 {len(plugins)} 个站点: {', '.join(p.name for p in plugins)} (最大页数: {pages})")
+            results = SiteRunner(plugins).run(task)
+            execution_logger.attach_metrics(get_metrics())
+            failed = [r for r in results if not r.ok]
+            if len(failed) == len(results):
+                raise RuntimeError("; ".join(f"{r.name}: {r.error}" for r in failed))
+            details = [
+                f"{r.name} {r.total_posts}条" if r.ok else f"{r.name} 失败({r.error})" for r in results
+            ]
+            total_posts = sum(r.total_posts for r in results)
+            for r in results:
+                print(f"站点 {r.name}: {'成功' if r.ok else '失败'}，{r.total_posts} 个帖子，耗时 {r.elapsed:.1f}秒")
+
+        if details:
+            message = f"任务执行成功，共处理 {total_posts} 个帖子，其中，{', '.join(details)}"
+        else:
+            message = f"任务执行成功，共处理 {total_posts} 个帖子"
+        
+        print(f"分页抓取{'入库' if mode == 'db' else '写入文件'}完成，共处理 {total_posts} 个帖子")
+        # 手动更新执行日志中的帖子数量
+        execution_logger.end_execution('success', message, total_posts)
+
+
+def run_worker(
+    frontier_url: Optional[str] = None,
+    sites: Optional[List[str]] = None,
+    seed: bool = False,
+    pages: int = 2,
+    fid: Optional[int] = None,
+    mode: str = "db",
+    output: Optional[str] = None,
+    kinds: Optional[List[str]] = None,
+    concurrency: Optional[int] = None,
+    max_tasks: Optional[int] = None,
+    stats_only: bool = False,
+) -> None:
+    """从持久化抓取队列领取并处理任务（可在多个进程/机器上同时运行）
+
+    Args:
+        frontier_url: 队列 URL（sqlite:///path 或 redis://host:port/db），默认 settings.frontier.url
+        sites: 处理的站点，默认取 settings.sites.enabled，仍为空时处理全部已发现站点
+        seed: 是否先入队各版块第 1 页列表任务
+        pages: 入队时每个版块最多翻到第几页
+        fid: 入队时仅入队指定版块
+        mode: db=写入数据库；json=写入文件（多个 worker 进程请使用不同的 --output）
+        output: json 模式的输出文件（{site} 替换为站点名）
+        kinds: 只处理这些类型的任务（list/thread/image），默认全部
+        concurrency: 领取任务的线程数，默认 settings.frontier.concurrency
+        max_tasks: 最多处理的任务数（0 表示只入队不处理），默认处理到队列为空
+        stats_only: 只显示队列统计
+    """
+    from ..crawler.config.settings import get_settings
+    from ..crawler.sites.registry import get_site_registry
+    from ..crawler.sites.runner import close_crawler
+    from ..crawler.sites.worker import FrontierWorker
+    from ..crawler.utils.frontier import open_frontier
+    from ..crawler.utils.sinks import create_sink
+
+    settings = get_settings()
+    try:
+        frontier = open_frontier(frontier_url)
+    except (ValueError, ImportError) as e:
+        print(f"错误: {e}")
+        sys.exit(2)
+    with frontier:
+        if stats_only:
+            print(f"队列 {frontier_url or settings.frontier.url}: {frontier.counts()}")
             return
+        try:
+            plugins = get_site_registry().select(sites or settings.sites.enabled or None)
+        except KeyError as e:
+            print(f"错误: {e.args[0]}")
+            sys.exit(2)
+        output = output or DEFAULT_OUTPUT
+        if mode == "json" and len(plugins) > 1 and "{site}" not in output:
+            print("错误: 多站点文件模式的 --output 需包含 {site} 占位符")
+            sys.exit(2)
+
+        crawlers = {}
+        sinks = []
+        try:
+            for plugin in plugins:
+                crawler = plugin.create(use_db=(mode == "db"))
+                crawlers[plugin.name] = crawler
+                if fid is not None:
+                    crawler.fids = [fid]
+                if mode == "json":
+                    sink_path, existing_ids = _prepare_file_output(output.replace("{site}", plugin.name), False)
+                    sink = create_sink(sink_path, metrics=crawler.metrics)
+                    sinks.append(sink)
+                    crawler.set_sinks([sink])
+                    crawler.known_ids = existing_ids
+                if seed:
+                    queued = crawler.seed_frontier(frontier, max_pages=pages)
+                    print(f"站点 {plugin.name}: 入队 {queued} 个列表任务（最大页数: {pages}）")
+
+            worker = FrontierWorker(frontier, crawlers, kinds=kinds, concurrency=concurrency)
+            print(f"worker {worker.worker_id} 开始处理队列任务，站点: {', '.join(crawlers)}")
+            stats = worker.run(max_tasks=max_tasks)
+        finally:
+            for sink in sinks:
+                sink.close()
+            for crawler in crawlers.values():
+                close_crawler(crawler)
+        print(
+            f"worker 结束: 领取 {stats.leased}，完成 {stats.done}，重试 {stats.retried}，"
+            f"放弃 {stats.dead}，租约失效 {stats.lost}；队列: {frontier.counts()}"
+        )
+
+
+def run_reextract(
+    sites: Optional[List[str]] = None,
+    archive_root: Optional[str] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+) -> None:
+    """用当前解析规则重新解析归档的详情页，批量更新库中有变化的帖子（不重新抓取）
+
+    Args:
+        sites: 要处理的站点，默认取 settings.sites.enabled，仍为空时处理全部已发现站点
+        archive_root: 归档目录（仅限单个站点），默认 settings.archive.root/<site>
+        workers: 解析进程数（0 表示在当前进程解析），默认 CPU 核数
+        dry_run: 只统计有变化的帖子，不更新数据库
+    """
+    from ..crawler.config.settings import get_settings
+    from ..crawler.sites.registry import get_site_registry
+    from ..crawler.sites.runner import close_crawler
+    from ..crawler.utils.archive import archive_path, open_archive
+
+    settings = get_settings()
+    try:
+        plugins = get_site_registry().select(sites or settings.sites.enabled or None)
+    except KeyError as e:
+        print(f"错误: {e.args[0]}")
+        sys.exit(2)
+    if archive_root and len(plugins) > 1:
+        print("错误: --archive 只能用于单个站点（用 --site 指定）")
+        sys.exit(2)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # 重新解析只更新已有记录，不写入新的归档
+    settings.archive.enabled = False
+
+    for plugin in plugins:
+        root = archive_root or archive_path(plugin.name)
+        if not os.path.isdir(root):
+            print(f"站点 {plugin.name}: 归档目录 {root} 不存在，跳过")
+            continue
+        crawler = plugin.create(use_db=True)
+        try:
+            with open_archive(plugin.name, root) as archive:
+                print(f"站点 {plugin.name}: 重新解析归档 {root}（{len(archive)} 个页面，解析进程 {workers}）")
+                stats = crawler.reextract(archive, workers=workers, dry_run=dry_run)
+        finally:
+            close_crawler(crawler)
+        result = "未更新（--dry-run）" if dry_run else f"已更新 {stats['updated']} 条"
+        print(
+            f"站点 {plugin.name}: 归档 {stats['scanned']} 条，库中不存在 {stats['missing']} 条，"
+            f"有变化 {stats['changed']} 条，{result}"
+        )
+
+
+def _dump_post(crawler, post_id: int) -> None:
+    """抓取单个帖子详情：原始响应写入站点归档，输出清洗结果与图片列表"""
+    import json
+
+    from ..crawler.utils.archive import open_archive
+
+    archive = None
+    if crawler.archive is None:
+        archive = crawler.archive = open_archive(crawler.SITE_NAME)
+    thread_url = f"{crawler.base_url}/thread-{post_id}-1-1.html"
+    try:
+        content, images = crawler._fetch_post_content(thread_url)
+        print(json.dumps({"content": content, "images": images}, ensure_ascii=False, indent=2))
+        print(f"原始响应已归档: {crawler.archive.root}（python main.py archive --env <env> --get {post_id}）")
+    finally:
+        if archive is not None:
+            archive.close()
+            crawler.archive = None
+
+
+def run_archive(
+    site: Optional[str] = None,
+    archive_root: Optional[str] = None,
+    get: Optional[str] = None,
+    output: Optional[str] = None,
+    reindex: bool = False,
+) -> None:
+    """查看原始响应归档：统计、按 URL/帖子ID 读取单个响应、重建索引
 
-        # JSON 模式（与之前行为一致）
-        print("开始抓取论坛帖子...")
-        posts = crawler.crawl_forum_posts()
-        if not posts:
-            print("未抓取到任何帖子数据")
+    Args:
+        site: 站点名（默认 boniu），决定默认归档目录 settings.archive.root/<site>
+        archive_root: 归档目录，默认按站点确定
+        get: 按 URL 或帖子ID 读取最新归档的响应，输出元信息
+        output: 与 get 一同使用，把响应体写入该文件（"-" 表示标准输出）
+        reindex: 由 index.jsonl 重建内存映射索引 index.map
+    """
+    import json
+
+    from ..crawler.utils.archive import SEGMENT_SUFFIX, archive_path, open_archive
+
+    root = archive_root or archive_path(site or "boniu")
+    if not os.path.isdir(root):
+        print(f"错误: 归档目录 {root} 不存在")
+        sys.exit(2)
+    with open_archive(site or "boniu", root) as archive:
+        if reindex:
+            print(f"已重建索引: {archive.reindex()} 个 URL")
+        if get:
+            record = archive.get(get)
+            if record is None:
+                print(f"未找到: {get}")
+                sys.exit(1)
+            if output == "-":
+                sys.stdout.write(record.text)
+                return
+            print(json.dumps(record.meta(), ensure_ascii=False, indent=2))
+            if output:
+                ensure_dir(os.path.dirname(output) or ".")
+                Path(output).write_bytes(record.body)
+                print(f"响应体已保存: {output}（{len(record.body)} 字节）")
             return
+        segments = [f for f in os.listdir(root) if f.endswith(SEGMENT_SUFFIX)]
+        size = sum(os.path.getsize(os.path.join(root, f)) for f in segments)
+        print(f"归档 {root}: {len(archive)} 个 URL，{len(segments)} 个段文件，{size / 1024 / 1024:.1f} MB")
 
-        if not output:
-            output = "data/boniu_forum_posts.json"
-        dirname = os.path.dirname(output) or "."
-        ensure_dir(dirname)
 
-        file_path = save_data(posts, os.path.basename(output), output_dir=dirname)
-        print(f"抓取完成，共 {len(posts)} 条；已保存到: {file_path}")
+def _crawl_to_file(crawler, output: str, pages: int, overwrite: bool) -> Optional[dict]:
+    """文件模式：与 db 模式相同的分页、多版块、详情与图片流程，结果边爬边写入文件"""
+    from ..crawler.utils.sinks import create_sink
+    from ..crawler.utils.storage import jsonl_to_json
+
+    sink_path, existing_ids = _prepare_file_output(output, overwrite)
+    sink = create_sink(sink_path, metrics=crawler.metrics)
+    crawler.set_sinks([sink])
+    reply_sink = None
+    if crawler.replies.enabled:
+        # 回复写入同目录的 <输出名>_replies 文件（格式与帖子输出相同）
+        root, ext = os.path.splitext(sink_path)
+        reply_sink = create_sink(f"{root}_replies{ext}", metrics=crawler.metrics)
+        crawler.set_reply_sink(reply_sink)
+    print(f"开始分页抓取并写入文件... (最大页数: {pages}, 输出: {sink_path}, 已有 {len(existing_ids)} 条)")
+    try:
+        stats_info = crawler.crawl_paginated_and_store(max_pages=pages, existing_ids=existing_ids)
+    finally:
+        sink.close()
+        if reply_sink is not None:
+            reply_sink.close()
+    if sink_path != output:
+        count = jsonl_to_json(sink_path, output)
+        print(f"已导出 JSON: {output}（{count} 条）")
+    return stats_info
+
+
+def _prepare_file_output(output: str, overwrite: bool) -> Tuple[str, Set[str]]:
+    """确定文件模式的流式输出路径，并读取已写入的帖子ID用于续爬
+
+    .json 输出先流式写入同名 .jsonl，结束后再导出为 JSON 数组；
+    Parquet 无法追加，已存在时与 overwrite 一样重新写入。
+
+    Args:
+        output: 输出文件路径（.jsonl/.json/.csv/.parquet）
+        overwrite: 是否丢弃已有输出重新抓取
+
+    Returns:
+        (流式输出路径, 已存在的帖子ID集合)
+    """
+    from ..crawler.utils.storage import iter_records
+
+    sink_path = f"{output}l" if output.endswith(".json") else output
+    ensure_dir(os.path.dirname(sink_path) or ".")
+    existing_ids: Set[str] = set()
+    if os.path.exists(sink_path):
+        if overwrite or sink_path.endswith(".parquet"):
+            os.remove(sink_path)
+        else:
+            existing_ids = {
+                str(r["forum_post_id"]) for r in iter_records(sink_path) if r.get("forum_post_id")
+            }
+    return sink_path, existing_ids
 
 
 def _load_env(env_name: str) -> None:
@@ -142,52 +453,100 @@ def _load_env(env_name: str) -> None:
         pass
 
 
-def translate_history() -> None:
-    """翻译历史数据"""
-    # 导入翻译脚本
-    script_path = Path(__file__).parent.parent.parent / "scripts" / "translate_history_data.py"
-    if not script_path.exists():
-        print(f"错误: 找不到翻译脚本 {script_path}")
-        sys.exit(1)
-    
-    # 执行翻译脚本
-    import subprocess
-    # 过滤掉 --env 参数，因为翻译脚本不需要
+def _script_args() -> List[str]:
+    """取出传给翻译脚本的参数：过滤掉脚本不需要的 --env 与 --profile"""
     args = []
     skip_next = False
-    for i, arg in enumerate(sys.argv[2:]):
+    argv = sys.argv[2:]
+    for i, arg in enumerate(argv):
         if skip_next:
             skip_next = False
             continue
         if arg == '--env':
             skip_next = True
             continue
+        if arg == '--profile':
+            skip_next = i + 1 < len(argv) and argv[i + 1] in PROFILE_MODES
+            continue
         args.append(arg)
-    subprocess.run([sys.executable, str(script_path)] + args)
+    return args
+
+
+def _run_script(script_path: Path, args: List[str], profile: Optional[str] = None) -> None:
+    """执行翻译脚本；开启剖析时在当前进程内运行，以便剖析器能采集到脚本的调用栈"""
+    if not profile:
+        import subprocess
+        subprocess.run([sys.executable, str(script_path)] + args)
+        return
+
+    import runpy
+    saved_argv = sys.argv
+    sys.argv = [str(script_path)] + args
+    try:
+        with _profiled(script_path.stem, profile):
+            runpy.run_path(str(script_path), run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        sys.argv = saved_argv
 
 
-def translate_circle() -> None:
-    """翻译圈子数据"""
+@contextmanager
+def _profiled(name: str, mode: Optional[str]):
+    """按 --profile 开启剖析，结束后输出结果文件路径"""
+    if not mode:
+        yield
+        return
+    with profile_session(name, mode) as outputs:
+        yield
+    for path in outputs.values():
+        print(f"剖析结果已保存: {path}")
+
+
+def translate_history(profile: Optional[str] = None) -> None:
+    """翻译历史数据
+    
+    Args:
+        profile: 剖析模式（sampling/cprofile），为None时不剖析
+    """
+    # 导入翻译脚本
+    script_path = Path(__file__).parent.parent.parent / "scripts" / "translate_history_data.py"
+    if not script_path.exists():
+        print(f"错误: 找不到翻译脚本 {script_path}")
+        sys.exit(1)
+    
+    # 执行翻译脚本（过滤掉 --env 参数，因为翻译脚本不需要）
+    _run_script(script_path, _script_args(), profile)
+
+
+def translate_circle(profile: Optional[str] = None) -> None:
+    """翻译圈子数据
+    
+    Args:
+        profile: 剖析模式（sampling/cprofile），为None时不剖析
+    """
     # 导入翻译脚本
     script_path = Path(__file__).parent.parent.parent / "scripts" / "translate_circle_data.py"
     if not script_path.exists():
         print(f"错误: 找不到圈子翻译脚本 {script_path}")
         sys.exit(1)
     
-    # 执行翻译脚本
-    import subprocess
-    # 过滤掉 --env 参数，因为翻译脚本不需要
-    args = []
-    skip_next = False
-    for i, arg in enumerate(sys.argv[2:]):
-        if skip_next:
-            skip_next = False
-            continue
-        if arg == '--env':
-            skip_next = True
-            continue
-        args.append(arg)
-    subprocess.run([sys.executable, str(script_path)] + args)
+    # 执行翻译脚本（过滤掉 --env 参数，因为翻译脚本不需要）
+    _run_script(script_path, _script_args(), profile)
+
+
+PROFILE_HELP = "剖析模式：sampling=采样（默认，输出折叠栈与热点报告），cprofile=确定性剖析；结果写入 logs/YYYY/MM/"
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sampling",
+        choices=PROFILE_MODES,
+        default=None,
+        help=PROFILE_HELP,
+    )
 
 
 def main() -> None:
@@ -203,7 +562,7 @@ def main() -> None:
         "--mode",
         choices=["db", "json"],
         default="db",
-        help="运行模式：db=分页入库（默认），json=保存为文件",
+        help="运行模式：db=分页入库（默认），json=完整抓取并流式写入文件（不需要数据库）",
     )
     crawl_parser.add_argument(
         "--env",
@@ -214,7 +573,8 @@ def main() -> None:
     crawl_parser.add_argument(
         "--output",
         "-o",
-        help="输出文件路径（默认 data/boniu_forum_posts.json）",
+        help="json 模式的输出文件（.jsonl/.json/.csv/.parquet，{site} 替换为站点名，"
+        "默认 data/{site}_forum_posts.jsonl；已存在时续爬）",
         default=None,
     )
     crawl_parser.add_argument(
@@ -226,7 +586,24 @@ def main() -> None:
     crawl_parser.add_argument(
         "--overwrite",
         action="store_true",
-        help="覆盖数据库中已存在的记录（默认不覆盖）",
+        help="覆盖已存在的记录（db 模式更新数据库，json 模式重写输出文件；默认不覆盖）",
+    )
+    crawl_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="增量刷新（仅 db 模式）：已有帖子在列表页回复数或最后回复时间变化时重新抓取详情，正文未变只更新回复信号",
+    )
+    crawl_parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="每个站点本次运行的时长上限（秒）；设置预算时详情按新鲜度/精华/回复数/版块权重的分数从高到低抓取",
+    )
+    crawl_parser.add_argument(
+        "--request-budget",
+        type=int,
+        default=None,
+        help="每个站点本次运行的页面请求数上限（列表/详情/回复页，不含图片）；预算耗尽时停止，未抓取的帖子下次运行补抓",
     )
     crawl_parser.add_argument(
         "--fid",
@@ -237,10 +614,86 @@ def main() -> None:
     crawl_parser.add_argument(
         "--post-id",
         type=int,
-        help="仅抓取指定的帖子ID（thread id），会保存清洗结果到 data/debug",
+        help="仅抓取指定的帖子ID（thread id），输出清洗结果，原始响应写入归档（ARCHIVE__ROOT/<site>）",
         default=None,
     )
+    crawl_parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="使用 HTTP/2 传输（需安装 httpx[http2]，不可用时自动回退 HTTP/1.1）",
+    )
+    crawl_parser.add_argument(
+        "--site",
+        action="append",
+        dest="sites",
+        help="要运行的站点（可重复指定；默认 SITES__ENABLED，仍为空时运行全部站点，多个站点并发运行）",
+    )
+    _add_profile_argument(crawl_parser)
     
+    # worker 子命令（持久化抓取队列）
+    worker_parser = subparsers.add_parser('worker', help='从持久化抓取队列领取并处理任务（可多进程/多机运行）')
+    worker_parser.add_argument(
+        "--env",
+        choices=["dev", "prd"],
+        required=True,
+        help="加载环境变量文件：dev -> env.dev；prd -> env.prd（必传）",
+    )
+    worker_parser.add_argument(
+        "--frontier",
+        default=None,
+        help="队列 URL：sqlite:///data/frontier.db（单机）或 redis://host:6379/0（多机），默认 FRONTIER__URL",
+    )
+    worker_parser.add_argument("--site", action="append", dest="sites", help="处理的站点（可重复指定）")
+    worker_parser.add_argument("--seed", action="store_true", help="先入队各版块第 1 页列表任务")
+    worker_parser.add_argument("--pages", type=int, default=2, help="入队时每个版块最多翻到第几页（默认 2）")
+    worker_parser.add_argument("--fid", type=int, default=None, help="入队时仅入队指定的版块ID（fid）")
+    worker_parser.add_argument(
+        "--mode",
+        choices=["db", "json"],
+        default="db",
+        help="db=写入数据库（默认），json=写入文件（多个 worker 进程请使用不同的 --output）",
+    )
+    worker_parser.add_argument("--output", "-o", default=None, help="json 模式的输出文件（{site} 替换为站点名）")
+    worker_parser.add_argument(
+        "--kind",
+        action="append",
+        dest="kinds",
+        choices=["list", "thread", "image"],
+        help="只处理指定类型的任务（可重复指定，默认全部）",
+    )
+    worker_parser.add_argument("--concurrency", type=int, default=None, help="领取任务的线程数（默认 FRONTIER__CONCURRENCY）")
+    worker_parser.add_argument("--max-tasks", type=int, default=None, help="最多处理的任务数（0 表示只入队不处理）")
+    worker_parser.add_argument("--stats", action="store_true", help="只显示队列统计")
+
+    # reextract 子命令（从原始页面归档重新解析）
+    reextract_parser = subparsers.add_parser('reextract', help='用当前解析规则重新解析归档的详情页并更新数据库（不重新抓取）')
+    reextract_parser.add_argument(
+        "--env",
+        choices=["dev", "prd"],
+        required=True,
+        help="加载环境变量文件：dev -> env.dev；prd -> env.prd（必传）",
+    )
+    reextract_parser.add_argument("--site", action="append", dest="sites", help="处理的站点（可重复指定）")
+    reextract_parser.add_argument(
+        "--archive", default=None, help="归档目录（仅限单个站点，默认 ARCHIVE__ROOT/<site>）"
+    )
+    reextract_parser.add_argument("--workers", type=int, default=None, help="解析进程数（默认 CPU 核数，0 表示不使用子进程）")
+    reextract_parser.add_argument("--dry-run", action="store_true", help="只统计有变化的帖子，不更新数据库")
+
+    # archive 子命令（查看原始响应归档）
+    archive_parser = subparsers.add_parser('archive', help='查看原始响应归档（统计、按 URL/帖子ID 读取、重建索引）')
+    archive_parser.add_argument(
+        "--env",
+        choices=["dev", "prd"],
+        required=True,
+        help="加载环境变量文件：dev -> env.dev；prd -> env.prd（必传）",
+    )
+    archive_parser.add_argument("--site", default=None, help="站点名（默认 boniu）")
+    archive_parser.add_argument("--archive", default=None, help="归档目录（默认 ARCHIVE__ROOT/<site>）")
+    archive_parser.add_argument("--get", default=None, help="按 URL 或帖子ID 读取最新归档的响应")
+    archive_parser.add_argument("--output", "-o", default=None, help="与 --get 一同使用：响应体写入文件（- 表示输出到终端）")
+    archive_parser.add_argument("--reindex", action="store_true", help="重建内存映射索引 index.map")
+
     # translate 子命令（翻译历史数据）
     translate_parser = subparsers.add_parser('translate', help='翻译历史数据')
     translate_parser.add_argument('--batch-size', type=int, default=10, help='每批处理的记录数（默认10）')
@@ -249,6 +702,7 @@ def main() -> None:
     translate_parser.add_argument('--table', type=str, default='ims_mdkeji_im_boniu_forum_post', help='数据表名称')
     translate_parser.add_argument('--stats', action='store_true', help='只显示统计信息')
     translate_parser.add_argument('--auto', action='store_true', help='自动模式，不需要用户确认')
+    _add_profile_argument(translate_parser)
     translate_parser.add_argument(
         "--env",
         choices=["dev", "prd"],
@@ -264,6 +718,7 @@ def main() -> None:
     translate_circle_parser.add_argument('--table', type=str, default='ims_mdkeji_im_circle', help='数据表名称')
     translate_circle_parser.add_argument('--stats', action='store_true', help='只显示统计信息')
     translate_circle_parser.add_argument('--auto', action='store_true', help='自动模式，不需要用户确认')
+    _add_profile_argument(translate_circle_parser)
     translate_circle_parser.add_argument(
         "--env",
         choices=["dev", "prd"],
@@ -284,11 +739,24 @@ def main() -> None:
     
     # 执行对应的命令
     if args.command == 'crawl':
-        run(args.mode, args.output, args.pages, args.overwrite, args.fid, args.post_id)
+        with _profiled('crawl', args.profile):
+            run(
+                args.mode, args.output, args.pages, args.overwrite, args.fid, args.post_id, args.http2, args.sites,
+                args.refresh, args.time_budget, args.request_budget,
+            )
+    elif args.command == 'worker':
+        run_worker(
+            args.frontier, args.sites, args.seed, args.pages, args.fid, args.mode, args.output,
+            args.kinds, args.concurrency, args.max_tasks, args.stats,
+        )
+    elif args.command == 'reextract':
+        run_reextract(args.sites, args.archive, args.workers, args.dry_run)
+    elif args.command == 'archive':
+        run_archive(args.site, args.archive, args.get, args.output, args.reindex)
     elif args.command == 'translate':
-        translate_history()
+        translate_history(args.profile)
     elif args.command == 'translate-circle':
-        translate_circle()
+        translate_circle(args.profile)
 
 
 if __name__ == "__main__":
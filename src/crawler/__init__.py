@@ -1,5 +1,14 @@
-"""爬虫核心包"""
+"""爬虫核心包
 
-from .sites.boniu.crawler import BoniuCrawler
+BoniuCrawler 按需导入（依赖 bs4、pymysql、翻译器等），
+导入 src.crawler 下的轻量模块（配置、指标等）时不会加载整条爬虫依赖链。
+"""
 
 __all__ = ["BoniuCrawler"]
+
+
+def __getattr__(name):
+    if name == "BoniuCrawler":
+        from .sites.boniu.crawler import BoniuCrawler
+        return BoniuCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
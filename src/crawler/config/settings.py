@@ -1,6 +1,7 @@
 """配置管理模块"""
 
 import os
+import threading
 from typing import Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
@@ -48,6 +49,11 @@ class StorageConfig(BaseModel):
     output_dir: str = "./data"
     format: str = "json"  # json, csv, excel, txt
     filename: str = "crawled_data"
+    batch_size: int = 50  # Sink 每批写出的记录数
+    fsync_every: int = 1000  # JSONL 每写入多少条记录 fsync 一次（0 表示不按条数）
+    fsync_interval: float = 5.0  # JSONL 距上次 fsync 超过多少秒时 fsync（0 表示不按时间）
+    parquet_row_group_size: int = 10000  # Parquet 每个 row group 的行数
+    parquet_compression: str = "zstd"  # Parquet 压缩算法
 
 
 class AntiCrawlerConfig(BaseModel):
@@ -66,12 +72,94 @@ class AntiCrawlerConfig(BaseModel):
     proxy_pool_url: Optional[str] = None
 
 
+class RateLimitConfig(BaseModel):
+    """自适应限速配置（按主机 AIMD）"""
+    enabled: bool = True
+    initial_rate: float = 0.5  # 初始速率（请求/秒）
+    min_rate: float = 0.1  # 最低速率（请求/秒）
+    max_rate: float = 2.0  # 最高速率（请求/秒）
+    increase_step: float = 0.05  # 正常响应后的加性增量
+    decrease_factor: float = 0.5  # 429/5xx/慢响应后的乘性减因子
+    slow_threshold: float = 5.0  # 慢响应阈值（秒）
+    jitter: float = 0.2  # 请求间隔随机抖动比例
+
+
+class CircuitBreakerConfig(BaseModel):
+    """熔断器配置（按主机/接口）"""
+    enabled: bool = True
+    failure_threshold: int = 5  # 连续失败多少次后熔断
+    recovery_timeout: float = 60.0  # 熔断后多久放行探测请求（秒）
+
+
+class HttpClientConfig(BaseModel):
+    """共享HTTP客户端配置"""
+    pool_connections: int = 32  # 缓存的主机连接池数量
+    pool_maxsize: Optional[int] = None  # 每主机最大连接数，默认 max(10, max_concurrent*2)
+    dns_cache_ttl: float = 300.0  # DNS缓存时间（秒），0 表示不缓存
+    http2: bool = False  # 详情页与图片请求使用 HTTP/2（需安装 httpx[http2]，不可用时回退 HTTP/1.1）
+
+
+class MetricsConfig(BaseModel):
+    """Prometheus 指标导出配置"""
+    textfile_dir: Optional[str] = None  # node_exporter textfile collector 目录，运行结束写入 *.prom
+    http_port: Optional[int] = None  # 本地 /metrics 端口，不设置则不启动
+    http_addr: str = "127.0.0.1"  # /metrics 监听地址
+
+
+class SitesConfig(BaseModel):
+    """多站点运行配置"""
+    enabled: List[str] = Field(default_factory=list)  # 运行的站点，为空表示 src/crawler/sites 下发现的全部站点
+    max_parallel: int = 4  # 同时运行的站点数（每个站点一个线程）
+    detail_workers: int = 1  # 每个站点抓取详情页的线程数（请求节奏仍受按主机限速约束）
+
+
+class FrontierConfig(BaseModel):
+    """持久化抓取队列配置（python main.py worker）"""
+    url: str = "sqlite:///data/frontier.db"  # 单机 sqlite:///path；多机 redis://host:6379/0
+    lease_seconds: float = 300.0  # 租约时长（秒），到期未确认的任务重新可见
+    max_attempts: int = 3  # 每个任务最多领取次数，超过后标记为 dead
+    retry_delay: float = 30.0  # 失败重试的基准延迟（秒），按 2 的幂次递增
+    poll_interval: float = 1.0  # 队列暂时为空时的轮询间隔（秒）
+    concurrency: int = 1  # 每个 worker 进程中领取任务的线程数
+
+
+class ArchiveConfig(BaseModel):
+    """原始响应归档配置（python main.py archive / reextract）"""
+    enabled: bool = False  # 归档抓取到的页面响应（图片不归档）
+    root: str = "data/archive"  # 归档根目录，每个站点一个子目录
+    segment_mb: int = 64  # 单个段文件大小上限（MB）
+    level: int = 3  # 压缩级别（zstd；未安装 zstandard 时使用 zlib）
+
+
+class RepliesConfig(BaseModel):
+    """帖子回复分页抓取配置"""
+    enabled: bool = False  # 抓取帖子的回复页，回复写入回复表（默认只抓主楼）
+    max_pages: int = 0  # 每帖最多抓取的页数（含第 1 页），0 表示不限
+    workers: int = 4  # 同一帖子回复页的并发抓取线程数（请求节奏仍受按主机限速约束）
+
+
+class ScheduleConfig(BaseModel):
+    """详情抓取优先级与单次运行预算配置（见 utils/priority.py）"""
+    time_budget: float = 0  # 单次运行时长上限（秒），0 表示不限
+    request_budget: int = 0  # 单次运行页面请求数上限（列表/详情/回复页，不含图片），0 表示不限
+    list_share: float = 0.5  # 翻列表页最多使用的预算比例，其余留给按分数抓取详情
+    freshness_weight: float = 1.0  # 新鲜度（最后回复时间）权重
+    essence_weight: float = 1.0  # 精华帖权重
+    reply_weight: float = 1.0  # 回复数权重
+    freshness_half_life: float = 24.0  # 新鲜度半衰期（小时）
+    reply_saturation: int = 100  # 回复数达到该值时回复项记满分
+    fid_weights: Dict[str, float] = Field(default_factory=dict)  # 版块权重 {fid: 系数}，未列出的版块为 1
+
+
 class CrawlerConfig(BaseModel):
     """爬虫基础配置"""
     timeout: int = 30
-    retries: int = 3
-    retry_delay: int = 1
+    retries: int = 3  # 单个请求的最大尝试次数
+    retry_delay: int = 1  # 指数退避的基准延迟（秒）
+    retry_max_delay: float = 30.0  # 单次退避的最大延迟（秒）
+    retry_budget: int = 50  # 每次运行的重试总预算，-1 表示不限制
     max_concurrent: int = 5
+    parse_workers: int = 0  # HTML 解析进程数，0 表示在抓取线程中解析（见 utils/parse_pool.py）
     headers: Dict[str, str] = Field(default_factory=lambda: {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -123,6 +211,33 @@ class Settings(BaseSettings):
     # 代理配置
     proxy: ProxyConfig = ProxyConfig()
     
+    # 限速配置
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    
+    # 熔断配置
+    circuit_breaker: CircuitBreakerConfig = CircuitBreakerConfig()
+    
+    # HTTP客户端配置
+    http_client: HttpClientConfig = HttpClientConfig()
+    
+    # 指标导出配置
+    metrics: MetricsConfig = MetricsConfig()
+    
+    # 多站点配置
+    sites: SitesConfig = SitesConfig()
+    
+    # 抓取队列配置
+    frontier: FrontierConfig = FrontierConfig()
+    
+    # 原始响应归档配置
+    archive: ArchiveConfig = ArchiveConfig()
+    
+    # 帖子回复分页抓取配置
+    replies: RepliesConfig = RepliesConfig()
+    
+    # 详情抓取优先级与运行预算配置
+    schedule: ScheduleConfig = ScheduleConfig()
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -144,18 +259,21 @@ class Settings(BaseSettings):
 
 # 全局设置实例
 _settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
 
 
 def get_settings() -> Settings:
     """获取设置实例"""
     global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = Settings()
+        return _settings
 
 
 def reload_settings() -> Settings:
     """重新加载设置"""
     global _settings
-    _settings = Settings()
-    return _settings
+    with _settings_lock:
+        _settings = Settings()
+        return _settings
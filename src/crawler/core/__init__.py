@@ -1,6 +1,14 @@
 """核心爬虫模块"""
 
-from .base import BaseCrawler
-from .requests_impl import RequestsCrawler
-
 __all__ = ["BaseCrawler", "RequestsCrawler"]
+
+
+def __getattr__(name):
+    # 按需导入：requests_impl 依赖 requests/bs4，导入 core.base 时不必加载
+    if name == "BaseCrawler":
+        from .base import BaseCrawler
+        return BaseCrawler
+    if name == "RequestsCrawler":
+        from .requests_impl import RequestsCrawler
+        return RequestsCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,7 @@
 """
 
 import asyncio
+import threading
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -11,6 +12,10 @@ from dataclasses import dataclass, field
 
 from ..config.settings import get_settings
 from ..utils.anti_detect import random_delay, get_random_user_agent
+from ..utils.circuit_breaker import get_breaker_registry
+from ..utils.metrics import Stage, get_metrics
+from ..utils.rate_limiter import get_rate_limiter
+from ..utils.retry import RetryBudget, RetryPolicy
 
 
 @dataclass
@@ -43,6 +48,16 @@ class BaseCrawler(ABC):
         self.logger = None  # 将在子类中初始化
         self.stats = CrawlerStats()
         self.is_running = False
+        self.rate_limiter = get_rate_limiter()
+        self.breakers = get_breaker_registry()
+        self.retry_policy = RetryPolicy(
+            max_attempts=self.settings.crawler.retries,
+            base_delay=self.settings.crawler.retry_delay,
+            max_delay=self.settings.crawler.retry_max_delay,
+            budget=RetryBudget(self.settings.crawler.retry_budget),
+        )
+        self.metrics = get_metrics()
+        self._waits = threading.local()
         
     def start(self) -> None:
         """开始爬取"""
@@ -51,6 +66,8 @@ class BaseCrawler(ABC):
         
         self.is_running = True
         self.stats.start_time = datetime.now()
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.reset()
         if self.logger:
             self.logger.info(f"爬虫 {self.name} 开始运行")
         
@@ -87,9 +104,13 @@ class BaseCrawler(ABC):
                 "success": self.stats.success,
                 "failed": self.stats.failed,
                 "retries": self.stats.retries,
+                "retry_budget_remaining": self.retry_policy.budget.remaining if self.retry_policy.budget else None,
                 "start_time": self.stats.start_time.isoformat() if self.stats.start_time else None,
                 "end_time": self.stats.end_time.isoformat() if self.stats.end_time else None,
-            }
+            },
+            "rate_limits": self.rate_limiter.snapshot(),
+            "breakers": self.breakers.snapshot(),
+            "stages": self.metrics.summary()["stages"],
         }
     
     def log_stats(self) -> None:
@@ -109,17 +130,50 @@ class BaseCrawler(ABC):
             f"耗时={duration:.2f}秒"
         )
     
-    def apply_anti_crawler_strategy(self) -> None:
-        """应用反爬虫策略"""
+    def record_wait(self, stage: str, seconds: float) -> None:
+        """
+        记录一次主动等待（礼貌等待、重试退避）
+
+        等待时间计入对应阶段，同时累加到当前线程的等待总量，
+        便于抓取阶段从自身耗时中扣除等待部分。
+        
+        Args:
+            stage: 阶段名称（Stage.POLITENESS_SLEEP / Stage.RETRY_BACKOFF）
+            seconds: 等待秒数
+        """
+        if seconds <= 0:
+            return
+        self.metrics.observe(stage, seconds)
+        self._waits.total = self.waited_seconds() + seconds
+    
+    def waited_seconds(self) -> float:
+        """当前线程累计的主动等待秒数"""
+        return getattr(self._waits, 'total', 0.0)
+    
+    def apply_anti_crawler_strategy(self, url: Optional[str] = None) -> None:
+        """
+        应用反爬虫策略
+        
+        Args:
+            url: 即将请求的URL，提供时按主机自适应限速
+        """
         if not self.settings.anti_crawler.enabled:
             return
         
-        # 随机延迟
-        if self.settings.anti_crawler.random_delay:
+        # 按主机自适应限速；未启用时退回随机延迟
+        if url and self.settings.rate_limit.enabled:
+            waited = self.rate_limiter.acquire(url)
+            self.record_wait(Stage.POLITENESS_SLEEP, waited)
+            if self.logger and waited > 0:
+                self.logger.debug(
+                    f"限速等待: {waited:.2f}秒 (当前速率 {self.rate_limiter.get_rate(url):.2f} 次/秒)"
+                )
+        elif self.settings.anti_crawler.random_delay:
             delay = random_delay(*self.settings.anti_crawler.delay_range)
             if self.logger:
                 self.logger.debug(f"应用随机延迟: {delay:.2f}秒")
             time.sleep(delay)
+            self.record_wait(Stage.POLITENESS_SLEEP, delay)
         
         # 旋转User-Agent
         if self.settings.anti_crawler.rotate_user_agents:
@@ -143,11 +197,13 @@ class BaseCrawler(ABC):
             self.logger.error(f"爬取失败 {url}: {str(error)} (尝试 {attempt})")
         self.stats.failed += 1
         
-        if attempt < self.settings.crawler.retries:
+        if self.retry_policy.should_retry(attempt):
             if self.logger:
                 self.logger.info(f"重试 {url} (第 {attempt + 1} 次)")
             self.stats.retries += 1
-            time.sleep(self.settings.crawler.retry_delay * attempt)
+            delay = self.retry_policy.backoff(attempt)
+            time.sleep(delay)
+            self.record_wait(Stage.RETRY_BACKOFF, delay)
             return True
         
         return False
@@ -246,6 +302,8 @@ class AsyncBaseCrawler(BaseCrawler):
         
         self.is_running = True
         self.stats.start_time = datetime.now()
+        if self.retry_policy.budget is not None:
+            self.retry_policy.budget.reset()
         if self.logger:
             self.logger.info(f"异步爬虫 {self.name} 开始运行")
         
@@ -272,17 +330,30 @@ class AsyncBaseCrawler(BaseCrawler):
         self.is_running = False
         await self.before_stop()
     
-    async def apply_anti_crawler_strategy(self) -> None:
-        """异步应用反爬虫策略"""
+    async def apply_anti_crawler_strategy(self, url: Optional[str] = None) -> None:
+        """
+        异步应用反爬虫策略
+        
+        Args:
+            url: 即将请求的URL，提供时按主机自适应限速
+        """
         if not self.settings.anti_crawler.enabled:
             return
         
-        # 随机延迟
-        if self.settings.anti_crawler.random_delay:
+        # 按主机自适应限速；未启用时退回随机延迟
+        if url and self.settings.rate_limit.enabled:
+            wait = self.rate_limiter.reserve(url)
+            if wait > 0:
+                if self.logger:
+                    self.logger.debug(f"限速等待: {wait:.2f}秒")
+                await asyncio.sleep(wait)
+                self.record_wait(Stage.POLITENESS_SLEEP, wait)
+        elif self.settings.anti_crawler.random_delay:
             delay = random_delay(*self.settings.anti_crawler.delay_range)
             if self.logger:
                 self.logger.debug(f"应用随机延迟: {delay:.2f}秒")
             await asyncio.sleep(delay)
+            self.record_wait(Stage.POLITENESS_SLEEP, delay)
         
         # 旋转User-Agent
         if self.settings.anti_crawler.rotate_user_agents:
@@ -306,11 +377,13 @@ class AsyncBaseCrawler(BaseCrawler):
             self.logger.error(f"爬取失败 {url}: {str(error)} (尝试 {attempt})")
         self.stats.failed += 1
         
-        if attempt < self.settings.crawler.retries:
+        if self.retry_policy.should_retry(attempt):
             if self.logger:
                 self.logger.info(f"重试 {url} (第 {attempt + 1} 次)")
             self.stats.retries += 1
-            await asyncio.sleep(self.settings.crawler.retry_delay * attempt)
+            delay = self.retry_policy.backoff(attempt)
+            await asyncio.sleep(delay)
+            self.record_wait(Stage.RETRY_BACKOFF, delay)
             return True
         
         return False
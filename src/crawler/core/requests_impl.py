@@ -9,11 +9,14 @@ from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
 
 from .base import BaseCrawler, CrawlResult
 from ..config.settings import get_settings
 from ..utils.parser import clean_text, extract_links_from_html, extract_json_from_html
+from ..utils.decoding import accept_encoding, read_body, response_text
+from ..utils.http_client import get_http_client
+from ..utils.metrics import Stage
+from ..utils.rate_limiter import parse_retry_after
 
 
 class RequestsCrawler(BaseCrawler):
@@ -21,14 +24,27 @@ class RequestsCrawler(BaseCrawler):
     
     def __init__(self, name: str = "requests_crawler"):
         super().__init__(name)
-        self.session = requests.Session()
-        self.ua = UserAgent()
+        self.http_client = get_http_client()
+        self.session = self.http_client.create_session()
+        self._ua = None
+        # 原始响应归档（utils/archive.py），子类按配置设置；为None时不归档
+        self.archive = None
         self._setup_session()
+
+    @property
+    def ua(self):
+        """User-Agent 生成器（fake_useragent 加载较慢，首次使用时才创建）"""
+        if getattr(self, "_ua", None) is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
     
     def _setup_session(self) -> None:
         """设置会话配置"""
         # 设置默认请求头
         self.session.headers.update(self.settings.crawler.headers)
+        # 只声明能解压的编码
+        self.session.headers['Accept-Encoding'] = accept_encoding()
         
         # 设置代理
         if self.settings.proxy.enabled and self.settings.proxy.host:
@@ -44,22 +60,29 @@ class RequestsCrawler(BaseCrawler):
         # 设置超时
         self.session.timeout = self.settings.crawler.timeout
     
+    def get_status(self) -> Dict[str, Any]:
+        """获取爬虫状态（含共享连接池信息）"""
+        status = super().get_status()
+        status["http_client"] = self.http_client.snapshot()
+        return status
+    
     def crawl_url(self, url: str, **kwargs) -> CrawlResult:
         """
         爬取单个URL
         
         Args:
             url: 要爬取的URL
-            **kwargs: 其他参数
+            **kwargs: 其他参数；stage 指定时按该阶段记录抓取耗时（已扣除限速与退避等待）与字节数
             
         Returns:
             爬取结果
         """
         if self.logger:
             self.logger.info(f"开始爬取: {url}")
-        
-        # 应用反爬虫策略
-        self.apply_anti_crawler_strategy()
+        stage = kwargs.get('stage')
+        started = time.perf_counter()
+        waited_before = self.waited_seconds()
+        nbytes = 0
         
         # 更新请求头
         headers = kwargs.get('headers', {})
@@ -67,19 +90,29 @@ class RequestsCrawler(BaseCrawler):
             headers['User-Agent'] = self.ua.random
         
         try:
-            response = self.session.get(
+            response = self._request(
+                "GET",
                 url,
                 headers=headers,
                 timeout=kwargs.get('timeout', self.settings.crawler.timeout),
                 allow_redirects=kwargs.get('allow_redirects', True),
                 verify=kwargs.get('verify', True),
+                stream=True,  # 响应体由 parse_data 流式读取并解压
             )
             
-            # 验证响应
-            self.validate_response(response, url)
-            
-            # 解析数据
-            data = self.parse_data(response, url)
+            try:
+                if self.archive is not None:
+                    self._archive_response(url, response)
+                
+                # 验证响应
+                self.validate_response(response, url)
+                
+                # 解析数据
+                data = self.parse_data(response, url)
+                nbytes = len(response.content or b'')
+                self.metrics.add_bytes(url, nbytes)
+            finally:
+                response.close()
             
             self.stats.success += 1
             if self.logger:
@@ -101,6 +134,31 @@ class RequestsCrawler(BaseCrawler):
                 data=None,
                 error=str(e),
             )
+        finally:
+            if stage:
+                waited = self.waited_seconds() - waited_before
+                self.metrics.observe(stage, time.perf_counter() - started - waited, nbytes)
+    
+    def archive_key(self, url: str) -> Optional[str]:
+        """归档时与URL一同索引的站点标识（如帖子ID），子类按站点规则覆盖"""
+        return None
+    
+    def _archive_response(self, url: str, response: requests.Response) -> None:
+        """归档响应（含错误状态码的响应；归档失败不影响抓取）"""
+        try:
+            body = read_body(response)
+            elapsed = getattr(response, 'elapsed', None)
+            self.archive.put(
+                url,
+                bytes(body),
+                key=self.archive_key(url),
+                status=response.status_code,
+                headers=dict(response.headers),
+                elapsed=elapsed.total_seconds() if hasattr(elapsed, 'total_seconds') else None,
+            )
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"归档响应失败 {url}: {e}")
     
     def crawl_html(self, url: str, selectors: Optional[Dict[str, str]] = None, **kwargs) -> CrawlResult:
         """
@@ -156,11 +214,8 @@ class RequestsCrawler(BaseCrawler):
         if self.logger:
             self.logger.info(f"开始爬取API: {url}")
         
-        # 应用反爬虫策略
-        self.apply_anti_crawler_strategy()
-        
         # 设置API请求头
-        headers = kwargs.get('headers', {})
+        headers = kwargs.pop('headers', {})
         headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
@@ -171,11 +226,9 @@ class RequestsCrawler(BaseCrawler):
         
         try:
             if method.upper() == "GET":
-                response = self.session.get(url, headers=headers, **kwargs)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, headers=headers, **kwargs)
+                response = self._request("GET", url, headers=headers, **kwargs)
             else:
-                response = self.session.request(method, url, json=data, headers=headers, **kwargs)
+                response = self._request(method.upper(), url, json=data, headers=headers, **kwargs)
             
             # 验证响应
             self.validate_response(response, url)
@@ -223,16 +276,13 @@ class RequestsCrawler(BaseCrawler):
             self.logger.info(f"开始批量爬取 {len(urls)} 个URL")
         
         results = []
-        for i, url in enumerate(urls):
+        for url in urls:
             if not self.is_running:
                 break
             
+            # 请求节奏由 crawl_url 中的按主机限速器控制
             result = self.crawl_url(url, **kwargs)
             results.append(result)
-            
-            # 添加延迟
-            if i < len(urls) - 1:
-                time.sleep(self.settings.crawler.retry_delay)
         
         success_count = len([r for r in results if not r.error])
         failed_count = len([r for r in results if r.error])
@@ -292,13 +342,76 @@ class RequestsCrawler(BaseCrawler):
                 all_data.append(result.data)
             
             current_page += 1
-            
-            # 页面间延迟
-            if current_page <= max_pages:
-                time.sleep(self.settings.crawler.retry_delay)
         
         return all_data
     
+    def _request(self, method: str, url: str, **request_kwargs) -> requests.Response:
+        """
+        发送HTTP请求（含按主机限速与统一重试）
+        
+        每次尝试前检查主机熔断器并经过限速器；连接错误、超时、5xx 与 429
+        按重试策略做指数退避（完全抖动，429/503 优先遵循 Retry-After）后重试，
+        重试次数计入 stats.retries，并受每次运行的重试预算约束。
+        
+        Args:
+            method: HTTP方法
+            url: 请求的URL
+            **request_kwargs: 透传给 session.request 的参数
+            
+        Returns:
+            最后一次尝试的响应对象
+            
+        Raises:
+            CircuitOpenError: 主机熔断中，快速失败
+        """
+        breaker = self.breakers.for_url(url)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker.before_request()
+            try:
+                self.apply_anti_crawler_strategy(url)
+                started = time.monotonic()
+                try:
+                    response = self.session.request(method, url, **request_kwargs)
+                except requests.RequestException as e:
+                    self.rate_limiter.record(url, None, time.monotonic() - started)
+                    self.metrics.record_request(url, None, time.monotonic() - started)
+                    breaker.record_failure()
+                    if not (self.retry_policy.is_retryable_exception(e) and self.retry_policy.should_retry(attempt)):
+                        raise
+                    delay = self.retry_policy.backoff(attempt)
+                    reason = str(e)
+                else:
+                    retry_after = self._record_rate(url, response, time.monotonic() - started)
+                    self.metrics.record_request(url, response.status_code, time.monotonic() - started)
+                    if not self.retry_policy.is_retryable_status(response.status_code):
+                        breaker.record_success()
+                        return response
+                    breaker.record_failure()
+                    delay = self.retry_policy.backoff(attempt, retry_after)
+                    if delay is None or not self.retry_policy.should_retry(attempt):
+                        return response
+                    response.close()
+                    reason = f"HTTP {response.status_code}"
+            finally:
+                # 限速等待或非 requests 异常中途退出时归还半开探测名额
+                breaker.release(probe)
+            
+            self.stats.retries += 1
+            if self.logger:
+                self.logger.warning(f"请求失败 {url}: {reason}，{delay:.2f}秒后重试 (第 {attempt + 1} 次)")
+            time.sleep(delay)
+            self.record_wait(Stage.RETRY_BACKOFF, delay)
+    
+    def _record_rate(self, url: str, response: requests.Response, elapsed: float) -> Optional[float]:
+        """将响应状态与耗时反馈给限速器，返回解析出的 Retry-After 秒数"""
+        retry_after = None
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        self.rate_limiter.record(url, response.status_code, elapsed, retry_after)
+        return retry_after
+    
     def validate_response(self, response: requests.Response, url: str) -> bool:
         """
         验证响应
@@ -329,40 +442,14 @@ class RequestsCrawler(BaseCrawler):
             解析后的数据
         """
         content_type = response.headers.get('content-type', '').lower()
-        content_encoding = response.headers.get('content-encoding', '').lower()
         
         if 'application/json' in content_type:
             try:
                 return response.json()
             except ValueError:
-                return response.text
-        elif 'text/html' in content_type:
-            # 处理brotli压缩
-            if 'br' in content_encoding:
-                try:
-                    import brotli  # type: ignore
-                    decoded = brotli.decompress(response.content)
-                    try:
-                        return decoded.decode(response.encoding or 'utf-8', errors='ignore')
-                    except Exception:
-                        return decoded.decode('utf-8', errors='ignore')
-                except Exception:
-                    # 回退到requests的解码结果
-                    return response.text
-            return response.text
-        else:
-            # 其他类型也尽量返回文本
-            if 'br' in content_encoding:
-                try:
-                    import brotli  # type: ignore
-                    decoded = brotli.decompress(response.content)
-                    try:
-                        return decoded.decode(response.encoding or 'utf-8', errors='ignore')
-                    except Exception:
-                        return decoded.decode('utf-8', errors='ignore')
-                except Exception:
-                    return response.text
-            return response.text
+                return response_text(response)
+        # HTML 与其他类型：增量解压后按声明/嗅探的字符集一次性解码
+        return response_text(response)
     
     def run(self) -> None:
         """运行爬虫的主要逻辑"""
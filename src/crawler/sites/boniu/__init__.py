@@ -1,5 +1,23 @@
 """博牛社区爬虫模块"""
 
-from .crawler import BoniuCrawler
+from ..registry import SitePlugin
 
-__all__ = ["BoniuCrawler"]
+__all__ = ["BoniuCrawler", "SITE"]
+
+
+def create_crawler(**kwargs):
+    """创建博牛爬虫（参数同 BoniuCrawler）"""
+    from .crawler import BoniuCrawler
+    return BoniuCrawler(**kwargs)
+
+
+# 站点插件：由 sites.registry 自动发现
+SITE = SitePlugin(name="boniu", factory=create_crawler, description="博牛社区")
+
+
+def __getattr__(name):
+    # 按需导入：站点发现只需 SITE，不加载爬虫依赖
+    if name == "BoniuCrawler":
+        from .crawler import BoniuCrawler
+        return BoniuCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
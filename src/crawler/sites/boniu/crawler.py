@@ -2,21 +2,41 @@
 
 import os
 import json
-import re
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
 import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 
 from ...core.requests_impl import RequestsCrawler
-from ...utils.parser import clean_text
-from ...utils.http import format_datetime
+from ...utils.archive import PageArchive, get_page_archive
 from ...utils.db import get_db_config, connect, fetch_all, executemany
+from ...utils.frontier import TASK_IMAGE, TASK_LIST, TASK_THREAD, Frontier, Task
+from ...utils.http import format_datetime
 from ...utils.image_downloader import ImageDownloader
-from ...utils.translator_config import create_translator_from_config
+from ...utils.metrics import Stage
+from ...utils.parse_pool import ParsePool, get_parse_pool
+from ...utils.priority import CrawlBudget, DetailQueue, priority_bucket, score_post
+from ...utils.sinks import BaseSink, MultiSink, MySQLSink
+from ...utils.translator_config import get_translator
+from ..spec import SiteSpec, load_site_spec
+from .extract import (
+    content_hash,
+    extract_detail,
+    extract_list,
+    extract_replies,
+    extract_thread,
+    parse_detail,
+    parse_list,
+    parse_post_row,
+    parse_replies,
+    parse_thread,
+)
 
 
 def _extract_text(result: Any) -> Optional[str]:
@@ -33,16 +53,57 @@ def _extract_text(result: Any) -> Optional[str]:
         return None
 
 
+# 帖子表写入列（与 _insert_posts 生成的记录键一致）
+POST_COLUMNS = (
+    "forum_post_id", "title", "url", "user_id", "username", "avatar_url",
+    "publish_time", "reply_count", "view_count", "last_reply_time", "images", "category",
+    "is_sticky", "is_essence", "crawl_time", "fid", "is_crawl", "content", "uniacid",
+    "title_zh", "content_zh", "title_en", "content_en",
+    "content_summary", "content_summary_en", "content_summary_zh", "content_hash",
+)
+
+# 回复表写入列（replies.enabled 时按帖子分页抓取的回复）
+REPLY_COLUMNS = (
+    "forum_reply_id", "forum_post_id", "floor", "user_id", "username",
+    "publish_time", "content", "crawl_time", "uniacid",
+)
+
+# 按优先级排队的详情任务类型：新帖抓取入库 / 已有帖子增量刷新
+_DETAIL_NEW = "new"
+_DETAIL_REFRESH = "refresh"
+
+
+def _post_signals(post: Dict[str, Any]) -> Tuple[int, Optional[str], int]:
+    """
+    帖子的列表页信号 (回复数, 最后回复时间, 浏览数)
+
+    库中的 last_reply_time（MySQL 返回 datetime，SQLite 返回文本）统一为 YYYY-MM-DD HH:MM:SS。
+    """
+    value = post.get('last_reply_time')
+    if isinstance(value, datetime):
+        value = value.strftime('%Y-%m-%d %H:%M:%S')
+    return int(post.get('reply_count') or 0), (str(value) if value else None), int(post.get('view_count') or 0)
+
+
 class BoniuCrawler(RequestsCrawler):
     """博牛社区爬虫"""
     
     
     # 配置常量
     DEFAULT_MAX_PAGES = 2
-    DEFAULT_DELAY_SECONDS = 3.0  # 增加延迟时间
     DEFAULT_FIDS = [89, 734]
+    # 站点名（与 sites/boniu 的 SITE 一致，用作 frontier 任务的 site）
+    SITE_NAME = "boniu"
+    # frontier 任务优先级：先完成已发现帖子的详情与图片，再翻下一页
+    TASK_PRIORITIES = {TASK_LIST: 0, TASK_THREAD: 10, TASK_IMAGE: 20}
     
-    def __init__(self):
+    def __init__(self, use_db: bool = True):
+        """
+        初始化博牛爬虫
+
+        Args:
+            use_db: 是否使用数据库；为False时不加载历史头像映射（文件输出模式）
+        """
         super().__init__("boniu_crawler")
         # 初始化日志器
         if not self.logger:
@@ -67,13 +128,44 @@ class BoniuCrawler(RequestsCrawler):
                 self.logger.addHandler(file_handler)
         except Exception:
             pass
-        self.base_url = "https://bbs.boniu123.cc"
-        self.forum_url = "https://bbs.boniu123.cc/forum.php?mod=forumdisplay&fid=89&page=1"
+        # 选择器、分类、正则与请求头来自 config/sites/boniu.yaml（进程内只编译一次）
+        self.spec: SiteSpec = load_site_spec("boniu")
+        self.base_url = self.settings.boniu.base_url.rstrip("/")
+        self.forum_url = f"{self.base_url}/forum.php?mod=forumdisplay&fid=89&page=1"
         self.fids = self.DEFAULT_FIDS[:]
+        # 详情页抓取线程数（同一主机的请求节奏仍由限速器控制）
+        self.detail_workers = max(1, self.settings.sites.detail_workers)
+        # HTML 解析进程池（crawler.parse_workers 为 0 时为None，在抓取线程中解析）
+        self.parse_pool = get_parse_pool()
+        # 原始响应归档（archive.enabled 为 False 时为None，不归档）
+        self.archive: Optional[PageArchive] = get_page_archive(self.SITE_NAME)
         self._setup_headers()
         # DB 配置（可通过环境变量覆盖）
         self.db_cfg = get_db_config()
         self.table_name = "ims_mdkeji_im_boniu_forum_post"
+        self.reply_table_name = "ims_mdkeji_im_boniu_forum_reply"
+        # 默认输出到 MySQL；通过 set_sinks 可改为/追加文件输出
+        self.sink: BaseSink = MySQLSink(
+            self.table_name,
+            POST_COLUMNS,
+            key="forum_post_id",
+            batch_size=self.settings.storage.batch_size,
+            metrics=self.metrics,
+            # 调用时再解析模块级 executemany，便于替换数据库实现
+            executemany=lambda sql, rows: executemany(sql, rows),
+        )
+        # 帖子回复分页抓取（replies.enabled 为 False 时只抓主楼）；回复按批写入回复表
+        self.replies = self.settings.replies
+        # 详情抓取优先级与单次运行预算（设置预算时 crawl_paginated_and_store 按分数排队抓取详情）
+        self.schedule = self.settings.schedule
+        self.reply_sink: BaseSink = MySQLSink(
+            self.reply_table_name,
+            REPLY_COLUMNS,
+            key="forum_reply_id",
+            batch_size=self.settings.storage.batch_size,
+            metrics=self.metrics,
+            executemany=lambda sql, rows: executemany(sql, rows),
+        )
         
         # 初始化图片下载器
         # 通过环境变量控制图片基础路径；未提供时退回到项目目录下 images/boniu
@@ -83,9 +175,9 @@ class BoniuCrawler(RequestsCrawler):
             logger=self.logger
         )
         
-        # 初始化翻译器
+        # 初始化翻译器（进程内各站点共享同一翻译器与翻译缓存）
         try:
-            self.translator = create_translator_from_config()
+            self.translator = get_translator()
             self.enable_translation = True
             if self.logger:
                 self.logger.info("翻译器初始化成功")
@@ -96,7 +188,24 @@ class BoniuCrawler(RequestsCrawler):
                 self.logger.warning(f"翻译器初始化失败: {e}，翻译功能已禁用")
         
         # 加载历史数据中的用户名和头像URL映射
-        self.username_avatar_map = self._load_username_avatar_map()
+        self.use_db = use_db
+        self.username_avatar_map = self._load_username_avatar_map() if use_db else {}
+        # frontier 模式：已入库/已写出的帖子ID（首次处理列表任务时加载），以及输出写入锁
+        self.known_ids: Optional[set] = None
+        self._write_lock = threading.Lock()
+
+    def set_sinks(self, sinks: List[BaseSink]) -> None:
+        """
+        设置帖子输出目标
+
+        Args:
+            sinks: 一个或多个 Sink，多个时同时写入
+        """
+        self.sink = sinks[0] if len(sinks) == 1 else MultiSink(sinks)
+
+    def set_reply_sink(self, sink: BaseSink) -> None:
+        """设置回复输出目标（replies.enabled 时使用，默认写入回复表）"""
+        self.reply_sink = sink
 
     def _load_username_avatar_map(self) -> Dict[str, str]:
         """加载历史数据中的用户名和头像URL映射
@@ -131,105 +240,54 @@ class BoniuCrawler(RequestsCrawler):
         return username_avatar_map
 
     def _setup_headers(self):
-        """设置博牛社区特定的请求头"""
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            # 去掉 br，避免生产环境未解码时保存乱码
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Referer': self.base_url,
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'sec-ch-ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-        })
-
-
-    def crawl_forum_posts(self) -> List[Dict[str, Any]]:
-        """爬取论坛帖子列表"""
+        """设置博牛社区特定的请求头（见站点配置 headers）"""
+        self.session.headers.update(self.spec.headers)
+        self.session.headers['Referer'] = self.base_url
+
+
+    def crawl_forum_posts(self, url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        爬取论坛帖子列表
+
+        Args:
+            url: 列表页URL，默认 self.forum_url
+        """
+        url = url or self.forum_url
         if self.logger:
-            self.logger.info(f"开始爬取论坛页面: {self.forum_url}")
+            self.logger.info(f"开始爬取论坛页面: {url}")
         
-        # 先访问主页，模拟真实用户行为（含重试）
-        import time
-        homepage_ok = False
-        for i in range(2):
-            try:
-                if self.logger:
-                    self.logger.info("先访问主页建立会话...")
-                resp_home = self.crawl_url(self.base_url)
-                if _extract_text(resp_home):
-                    homepage_ok = True
-                    break
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"访问主页失败(第{i+1}次): {e}")
-            time.sleep(1)
+        # 先访问主页，模拟真实用户行为（重试与退避由 HTTP 层统一处理）
+        if self.logger:
+            self.logger.info("先访问主页建立会话...")
+        resp_home = self.crawl_url(self.base_url, stage=Stage.LIST_FETCH)
+        if not _extract_text(resp_home) and self.logger:
+            self.logger.warning(f"访问主页失败: {getattr(resp_home, 'error', None)}")
         
-        # 添加重试机制
-        max_retries = 3
-        html = None
-        for attempt in range(max_retries):
-            try:
-                resp = self.crawl_url(self.forum_url)
-                html = _extract_text(resp)
-                if html:
-                    break
-                else:
-                    if self.logger:
-                        self.logger.warning(f"第 {attempt + 1} 次尝试获取HTML失败")
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"第 {attempt + 1} 次爬取失败: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(3)
+        resp = self.crawl_url(url, stage=Stage.LIST_FETCH)
+        html = _extract_text(resp)
 
         # 列表页失败时，切换备用静态路径 forum-<fid>-1.html 再试
         if not html:
-            try:
-                fid_match = re.search(r'fid=(\d+)', self.forum_url)
-                if fid_match:
-                    alt_url = f"{self.base_url}/forum-{fid_match.group(1)}-1.html"
-                    if self.logger:
-                        self.logger.info(f"主URL获取失败，尝试备用URL: {alt_url}")
-                    for attempt in range(max_retries):
-                        try:
-                            resp_alt = self.crawl_url(alt_url)
-                            html = _extract_text(resp_alt)
-                            if html:
-                                break
-                        except Exception as e:
-                            if self.logger:
-                                self.logger.warning(f"备用URL第 {attempt + 1} 次失败: {e}")
-                        time.sleep(2)
-            except Exception as e:
+            fid = self.spec.group('fid', url)
+            if fid:
+                alt_url = f"{self.base_url}/forum-{fid}-1.html"
                 if self.logger:
-                    self.logger.warning(f"备用URL尝试异常: {e}")
+                    self.logger.info(f"主URL获取失败，尝试备用URL: {alt_url}")
+                html = _extract_text(self.crawl_url(alt_url, stage=Stage.LIST_FETCH))
         
         if not html:
             if self.logger:
                 self.logger.error("爬取论坛页面失败")
             return []
         
-        soup = BeautifulSoup(html, 'html.parser')
-        posts: List[Dict[str, Any]] = []
-        
-        for row in soup.find_all('tr'):
-            try:
-                item = self._parse_post_row(row)
-                if item:
-                    posts.append(item)
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"解析帖子行失败: {e}")
+        with self.metrics.timer(Stage.LIST_PARSE) as timing:
+            timing.bytes = len(html)
+            if self.parse_pool is not None:
+                posts = self.parse_pool.run(extract_list, self.SITE_NAME, html, self.base_url, url)
+            else:
+                posts = parse_list(self.spec, html, self.base_url, url)
+        for item in posts:
+            self._fill_avatar(item)
         
         if self.logger:
             self.logger.info(f"解析到 {len(posts)} 个帖子")
@@ -237,133 +295,27 @@ class BoniuCrawler(RequestsCrawler):
         return posts
 
     def _parse_post_row(self, row) -> Optional[Dict[str, Any]]:
-        """解析帖子行数据"""
-        # 标题与URL
-        title_link = row.find('a', class_='s xst') or row.find('a', href=re.compile(r'thread-\d+'))
-        if not title_link:
-            return None
-        
-        title = clean_text(title_link.get_text())
-        post_url = urljoin(self.base_url, title_link.get('href', ''))
-
-        # 帖子ID
-        post_id = None
-        # 优先从tbody的id属性中提取
-        tbody = row.find_parent('tbody')
-        if tbody and tbody.get('id'):
-            m = re.search(r'normalthread_(\d+)', tbody.get('id'))
-            if m:
-                post_id = m.group(1)
-        
-        # 如果没找到，从URL中提取
-        if not post_id:
-            m = re.search(r'thread-(\d+)', post_url)
-            if m:
-                post_id = m.group(1)
-            # 从viewthread URL中提取tid
-            if not post_id:
-                m = re.search(r'tid=(\d+)', post_url)
-                if m:
-                    post_id = m.group(1)
-
-        # 用户名
-        username = None
-        user_element = (
-            row.select_one('td.by cite a')
-            or row.select_one('td.by a[href*="space-uid"]')
-            or row.find('a', href=re.compile(r'space-uid|uid=\d+'))
-            or row.find('a', class_=re.compile(r'username|author'))
-        )
-        if user_element and user_element.get_text(strip=True):
-            username = clean_text(user_element.get_text())
-        if not username:
-            username = "未知用户"
-
-        # 头像
-        avatar_url = None
-        avatar_img = row.find('img', class_='author-avatar') or row.find('img', src=re.compile(r'avatar'))
-        if avatar_img and avatar_img.get('src'):
-            avatar_url = urljoin(self.base_url, avatar_img['src'])
-        
-        # 如果当前没有获取到头像，从历史数据中查找（排除"未知用户"）
-        if not avatar_url and username and username != "未知用户" and username in self.username_avatar_map:
-            avatar_url = self.username_avatar_map[username]
-            if self.logger:
-                self.logger.debug(f"从历史数据获取用户 {username} 的头像: {avatar_url}")
-
-        # 发帖时间
-        publish_time = ""
-        # 优先获取有title属性的span
-        for span in row.find_all('span', title=True):
-            t = span.get('title', '')
-            if re.search(r'\d{4}-\d{1,2}-\d{1,2}', t):
-                publish_time = t
-                break
-        
-        # 如果没有找到title，则获取span的文本内容
-        if not publish_time:
-            for span in row.find_all('span'):
-                text = clean_text(span.get_text())
-                if re.search(r'\d{4}-\d{1,2}-\d{1,2}', text):
-                    publish_time = text
-                    break
-
-        # 回复/浏览（不抓取，默认0）
-        reply_count = 0
-        view_count = 0
-
-        # 图片（列表页不爬取图片，只爬取内容页的图片）
-        images: List[str] = []
-
-        # 分类
-        category = ""
-        for a in row.find_all('a'):
-            text = clean_text(a.get_text())
-            if text in ['游戏包网', '游戏API', '支付渠道', '广告营销', '云服务', '技术外包', '媒体渠道', '本地服务']:
-                category = text
-                break
-
-        # 标识
-        is_sticky = False
-        # 检查置顶图片：static/image/common/pin_*.gif
-        sticky_img = row.find('img', src=re.compile(r'static/image/common/pin_.*\.gif'))
-        if sticky_img:
-            is_sticky = True
-            
-        # 跳过置顶帖子
-        if is_sticky:
-            return None
-            
-        is_essence = bool(row.find('img', alt=re.compile(r'精华|essence|hot')))
-
-        # 从当前爬取的URL中提取fid参数值作为type
-        type_value = ""
-        if self.forum_url:
-            match = re.search(r'fid=(\d+)', self.forum_url)
-            if match:
-                type_value = match.group(1)
+        """解析帖子行数据（字段规则见站点配置 selectors），缺少头像时从历史数据补全"""
+        item = parse_post_row(self.spec, row, self.base_url, self.forum_url)
+        if item:
+            self._fill_avatar(item)
+        return item
 
-        return {
-            'id': post_id,
-            'title': title,
-            'url': post_url,
-            'username': username,
-            'avatar_url': avatar_url,
-            'publish_time': publish_time,
-            'reply_count': reply_count,
-            'view_count': view_count,
-            'images': images,
-            'category': category,
-            'is_sticky': is_sticky,
-            'is_essence': is_essence,
-            'crawl_time': format_datetime(),
-            'fid': type_value,  # 存储fid值
-            'content': '',  # 初始为空，后续通过详情页获取
-        }
+    def _fill_avatar(self, item: Dict[str, Any]) -> None:
+        """如果当前没有获取到头像，从历史数据中查找（排除"未知用户"）"""
+        username = item.get('username')
+        if not item.get('avatar_url') and username and username != "未知用户" and username in self.username_avatar_map:
+            item['avatar_url'] = self.username_avatar_map[username]
+            if self.logger:
+                self.logger.debug(f"从历史数据获取用户 {username} 的头像: {item['avatar_url']}")
 
-    def _fetch_post_content(self, post_url: str) -> tuple[str, List[str]]:
-        """获取帖子详情页内容和图片
+    def _fetch_post_content(self, post_url: str, known_replies: Optional[int] = None) -> tuple[str, List[str]]:
+        """获取帖子详情页内容和图片（replies.enabled 时同时抓取回复页并写入回复输出）
         
+        Args:
+            post_url: 帖子第 1 页URL
+            known_replies: 已入库的回复数；提供时只抓取含新回复的页，只写出更高楼层的回复
+
         Returns:
             tuple: (content, images) - 内容文本和图片URL列表
         """
@@ -371,211 +323,26 @@ class BoniuCrawler(RequestsCrawler):
             if self.logger:
                 self.logger.debug(f"获取帖子内容: {post_url}")
             
-            resp = self.crawl_url(post_url)
+            resp = self.crawl_url(post_url, stage=Stage.DETAIL_FETCH)
             html = _extract_text(resp)
             if not html:
                 return "", []
             
-            # 可选：如需调试可在此保存HTML
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 尝试多种选择器获取帖子内容（博牛论坛特定）
-            content_selectors = [
-                'td.t_f[id^="postmessage_"]',
-                '#postlist div[id^="post_"]:not([id$="_li"]) td.t_f',
-                'div.t_f',  # Discuz论坛常见的内容区域
-                'div.t_fsz',  # Discuz论坛内容区域
-                'div.postmessage',  # 帖子消息区域
-                'div#postmessage',  # ID选择器
-                'div.content',  # 通用内容区域
-                'div.message',  # 消息区域
-                'div.post_content',  # 帖子内容区域
-                'div.thread_content',  # 线程内容区域
-                'div[id*="postmessage"]',  # 包含postmessage的ID
-                'div[class*="postmessage"]',  # 包含postmessage的class
-                'td.t_f',  # 表格中的内容区域
-                'td[id*="postmessage"]',  # 表格中的postmessage
-            ]
-            
-            content = ""
-            content_element = None
-            for selector in content_selectors:
-                content_el = soup.select_one(selector)
-                if content_el:
-                    # 移除脚本和样式标签
-                    for script in content_el(["script", "style"]):
-                        script.decompose()
-                    # 先提取将被排除节点中的图片（如 ignore_js_op 内的附件图片）
-                    try:
-                        pre_images: List[str] = []
-                        # 目标区域：class 为 ignore_js_op 或标签 <ignore_js_op>
-                        pre_nodes = []
-                        try:
-                            pre_nodes.extend(content_el.select('.ignore_js_op'))
-                        except Exception:
-                            pass
-                        try:
-                            pre_nodes.extend(content_el.find_all(True, class_=re.compile(r'(?:^|\\s)ignore_js_op(?:\\s|$)')))
-                        except Exception:
-                            pass
-                        try:
-                            pre_nodes.extend(content_el.find_all('ignore_js_op'))
-                        except Exception:
-                            pass
-                        for n in pre_nodes:
-                            for img in n.find_all('img'):
-                                img_url = None
-                                if img.get('zoomfile'):
-                                    img_url = img.get('zoomfile')
-                                elif img.get('file'):
-                                    img_url = img.get('file')
-                                elif img.get('src'):
-                                    img_url = img.get('src')
-                                if img_url:
-                                    if not img_url.startswith('http'):
-                                        img_url = urljoin(self.base_url, img_url)
-                                    if img_url not in pre_images:
-                                        pre_images.append(img_url)
-
-                    except Exception:
-                        pre_images = []
-
-                    # 先移除可能的附件容器与相关节点（Discuz 常见结构）
-                    try:
-                        attachment_selectors = [
-                            'div.pattl', 'div.pattc', 'div.attach', 'div.attnm', 'p.attnm',
-                            'dl.tattl', 'ul.attlist', 'div.attlist', 'table.attnm', 'span.attprice',
-                            'div.mbm', 'div.mbn', 'div.mtm', 'span.xg1', 'em.xg1',
-                            '.ignore_js_op',
-                            'ignore_js_op'
-                        ]
-                        for sel in attachment_selectors:
-                            for node in content_el.select(sel):
-                                node.decompose()
-                        # 兼容移除：通过 class 正则匹配 ignore_js_op（避免选择器遗漏）
-                        for node in content_el.find_all(True, class_=re.compile(r'(?:^|\s)ignore_js_op(?:\s|$)')):
-                            try:
-                                node.decompose()
-                            except Exception:
-                                pass
-                        # 兼容移除：通过标签名直接移除 <ignore_js_op>
-                        for node in content_el.find_all('ignore_js_op'):
-                            try:
-                                node.decompose()
-                            except Exception:
-                                pass
-                        # 根据文本关键字移除包含附件信息的节点
-                        text_patterns = re.compile(r"下载附件|保存到相册|下载次数|\\.(?:png|jpg|jpeg|gif|webp)(?:\\s*\\([^)]+\\))?|上传\\s*$", re.I)
-                        for txt in content_el.find_all(string=text_patterns):
-                            parent = txt.parent
-                            # 尽量删除包含该文本的一整块
-                            container = parent.find_parent(["p", "div", "li", "td", "span"]) if parent else None
-                            if container:
-                                container.decompose()
-                            elif parent:
-                                parent.decompose()
-                            else:
-                                txt.extract()
-                    except Exception:
-                        pass
-                    content = clean_text(content_el.get_text())
-                    if content:
-                        content_element = content_el
-                        if self.logger:
-                            self.logger.debug(f"找到内容区域: {selector}")
-                        break
-            
-            # 保留内容原文（已做DOM级过滤）
-            
-            # 从内容区域提取图片
-            images: List[str] = []
-            if content_element:
-                # 查找所有图片标签
-                all_imgs = content_element.find_all('img', src=True)
-                if self.logger:
-                    self.logger.debug(f"内容区域找到 {len(all_imgs)} 个图片标签")
-                
-                for img in all_imgs:
-                    # 博牛论坛特殊处理：优先获取zoomfile或file属性
-                    img_url = None
-                    
-                    # 检查zoomfile属性（博牛论坛的真实图片URL）
-                    if img.get('zoomfile'):  
-                        img_url = img.get('zoomfile')
-                        if self.logger:
-                            self.logger.debug(f"找到zoomfile图片: {img_url}")
-                    # 检查file属性（备用真实图片URL）
-                    elif img.get('file'):
-                        img_url = img.get('file')
-                        if self.logger:
-                            self.logger.debug(f"找到file图片: {img_url}")
-                    # 最后检查src属性
-                    elif img.get('src'):
-                        img_src = img.get('src')
-                        if self.logger:
-                            self.logger.debug(f"检查src图片: {img_src}")
-                        
-                        # 过滤掉无效图片
-                        invalid_patterns = [
-                            r'none\.gif',  # 占位图片
-                            r'blank\.gif',  # 空白图片
-                            r'loading\.gif',  # 加载图片
-                            r'spacer\.gif',  # 间距图片
-                            r'pixel\.gif',  # 像素图片
-                            r'1x1\.gif',  # 1x1像素图片
-                            r'clear\.gif',  # 清除图片
-                            r'static/image/common/',  # 通用静态图片
-                            r'static/image/diy/',  # DIY图片
-                            r'static/image/',  # 静态图片
-                        ]
-                        
-                        # 检查是否为无效图片
-                        is_invalid = any(re.search(pattern, img_src, re.I) for pattern in invalid_patterns)
-                        if is_invalid:
-                            if self.logger:
-                                self.logger.debug(f"跳过无效图片: {img_src}")
-                            continue
-                        
-                        # 检查是否为有效的内容图片
-                        valid_patterns = [
-                            r'attachment/',  # 附件图片
-                            r'data/attachment/',  # 数据附件
-                            r'uploads/',  # 上传图片
-                            r'images/',  # 图片目录
-                            r'\.jpg$|\.jpeg$|\.png$|\.gif$|\.webp$',  # 图片文件扩展名
-                        ]
-                        
-                        is_valid = any(re.search(pattern, img_src, re.I) for pattern in valid_patterns)
-                        if is_valid:
-                            img_url = img_src
-                        else:
-                            if self.logger:
-                                self.logger.debug(f"跳过非内容图片: {img_src}")
-                            continue
-                    
-                    # 处理找到的图片URL
-                    if img_url:
-                        # 如果是相对路径，转换为绝对路径
-                        if not img_url.startswith('http'):
-                            img_url = urljoin(self.base_url, img_url)
-                        
-                        # 避免重复添加
-                        if img_url not in images:
-                            images.append(img_url)
-
-            # 合并在 ignore_js_op 中预先提取到的图片
-            try:
-                for u in pre_images:
-                    if u not in images:
-                        images.append(u)
-            except Exception:
-                pass
-                if self.logger:
-                    self.logger.debug(f"添加图片: {img_url}")
-            
-            # 限制长度避免过长
-            content = content[:65535] if content else ""
+            parse_started = time.perf_counter()
+            if self.replies.enabled:
+                if self.parse_pool is not None:
+                    content, images, replies, pages, per_page = self.parse_pool.run(
+                        extract_thread, self.SITE_NAME, html, self.base_url
+                    )
+                else:
+                    content, images, replies, pages, per_page = parse_thread(self.spec, html, self.base_url)
+            elif self.parse_pool is not None:
+                content, images = self.parse_pool.run(extract_detail, self.SITE_NAME, html, self.base_url)
+            else:
+                content, images = parse_detail(self.spec, html, self.base_url)
+            self.metrics.observe(Stage.DETAIL_PARSE, time.perf_counter() - parse_started, len(html))
+            if self.replies.enabled:
+                self._crawl_replies(post_url, replies, pages, per_page, known_replies)
             return content, images
             
         except Exception as e:
@@ -583,6 +350,95 @@ class BoniuCrawler(RequestsCrawler):
                 self.logger.warning(f"获取帖子内容失败 {post_url}: {e}")
             return "", []
 
+    def _crawl_replies(
+        self,
+        post_url: str,
+        first_page: List[Dict[str, Any]],
+        pages: int,
+        per_page: int,
+        known_replies: Optional[int] = None,
+    ) -> int:
+        """
+        写出第 1 页的回复，并发抓取其余回复页，每页解析后即写出（不在内存中累积整个帖子的回复）
+
+        Args:
+            post_url: 帖子第 1 页URL
+            first_page: 第 1 页解析出的回复
+            pages: 帖子总页数
+            per_page: 每页楼层数（第 1 页的楼层数）
+            known_replies: 已入库的回复数（楼层不超过 known_replies + 1 的回复不再写出）
+
+        Returns:
+            写出的回复数
+        """
+        tid = self.spec.group('thread_url_id', post_url)
+        if not tid:
+            return 0
+        if self.replies.max_pages > 0:
+            pages = min(pages, self.replies.max_pages)
+        # 已入库的最高楼层，其所在页之前的页不再抓取
+        stored_floor = known_replies + 1 if known_replies is not None else 0
+        start = max(2, stored_floor // per_page + 1) if per_page else 2
+        written = self._write_replies(tid, first_page, stored_floor)
+        remaining = list(range(start, pages + 1))
+        if not remaining:
+            return written
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.replies.workers, len(remaining))), thread_name_prefix=f"{self.name}-reply"
+        ) as pool:
+            futures = [pool.submit(self._fetch_reply_page, tid, page, per_page) for page in remaining]
+            for future in as_completed(futures):
+                written += self._write_replies(tid, future.result(), stored_floor)
+        if self.logger:
+            self.logger.info(f"帖子 {tid} 回复：{pages} 页，抓取 {len(remaining)} 页，写出 {written} 条")
+        return written
+
+    def _fetch_reply_page(self, tid: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """抓取并解析帖子的第 page 页回复（失败时返回空列表）"""
+        url = f"{self.base_url}/thread-{tid}-{page}-1.html"
+        try:
+            html = _extract_text(self.crawl_url(url, stage=Stage.REPLY_FETCH))
+            if not html:
+                return []
+            parse_started = time.perf_counter()
+            if self.parse_pool is not None:
+                replies, _, _ = self.parse_pool.run(extract_replies, self.SITE_NAME, html, page, per_page)
+            else:
+                replies, _, _ = parse_replies(self.spec, html, page, per_page)
+            self.metrics.observe(Stage.REPLY_PARSE, time.perf_counter() - parse_started, len(html))
+            return replies
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"获取回复页失败 {url}: {e}")
+            return []
+
+    def _write_replies(self, tid: str, replies: List[Dict[str, Any]], stored_floor: int = 0) -> int:
+        """回复转换为回复表记录并写入回复输出（按批写出）"""
+        crawl_time = format_datetime()
+        records = [
+            {
+                'forum_reply_id': int(reply['id']),
+                'forum_post_id': int(tid),
+                'floor': reply['floor'],
+                'user_id': None if reply.get('user_id') in (None, '') else int(reply['user_id']),
+                'username': (reply.get('username') or '')[:100],
+                'publish_time': reply.get('publish_time'),
+                'content': reply.get('content') or '',
+                'crawl_time': crawl_time,
+                'uniacid': 1,
+            }
+            for reply in replies
+            if reply['floor'] > stored_floor
+        ]
+        if records:
+            with self._write_lock:
+                self.reply_sink.write(records)
+        return len(records)
+
+    def archive_key(self, url: str) -> Optional[str]:
+        """详情页按帖子ID归档（thread-<tid> / tid=<tid>），列表页等返回None"""
+        return self.spec.group('thread_url_id', url)
+
     # 已移除：仅保留DOM级过滤后的内容
 
     def _translate_text(self, text: str, from_lang: str = "zh", to_lang: str = "en") -> str:
@@ -600,13 +456,24 @@ class BoniuCrawler(RequestsCrawler):
             return ""
         
         try:
-            result = self.translator.translate(text, from_lang, to_lang)
+            with self.metrics.timer(Stage.TRANSLATE) as timing:
+                timing.bytes = len(text.encode('utf-8'))
+                result = self.translator.translate(text, from_lang, to_lang)
             return result
         except Exception as e:
             if self.logger:
                 self.logger.error(f"翻译失败: {e}")
             return ""
 
+    def _download_with_metrics(self, stage: str, download, *args, **kwargs):
+        """调用图片下载方法，并按阶段记录耗时与下载字节数"""
+        with self.metrics.timer(stage) as timing:
+            before = self.image_downloader.thread_bytes_downloaded
+            try:
+                return download(*args, **kwargs)
+            finally:
+                timing.bytes = self.image_downloader.thread_bytes_downloaded - before
+
     # ========= 分页爬取 + 去重 + 入库 =========
 
     def _get_existing_ids(self) -> set:
@@ -619,53 +486,134 @@ class BoniuCrawler(RequestsCrawler):
             self.logger.info(f"已存在ID数量: {len(existing)}")
         return existing
 
+    def _load_signals(self) -> Dict[str, Tuple[int, Optional[str], int]]:
+        """读取库中帖子的列表页信号 {帖子ID: (回复数, 最后回复时间, 浏览数)}（增量刷新用）"""
+        rows = fetch_all(
+            f"SELECT forum_post_id, reply_count, last_reply_time, view_count FROM `{self.table_name}` "
+            f"WHERE forum_post_id IS NOT NULL"
+        )
+        return {
+            str(row['forum_post_id']): _post_signals(row)
+            for row in rows
+        }
+
+    @staticmethod
+    def _signals_changed(post: Dict[str, Any], known: Tuple[int, Optional[str], int]) -> bool:
+        """列表页的回复数或最后回复时间与库中不同（列表页没有最后回复时间时只比较回复数；浏览数不触发重新抓取）"""
+        reply_count, last_reply_time, _ = known
+        if int(post.get('reply_count') or 0) != reply_count:
+            return True
+        return bool(post.get('last_reply_time')) and post.get('last_reply_time') != last_reply_time
+
+    def _update_counts(self, posts: List[Dict[str, Any]]) -> int:
+        """只更新列表页统计（回复数、浏览数、最后回复时间；列表页没有最后回复时间时保留原值），不读取详情页"""
+        rows = [
+            (int(p.get('reply_count') or 0), int(p.get('view_count') or 0), p.get('last_reply_time') or None, int(p['id']))
+            for p in posts
+        ]
+        if not rows:
+            return 0
+        with self.metrics.timer(Stage.DB_INSERT):
+            executemany(
+                f"UPDATE `{self.table_name}` SET `reply_count`=%s, `view_count`=%s, "
+                f"`last_reply_time`=COALESCE(%s, `last_reply_time`), `updated_at`=NOW() WHERE `forum_post_id`=%s",
+                rows,
+            )
+        return len(rows)
+
+    def _fetch_rows(self, ids: List[int], columns: str) -> Dict[int, Dict[str, Any]]:
+        """按帖子ID批量读取库中记录，返回 {帖子ID: 行}"""
+        if not ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(ids))
+        return {
+            int(row['forum_post_id']): row
+            for row in fetch_all(
+                f"SELECT forum_post_id, {columns} FROM `{self.table_name}` WHERE forum_post_id IN ({placeholders})",
+                ids,
+            )
+        }
+
+    def _refresh_posts(self, posts: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+        """
+        重新抓取列表页信号有变化的已有帖子：正文哈希未变时只更新列表页统计，
+        变化时更新正文、图片与译文（标题未变时沿用已有标题译文）
+
+        Args:
+            posts: 列表页解析出的帖子（均已在库中）
+            stats: 增量刷新统计，原地累加 checked/changed/unchanged/failed
+        """
+        rows = self._fetch_rows(
+            [int(p['id']) for p in posts], "title, title_en, content, content_hash, images, reply_count"
+        )
+        urls = [p['url'] for p in posts]
+        # 已入库的回复数：开启回复抓取时只抓取含新回复的页
+        known_replies = [
+            int(rows[int(p['id'])].get('reply_count') or 0) if int(p['id']) in rows else None for p in posts
+        ]
+        if self.detail_workers > 1 and len(urls) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.detail_workers, len(urls)), thread_name_prefix=f"{self.name}-refresh"
+            ) as pool:
+                fetched = list(pool.map(self._fetch_post_content, urls, known_replies))
+        else:
+            fetched = [self._fetch_post_content(url, known) for url, known in zip(urls, known_replies)]
+
+        unchanged = []
+        changed = []
+        for post, (content, images) in zip(posts, fetched):
+            pid = int(post['id'])
+            row = rows.get(pid)
+            stats['checked'] += 1
+            if row is None or not content:
+                # 抓取失败时不更新信号，下次运行重试
+                stats['failed'] += 1
+                continue
+            old_hash = row.get('content_hash') or content_hash(row.get('content') or '')
+            if content_hash(content) == old_hash:
+                stats['unchanged'] += 1
+                unchanged.append(post)
+                continue
+            stats['changed'] += 1
+            try:
+                old_images = json.loads(row.get('images') or '[]')
+            except ValueError:
+                old_images = []
+            updated = dict(post, content=content, images=self._reuse_images(images, old_images))
+            if (post.get('title') or '')[:255] == (row.get('title') or ''):
+                updated['title_en'] = row.get('title_en')
+            changed.append(updated)
+
+        self._update_counts(unchanged)
+        if changed:
+            self._insert_posts(changed, overwrite=True)
+        if self.logger:
+            self.logger.info(
+                f"刷新 {len(posts)} 个已有帖子：正文变化 {len(changed)} 条，仅更新列表页统计 {len(unchanged)} 条"
+            )
+
     def _insert_posts(self, posts: List[Dict[str, Any]], overwrite: bool = False) -> int:
         """批量插入/更新帖子"""
         if not posts:
             return 0
-        sql = f"""
-        INSERT INTO `{self.table_name}` (
-          `forum_post_id`,`title`,`url`,`user_id`,`username`,`avatar_url`,
-          `publish_time`,`reply_count`,`view_count`,`images`,`category`,
-          `is_sticky`,`is_essence`,`crawl_time`,`fid`,`is_crawl`,`content`,`uniacid`,
-          `title_zh`,`content_zh`,`title_en`,`content_en`,
-          `content_summary`,`content_summary_en`,`content_summary_zh`
-        ) VALUES (
-          %s,%s,%s,%s,%s,%s,
-          %s,%s,%s,%s,%s,
-          %s,%s,%s,%s,%s,%s,%s,
-          %s,%s,%s,%s,
-          %s,%s,%s
-        )
-        ON DUPLICATE KEY UPDATE
-          `title`=VALUES(`title`),
-          `url`=VALUES(`url`),
-          `user_id`=VALUES(`user_id`),
-          `username`=VALUES(`username`),
-          `avatar_url`=VALUES(`avatar_url`),
-          `publish_time`=VALUES(`publish_time`),
-          `reply_count`=VALUES(`reply_count`),
-          `view_count`=VALUES(`view_count`),
-          `images`=VALUES(`images`),
-          `category`=VALUES(`category`),
-          `is_sticky`=VALUES(`is_sticky`),
-          `is_essence`=VALUES(`is_essence`),
-          `crawl_time`=VALUES(`crawl_time`),
-          `fid`=VALUES(`fid`),
-          `is_crawl`=VALUES(`is_crawl`),
-          `content`=VALUES(`content`),
-          `uniacid`=VALUES(`uniacid`),
-          `title_zh`=VALUES(`title_zh`),
-          `content_zh`=VALUES(`content_zh`),
-          `title_en`=VALUES(`title_en`),
-          `content_en`=VALUES(`content_en`),
-          `content_summary`=VALUES(`content_summary`),
-          `content_summary_en`=VALUES(`content_summary_en`),
-          `content_summary_zh`=VALUES(`content_summary_zh`);
+        return self._write_post_records(*self._build_post_records(posts, overwrite))
+
+    def _build_post_records(
+        self, posts: List[Dict[str, Any]], overwrite: bool = False
+    ) -> Tuple[List[Tuple[Any, ...]], List[Dict[str, Any]], int]:
+        """
+        生成帖子的输出记录（含自动翻译，可能发起阻塞的翻译请求，不持有写锁）
+
+        Returns:
+            (UPDATE 参数行, 输出记录, 跳过数)，overwrite 时只生成参数行
         """
         rows = []
+        records = []
         skipped_count = 0
-        for p in posts:
+        for index, p in enumerate(posts):
+            # 待翻译队列深度：本批尚未处理的帖子数
+            if self.enable_translation:
+                self.metrics.set_gauge('translation_queue_depth', len(posts) - index)
             # 过滤掉无效或缺失的帖子ID，避免产生重复/脏数据
             try:
                 pid = int(p.get('id') or 0)
@@ -744,82 +692,226 @@ class BoniuCrawler(RequestsCrawler):
                         content_summary,
                         content_summary_en,
                         content_summary_zh,
-                        pid,
-                    )
-                )
-            else:
-                rows.append(
-                    (
-                        pid,
-                        original_title,
-                        (p.get('url') or '')[:512],
-                        None if p.get('user_id') in (None, '') else int(p.get('user_id')),
-                        (p.get('username') or '')[:100],
-                        (p.get('avatar_url') or None),
-                        p.get('publish_time') or None,
+                        content_hash(original_content),
                         int(p.get('reply_count') or 0),
                         int(p.get('view_count') or 0),
-                        images_json,
-                        (p.get('category') or '')[:100],
-                        1 if p.get('is_sticky') else 0,
-                        1 if p.get('is_essence') else 0,
-                        p.get('crawl_time') or None,
-                        (p.get('fid') or '')[:50],
-                        1 if p.get('is_crawl', 1) else 0,
-                        original_content,
-                        1,  # uniacid=1
-                        (title_zh or '')[:255],
-                        (content_zh or '')[:65535],
-                        (title_en or '')[:255],
-                        (content_en or '')[:65535],
-                        content_summary,
-                        content_summary_en,
-                        content_summary_zh,
+                        p.get('last_reply_time') or None,
+                        pid,
                     )
                 )
+            else:
+                records.append({
+                    'forum_post_id': pid,
+                    'title': original_title,
+                    'url': (p.get('url') or '')[:512],
+                    'user_id': None if p.get('user_id') in (None, '') else int(p.get('user_id')),
+                    'username': (p.get('username') or '')[:100],
+                    'avatar_url': p.get('avatar_url') or None,
+                    'publish_time': p.get('publish_time') or None,
+                    'reply_count': int(p.get('reply_count') or 0),
+                    'view_count': int(p.get('view_count') or 0),
+                    'last_reply_time': p.get('last_reply_time') or None,
+                    'images': images_json,
+                    'category': (p.get('category') or '')[:100],
+                    'is_sticky': 1 if p.get('is_sticky') else 0,
+                    'is_essence': 1 if p.get('is_essence') else 0,
+                    'crawl_time': p.get('crawl_time') or None,
+                    'fid': (p.get('fid') or '')[:50],
+                    'is_crawl': 1 if p.get('is_crawl', 1) else 0,
+                    'content': original_content,
+                    'uniacid': 1,
+                    'title_zh': (title_zh or '')[:255],
+                    'content_zh': (content_zh or '')[:65535],
+                    'title_en': (title_en or '')[:255],
+                    'content_en': (content_en or '')[:65535],
+                    'content_summary': content_summary,
+                    'content_summary_en': content_summary_en,
+                    'content_summary_zh': content_summary_zh,
+                    'content_hash': content_hash(original_content),
+                })
+        self.metrics.set_gauge('translation_queue_depth', 0)
+        return rows, records, skipped_count
+
+    def _write_post_records(
+        self, rows: List[Tuple[Any, ...]], records: List[Dict[str, Any]], skipped_count: int
+    ) -> int:
+        """写出 _build_post_records 生成的记录：参数行更新数据库，输出记录写入 Sink"""
         if rows:
             if self.logger:
                 self.logger.info(f"批量入库: 记录数={len(rows)} 表={self.table_name}")
-            if overwrite:
-                update_sql = f"UPDATE `{self.table_name}` SET `title`=%s, `content`=%s, `images`=%s, `title_zh`=%s, `content_zh`=%s, `title_en`=%s, `content_en`=%s, `content_summary`=%s, `content_summary_en`=%s, `content_summary_zh`=%s, `updated_at`=NOW() WHERE `forum_post_id`=%s"
+            with self.metrics.timer(Stage.DB_INSERT):
+                update_sql = f"UPDATE `{self.table_name}` SET `title`=%s, `content`=%s, `images`=%s, `title_zh`=%s, `content_zh`=%s, `title_en`=%s, `content_en`=%s, `content_summary`=%s, `content_summary_en`=%s, `content_summary_zh`=%s, `content_hash`=%s, `reply_count`=%s, `view_count`=%s, `last_reply_time`=COALESCE(%s, `last_reply_time`), `updated_at`=NOW() WHERE `forum_post_id`=%s"
                 affected = executemany(update_sql, rows)
-            else:
-                affected = executemany(sql, rows)
             if self.logger:
                 self.logger.info(f"入库完成: 受影响行数≈{affected}")
                 if skipped_count > 0:
                     self.logger.info(f"跳过 {skipped_count} 个帖子（内容长度超过TEXT限制）")
             return len(rows)
-        else:
-            if self.logger and skipped_count > 0:
-                self.logger.info(f"所有帖子都被跳过（内容长度超过TEXT限制），跳过数量: {skipped_count}")
+        if records:
+            # 写入输出目标（按批写出，未满一批的记录在 flush 时写出）
+            self.sink.write(records)
+            if self.logger:
+                self.logger.info(f"写入 {self.sink.name}: 记录数={len(records)}，待写出={self.sink.pending}")
+                if skipped_count > 0:
+                    self.logger.info(f"跳过 {skipped_count} 个帖子（内容长度超过TEXT限制）")
+            return len(records)
+        if self.logger and skipped_count > 0:
+            self.logger.info(f"所有帖子都被跳过（内容长度超过TEXT限制），跳过数量: {skipped_count}")
         return 0
 
 
-    def crawl_paginated_and_store(self, max_pages: int = None, delay_seconds: float = None, overwrite: bool = False) -> int:
+    def _enrich_posts(self, posts: List[Dict[str, Any]]) -> None:
+        """为一页帖子抓取详情内容并下载图片与头像（detail_workers > 1 时并发执行）"""
+        total = len(posts)
+        jobs = [(i, post) for i, post in enumerate(posts, 1) if post.get('url')]
+        if self.detail_workers > 1 and len(jobs) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.detail_workers, len(jobs)), thread_name_prefix=f"{self.name}-detail"
+            ) as pool:
+                for future in [pool.submit(self._enrich_post, post, i, total) for i, post in jobs]:
+                    future.result()
+        else:
+            for i, post in jobs:
+                self._enrich_post(post, i, total)
+
+    def _enrich_post(
+        self, post: Dict[str, Any], index: int = 1, total: int = 1, frontier: Optional[Frontier] = None
+    ) -> None:
+        """
+        抓取单个帖子的详情内容，下载图片与头像
+
+        Args:
+            post: 列表页解析出的帖子
+            index: 序号（日志用）
+            total: 总数（日志用）
+            frontier: 提供时图片与头像不在此下载，改为入队 image 任务，帖子记录使用计划的本地路径
+        """
+        if self.logger:
+            self.logger.info(f"获取内容 [{index}/{total}]: 帖子ID={post.get('id')}")
+
+        content, images = self._fetch_post_content(post['url'])
+        post['content'] = content
+
+        # 下载图片到本地
+        if images:
+            post['images'] = self._store_images(images, frontier)  # 更新为本地图片路径
+        else:
+            post['images'] = []  # 没有图片
+
+        # 下载头像到本地（保存到 images/boniu/avatar 目录）
+        avatar_url = post.get('avatar_url')
+        username = post.get('username')
+
+        # 如果用户名已存在，检查历史数据中是否有本地头像
+        if username and username != "未知用户" and username in self.username_avatar_map:
+            historical_avatar = self.username_avatar_map[username]
+            # 如果历史数据中的头像是本地路径，直接使用
+            if historical_avatar and historical_avatar.startswith('images/boniu'):
+                post['avatar_url'] = historical_avatar
+                if self.logger:
+                    self.logger.debug(f"使用历史头像: {username} -> {historical_avatar}")
+            # 如果历史数据中的头像是URL，且当前也是URL，则下载
+            elif avatar_url and (avatar_url.startswith('http://') or avatar_url.startswith('https://')):
+                self._store_avatar(post, avatar_url, frontier)
+        # 如果用户名不存在于历史数据中，且当前头像是URL，则下载
+        elif avatar_url and (avatar_url.startswith('http://') or avatar_url.startswith('https://')):
+            self._store_avatar(post, avatar_url, frontier)
+
+        if self.logger:
+            if content:
+                self.logger.info(f"✓ 成功获取内容: {len(content)} 字符")
+            else:
+                self.logger.warning(f"✗ 未能获取到内容")
+
+    def _store_images(self, images: List[str], frontier: Optional[Frontier] = None) -> List[str]:
+        """下载帖子图片，返回本地相对路径；提供 frontier 时改为入队 image 任务"""
+        if frontier is None:
+            return self._download_with_metrics(
+                Stage.IMAGE_DOWNLOAD, self.image_downloader.download_images, images
+            )
+        return [self._defer_image(frontier, url, Stage.IMAGE_DOWNLOAD) for url in images]
+
+    def _store_avatar(self, post: Dict[str, Any], avatar_url: str, frontier: Optional[Frontier] = None) -> None:
+        """下载头像并把 post['avatar_url'] 更新为本地路径；提供 frontier 时改为入队 image 任务"""
+        username = post.get('username')
+        # 构建头像保存路径
+        avatar_save_path = os.path.join(self.image_downloader.base_path, 'avatar')
+        if frontier is not None:
+            post['avatar_url'] = self._defer_image(frontier, avatar_url, Stage.AVATAR_DOWNLOAD, avatar_save_path)
+            return
+        # 如果avatar_url是HTTP/HTTPS URL，则下载到本地
+        local_avatar = self._download_with_metrics(
+            Stage.AVATAR_DOWNLOAD, self.image_downloader.download_image,
+            avatar_url, save_path=avatar_save_path,
+        )
+        if local_avatar:
+            post['avatar_url'] = local_avatar
+            if self.logger:
+                self.logger.debug(f"头像下载成功: {username} -> {local_avatar}")
+        else:
+            if self.logger:
+                self.logger.warning(f"头像下载失败: {username} -> {avatar_url}")
+
+    def _defer_image(self, frontier: Frontier, url: str, stage: str, save_path: Optional[str] = None) -> str:
+        """入队 image 任务，返回计划的本地相对路径（任务中保存相对 base_path 的路径，各机器可配置不同根目录）"""
+        local_path = self.image_downloader.plan_path(url, save_path)
+        frontier.push(Task(
+            self.SITE_NAME, TASK_IMAGE, url,
+            payload={'path': os.path.relpath(local_path, self.image_downloader.base_path), 'stage': stage},
+            priority=self.TASK_PRIORITIES[TASK_IMAGE],
+        ))
+        return self.image_downloader.relative_path(local_path)
+
+    def crawl_paginated_and_store(
+        self,
+        max_pages: int = None,
+        delay_seconds: float = None,
+        overwrite: bool = False,
+        existing_ids: Optional[set] = None,
+        refresh: bool = False,
+    ) -> int:
         """分页爬取；若当前页所有帖子已存在则停止；最后插入新数据
         
         Args:
             max_pages: 最大爬取页数
-            delay_seconds: 延迟秒数
+            delay_seconds: 翻页时额外的固定延迟秒数；默认不延迟，由按主机自适应限速器控制节奏
             overwrite: 是否覆盖已存在的记录
+            existing_ids: 已存在的帖子ID集合；提供时不再查询数据库（如文件模式从已有输出读取）
+            refresh: 增量刷新（需数据库）：已存在的帖子在列表页回复数或最后回复时间变化时重新抓取详情，
+                正文哈希未变只更新回复数与最后回复时间；当前页既无新帖也无变化时停止当前fid
+
+        设置了运行预算（schedule.time_budget / schedule.request_budget）时先翻完列表页，
+        待抓取的详情按 score_post 的分数排队，再按分数从高到低每批 detail_workers 条抓取；
+        预算耗尽时不再翻页或派发新的一批，未抓取的帖子不入库，下次运行重新发现。
             
         Returns:
             int: 本次实际处理的新帖子数量（不包括已存在的）
         """
         # 使用默认值
         max_pages = max_pages or self.DEFAULT_MAX_PAGES
-        delay_seconds = delay_seconds or self.DEFAULT_DELAY_SECONDS
         
         if self.logger:
-            self.logger.info(f"开始分页爬取并入库 (最大页数: {max_pages}, 延迟: {delay_seconds}秒, 覆盖模式: {overwrite})")
+            self.logger.info(f"开始分页爬取并入库 (最大页数: {max_pages}, 额外延迟: {delay_seconds or 0}秒, 覆盖模式: {overwrite}, 增量刷新: {refresh})")
 
-        existing_ids = set()
-        if not overwrite:
+        # 增量刷新：库中帖子的列表页信号 {帖子ID: (回复数, 最后回复时间, 浏览数)}
+        known_signals: Dict[str, Tuple[int, Optional[str], int]] = {}
+        refresh_stats = {'checked': 0, 'changed': 0, 'unchanged': 0, 'failed': 0, 'counts': 0}
+        refresh = refresh and not overwrite
+        if refresh:
+            known_signals = self._load_signals()
+            existing_ids = set(known_signals)
+            if self.logger:
+                self.logger.info(f"增量刷新：数据库已有 {len(existing_ids)} 条")
+        elif existing_ids is not None and not overwrite:
+            existing_ids = {str(i) for i in existing_ids}
+            if self.logger:
+                self.logger.info(f"已知帖子 {len(existing_ids)} 条")
+        elif not overwrite:
             existing_ids = self._get_existing_ids()
             if self.logger:
                 self.logger.info(f"数据库已有 {len(existing_ids)} 条")
         else:
+            existing_ids = set()
             if self.logger:
                 self.logger.info("覆盖模式：将处理所有帖子，包括已存在的记录")
         
@@ -828,14 +920,32 @@ class BoniuCrawler(RequestsCrawler):
         # 统计每个版块的帖子数量
         fid_stats = {}
 
+        # 运行预算：列表/详情/回复页请求都计入（按本爬虫的请求统计，不含图片下载）
+        budget = CrawlBudget(
+            self.schedule.time_budget,
+            self.schedule.request_budget,
+            requests=lambda: self.stats.success + self.stats.failed,
+        )
+        scheduled = budget.limited
+        detail_queue = DetailQueue()
+        queued = 0
+        stopped = None
+        now = datetime.now()
+
         # 遍历多个 fid 抓取
         for fid in self.fids:
             # 初始化该版块的统计
             fid_stats[fid] = 0
             page = 1
-            while page <= max_pages:
+            while page <= max_pages and not stopped:
+                # 翻页只使用一部分预算，其余留给按分数抓取详情
+                stopped = budget.exhausted(self.schedule.list_share)
+                if stopped:
+                    if self.logger:
+                        self.logger.info(f"翻页预算已用完（{stopped}），停止翻页")
+                    break
                 # 构造分页 URL（根据 fid 与页码）
-                self.forum_url = f"https://bbs.boniu123.cc/forum.php?mod=forumdisplay&fid={fid}&page={page}"
+                self.forum_url = f"{self.base_url}/forum.php?mod=forumdisplay&fid={fid}&page={page}"
                 if self.logger:
                     self.logger.info(f"爬取(fid={fid}) 第 {page} 页: {self.forum_url}")
 
@@ -855,84 +965,52 @@ class BoniuCrawler(RequestsCrawler):
                     posts_to_process = posts
                     if self.logger:
                         self.logger.info(f"(fid={fid}) 第 {page} 页覆盖模式：处理所有 {len(posts_to_process)} 条")
-                    # 覆盖模式下，统计所有处理的帖子
-                    total_new_posts += len(posts_to_process)
-                    fid_stats[fid] += len(posts_to_process)
                 else:
-                    # 非覆盖模式：只处理新帖子
+                    # 非覆盖模式：只处理新帖子（增量刷新时另外刷新列表页信号有变化的已有帖子）
                     new_ids = ids_on_page - existing_ids
-                    if not new_ids:
+                    stale = [
+                        p for p in posts
+                        if str(p.get('id')) in known_signals
+                        and self._signals_changed(p, known_signals[str(p.get('id'))])
+                    ]
+                    if stale and scheduled:
+                        for p in stale:
+                            detail_queue.push(p, score_post(p, self.schedule, now), _DETAIL_REFRESH)
+                        queued += len(stale)
+                    elif stale:
+                        self._refresh_posts(stale, refresh_stats)
+                    # 只有浏览数变化的帖子不打开详情页，直接更新列表页统计
+                    stale_ids = {str(p['id']) for p in stale}
+                    refresh_stats['counts'] += self._update_counts([
+                        p for p in posts
+                        if str(p.get('id')) in known_signals and str(p['id']) not in stale_ids
+                        and _post_signals(p) != known_signals[str(p['id'])]
+                    ])
+                    for p in posts:
+                        if str(p.get('id')) in known_signals:
+                            known_signals[str(p['id'])] = _post_signals(p)
+                    if not new_ids and not stale:
                         if self.logger:
                             self.logger.info("该页全部 ID 已存在，停止当前fid继续翻页")
                         break
                     posts_to_process = [p for p in posts if str(p.get('id')) in new_ids]
                     if self.logger:
                         self.logger.info(f"(fid={fid}) 第 {page} 页新增 {len(posts_to_process)} 条")
-                    # 非覆盖模式下，只统计新帖子
+
+                if scheduled:
+                    # 有运行预算：详情按分数排队，翻完列表页后统一抓取
+                    for p in posts_to_process:
+                        detail_queue.push(p, score_post(p, self.schedule, now), _DETAIL_NEW)
+                    queued += len(posts_to_process)
+                    posts_to_process = []
+                else:
+                    # 覆盖模式统计所有处理的帖子，非覆盖模式只统计新帖子
                     total_new_posts += len(posts_to_process)
                     fid_stats[fid] += len(posts_to_process)
-
-                # 为帖子获取内容
-                if self.logger:
-                    self.logger.info(f"开始获取 {len(posts_to_process)} 个帖子的详细内容...")
-                
-                for i, post in enumerate(posts_to_process, 1):
-                    if post.get('url'):
-                        if self.logger:
-                            self.logger.info(f"获取内容 [{i}/{len(posts_to_process)}]: 帖子ID={post.get('id')}")
-                        
-                        content, images = self._fetch_post_content(post['url'])
-                        post['content'] = content
-                        
-                        # 下载图片到本地
-                        if images:
-                            local_images = self.image_downloader.download_images(images)
-                            post['images'] = local_images  # 更新为本地图片路径
-                        else:
-                            post['images'] = []  # 没有图片
-                        
-                        # 下载头像到本地（保存到 images/boniu/avatar 目录）
-                        avatar_url = post.get('avatar_url')
-                        username = post.get('username')
-                        
-                        # 如果用户名已存在，检查历史数据中是否有本地头像
-                        if username and username != "未知用户" and username in self.username_avatar_map:
-                            historical_avatar = self.username_avatar_map[username]
-                            # 如果历史数据中的头像是本地路径，直接使用
-                            if historical_avatar and historical_avatar.startswith('images/boniu'):
-                                post['avatar_url'] = historical_avatar
-                                if self.logger:
-                                    self.logger.debug(f"使用历史头像: {username} -> {historical_avatar}")
-                            # 如果历史数据中的头像是URL，且当前也是URL，则下载
-                            elif avatar_url and (avatar_url.startswith('http://') or avatar_url.startswith('https://')):
-                                avatar_save_path = os.path.join(self.image_downloader.base_path, 'avatar')
-                                local_avatar = self.image_downloader.download_image(avatar_url, save_path=avatar_save_path)
-                                if local_avatar:
-                                    post['avatar_url'] = local_avatar
-                                    if self.logger:
-                                        self.logger.debug(f"头像下载成功: {username} -> {local_avatar}")
-                                else:
-                                    if self.logger:
-                                        self.logger.warning(f"头像下载失败: {username} -> {avatar_url}")
-                        # 如果用户名不存在于历史数据中，且当前头像是URL，则下载
-                        elif avatar_url and (avatar_url.startswith('http://') or avatar_url.startswith('https://')):
-                            # 构建头像保存路径
-                            avatar_save_path = os.path.join(self.image_downloader.base_path, 'avatar')
-                            # 如果avatar_url是HTTP/HTTPS URL，则下载到本地
-                            local_avatar = self.image_downloader.download_image(avatar_url, save_path=avatar_save_path)
-                            if local_avatar:
-                                post['avatar_url'] = local_avatar
-                                if self.logger:
-                                    self.logger.debug(f"头像下载成功: {username} -> {local_avatar}")
-                            else:
-                                if self.logger:
-                                    self.logger.warning(f"头像下载失败: {username} -> {avatar_url}")
-                        
-                        if self.logger:
-                            if content:
-                                self.logger.info(f"✓ 成功获取内容: {len(content)} 字符")
-                            else:
-                                self.logger.warning(f"✗ 未能获取到内容")
+                    # 为帖子获取内容
+                    if self.logger:
+                        self.logger.info(f"开始获取 {len(posts_to_process)} 个帖子的详细内容...")
+                    self._enrich_posts(posts_to_process)
 
                 # 当前页入库：覆盖模式走 UPDATE，否则 INSERT/UPDATE
                 if posts_to_process:
@@ -946,23 +1024,338 @@ class BoniuCrawler(RequestsCrawler):
 
                 page += 1
                 if delay_seconds and delay_seconds > 0:
-                    try:
-                        import time
-                        time.sleep(delay_seconds)
-                    except Exception:
-                        pass
+                    time.sleep(delay_seconds)
+                    self.record_wait(Stage.POLITENESS_SLEEP, delay_seconds)
 
+        # 按分数从高到低抓取排队的详情（翻页因预算提前停止时仍用剩余预算抓取分数最高的帖子）
+        if scheduled:
+            processed, drained_stop = self._drain_detail_queue(
+                detail_queue, budget, overwrite, refresh_stats, fid_stats
+            )
+            total_new_posts += processed
+            stopped = drained_stop or stopped
+
+        # 写出最后一个未满的批次
+        self.sink.flush()
+        self.reply_sink.flush()
         if self.logger:
             self.logger.info(f"分页抓取入库完成，本次共处理 {total_new_posts} 个新帖子")
+            for host, state in self.rate_limiter.snapshot().items():
+                self.logger.info(f"限速状态 {host}: {state['rate']} 次/秒, 退避 {state['backoffs']} 次")
+            for name, state in self.breakers.snapshot().items():
+                if state['opened']:
+                    self.logger.warning(f"熔断状态 {name}: {state['state']}, 熔断 {state['opened']} 次, 拒绝 {state['rejected']} 次")
+            for line in self.metrics.format_summary():
+                self.logger.info(f"阶段耗时 {line}")
         
         # 构建统计信息
         stats_info = {
             'total_posts': total_new_posts,
             'fid_stats': fid_stats
         }
+        if scheduled:
+            stats_info['schedule'] = {
+                'queued': queued,
+                'skipped': len(detail_queue),
+                'stopped': stopped,
+                'requests': budget.used_requests(),
+                'elapsed': round(budget.elapsed(), 3),
+            }
+            if self.logger:
+                self.logger.info(
+                    f"优先级调度：排队 {queued} 条，因预算未抓取 {len(detail_queue)} 条，"
+                    f"请求 {budget.used_requests()} 次，用时 {budget.elapsed():.1f} 秒"
+                    + (f"，预算耗尽（{stopped}）" if stopped else "")
+                )
+        if refresh:
+            stats_info['refresh'] = refresh_stats
+            if self.logger:
+                self.logger.info(
+                    f"增量刷新：检查 {refresh_stats['checked']} 条，正文变化 {refresh_stats['changed']} 条，"
+                    f"仅信号变化 {refresh_stats['unchanged']} 条，抓取失败 {refresh_stats['failed']} 条，"
+                    f"仅浏览数变化 {refresh_stats['counts']} 条"
+                )
         
         return stats_info
 
+    def _drain_detail_queue(
+        self,
+        queue: DetailQueue,
+        budget: CrawlBudget,
+        overwrite: bool,
+        refresh_stats: Dict[str, int],
+        fid_stats: Dict[int, int],
+    ) -> Tuple[int, Optional[str]]:
+        """
+        按分数从高到低抓取排队的详情，每批 detail_workers 条；每批开始前检查预算，
+        已派发的一批总会完成，因此实际用量最多超出一批的请求数
+
+        Args:
+            queue: 详情优先队列（未抓取的帖子留在队列中）
+            budget: 运行预算
+            overwrite: 新帖是否按覆盖模式入库
+            refresh_stats: 增量刷新统计（原地累加）
+            fid_stats: 每个版块的新帖统计（原地累加）
+
+        Returns:
+            (入库的新帖数, 耗尽的预算名称或 None)
+        """
+        fids = {str(fid): fid for fid in fid_stats}
+        processed = 0
+        while queue:
+            stopped = budget.exhausted()
+            if stopped:
+                if self.logger:
+                    self.logger.info(f"运行预算已耗尽（{stopped}），剩余 {len(queue)} 条详情留待下次运行")
+                return processed, stopped
+            batch = queue.pop_batch(self.detail_workers)
+            stale = [post for kind, post in batch if kind == _DETAIL_REFRESH]
+            posts = [post for kind, post in batch if kind == _DETAIL_NEW]
+            if stale:
+                self._refresh_posts(stale, refresh_stats)
+            if posts:
+                self._enrich_posts(posts)
+                self._insert_posts(posts, overwrite=overwrite)
+                processed += len(posts)
+                for post in posts:
+                    fid = fids.get(str(post.get('fid')))
+                    if fid is not None:
+                        fid_stats[fid] += 1
+        return processed, None
+
+    # ========= 分布式抓取（frontier 任务） =========
+
+    def _list_url(self, fid: int, page: int) -> str:
+        return f"{self.base_url}/forum.php?mod=forumdisplay&fid={fid}&page={page}"
+
+    def seed_frontier(self, frontier: Frontier, max_pages: int = None) -> int:
+        """
+        为每个版块入队第 1 页列表任务（已完成的列表任务重新入队，以便每次运行都检查新帖）
+
+        Args:
+            frontier: 抓取队列
+            max_pages: 每个版块最多翻到第几页
+
+        Returns:
+            新入队的任务数
+        """
+        max_pages = max_pages or self.DEFAULT_MAX_PAGES
+        tasks = [
+            Task(
+                self.SITE_NAME, TASK_LIST, self._list_url(fid, 1),
+                payload={'fid': fid, 'page': 1, 'max_pages': max_pages},
+                priority=self.TASK_PRIORITIES[TASK_LIST],
+            )
+            for fid in self.fids
+        ]
+        return frontier.push_many(tasks, refresh=True)
+
+    def handle_task(self, task: Task, frontier: Frontier) -> None:
+        """
+        处理一个 frontier 任务（帖子记录写入输出缓冲区，见 output_pending/flush_output）
+
+        Args:
+            task: 领取到的任务
+            frontier: 抓取队列（用于入队新发现的任务）
+
+        Raises:
+            Exception: 处理失败（任务按重试策略重新入队）
+        """
+        if task.kind == TASK_LIST:
+            self._handle_list_task(task, frontier)
+        elif task.kind == TASK_THREAD:
+            self._handle_thread_task(task, frontier)
+        elif task.kind == TASK_IMAGE:
+            self._handle_image_task(task)
+        else:
+            raise ValueError(f"未知任务类型: {task.kind}")
+
+    def _handle_list_task(self, task: Task, frontier: Frontier) -> None:
+        """列表页：新帖子入队 thread 任务；本页有新帖且未到最大页数时入队下一页"""
+        fid, page, max_pages = task.payload['fid'], task.payload['page'], task.payload['max_pages']
+        posts = self.crawl_forum_posts(task.url)
+        if not posts:
+            if self.logger:
+                self.logger.info(f"(fid={fid}) 第 {page} 页无数据")
+            return
+
+        with self._write_lock:
+            if self.known_ids is None:
+                self.known_ids = self._get_existing_ids() if self.use_db else set()
+            known_ids = set(self.known_ids)
+        new_posts = [p for p in posts if p.get('id') and str(p['id']) not in known_ids]
+        for post in new_posts:
+            post['fid'] = str(fid)
+        # 帖子详情在 thread 档内按分数细分优先级（0-9 档，不越过 image 任务）
+        now = datetime.now()
+        base = self.TASK_PRIORITIES[TASK_THREAD]
+        queued = frontier.push_many([
+            Task(
+                self.SITE_NAME, TASK_THREAD, post['url'], payload=post,
+                priority=base + priority_bucket(score_post(post, self.schedule, now), self.schedule),
+                key=f"{self.SITE_NAME}:{TASK_THREAD}:{post['id']}",
+            )
+            for post in new_posts
+        ])
+        if self.logger:
+            self.logger.info(f"(fid={fid}) 第 {page} 页帖子数={len(posts)}，新帖 {len(new_posts)} 条，入队 {queued} 条")
+
+        if not new_posts:
+            if self.logger:
+                self.logger.info("该页全部 ID 已存在，停止当前fid继续翻页")
+            return
+        if page < max_pages:
+            frontier.push(Task(
+                self.SITE_NAME, TASK_LIST, self._list_url(fid, page + 1),
+                payload={'fid': fid, 'page': page + 1, 'max_pages': max_pages},
+                priority=self.TASK_PRIORITIES[TASK_LIST],
+            ), refresh=True)
+
+    def _handle_thread_task(self, task: Task, frontier: Frontier) -> None:
+        """帖子详情：抓取正文，图片与头像入队 image 任务，写入输出"""
+        post = dict(task.payload)
+        self._enrich_post(post, frontier=frontier)
+        # 翻译在锁外进行，写锁只保护 Sink 写入与已知ID集合
+        built = self._build_post_records([post])
+        with self._write_lock:
+            self._write_post_records(*built)
+            if self.known_ids is not None:
+                self.known_ids.add(str(post['id']))
+
+    def output_pending(self) -> int:
+        """输出缓冲区中尚未写出的记录数"""
+        with self._write_lock:
+            return self.sink.pending + self.reply_sink.pending
+
+    def flush_output(self) -> None:
+        """写出输出缓冲区中的帖子与回复记录（frontier worker 确认任务前调用）"""
+        with self._write_lock:
+            self.sink.flush()
+            self.reply_sink.flush()
+
+    def _handle_image_task(self, task: Task) -> None:
+        """图片/头像：下载到任务指定的路径（相对本机 image_downloader.base_path）"""
+        local_path = os.path.join(self.image_downloader.base_path, task.payload['path'])
+        stage = task.payload.get('stage', Stage.IMAGE_DOWNLOAD)
+        if self._download_with_metrics(stage, self.image_downloader.download_to, task.url, local_path) is None:
+            raise RuntimeError(f"图片下载失败: {task.url}")
+
+    # ========= 从归档重新解析 =========
+
+    def reextract(
+        self,
+        archive: PageArchive,
+        workers: int = 0,
+        dry_run: bool = False,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        用当前的解析规则重新解析归档的详情页，只更新正文或图片有变化的帖子（不重新抓取页面）
+
+        新出现的图片会下载，仍然存在的图片按文件名沿用已下载的本地路径。
+
+        Args:
+            archive: 原始响应归档（每个帖子取最新归档的详情页）
+            workers: 解析进程数，0 表示在当前进程解析
+            dry_run: 只统计有变化的帖子，不更新数据库、不下载图片
+            batch_size: 每批解析与更新的帖子数，默认取 settings.storage.batch_size
+
+        Returns:
+            统计：scanned=归档帖子数，missing=库中不存在，changed=有变化，updated=已更新
+        """
+        batch_size = max(1, batch_size or self.settings.storage.batch_size)
+        stats = {'scanned': 0, 'missing': 0, 'changed': 0, 'updated': 0}
+        pool = ParsePool(workers) if workers > 0 else None
+        try:
+            batch: List[Tuple[int, str]] = []
+            for record in archive.records(keyed=True):
+                if not record.key.isdigit() or record.status >= 400:
+                    continue
+                batch.append((int(record.key), record.text))
+                if len(batch) >= batch_size:
+                    self._reextract_batch(batch, pool, dry_run, stats)
+                    batch = []
+            if batch:
+                self._reextract_batch(batch, pool, dry_run, stats)
+        finally:
+            if pool is not None:
+                pool.close()
+        if self.logger:
+            self.logger.info(
+                f"重新解析完成: 归档 {stats['scanned']} 条，库中不存在 {stats['missing']} 条，"
+                f"有变化 {stats['changed']} 条，已更新 {stats['updated']} 条"
+            )
+        return stats
+
+    def _reextract_batch(
+        self, batch: List[Tuple[int, str]], pool: Optional[ParsePool], dry_run: bool, stats: Dict[str, int]
+    ) -> None:
+        """解析一批归档页面，与库中记录比较后批量 UPDATE 有变化的帖子"""
+        htmls = [html for _, html in batch]
+        parse_started = time.perf_counter()
+        if pool is not None:
+            chunksize = max(1, len(htmls) // (pool.workers * 4))
+            parsed = list(pool.map(extract_detail, repeat(self.SITE_NAME), htmls, repeat(self.base_url),
+                                   chunksize=chunksize))
+        else:
+            parsed = [parse_detail(self.spec, html, self.base_url) for html in htmls]
+        self.metrics.observe(Stage.DETAIL_PARSE, time.perf_counter() - parse_started, sum(map(len, htmls)))
+        stats['scanned'] += len(batch)
+
+        ids = [pid for pid, _ in batch]
+        rows = self._fetch_rows(
+            ids, "title, title_zh, title_en, content, content_en, images, reply_count, view_count, last_reply_time"
+        )
+
+        changed = []
+        for pid, (content, images) in zip(ids, parsed):
+            row = rows.get(pid)
+            if row is None:
+                stats['missing'] += 1
+                continue
+            try:
+                old_images = json.loads(row.get('images') or '[]')
+            except ValueError:
+                old_images = []
+            local_images = self._reuse_images(images, old_images, download=not dry_run)
+            if content == (row.get('content') or '') and local_images == old_images:
+                continue
+            stats['changed'] += 1
+            post = {
+                'id': pid,
+                'title': row.get('title'),
+                'title_zh': row.get('title_zh'),
+                'title_en': row.get('title_en'),
+                'content': content,
+                'images': local_images,
+                'reply_count': row.get('reply_count'),
+                'view_count': row.get('view_count'),
+                'last_reply_time': row.get('last_reply_time'),
+            }
+            if content == (row.get('content') or ''):
+                # 正文未变时沿用已有译文，避免重复翻译
+                post['content_en'] = row.get('content_en')
+            changed.append(post)
+        if changed and not dry_run:
+            stats['updated'] += self._insert_posts(changed, overwrite=True)
+
+    def _reuse_images(self, images: List[str], old_images: List[str], download: bool = True) -> List[str]:
+        """图片URL转换为本地路径：与已下载图片文件名相同的沿用原路径，其余下载（download=False 时保留URL）"""
+        by_name = {os.path.basename(path): path for path in old_images}
+        local_images = []
+        for url in images:
+            local = by_name.get(os.path.basename(urlparse(url).path))
+            if local is None:
+                if not download:
+                    local_images.append(url)
+                    continue
+                downloaded = self._store_images([url])
+                if not downloaded:
+                    continue
+                local = downloaded[0]
+            local_images.append(local)
+        return local_images
+
     def run(self) -> dict:
         """运行博牛爬虫的主要逻辑（分页入库）"""
         return self.crawl_paginated_and_store()
@@ -0,0 +1,380 @@
+"""博牛页面解析（HTML -> 记录）
+
+不依赖爬虫实例的纯函数：输入 HTML 文本与上下文（base_url、列表页URL），输出普通的
+dict/tuple，可以在解析进程池（utils/parse_pool.py）的子进程中执行。
+
+- parse_list / parse_detail / parse_thread / parse_replies：使用给定的 SiteSpec，在当前进程解析；
+- content_hash / normalize_datetime / parse_count：增量刷新比较正文、最后回复时间与回复/浏览数；
+- extract_list / extract_detail / extract_thread / extract_replies：按站点名加载规格（每个进程只编译一次），
+  参数与返回值都可 pickle，作为进程池的任务函数。
+"""
+
+import hashlib
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from ...utils.http import format_datetime
+from ...utils.parser import clean_text
+from ..spec import SiteSpec, load_site_spec
+
+logger = logging.getLogger(__name__)
+
+# 详情正文最大长度（与入库 TEXT 字段一致）
+MAX_CONTENT_LENGTH = 65535
+
+_DATETIME_RE = re.compile(r'(\d{4}-\d{1,2}-\d{1,2})(?:\s+(\d{1,2}:\d{2})(:\d{2})?)?')
+_COUNT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(万|[wWkK])?')
+_COUNT_UNITS = {'万': 10000, 'w': 10000, 'k': 1000}
+
+
+def content_hash(content: str) -> str:
+    """正文哈希（SHA-1 十六进制，与入库的 content_hash 字段比较）"""
+    return hashlib.sha1((content or "").encode("utf-8")).hexdigest()
+
+
+def parse_count(text: Optional[str]) -> int:
+    """
+    解析列表页的回复/浏览数
+
+    Args:
+        text: 如 "128"、"1.2万"、"3k"、"1,024"
+
+    Returns:
+        整数；无法识别时返回0
+    """
+    match = _COUNT_RE.search((text or "").replace(",", ""))
+    if not match:
+        return 0
+    number, unit = match.groups()
+    return int(float(number) * _COUNT_UNITS.get((unit or '').lower(), 1))
+
+
+def normalize_datetime(text: Optional[str]) -> Optional[str]:
+    """
+    把列表页上的时间文本规范为 YYYY-MM-DD HH:MM:SS
+
+    Args:
+        text: 如 "2026-10-19 12:05"、"2026-10-19"
+
+    Returns:
+        规范化的时间；无法识别时返回None
+    """
+    match = _DATETIME_RE.search(text or "")
+    if not match:
+        return None
+    date, hm, sec = match.groups()
+    try:
+        value = datetime.strptime(f"{date} {hm or '00:00'}{sec or ':00'}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_post_row(spec: SiteSpec, row, base_url: str, list_url: str) -> Optional[Dict[str, Any]]:
+    """
+    解析帖子行数据（字段规则见站点配置 selectors）
+
+    Args:
+        spec: 站点规格
+        row: 列表页中的一行（bs4 Tag）
+        base_url: 站点根地址
+        list_url: 列表页URL（从中提取 fid）
+
+    Returns:
+        帖子字典；不是帖子行或为置顶帖时返回None
+    """
+    # 标题与URL
+    title_link = spec.field('title_link').first(row)
+    if not title_link:
+        return None
+
+    # 跳过置顶帖子（检查置顶图片：static/image/common/pin_*.gif）
+    is_sticky = spec.field('sticky').first(row) is not None
+    if is_sticky:
+        return None
+
+    title = clean_text(title_link.get_text())
+    post_url = urljoin(base_url, title_link.get('href', ''))
+
+    # 帖子ID：优先从tbody的id属性中提取，其次从URL（thread-<tid> / tid=<tid>）中提取
+    post_id = None
+    tbody = row.find_parent('tbody')
+    if tbody:
+        post_id = spec.group('thread_container_id', tbody.get('id'))
+    if not post_id:
+        post_id = spec.group('thread_url_id', post_url)
+
+    # 用户名
+    username = None
+    user_element = spec.field('username').first(row)
+    if user_element and user_element.get_text(strip=True):
+        username = clean_text(user_element.get_text())
+    if not username:
+        username = "未知用户"
+
+    # 头像（没有时由爬虫从历史数据中补全）
+    avatar_url = None
+    avatar_img = spec.field('avatar').first(row)
+    if avatar_img and avatar_img.get('src'):
+        avatar_url = urljoin(base_url, avatar_img['src'])
+
+    # 发帖时间：优先取带日期的 title 属性，其次取带日期的文本
+    publish_time = spec.field('publish_time').value(row)
+
+    # 分类
+    category = ""
+    for a in spec.field('category').iter(row):
+        text = clean_text(a.get_text())
+        if text in spec.categories:
+            category = text
+            break
+
+    is_essence = spec.field('essence').first(row) is not None
+
+    # 列表页统计：回复数、浏览数与最后回复时间（与其他字段在同一次行解析中提取）
+    reply_count = parse_count(spec.field('reply_count').value(row))
+    view_count = parse_count(spec.field('view_count').value(row))
+    last_reply_time = normalize_datetime(spec.field('last_post_time').value(row))
+
+    # 从当前爬取的URL中提取fid参数值作为type
+    type_value = spec.group('fid', list_url, default="")
+
+    return {
+        'id': post_id,
+        'title': title,
+        'url': post_url,
+        'username': username,
+        'avatar_url': avatar_url,
+        'publish_time': publish_time,
+        'reply_count': reply_count,
+        'view_count': view_count,
+        'last_reply_time': last_reply_time,
+        # 图片（列表页不爬取图片，只爬取内容页的图片）
+        'images': [],
+        'category': category,
+        'is_sticky': is_sticky,
+        'is_essence': is_essence,
+        'crawl_time': format_datetime(),
+        'fid': type_value,  # 存储fid值
+        'content': '',  # 初始为空，后续通过详情页获取
+    }
+
+
+def parse_list(spec: SiteSpec, html: str, base_url: str, list_url: str) -> List[Dict[str, Any]]:
+    """
+    解析列表页
+
+    Args:
+        spec: 站点规格
+        html: 列表页 HTML
+        base_url: 站点根地址
+        list_url: 列表页URL
+
+    Returns:
+        帖子字典列表（单行解析失败时跳过该行）
+    """
+    posts: List[Dict[str, Any]] = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for row in spec.field('post_row').select(soup):
+        try:
+            item = parse_post_row(spec, row, base_url, list_url)
+            if item:
+                posts.append(item)
+        except Exception as e:
+            logger.warning(f"解析帖子行失败: {e}")
+    return posts
+
+
+def parse_detail(spec: SiteSpec, html: str, base_url: str) -> Tuple[str, List[str]]:
+    """
+    解析详情页正文与图片
+
+    Args:
+        spec: 站点规格
+        html: 详情页 HTML
+        base_url: 站点根地址（补全相对图片地址）
+
+    Returns:
+        (正文, 图片URL列表)
+    """
+    return _parse_detail_soup(spec, BeautifulSoup(html, 'html.parser'), base_url)
+
+
+def parse_thread(
+    spec: SiteSpec, html: str, base_url: str
+) -> Tuple[str, List[str], List[Dict[str, Any]], int, int]:
+    """
+    解析帖子第 1 页：主楼正文与图片，以及本页的回复（HTML 只解析一次）
+
+    Args:
+        spec: 站点规格
+        html: 帖子第 1 页 HTML
+        base_url: 站点根地址
+
+    Returns:
+        (正文, 图片URL列表, 回复列表, 总页数, 本页楼层数)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    # 先解析回复：正文解析会移除主楼中的附件节点
+    replies, pages, floors = _parse_replies_soup(spec, soup, 1, 0)
+    content, images = _parse_detail_soup(spec, soup, base_url)
+    return content, images, replies, pages, floors
+
+
+def parse_replies(
+    spec: SiteSpec, html: str, page: int, per_page: int
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    解析帖子的一页回复
+
+    Args:
+        spec: 站点规格
+        html: 帖子第 page 页 HTML
+        page: 页码（从 1 开始）
+        per_page: 每页楼层数（取第 1 页的楼层数，用于计算楼层号）
+
+    Returns:
+        (回复列表, 总页数, 本页楼层数)；回复为 {id, floor, username, user_id, publish_time, content}，
+        第 1 页的主楼不计入回复
+    """
+    return _parse_replies_soup(spec, BeautifulSoup(html, 'html.parser'), page, per_page)
+
+
+def _parse_replies_soup(spec: SiteSpec, soup, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int, int]:
+    rows = spec.field('reply_row').select(soup)
+    replies: List[Dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        floor = (page - 1) * per_page + index + 1
+        if floor == 1:
+            continue
+        reply_id = spec.group('reply_id', row.get('id'))
+        content_el = spec.field('reply_content').first(row)
+        if not reply_id or content_el is None:
+            continue
+        for node in content_el(["script", "style"]):
+            node.decompose()
+        for node in spec.field('attachment').select(content_el):
+            if not node.decomposed:
+                node.decompose()
+        author = spec.field('reply_author').first(row)
+        replies.append({
+            'id': reply_id,
+            'floor': floor,
+            'username': clean_text(author.get_text()) if author else "未知用户",
+            'user_id': spec.group('user_id', author.get('href')) if author else None,
+            'publish_time': normalize_datetime(spec.field('reply_time').value(row)),
+            'content': clean_text(content_el.get_text())[:MAX_CONTENT_LENGTH],
+        })
+    pages = max(page, parse_count(spec.field('thread_page_count').value(soup)))
+    return replies, pages, len(rows)
+
+
+def _parse_detail_soup(spec: SiteSpec, soup, base_url: str) -> Tuple[str, List[str]]:
+    # 按站点配置 content 中的选择器顺序尝试获取帖子内容
+    content = ""
+    content_element = None
+    pre_images: List[str] = []
+    for rule in spec.field('content').rules:
+        content_el = rule.selector.select_one(soup)
+        if content_el:
+            # 移除脚本和样式标签
+            for script in content_el(["script", "style"]):
+                script.decompose()
+            # 先提取将被排除节点中的图片（如 ignore_js_op 内的附件图片）
+            try:
+                pre_images = []
+                for n in spec.field('embedded_images').iter(content_el):
+                    for img in n.find_all('img'):
+                        img_url = img.get('zoomfile') or img.get('file') or img.get('src')
+                        if img_url:
+                            if not img_url.startswith('http'):
+                                img_url = urljoin(base_url, img_url)
+                            if img_url not in pre_images:
+                                pre_images.append(img_url)
+            except Exception:
+                pre_images = []
+
+            # 先移除可能的附件容器与相关节点（Discuz 常见结构）
+            try:
+                for node in spec.field('attachment').select(content_el):
+                    # 外层容器已移除时其中的节点随之销毁
+                    if not node.decomposed:
+                        node.decompose()
+                # 根据文本关键字移除包含附件信息的节点
+                for text_pattern in spec.patterns['attachment_text']:
+                    for txt in content_el.find_all(string=text_pattern):
+                        parent = txt.parent
+                        # 尽量删除包含该文本的一整块
+                        container = parent.find_parent(["p", "div", "li", "td", "span"]) if parent else None
+                        if container:
+                            container.decompose()
+                        elif parent:
+                            parent.decompose()
+                        else:
+                            txt.extract()
+            except Exception:
+                pass
+            content = clean_text(content_el.get_text())
+            if content:
+                content_element = content_el
+                logger.debug(f"找到内容区域: {rule.selector.pattern}")
+                break
+
+    # 从内容区域提取图片
+    images: List[str] = []
+    if content_element:
+        # 查找所有图片标签
+        for img in content_element.find_all('img', src=True):
+            # 博牛论坛特殊处理：优先获取zoomfile或file属性（真实图片URL），最后检查src属性
+            img_url = img.get('zoomfile') or img.get('file')
+            if not img_url:
+                img_src = img.get('src')
+                # 过滤掉占位/静态等无效图片
+                if spec.search('invalid_image', img_src):
+                    logger.debug(f"跳过无效图片: {img_src}")
+                    continue
+                # 检查是否为有效的内容图片
+                if not spec.search('valid_image', img_src):
+                    logger.debug(f"跳过非内容图片: {img_src}")
+                    continue
+                img_url = img_src
+
+            # 如果是相对路径，转换为绝对路径
+            if not img_url.startswith('http'):
+                img_url = urljoin(base_url, img_url)
+            # 避免重复添加
+            if img_url not in images:
+                images.append(img_url)
+
+    # 合并在 ignore_js_op 中预先提取到的图片
+    for u in pre_images:
+        if u not in images:
+            images.append(u)
+
+    # 限制长度避免过长
+    return (content[:MAX_CONTENT_LENGTH] if content else ""), images
+
+
+def extract_list(site: str, html: str, base_url: str, list_url: str) -> List[Dict[str, Any]]:
+    """进程池任务：按站点名加载规格并解析列表页（参数见 parse_list）"""
+    return parse_list(load_site_spec(site), html, base_url, list_url)
+
+
+def extract_detail(site: str, html: str, base_url: str) -> Tuple[str, List[str]]:
+    """进程池任务：按站点名加载规格并解析详情页（参数见 parse_detail）"""
+    return parse_detail(load_site_spec(site), html, base_url)
+
+
+def extract_thread(site: str, html: str, base_url: str) -> Tuple[str, List[str], List[Dict[str, Any]], int, int]:
+    """进程池任务：按站点名加载规格并解析帖子第 1 页（参数见 parse_thread）"""
+    return parse_thread(load_site_spec(site), html, base_url)
+
+
+def extract_replies(site: str, html: str, page: int, per_page: int) -> Tuple[List[Dict[str, Any]], int, int]:
+    """进程池任务：按站点名加载规格并解析一页回复（参数见 parse_replies）"""
+    return parse_replies(load_site_spec(site), html, page, per_page)
@@ -0,0 +1,113 @@
+"""站点注册表
+
+``src/crawler/sites`` 下每个站点是一个子包，在 ``__init__`` 中声明模块级
+``SITE = SitePlugin(...)``。注册表按子包自动发现站点，新增站点只需新建子包
+（通常再加一份 config/sites/<站点>.yaml），CLI 与 SiteRunner 无需修改。
+"""
+
+import importlib
+import logging
+import pkgutil
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SitePlugin:
+    """站点插件"""
+
+    name: str
+    factory: Callable[..., Any]  # 创建爬虫实例，接受 use_db 等关键字参数
+    description: str = ""
+
+    def create(self, **kwargs) -> Any:
+        """创建该站点的爬虫实例"""
+        return self.factory(**kwargs)
+
+
+class SiteRegistry:
+    """站点注册表"""
+
+    def __init__(self):
+        self._sites: Dict[str, SitePlugin] = {}
+
+    def register(self, plugin: SitePlugin) -> None:
+        """
+        注册站点
+
+        Raises:
+            ValueError: 站点名重复
+        """
+        existing = self._sites.get(plugin.name)
+        if existing is not None and existing is not plugin:
+            raise ValueError(f"站点重复注册: {plugin.name}")
+        self._sites[plugin.name] = plugin
+
+    def discover(self, package: str = __package__) -> List[str]:
+        """
+        导入 package 下的全部子包并注册其中的 SITE
+
+        Args:
+            package: 站点包名，默认 src.crawler.sites
+
+        Returns:
+            本次发现的站点名列表
+        """
+        found = []
+        pkg = importlib.import_module(package)
+        for info in pkgutil.iter_modules(pkg.__path__):
+            if not info.ispkg:
+                continue
+            try:
+                module = importlib.import_module(f"{package}.{info.name}")
+            except Exception as e:
+                logger.warning(f"加载站点 {info.name} 失败: {e}")
+                continue
+            plugin = getattr(module, "SITE", None)
+            if isinstance(plugin, SitePlugin):
+                self.register(plugin)
+                found.append(plugin.name)
+        return found
+
+    def get(self, name: str) -> SitePlugin:
+        """
+        获取站点
+
+        Raises:
+            KeyError: 站点不存在
+        """
+        try:
+            return self._sites[name]
+        except KeyError:
+            raise KeyError(f"未知站点: {name}（可选 {', '.join(self.names()) or '无'}）") from None
+
+    def names(self) -> List[str]:
+        """已注册的站点名（按名称排序）"""
+        return sorted(self._sites)
+
+    def select(self, names: Optional[List[str]] = None) -> List[SitePlugin]:
+        """
+        按名称选择站点，names 为空时返回全部站点
+
+        Raises:
+            KeyError: 站点不存在
+        """
+        return [self.get(name) for name in (names or self.names())]
+
+
+# 全局站点注册表
+_registry: Optional[SiteRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_site_registry() -> SiteRegistry:
+    """获取全局站点注册表（首次调用时自动发现站点）"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SiteRegistry()
+            _registry.discover()
+        return _registry
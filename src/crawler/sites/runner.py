@@ -0,0 +1,114 @@
+"""多站点运行器
+
+每个站点在独立线程中运行（同时运行的站点数见 settings.sites.max_parallel），
+站点内部的详情页并发由 settings.sites.detail_workers 控制。各站点共享进程内的
+按主机限速器、熔断器、HTTP 连接池、数据库连接池与翻译缓存：不同主机互不
+限速，同一主机的请求节奏不会因多站点而叠加。一个站点失败不影响其他站点。
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config.settings import get_settings
+from .registry import SitePlugin
+
+logger = logging.getLogger(__name__)
+
+SiteTask = Callable[[SitePlugin], Optional[Dict[str, Any]]]
+
+
+@dataclass
+class SiteResult:
+    """单个站点的运行结果"""
+
+    name: str
+    stats: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def total_posts(self) -> int:
+        return (self.stats or {}).get("total_posts", 0)
+
+
+def crawl_site(plugin: SitePlugin, use_db: bool = True, **crawl_kwargs) -> Optional[Dict[str, Any]]:
+    """
+    默认站点任务：创建爬虫并分页抓取入库
+
+    Args:
+        plugin: 站点插件
+        use_db: 是否使用数据库
+        **crawl_kwargs: 传给 crawl_paginated_and_store 的参数
+
+    Returns:
+        crawl_paginated_and_store 的统计信息
+    """
+    crawler = plugin.create(use_db=use_db)
+    try:
+        return crawler.crawl_paginated_and_store(**crawl_kwargs)
+    finally:
+        close_crawler(crawler)
+
+
+def close_crawler(crawler: Any) -> None:
+    """关闭爬虫持有的会话（共享连接池不受影响）"""
+    downloader = getattr(crawler, "image_downloader", None)
+    for session in (getattr(crawler, "session", None), getattr(downloader, "session", None)):
+        try:
+            if session is not None:
+                session.close()
+        except Exception:
+            pass
+
+
+class SiteRunner:
+    """并发运行多个站点"""
+
+    def __init__(self, plugins: Sequence[SitePlugin], max_parallel: Optional[int] = None):
+        """
+        初始化运行器
+
+        Args:
+            plugins: 要运行的站点
+            max_parallel: 同时运行的站点数，默认取 settings.sites.max_parallel
+        """
+        self.plugins = list(plugins)
+        self.max_parallel = max(1, max_parallel or get_settings().sites.max_parallel)
+
+    def run(self, task: SiteTask = crawl_site) -> List[SiteResult]:
+        """
+        运行全部站点
+
+        Args:
+            task: 站点任务，接收站点插件并返回统计信息，默认 crawl_site
+
+        Returns:
+            各站点结果（与 plugins 顺序一致）
+        """
+        if not self.plugins:
+            return []
+        workers = min(self.max_parallel, len(self.plugins))
+        if workers == 1:
+            return [self._run_one(task, plugin) for plugin in self.plugins]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="site") as pool:
+            futures = [pool.submit(self._run_one, task, plugin) for plugin in self.plugins]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _run_one(task: SiteTask, plugin: SitePlugin) -> SiteResult:
+        started = time.perf_counter()
+        result = SiteResult(plugin.name)
+        try:
+            result.stats = task(plugin)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            logger.exception(f"站点 {plugin.name} 运行失败")
+        result.elapsed = time.perf_counter() - started
+        return result
@@ -0,0 +1,248 @@
+"""站点规格（site spec）
+
+``config/sites/<站点>.yaml`` 声明选择器、分类、正则与请求头。``load_site_spec``
+在进程内只加载并编译一次：CSS 选择器预编译为 soupsieve 对象，正则预编译，分类
+转为 frozenset。解析时每个字段按编译好的规则依次匹配，修改选择器或新增站点只需
+改配置，不会给每一行解析增加额外开销。
+
+字段（selectors 下的每一项）是一条或一组按顺序尝试的规则，规则可以是：
+
+- CSS 选择器字符串：第一个匹配的元素即为结果；
+- 映射 ``{css, attr, pattern}``：在 css 匹配的元素中，取 attr 属性（省略时取
+  清洗后的文本）满足 pattern（re.search）的第一个元素。
+
+正则（patterns 下的每一项）可以是字符串、按顺序尝试的字符串列表，或
+``{any: [...], ignore_case: true}``。
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Pattern, Tuple
+
+import soupsieve
+
+from ..utils.parser import clean_text
+
+# 站点配置目录：项目根目录下的 config/sites
+SITES_DIR = Path(__file__).resolve().parent.parent.parent.parent / "config" / "sites"
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """预编译的字段规则"""
+
+    selector: Any  # soupsieve.SoupSieve
+    attr: Optional[str] = None
+    pattern: Optional[Pattern[str]] = None
+
+    def value(self, element) -> str:
+        """取规则关注的值：属性值或清洗后的文本"""
+        if self.attr is None:
+            return clean_text(element.get_text())
+        value = element.get(self.attr)
+        if isinstance(value, list):  # class 等多值属性
+            value = " ".join(value)
+        return value or ""
+
+    def iter_matches(self, node) -> Iterator[Any]:
+        """按文档顺序产出满足规则的元素"""
+        if self.pattern is None:
+            yield from self.selector.iselect(node)
+            return
+        for element in self.selector.iselect(node):
+            if self.pattern.search(self.value(element)):
+                yield element
+
+
+class Field:
+    """由若干规则组成的字段，规则按顺序尝试"""
+
+    def __init__(self, name: str, rules: Tuple[FieldRule, ...]):
+        self.name = name
+        self.rules = rules
+
+    def first(self, node) -> Optional[Any]:
+        """
+        返回第一条命中规则的第一个元素
+
+        Args:
+            node: BeautifulSoup 文档或元素
+
+        Returns:
+            元素，均未命中时返回None
+        """
+        for rule in self.rules:
+            if rule.pattern is None:
+                element = rule.selector.select_one(node)
+                if element is not None:
+                    return element
+                continue
+            for element in rule.iter_matches(node):
+                return element
+        return None
+
+    def value(self, node) -> str:
+        """返回第一个命中元素的值（属性值或清洗后的文本），未命中时返回空字符串"""
+        for rule in self.rules:
+            for element in rule.iter_matches(node):
+                return rule.value(element)
+        return ""
+
+    def iter(self, node) -> Iterator[Any]:
+        """按规则顺序产出所有命中的元素（去重）"""
+        if len(self.rules) == 1:
+            yield from self.rules[0].iter_matches(node)
+            return
+        seen = set()
+        for rule in self.rules:
+            for element in rule.iter_matches(node):
+                if id(element) not in seen:
+                    seen.add(id(element))
+                    yield element
+
+    def select(self, node) -> List[Any]:
+        """返回所有命中的元素（按规则顺序拼接，去重）"""
+        return list(self.iter(node))
+
+    def __repr__(self) -> str:
+        return f"Field({self.name!r}, rules={len(self.rules)})"
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """编译后的站点规格"""
+
+    name: str
+    base_url: str
+    forum_url: str
+    headers: Dict[str, str]
+    categories: FrozenSet[str]
+    fields: Dict[str, Field]
+    patterns: Dict[str, Tuple[Pattern[str], ...]]
+
+    def field(self, name: str) -> Field:
+        """
+        获取字段
+
+        Raises:
+            KeyError: 配置中未声明该字段
+        """
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise KeyError(f"站点 {self.name} 未声明选择器: {name}") from None
+
+    def search(self, name: str, text: Optional[str]) -> Optional["re.Match[str]"]:
+        """
+        按顺序尝试命名正则，返回第一个匹配
+
+        Args:
+            name: patterns 下的名称
+            text: 待匹配文本（为空时返回None）
+        """
+        if not text:
+            return None
+        try:
+            patterns = self.patterns[name]
+        except KeyError:
+            raise KeyError(f"站点 {self.name} 未声明正则: {name}") from None
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                return match
+        return None
+
+    def group(self, name: str, text: Optional[str], default: Optional[str] = None) -> Optional[str]:
+        """返回命名正则第一个匹配的第1个分组"""
+        match = self.search(name, text)
+        return match.group(1) if match else default
+
+
+def _compile_rule(field: str, raw: Any) -> FieldRule:
+    if isinstance(raw, str):
+        raw = {"css": raw}
+    if not isinstance(raw, dict) or "css" not in raw:
+        raise ValueError(f"选择器 {field} 的规则格式无效: {raw!r}")
+    try:
+        selector = soupsieve.compile(raw["css"])
+        pattern = re.compile(raw["pattern"]) if raw.get("pattern") else None
+    except (soupsieve.SelectorSyntaxError, re.error) as e:
+        raise ValueError(f"选择器 {field} 编译失败: {e}") from e
+    return FieldRule(selector=selector, attr=raw.get("attr"), pattern=pattern)
+
+
+def _compile_patterns(name: str, raw: Any) -> Tuple[Pattern[str], ...]:
+    flags = 0
+    if isinstance(raw, dict):
+        flags = re.IGNORECASE if raw.get("ignore_case") else 0
+        raw = raw.get("any", [])
+    items = [raw] if isinstance(raw, str) else list(raw or [])
+    if not items:
+        raise ValueError(f"正则 {name} 为空")
+    try:
+        return tuple(re.compile(p, flags) for p in items)
+    except re.error as e:
+        raise ValueError(f"正则 {name} 编译失败: {e}") from e
+
+
+def compile_site_spec(data: Dict[str, Any], name: str = "") -> SiteSpec:
+    """
+    将站点配置编译为 SiteSpec
+
+    Args:
+        data: YAML 解析后的字典
+        name: 站点标识（用于错误信息）
+
+    Returns:
+        SiteSpec
+
+    Raises:
+        ValueError: 选择器或正则无效
+    """
+    site = data.get("site") or {}
+    fields = {}
+    for field, raw in (data.get("selectors") or {}).items():
+        rules = raw if isinstance(raw, list) else [raw]
+        fields[field] = Field(field, tuple(_compile_rule(field, r) for r in rules))
+    patterns = {key: _compile_patterns(key, raw) for key, raw in (data.get("patterns") or {}).items()}
+    return SiteSpec(
+        name=site.get("name") or name,
+        base_url=site.get("base_url", ""),
+        forum_url=site.get("forum_url", ""),
+        headers={str(k): str(v) for k, v in (data.get("headers") or {}).items()},
+        categories=frozenset(data.get("categories") or ()),
+        fields=fields,
+        patterns=patterns,
+    )
+
+
+@lru_cache(maxsize=None)
+def _load(path: str) -> SiteSpec:
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return compile_site_spec(data, Path(path).stem)
+
+
+def load_site_spec(site: str = "boniu", path: Optional[str] = None) -> SiteSpec:
+    """
+    加载站点规格（同一文件在进程内只编译一次）
+
+    Args:
+        site: 站点标识，对应 config/sites/<site>.yaml
+        path: 显式指定配置文件路径
+
+    Returns:
+        SiteSpec
+
+    Raises:
+        FileNotFoundError: 配置文件不存在
+        ValueError: 选择器或正则无效
+    """
+    config_path = Path(path) if path else SITES_DIR / f"{site}.yaml"
+    if not config_path.exists():
+        raise FileNotFoundError(f"站点配置不存在: {config_path}")
+    return _load(str(config_path.resolve()))
@@ -0,0 +1,170 @@
+"""抓取队列 worker
+
+从持久化抓取队列（utils/frontier.py）领取任务，交给对应站点爬虫处理。爬虫需提供
+``handle_task(task, frontier)``、``output_pending()`` 与 ``flush_output()``。
+同一队列可由多个 worker 进程（同一台机器或多台机器）同时消费：
+
+- 处理成功的任务在结果写出后才确认：先暂存，站点输出缓冲区为空（刚写出一批，
+  或 worker 空闲/退出时 flush）时再一并确认；worker 崩溃时未写出的任务在租约到期后
+  由其他 worker 重新处理；
+- 处理失败的任务按队列的重试策略重新入队，超过最大次数后标记为 dead；
+- 队列中没有等待中或已领取的任务时退出（也可用 max_tasks 限制处理数量）。
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from ..config.settings import get_settings
+from ..utils.frontier import STATE_DEAD, Frontier, Task
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerStats:
+    """worker 运行统计"""
+
+    leased: int = 0  # 领取的任务数
+    done: int = 0  # 确认完成的任务数
+    retried: int = 0  # 失败后重新入队的任务数
+    dead: int = 0  # 失败后放弃的任务数
+    lost: int = 0  # 确认时租约已失效（已被其他 worker 重新领取）的任务数
+
+
+class FrontierWorker:
+    """从抓取队列领取并处理任务"""
+
+    def __init__(
+        self,
+        frontier: Frontier,
+        crawlers: Mapping[str, Any],
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        kinds: Optional[Sequence[str]] = None,
+    ):
+        """
+        初始化 worker
+
+        Args:
+            frontier: 抓取队列
+            crawlers: 站点名 -> 爬虫实例（只领取这些站点的任务）
+            worker_id: worker 标识，默认 主机名:进程号
+            concurrency: 领取任务的线程数，默认取 settings.frontier.concurrency
+            poll_interval: 队列暂时为空时的轮询间隔（秒），默认取 settings.frontier.poll_interval
+            kinds: 只领取这些类型的任务，默认全部
+        """
+        config = get_settings().frontier
+        self.frontier = frontier
+        self.crawlers = dict(crawlers)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = max(1, concurrency or config.concurrency)
+        self.poll_interval = config.poll_interval if poll_interval is None else poll_interval
+        self.kinds = list(kinds) if kinds else None
+        self.stats = WorkerStats()
+        self._lock = threading.Lock()
+        self._unflushed: Dict[str, List[Task]] = defaultdict(list)  # 站点 -> 结果尚在缓冲区的任务
+        self._stop = threading.Event()
+        self._max_tasks: Optional[int] = None
+
+    def run(self, max_tasks: Optional[int] = None) -> WorkerStats:
+        """
+        运行直到队列处理完毕
+
+        Args:
+            max_tasks: 最多领取的任务数，默认不限制
+
+        Returns:
+            运行统计
+        """
+        self._max_tasks = max_tasks
+        self._stop.clear()
+        if self.concurrency == 1:
+            self._loop()
+        else:
+            threads = [
+                threading.Thread(target=self._loop, name=f"frontier-worker-{i}", daemon=True)
+                for i in range(self.concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.flush()
+        return self.stats
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            task = self._lease()
+            if task is None:
+                if self._stop.is_set():
+                    break
+                # 空闲时写出缓冲区并确认暂存的任务，再判断队列是否已处理完毕
+                self.flush()
+                if self.frontier.outstanding() == 0:
+                    self._stop.set()
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            self._process(task)
+
+    def _lease(self) -> Optional[Task]:
+        with self._lock:
+            if self._max_tasks is not None and self.stats.leased >= self._max_tasks:
+                self._stop.set()
+                return None
+            tasks = self.frontier.lease(self.worker_id, limit=1, kinds=self.kinds, sites=list(self.crawlers))
+            if tasks:
+                self.stats.leased += 1
+        return tasks[0] if tasks else None
+
+    def _process(self, task: Task) -> None:
+        crawler = self.crawlers[task.site]
+        try:
+            crawler.handle_task(task, self.frontier)
+        except Exception as e:
+            state = self.frontier.fail(task, f"{type(e).__name__}: {e}")
+            with self._lock:
+                if state == STATE_DEAD:
+                    self.stats.dead += 1
+                elif state is not None:
+                    self.stats.retried += 1
+                else:
+                    self.stats.lost += 1
+            logger.warning(f"任务失败 {task.key}（第 {task.attempts} 次）: {e}，状态 -> {state}")
+            return
+        with self._lock:
+            self._unflushed[task.site].append(task)
+            # 暂存的任务都在写入输出之后才加入；此刻缓冲区为空说明它们的结果均已落盘/入库
+            if crawler.output_pending() == 0:
+                tasks, self._unflushed[task.site] = self._unflushed[task.site], []
+            else:
+                tasks = []
+        self._ack(tasks)
+
+    def flush(self) -> None:
+        """写出各站点的输出缓冲区，并确认结果已写出的任务"""
+        for site, crawler in self.crawlers.items():
+            with self._lock:
+                tasks, self._unflushed[site] = self._unflushed[site], []
+            if not tasks:
+                continue
+            crawler.flush_output()
+            self._ack(tasks)
+
+    def _ack(self, tasks: List[Task]) -> None:
+        for task in tasks:
+            ok = self.frontier.ack(task)
+            with self._lock:
+                if ok:
+                    self.stats.done += 1
+                else:
+                    self.stats.lost += 1
+            if not ok:
+                logger.warning(f"任务 {task.key} 确认时租约已失效（可能被重复处理）")
@@ -1,15 +1,26 @@
-"""工具模块"""
-
-from .http import *
-from .parser import *
-from .storage import *
-from .anti_detect import *
-
-__all__ = [
-    "clean_text",
-    "extract_number", 
-    "format_datetime",
-    "save_data",
-    "setup_session",
-    "get_random_user_agent",
-]
+"""工具模块
+
+常用函数按需从子模块导入（parser 依赖 bs4），
+导入 src.crawler.utils 下的某个子模块时不会连带加载其他子模块的依赖。
+"""
+
+import importlib
+
+# 导出名称 -> 所在子模块
+_EXPORTS = {
+    "clean_text": ".parser",
+    "extract_number": ".parser",
+    "format_datetime": ".http",
+    "save_data": ".storage",
+    "setup_session": ".anti_detect",
+    "get_random_user_agent": ".anti_detect",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
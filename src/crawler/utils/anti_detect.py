@@ -3,7 +3,6 @@
 import random
 import time
 from typing import List
-from fake_useragent import UserAgent
 
 from ..config.settings import get_settings
 
@@ -30,6 +29,7 @@ def get_random_user_agent() -> str:
         随机User-Agent字符串
     """
     try:
+        from fake_useragent import UserAgent  # 加载数据较慢，用到时才导入
         ua = UserAgent()
         return ua.random
     except:
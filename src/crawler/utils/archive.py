@@ -0,0 +1,512 @@
+"""原始响应归档模块
+
+类似 WARC 的只追加归档：抓取到的每个页面响应（URL、状态码、响应头、耗时、解压后的响应体）
+逐条压缩写入段文件，可按 URL 或帖子ID O(1) 查找，也可顺序遍历用于批量回放。
+用途：清洗规则调整后 ``python main.py reextract`` 在本地重新解析、``python main.py archive``
+查看单个页面、解析基准与回归测试使用真实页面，都不必重新抓取，也不会产生大量小文件。
+
+目录结构（每个站点一个目录，如 data/archive/boniu）：
+
+- ``*.seg``：段文件，每条记录独立压缩（可按偏移单独读取），解压后为一行 JSON 元信息
+  {url, key, status, headers, elapsed, time} 加换行与响应体，不依赖索引也能解析；
+  每个写入进程写自己的段文件，达到 segment_bytes 后换新段；
+- ``index.jsonl``：追加日志，每条记录一行 {url, key, segment, offset, length, codec, time}，
+  段数据写出后才追加（单次 O_APPEND 写入，多进程追加不会交错），不完整的行在读取时跳过；
+- ``index.map``：由日志构建的开放寻址哈希表（reindex 时原子替换），以 mmap 只读打开，
+  查找时不需要把整个索引读入内存；构建之后追加的日志行在打开时读入内存补充查找。
+
+同一 URL 或同一 key（帖子ID）多次归档时以最后一条为准。压缩优先使用 zstd（需要 zstandard），
+未安装时使用 zlib；编码按段记录，两种段可以混合读取。
+"""
+
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from ..config.settings import get_settings
+from .decoding import decode_body
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+INDEX_LOG = "index.jsonl"
+INDEX_MAP = "index.map"
+SEGMENT_SUFFIX = ".seg"
+
+# index.map：文件头 + 槽位数组 + 段表（JSON）
+_MAP_MAGIC = b"CRAWLIX1"
+_MAP_HEADER = struct.Struct("<8sQQQQ")  # magic, 槽位数, URL 数, 已覆盖的日志字节数, 段表偏移
+_MAP_SLOT = struct.Struct("<QIQI")  # 键哈希（0 表示空槽）, 段序号, 偏移, 长度
+
+# 响应体已解压，归档时去掉与原始传输相关的响应头
+_DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+
+def _zstd():
+    try:
+        import zstandard  # type: ignore
+    except ImportError:
+        raise ImportError("读取 zstd 归档需要安装 zstandard: pip install zstandard")
+    return zstandard
+
+
+def default_codec() -> str:
+    """已安装 zstandard 时使用 zstd，否则使用 zlib"""
+    try:
+        _zstd()
+        return CODEC_ZSTD
+    except ImportError:
+        return CODEC_ZLIB
+
+
+def compress(data: bytes, codec: str, level: int = 3) -> bytes:
+    """按编码压缩一条记录"""
+    if codec == CODEC_ZSTD:
+        return _zstd().ZstdCompressor(level=level).compress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, min(max(level, 1), 9))
+    raise ValueError(f"不支持的归档压缩编码: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """按编码解压一条记录"""
+    if codec == CODEC_ZSTD:
+        return _zstd().ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"不支持的归档压缩编码: {codec}")
+
+
+def _hash(lookup: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(lookup.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+def _url_lookup(url: str) -> str:
+    return f"u:{url}"
+
+
+def _key_lookup(key: str) -> str:
+    return f"k:{key}"
+
+
+@dataclass
+class ArchiveRecord:
+    """一条归档的响应"""
+
+    url: str
+    body: bytes
+    key: Optional[str] = None  # 帖子ID等站点标识（列表页等为None）
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)  # 响应头（小写名称）
+    elapsed: Optional[float] = None  # 响应耗时（秒）
+    time: float = 0.0  # 抓取时间（Unix 时间戳）
+
+    @property
+    def text(self) -> str:
+        """按 Content-Type 声明/嗅探的字符集解码后的响应体"""
+        return decode_body(self.body, self.headers.get("content-type"))
+
+    def meta(self) -> Dict[str, Any]:
+        """元信息（不含响应体）"""
+        return {
+            "url": self.url, "key": self.key, "status": self.status,
+            "headers": self.headers, "elapsed": self.elapsed, "time": self.time,
+        }
+
+
+def _encode_record(record: ArchiveRecord) -> bytes:
+    return json.dumps(record.meta(), ensure_ascii=False).encode("utf-8") + b"\n" + bytes(record.body)
+
+
+def _decode_record(data: bytes) -> ArchiveRecord:
+    head, _, body = data.partition(b"\n")
+    meta = json.loads(head)
+    return ArchiveRecord(body=body, **meta)
+
+
+class _IndexMap:
+    """mmap 打开的 index.map（只读）"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise
+        magic, self.slots, self.urls, self.log_pos, table_offset = _MAP_HEADER.unpack_from(self._mm, 0)
+        if magic != _MAP_MAGIC or self.slots & (self.slots - 1):
+            self.close()
+            raise ValueError(f"索引文件格式无效: {path}")
+        self.segments: List[Tuple[str, str]] = [tuple(s) for s in json.loads(self._mm[table_offset:])]
+
+    def find(self, lookup: str) -> Iterator[Tuple[str, str, int, int]]:
+        """按键哈希线性探测，依次返回哈希相同的 (段文件, 编码, 偏移, 长度)"""
+        h = _hash(lookup)
+        mask = self.slots - 1
+        i = h & mask
+        for _ in range(self.slots):
+            slot_hash, seg, offset, length = _MAP_SLOT.unpack_from(self._mm, _MAP_HEADER.size + i * _MAP_SLOT.size)
+            if slot_hash == 0:
+                return
+            if slot_hash == h:
+                name, codec = self.segments[seg]
+                yield name, codec, offset, length
+            i = (i + 1) & mask
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        finally:
+            self._file.close()
+
+
+def _write_index_map(path: str, entries: Mapping[str, Dict[str, Any]], urls: int, log_pos: int) -> None:
+    """把 查找键 -> 日志行 写成 index.map（先写临时文件再原子替换）"""
+    slots = 64
+    while slots < len(entries) * 2:
+        slots *= 2
+    segments: Dict[Tuple[str, str], int] = {}
+    table = bytearray(slots * _MAP_SLOT.size)
+    mask = slots - 1
+    for lookup, entry in entries.items():
+        seg = segments.setdefault((entry["segment"], entry["codec"]), len(segments))
+        h = _hash(lookup)
+        i = h & mask
+        while _MAP_SLOT.unpack_from(table, i * _MAP_SLOT.size)[0] != 0:
+            i = (i + 1) & mask
+        _MAP_SLOT.pack_into(table, i * _MAP_SLOT.size, h, seg, entry["offset"], entry["length"])
+    segment_table = json.dumps([list(s) for s in sorted(segments, key=segments.get)]).encode("utf-8")
+    table_offset = _MAP_HEADER.size + len(table)
+    tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(_MAP_HEADER.pack(_MAP_MAGIC, slots, urls, log_pos, table_offset))
+        f.write(table)
+        f.write(segment_table)
+    os.replace(tmp, path)
+
+
+class PageArchive:
+    """原始响应归档（线程安全；同一目录可由多个进程同时写入与读取）"""
+
+    def __init__(
+        self,
+        root: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        codec: Optional[str] = None,
+        level: int = 3,
+        reindex_threshold: int = 10000,
+    ):
+        """
+        初始化归档
+
+        Args:
+            root: 归档目录（不存在时创建）
+            segment_bytes: 单个段文件的大小上限（字节），超过后换新段
+            codec: 压缩编码（zstd/zlib），默认已安装 zstandard 时使用 zstd
+            level: 压缩级别
+            reindex_threshold: 关闭时 index.map 之后追加的日志行达到该数量则重建 index.map
+        """
+        self.root = root
+        self.segment_bytes = max(1, segment_bytes)
+        self.codec = codec or default_codec()
+        self.level = level
+        self.reindex_threshold = reindex_threshold
+        os.makedirs(root, exist_ok=True)
+        self._log_path = os.path.join(root, INDEX_LOG)
+        self._map_path = os.path.join(root, INDEX_MAP)
+        self._map: Optional[_IndexMap] = None
+        self._tail: Dict[str, Dict[str, Any]] = {}  # index.map 之后追加的日志：查找键 -> 日志行
+        self._tail_pos = 0  # 已读入 _tail 的日志位置
+        self._readers: Dict[str, BinaryIO] = {}  # 段文件名 -> 只读文件对象（读取时持锁 seek + read）
+        self._writer = None  # 当前写入的段文件
+        self._segment_seq = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            self._open_map()
+            self._refresh()
+
+    # ---- 索引 ----
+
+    def _open_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._tail.clear()
+        self._tail_pos = 0
+        if os.path.exists(self._map_path):
+            try:
+                self._map = _IndexMap(self._map_path)
+                self._tail_pos = self._map.log_pos
+            except (ValueError, OSError):
+                self._map = None
+
+    def _refresh(self) -> None:
+        """读入日志中新追加的行（包括其他进程写入的）"""
+        for entry, end in _read_log(self._log_path, self._tail_pos):
+            self._tail_pos = end
+            self._tail[_url_lookup(entry["url"])] = entry
+            if entry.get("key"):
+                self._tail[_key_lookup(entry["key"])] = entry
+
+    def _locations(self, lookup: str) -> Iterator[Tuple[str, str, int, int]]:
+        """查找键可能对应的记录位置，新的在前（调用方持有锁）"""
+        entry = self._tail.get(lookup)
+        if entry is not None:
+            yield entry["segment"], entry["codec"], entry["offset"], entry["length"]
+        if self._map is not None:
+            yield from self._map.find(lookup)
+
+    def _first_location(self, lookup: str) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            for segment, _codec, offset, _length in self._locations(lookup):
+                return segment, offset
+        return None
+
+    def reindex(self) -> int:
+        """
+        由 index.jsonl 重建 index.map（原子替换，正在读取的进程不受影响）
+
+        Returns:
+            归档的 URL 数
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        urls = 0
+        log_pos = 0
+        for entry, end in _read_log(self._log_path, 0):
+            log_pos = end
+            lookup = _url_lookup(entry["url"])
+            if lookup not in entries:
+                urls += 1
+            entries[lookup] = entry
+            if entry.get("key"):
+                entries[_key_lookup(entry["key"])] = entry
+        _write_index_map(self._map_path, entries, urls, log_pos)
+        with self._lock:
+            self._open_map()
+            self._refresh()
+        return urls
+
+    # ---- 写入 ----
+
+    def _open_segment(self):
+        self._segment_seq += 1
+        name = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{self._segment_seq:04d}{SEGMENT_SUFFIX}"
+        return open(os.path.join(self.root, name), "ab")
+
+    def put(
+        self,
+        url: str,
+        body: Union[str, bytes],
+        key: Optional[str] = None,
+        status: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        elapsed: Optional[float] = None,
+    ) -> None:
+        """
+        归档一个响应
+
+        Args:
+            url: 请求URL
+            body: 解压后的响应体（str 按 UTF-8 编码）
+            key: 站点标识（如帖子ID），提供时也可按 key 查找
+            status: HTTP 状态码
+            headers: 响应头
+            elapsed: 响应耗时（秒）
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items() if k.lower() not in _DROPPED_HEADERS}
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+            headers.setdefault("content-type", "text/html; charset=utf-8")
+        record = ArchiveRecord(
+            url=url, body=body, key=None if key is None else str(key),
+            status=status, headers=headers, elapsed=elapsed, time=time.time(),
+        )
+        blob = compress(_encode_record(record), self.codec, self.level)
+        with self._lock:
+            if self._writer is None or self._writer.tell() + len(blob) > self.segment_bytes:
+                if self._writer is not None:
+                    self._writer.close()
+                self._writer = self._open_segment()
+            offset = self._writer.tell()
+            self._writer.write(blob)
+            self._writer.flush()
+            entry = {
+                "url": url,
+                "key": record.key,
+                "segment": os.path.basename(self._writer.name),
+                "offset": offset,
+                "length": len(blob),
+                "codec": self.codec,
+                "time": record.time,
+            }
+            line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            fd = os.open(self._log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._refresh()
+
+    # ---- 读取 ----
+
+    def _read(self, segment: str, codec: str, offset: int, length: int) -> ArchiveRecord:
+        with self._lock:
+            reader = self._readers.get(segment)
+            if reader is None:
+                reader = open(os.path.join(self.root, segment), "rb")
+                self._readers[segment] = reader
+            reader.seek(offset)
+            blob = reader.read(length)
+        return _decode_record(decompress(blob, codec))
+
+    def get(self, key_or_url: str) -> Optional[ArchiveRecord]:
+        """
+        按 URL 或 key（帖子ID）读取最新归档的响应
+
+        Returns:
+            归档记录；未归档时返回None
+        """
+        key_or_url = str(key_or_url)
+        with self._lock:
+            self._refresh()
+            locations = list(self._locations(_url_lookup(key_or_url))) + list(
+                self._locations(_key_lookup(key_or_url))
+            )
+        for location in locations:
+            record = self._read(*location)
+            # 哈希相同时核对记录本身
+            if record.url == key_or_url or record.key == key_or_url:
+                return record
+        return None
+
+    def __contains__(self, key_or_url: object) -> bool:
+        return self.get(str(key_or_url)) is not None
+
+    def __len__(self) -> int:
+        """归档的 URL 数"""
+        with self._lock:
+            self._refresh()
+            count = self._map.urls if self._map is not None else 0
+            tail_urls = [lookup for lookup in self._tail if lookup.startswith("u:")]
+            if self._map is not None:
+                tail_urls = [lookup for lookup in tail_urls if next(self._map.find(lookup), None) is None]
+            return count + len(tail_urls)
+
+    def records(self, latest: bool = True, keyed: bool = False) -> Iterator[ArchiveRecord]:
+        """
+        按写入顺序遍历归档（批量回放）
+
+        Args:
+            latest: 只返回每个 URL（keyed 时每个 key）最新的一条
+            keyed: 只返回带 key 的记录（如帖子详情页）
+
+        Yields:
+            归档记录
+        """
+        with self._lock:
+            self._refresh()
+            end = self._tail_pos
+        for entry, pos in _read_log(self._log_path, 0):
+            if pos > end:
+                break
+            if keyed and not entry.get("key"):
+                continue
+            if latest:
+                lookup = _key_lookup(entry["key"]) if keyed else _url_lookup(entry["url"])
+                if self._first_location(lookup) != (entry["segment"], entry["offset"]):
+                    continue
+            yield self._read(entry["segment"], entry["codec"], entry["offset"], entry["length"])
+
+    def close(self) -> None:
+        """关闭段文件；index.map 之后追加的日志较多时重建 index.map"""
+        with self._lock:
+            wrote = self._writer is not None
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            stale = len(self._tail) >= self.reindex_threshold
+        if wrote and stale:
+            self.reindex()
+        with self._lock:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _read_log(path: str, start: int) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """从 start 位置读取 index.jsonl，返回 (日志行, 该行结束位置)；遇到不完整的行时停止"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                return  # 正在写入或崩溃留下的不完整行，下次再读
+            pos += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            yield entry, pos
+
+
+# 全局归档（站点名 -> 归档）
+_archives: Dict[str, PageArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def archive_path(site: str) -> str:
+    """站点的归档目录（settings.archive.root/<site>）"""
+    return os.path.join(get_settings().archive.root, site)
+
+
+def open_archive(site: str, root: Optional[str] = None) -> PageArchive:
+    """按 settings.archive 打开站点归档（root 指定时使用该目录）"""
+    config = get_settings().archive
+    return PageArchive(
+        root or archive_path(site),
+        segment_bytes=config.segment_mb * 1024 * 1024,
+        level=config.level,
+    )
+
+
+def get_page_archive(site: str) -> Optional[PageArchive]:
+    """获取站点的全局归档；settings.archive.enabled 为 False 时返回None（不归档）"""
+    if not get_settings().archive.enabled:
+        return None
+    with _archives_lock:
+        archive = _archives.get(site)
+        if archive is None:
+            if not _archives:
+                atexit.register(close_page_archives)
+            archive = _archives[site] = open_archive(site)
+        return archive
+
+
+def close_page_archives() -> None:
+    """关闭并丢弃全局归档"""
+    with _archives_lock:
+        archives = list(_archives.values())
+        _archives.clear()
+    for archive in archives:
+        archive.close()
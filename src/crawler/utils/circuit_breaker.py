@@ -0,0 +1,232 @@
+"""熔断器模块
+
+为目标站点、图片主机与翻译接口提供 closed/open/half-open 三态熔断：
+连续失败达到阈值后熔断（open），期间请求直接快速失败；
+冷却时间过后进入半开（half-open）状态放行少量探测请求，
+探测成功则恢复（closed），失败则重新熔断。
+探测请求未记录结果就异常退出时由调用方 release 归还名额；
+超过冷却时间仍未记录结果的探测名额自动作废，避免熔断器永久停在半开状态。
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..config.settings import get_settings
+
+
+class CircuitState:
+    """熔断器状态"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态时抛出的异常"""
+
+    def __init__(self, name: str, retry_in: float = 0.0):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"熔断中: {name}（{retry_in:.0f}秒后探测）")
+
+
+class CircuitBreaker:
+    """单个依赖（主机/接口）的熔断器（线程安全）"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            name: 熔断器名称（通常为主机名）
+            failure_threshold: 连续失败多少次后熔断
+            recovery_timeout: 熔断后多久进入半开状态探测（秒）
+            half_open_max_calls: 半开状态下同时允许的探测请求数
+            clock: 单调时钟函数（便于测试注入）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_at = 0.0  # 最近一次放行探测请求的时间
+        self._generation = 0  # 状态变化或记录结果时递增，用于识别未记录结果的探测
+        self._open_count = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """当前状态（会根据冷却时间自动转为半开）"""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        now = self._clock()
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+            self._generation += 1
+        elif (
+            self._state == CircuitState.HALF_OPEN
+            and self._half_open_calls >= self.half_open_max_calls
+            and now - self._probe_at >= self.recovery_timeout
+        ):
+            # 探测请求超过冷却时间仍未记录结果（调用方异常退出且未 release），名额作废
+            self._half_open_calls = 0
+            self._generation += 1
+
+    def _acquire(self) -> Tuple[bool, Optional[int]]:
+        """放行判断；半开状态下占用探测名额时同时返回探测令牌"""
+        with self._lock:
+            self._refresh()
+            if self._state == CircuitState.CLOSED:
+                return True, None
+            if self._state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                self._probe_at = self._clock()
+                return True, self._generation
+            self._rejected += 1
+            return False, None
+
+    def allow_request(self) -> bool:
+        """判断是否放行请求；半开状态下只放行有限的探测请求（放行的探测需记录结果或 release）"""
+        return self._acquire()[0]
+
+    def before_request(self) -> Optional[int]:
+        """
+        请求前检查
+
+        Returns:
+            半开状态下放行的探测令牌（交给 release，在请求未记录结果就异常退出时归还名额），否则为None
+
+        Raises:
+            CircuitOpenError: 熔断器打开时抛出
+        """
+        allowed, probe = self._acquire()
+        if not allowed:
+            raise CircuitOpenError(self.name, self.retry_in())
+        return probe
+
+    def release(self, probe: Optional[int]) -> None:
+        """
+        归还未记录结果的探测名额（在 finally 中调用；已记录成功/失败时无操作）
+
+        Args:
+            probe: before_request 返回的探测令牌
+        """
+        if probe is None:
+            return
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._generation == probe and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def retry_in(self) -> float:
+        """距离下一次探测的剩余秒数"""
+        with self._lock:
+            if self._state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        """记录一次成功请求"""
+        with self._lock:
+            self._failures = 0
+            self._state = CircuitState.CLOSED
+            self._half_open_calls = 0
+            self._generation += 1
+
+    def record_failure(self) -> None:
+        """记录一次失败请求"""
+        with self._lock:
+            self._failures += 1
+            self._generation += 1
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    self._open_count += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._half_open_calls = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取熔断器状态快照"""
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "failures": self._failures,
+                "opened": self._open_count,
+                "rejected": self._rejected,
+            }
+
+
+class CircuitBreakerRegistry:
+    """按名称（主机）管理熔断器"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0, enabled: bool = True):
+        """
+        初始化注册表
+
+        Args:
+            failure_threshold: 新建熔断器的失败阈值
+            recovery_timeout: 新建熔断器的冷却时间（秒）
+            enabled: 是否启用熔断；关闭时所有熔断器阈值无限大
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.enabled = enabled
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """获取（必要时创建）指定名称的熔断器"""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                threshold = self.failure_threshold if self.enabled else float("inf")
+                breaker = CircuitBreaker(name, threshold, self.recovery_timeout)
+                self._breakers[name] = breaker
+            return breaker
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        """获取URL所属主机的熔断器"""
+        return self.get(urlparse(url).netloc.lower() or url)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """获取所有熔断器的状态"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.snapshot() for name, breaker in breakers}
+
+
+# 全局熔断器注册表（爬虫、图片下载器与翻译器共享）
+_registry: Optional[CircuitBreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_breaker_registry() -> CircuitBreakerRegistry:
+    """获取全局熔断器注册表"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            cfg = get_settings().circuit_breaker
+            _registry = CircuitBreakerRegistry(
+                failure_threshold=cfg.failure_threshold,
+                recovery_timeout=cfg.recovery_timeout,
+                enabled=cfg.enabled,
+            )
+        return _registry
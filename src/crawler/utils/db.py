@@ -1,7 +1,9 @@
 """Database helper for MySQL connections and simple operations."""
 
 import os
-from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import pymysql
 
@@ -25,28 +27,107 @@ def connect():
     return pymysql.connect(**get_db_config())
 
 
+class ConnectionPool:
+    """Thread-safe pool of reusable connections shared by all sites in a process.
+
+    Connections are handed out LIFO and pinged (with reconnect) before reuse.
+    Concurrency is not capped: when no idle connection is available a new one
+    is opened, and at most ``max_idle`` connections are kept when returned.
+    A connection whose ``with`` block raised is closed instead of returned.
+    """
+
+    def __init__(self, factory: Callable[[], Any] = connect, max_idle: int = 4):
+        self.factory = factory
+        self.max_idle = max(0, max_idle)
+        self.created = 0
+        self.reused = 0
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Any:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                conn = self.factory()
+                with self._lock:
+                    self.created += 1
+                return conn
+            try:
+                conn.ping(reconnect=True)
+            except Exception:
+                _close_quietly(conn)
+                continue
+            with self._lock:
+                self.reused += 1
+            return conn
+
+    def _release(self, conn: Any) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        _close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the ``with`` block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            _close_quietly(conn)
+            raise
+        self._release(conn)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _close_quietly(conn)
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+# Process-wide pool shared by fetch_all/executemany
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool (size from DB_POOL_SIZE)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(connect, max_idle=int(os.getenv("DB_POOL_SIZE", "4")))
+        return _pool
+
+
 def fetch_all(sql: str, params: Optional[Sequence[Any]] = None) -> Iterable[Dict[str, Any]]:
     """Run a SELECT and yield rows as dicts."""
-    conn = connect()
-    try:
+    with get_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.execute(sql, params or ())
-            for row in cur.fetchall():
-                yield row
-    finally:
-        conn.close()
+            rows = cur.fetchall()
+    # The connection is back in the pool before the caller iterates
+    yield from rows
 
 
 def executemany(sql: str, rows: Sequence[Tuple[Any, ...]]) -> int:
     """Execute many rows; returns affected rows (approx)."""
     if not rows:
         return 0
-    conn = connect()
-    try:
+    with get_pool().connection() as conn:
         with conn.cursor() as cur:
             cur.executemany(sql, rows)
             return cur.rowcount
-    finally:
-        conn.close()
-
-
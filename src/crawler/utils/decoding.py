@@ -0,0 +1,226 @@
+"""响应解码模块
+
+统一处理响应体的解压与字符集解码，避免在解析层重复解压、重复解码：
+
+- 流式读取原始响应（``stream=True``）时按块增量解压 gzip/deflate/br，
+  解压结果写入同一个 bytearray，不保留分块列表也不做额外拼接或拷贝；
+- 字符集优先取 Content-Type 头，其次嗅探前几 KB 内的 ``<meta charset>``，
+  都没有时使用默认编码，不再触发 requests 对整个响应体的编码猜测；
+- 整个响应体只解码一次，直接得到交给 BeautifulSoup 的字符串。
+"""
+
+import codecs
+import importlib.util
+import re
+import zlib
+from typing import Any, Optional, Union
+
+# 嗅探 <meta charset> 的字节数
+SNIFF_BYTES = 4096
+
+# 流式读取的块大小
+CHUNK_SIZE = 64 * 1024
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+# 常见的错误/过时字符集名称映射
+_CHARSET_ALIASES = {
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "x-gbk": "gb18030",
+    "iso-8859-1": "cp1252",
+    "latin-1": "cp1252",
+}
+
+
+def normalize_charset(charset: Optional[str]) -> Optional[str]:
+    """
+    规范化字符集名称
+
+    Args:
+        charset: 原始字符集名称
+
+    Returns:
+        Python 可用的编码名称；无法识别时返回None
+    """
+    if not charset:
+        return None
+    name = charset.strip().strip("\"'").lower()
+    name = _CHARSET_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """从 Content-Type 头中提取字符集"""
+    if not content_type:
+        return None
+    match = _HEADER_CHARSET_RE.search(content_type)
+    return normalize_charset(match.group(1)) if match else None
+
+
+def sniff_meta_charset(head: bytes) -> Optional[str]:
+    """
+    在响应体开头嗅探 ``<meta charset>`` / ``<meta http-equiv content="...charset=...">``
+
+    Args:
+        head: 响应体的前若干字节
+
+    Returns:
+        识别出的字符集；未找到时返回None
+    """
+    match = _META_CHARSET_RE.search(head[:SNIFF_BYTES])
+    return normalize_charset(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def detect_charset(content_type: Optional[str], head: bytes, default: str = "utf-8") -> str:
+    """
+    确定响应体的字符集：BOM > Content-Type > <meta> > 默认值
+
+    Args:
+        content_type: Content-Type 头
+        head: 响应体的前若干字节
+        default: 都无法确定时使用的编码
+
+    Returns:
+        编码名称
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    return charset_from_content_type(content_type) or sniff_meta_charset(head) or default
+
+
+def accept_encoding() -> str:
+    """返回本进程能解压的 Accept-Encoding（未安装 brotli 时不声明 br）"""
+    # 只探测是否安装，真正遇到 br 响应时才导入 brotli
+    if importlib.util.find_spec("brotli") is not None:
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+def make_decompressor(content_encoding: Optional[str]) -> Optional[Any]:
+    """
+    按 Content-Encoding 创建增量解压器
+
+    Args:
+        content_encoding: Content-Encoding 头
+
+    Returns:
+        具有 decompress(data) 方法的解压器；无需解压时返回None
+
+    Raises:
+        ValueError: 不支持的编码（如未安装 brotli 时的 br）
+    """
+    encoding = (content_encoding or "").strip().lower()
+    if not encoding or encoding == "identity":
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecompressor()
+    if encoding == "br":
+        try:
+            import brotli  # type: ignore
+        except ImportError:
+            raise ValueError("响应使用 br 压缩，但未安装 brotli")
+        return _BrotliDecompressor(brotli.Decompressor())
+    raise ValueError(f"不支持的 Content-Encoding: {content_encoding}")
+
+
+class _DeflateDecompressor:
+    """deflate 解压器：兼容带 zlib 头与裸 deflate 两种格式"""
+
+    def __init__(self):
+        self._obj = zlib.decompressobj()
+        self._first = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first:
+            self._first = False
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecompressor:
+    """统一 brotli（process）与 brotlicffi（decompress）的接口"""
+
+    def __init__(self, obj: Any):
+        self._decompress = getattr(obj, "decompress", None) or obj.process
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompress(data)
+
+
+def read_body(response: Any, chunk_size: int = CHUNK_SIZE) -> Union[bytes, bytearray]:
+    """
+    读取解压后的响应体
+
+    对 ``stream=True`` 且尚未读取的 requests 响应，按块读取原始数据并增量解压到
+    同一个 bytearray 中（不再拷贝为 bytes）；其他情况（已读取、HTTP/2 响应、
+    测试替身）直接返回 ``response.content``。
+
+    Args:
+        response: 响应对象
+        chunk_size: 流式读取块大小
+
+    Returns:
+        解压后的响应体
+    """
+    raw = getattr(response, "raw", None)
+    if raw is None or getattr(response, "_content_consumed", True) or not hasattr(raw, "stream"):
+        return response.content or b""
+
+    decompressor = make_decompressor(response.headers.get("content-encoding"))
+    buffer = bytearray()
+    for chunk in raw.stream(chunk_size, decode_content=False):
+        buffer += decompressor.decompress(chunk) if decompressor else chunk
+    if decompressor is not None and hasattr(decompressor, "flush"):
+        buffer += decompressor.flush()
+
+    # 回填到 Response，后续访问 content/text/json 不会再次读取连接
+    response._content = buffer
+    response._content_consumed = True
+    return buffer
+
+
+def decode_body(body: Union[bytes, bytearray], content_type: Optional[str] = None, default: str = "utf-8") -> str:
+    """
+    将响应体一次性解码为字符串
+
+    Args:
+        body: 解压后的响应体
+        content_type: Content-Type 头
+        default: 无法确定字符集时的默认编码
+
+    Returns:
+        解码后的文本（无法解码的字节被替换）
+    """
+    charset = detect_charset(content_type, bytes(body[:SNIFF_BYTES]), default)
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode(default, errors="replace")
+
+
+def response_text(response: Any, default: str = "utf-8") -> str:
+    """
+    读取并解码响应文本（替代 response.text）
+
+    Args:
+        response: 响应对象
+        default: 无法确定字符集时的默认编码
+
+    Returns:
+        响应文本
+    """
+    body = read_body(response)
+    return decode_body(body, response.headers.get("content-type"), default)
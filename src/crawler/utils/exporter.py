@@ -0,0 +1,280 @@
+"""Prometheus 指标导出模块
+
+将阶段指标、按主机的请求指标、熔断器/限速器状态与 CrawlerStats 计数
+渲染为 Prometheus 文本格式（0.0.4），支持两种导出方式：
+
+- textfile：运行结束时原子写入 ``<textfile_dir>/<name>.prom``，由 node_exporter
+  的 textfile collector 采集（适合定时任务这种短进程）；
+- HTTP：在本地端口提供 ``/metrics``，便于长时间运行时实时抓取。
+
+不依赖 prometheus_client。
+"""
+
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config.settings import get_settings
+from .metrics import StageMetrics, get_metrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 熔断器状态到数值的映射
+_BREAKER_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Family:
+    """一个指标族（同名、同类型的若干样本）"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, Any], float]] = []
+
+    def add(self, value: float, labels: Optional[Dict[str, Any]] = None, suffix: str = "") -> "_Family":
+        self.samples.append((suffix, labels or {}, value))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for suffix, labels, value in self.samples:
+            label_str = ""
+            if labels:
+                label_str = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+            lines.append(f"{self.name}{suffix}{label_str} {_format_value(value)}")
+        return lines
+
+
+class MetricsExporter:
+    """Prometheus 指标导出器"""
+
+    def __init__(
+        self,
+        metrics: Optional[StageMetrics] = None,
+        namespace: str = "boniu",
+        textfile_path: Optional[str] = None,
+        http_port: Optional[int] = None,
+        http_addr: str = "127.0.0.1",
+    ):
+        """
+        初始化导出器
+
+        Args:
+            metrics: 阶段指标，默认使用全局实例
+            namespace: 指标名前缀
+            textfile_path: textfile collector 文件路径，为None时不写文件
+            http_port: 本地 HTTP 端口，为None时不启动（0 表示随机端口）
+            http_addr: HTTP 监听地址
+        """
+        self.metrics = metrics or get_metrics()
+        self.namespace = namespace
+        self.textfile_path = textfile_path
+        self.http_port = http_port
+        self.http_addr = http_addr
+        self.crawler = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def from_settings(cls, name: str, metrics: Optional[StageMetrics] = None) -> "MetricsExporter":
+        """
+        按 settings.metrics 创建导出器
+
+        Args:
+            name: textfile 文件名（不含扩展名），如 boniu_crawler
+            metrics: 阶段指标，默认使用全局实例
+        """
+        cfg = get_settings().metrics
+        textfile_path = os.path.join(cfg.textfile_dir, f"{name}.prom") if cfg.textfile_dir else None
+        return cls(metrics, textfile_path=textfile_path, http_port=cfg.http_port, http_addr=cfg.http_addr)
+
+    def bind_crawler(self, crawler: Any) -> None:
+        """关联爬虫实例，导出其 CrawlerStats、熔断器与限速器状态"""
+        self.crawler = crawler
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}"
+
+    def collect(self) -> List[_Family]:
+        """收集当前所有指标族"""
+        snapshot = self.metrics.requests_snapshot()
+        summary = self.metrics.summary()
+        families: List[_Family] = []
+
+        run_seconds = snapshot["elapsed"]
+        families.append(_Family(self._name("run_duration_seconds"), "gauge", "本次运行已持续的秒数").add(run_seconds))
+
+        requests_total = _Family(self._name("http_requests_total"), "counter", "HTTP请求数（按主机与状态码）")
+        for (host, status), count in sorted(snapshot["requests"].items()):
+            requests_total.add(count, {"host": host, "status": status})
+        families.append(requests_total)
+
+        total_requests = sum(snapshot["requests"].values())
+        families.append(
+            _Family(self._name("http_requests_per_second"), "gauge", "本次运行的平均请求速率（请求/秒）")
+            .add(total_requests / run_seconds if run_seconds > 0 else 0.0)
+        )
+
+        latency = _Family(self._name("http_request_duration_seconds"), "histogram", "HTTP请求耗时（至响应头，按主机）")
+        for host, h in sorted(snapshot["latency"].items()):
+            for upper, cumulative in h.cumulative():
+                latency.add(cumulative, {"host": host, "le": _format_value(upper)}, "_bucket")
+            latency.add(h.count, {"host": host, "le": "+Inf"}, "_bucket")
+            latency.add(h.total, {"host": host}, "_sum")
+            latency.add(h.count, {"host": host}, "_count")
+        families.append(latency)
+
+        downloaded = _Family(self._name("http_response_bytes_total"), "counter", "下载的响应体字节数（按主机）")
+        for host, nbytes in sorted(snapshot["bytes"].items()):
+            downloaded.add(nbytes, {"host": host})
+        families.append(downloaded)
+
+        stage_duration = _Family(self._name("stage_duration_seconds"), "summary", "流水线各阶段耗时（入库耗时见 stage=\"db_insert\"）")
+        stage_bytes = _Family(self._name("stage_bytes_total"), "counter", "流水线各阶段处理的字节数")
+        for stage, s in sorted(summary["stages"].items()):
+            if not s["count"]:
+                continue
+            for quantile in ("50", "95", "99"):
+                stage_duration.add(s[f"p{quantile}"], {"stage": stage, "quantile": f"0.{quantile}"})
+            stage_duration.add(s["total"], {"stage": stage}, "_sum")
+            stage_duration.add(s["count"], {"stage": stage}, "_count")
+            stage_bytes.add(s["bytes"], {"stage": stage})
+        families.extend([stage_duration, stage_bytes])
+
+        for name, value in sorted(snapshot["gauges"].items()):
+            families.append(_Family(self._name(name), "gauge", f"瞬时值 {name}").add(value))
+
+        if self.crawler is not None:
+            families.extend(self._collect_crawler())
+        return families
+
+    def _collect_crawler(self) -> List[_Family]:
+        crawler = self.crawler
+        stats = crawler.stats
+        families = [
+            _Family(self._name("crawler_results_total"), "counter", "CrawlerStats 抓取结果计数")
+            .add(stats.success, {"result": "success"})
+            .add(stats.failed, {"result": "failed"}),
+            _Family(self._name("crawler_retries_total"), "counter", "CrawlerStats 重试次数").add(stats.retries),
+        ]
+        budget = getattr(crawler.retry_policy, "budget", None)
+        if budget is not None and budget.remaining is not None:
+            families.append(
+                _Family(self._name("crawler_retry_budget_remaining"), "gauge", "本次运行剩余的重试预算")
+                .add(budget.remaining)
+            )
+
+        state = _Family(self._name("circuit_breaker_state"), "gauge", "熔断器状态（0=closed 1=half_open 2=open）")
+        opened = _Family(self._name("circuit_breaker_opened_total"), "counter", "熔断器打开次数")
+        rejected = _Family(self._name("circuit_breaker_rejected_total"), "counter", "熔断期间被拒绝的请求数")
+        for name, snap in sorted(crawler.breakers.snapshot().items()):
+            state.add(_BREAKER_STATE_VALUES.get(snap["state"], 0), {"name": name})
+            opened.add(snap["opened"], {"name": name})
+            rejected.add(snap["rejected"], {"name": name})
+        families.extend([state, opened, rejected])
+
+        rate = _Family(self._name("rate_limit_requests_per_second"), "gauge", "自适应限速器当前速率（按主机）")
+        for host, snap in sorted(crawler.rate_limiter.snapshot().items()):
+            rate.add(snap["rate"], {"host": host})
+        families.append(rate)
+        return families
+
+    def render(self) -> str:
+        """渲染为 Prometheus 文本格式"""
+        lines: List[str] = []
+        for family in self.collect():
+            if family.samples:
+                lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        原子写入 textfile（先写临时文件再重命名，避免采集到半个文件）
+
+        Args:
+            path: 文件路径，默认使用 textfile_path
+
+        Returns:
+            写入的路径；未配置路径时返回None
+        """
+        path = path or self.textfile_path
+        if not path:
+            return None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+        return path
+
+    def start_http_server(self) -> Optional[int]:
+        """
+        在后台线程启动 /metrics HTTP 服务
+
+        Returns:
+            实际监听的端口；未配置端口时返回None
+        """
+        if self.http_port is None or self._server is not None:
+            return self._server.server_address[1] if self._server else None
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.http_addr, self.http_port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True).start()
+        port = self._server.server_address[1]
+        logger.info(f"指标导出服务已启动: http://{self.http_addr}:{port}/metrics")
+        return port
+
+    def stop_http_server(self) -> None:
+        """停止 HTTP 服务"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MetricsExporter":
+        self.start_http_server()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            path = self.write_textfile()
+            if path:
+                logger.info(f"指标已写入: {path}")
+        except OSError as e:
+            logger.error(f"写入指标文件失败: {e}")
+        finally:
+            self.stop_http_server()
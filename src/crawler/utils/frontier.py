@@ -0,0 +1,608 @@
+"""持久化抓取队列（URL frontier）模块
+
+把发现的工作（列表页、帖子详情、图片）写入持久化队列，多个 worker 进程
+（同一台机器或多台机器）从中领取任务：
+
+- 任务类型：list（列表页）、thread（帖子详情）、image（图片/头像）；
+- 优先级：数值越大越先领取，同优先级先入先出；
+- 入队去重：以任务 key（默认 ``site:kind:url``）去重，已入队或已完成的任务不会重复入队；
+  ``refresh=True`` 时已完成/已放弃的任务重新入队（如每次运行重抓列表页）；
+- 租约：领取的任务在 lease_seconds 内对其他 worker 不可见，到期未确认（worker 崩溃、
+  卡死）自动重新可见；
+- 重试：每次领取累计 attempts，失败后按 retry_delay 指数退避重新入队，
+  达到 max_attempts 后标记为 dead，不再领取。
+
+后端：
+
+- SQLiteFrontier（``sqlite:///data/frontier.db``）：单机多进程共享（WAL，领取在
+  ``BEGIN IMMEDIATE`` 事务中完成，同一任务只会被一个 worker 领取），也是离线测试的本地替身；
+- RedisFrontier（``redis://host:6379/0``）：多机共享，入队/领取/确认由 Lua 脚本原子完成，
+  时间取 Redis 服务器时间，不受 worker 机器时钟偏差影响。
+
+``open_frontier(url)`` 按 URL 创建后端，未指定时取 settings.frontier。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..config.settings import get_settings
+
+# 任务类型
+TASK_LIST = "list"
+TASK_THREAD = "thread"
+TASK_IMAGE = "image"
+TASK_KINDS = (TASK_LIST, TASK_THREAD, TASK_IMAGE)
+
+# 任务状态
+STATE_PENDING = "pending"
+STATE_LEASED = "leased"
+STATE_DONE = "done"
+STATE_DEAD = "dead"
+STATES = (STATE_PENDING, STATE_LEASED, STATE_DONE, STATE_DEAD)
+
+
+@dataclass
+class Task:
+    """队列中的一个任务"""
+
+    site: str
+    kind: str
+    url: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0
+    key: Optional[str] = None  # 去重键，默认 site:kind:url
+    attempts: int = 0  # 已领取次数（含本次）
+    lease_token: Optional[str] = None  # 领取时分配，确认/失败时校验
+
+    def __post_init__(self):
+        if self.kind not in TASK_KINDS:
+            raise ValueError(f"未知任务类型: {self.kind}")
+        if not self.key:
+            self.key = f"{self.site}:{self.kind}:{self.url}"
+
+
+class Frontier(ABC):
+    """抓取队列的抽象基类"""
+
+    def __init__(self, lease_seconds: float = 300.0, max_attempts: int = 3, retry_delay: float = 30.0):
+        """
+        初始化队列
+
+        Args:
+            lease_seconds: 租约时长（秒），到期未确认的任务重新可见
+            max_attempts: 最多领取次数，达到后失败/租约到期的任务标记为 dead
+            retry_delay: 失败重试的基准延迟（秒），第 n 次失败后延迟 retry_delay * 2^(n-1)
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+
+    def push(self, task: Task, refresh: bool = False) -> bool:
+        """
+        入队单个任务
+
+        Returns:
+            是否新入队（重复任务返回False）
+        """
+        return self.push_many([task], refresh=refresh) == 1
+
+    @abstractmethod
+    def push_many(self, tasks: Iterable[Task], refresh: bool = False) -> int:
+        """
+        批量入队（按 key 去重）
+
+        Args:
+            tasks: 任务
+            refresh: 为True时已完成/已放弃的同 key 任务重新入队（attempts 清零）
+
+        Returns:
+            新入队的任务数
+        """
+
+    @abstractmethod
+    def lease(
+        self,
+        worker: str,
+        limit: int = 1,
+        kinds: Optional[Sequence[str]] = None,
+        sites: Optional[Sequence[str]] = None,
+    ) -> List[Task]:
+        """
+        领取可执行的任务（优先级高者优先，同优先级先入先出）
+
+        Args:
+            worker: worker 标识（记录领取者，便于排查）
+            limit: 最多领取的任务数
+            kinds: 只领取这些类型的任务，默认全部
+            sites: 只领取这些站点的任务，默认全部
+
+        Returns:
+            领取到的任务（带 lease_token），没有可执行任务时为空列表
+        """
+
+    @abstractmethod
+    def ack(self, task: Task) -> bool:
+        """
+        确认任务完成
+
+        Returns:
+            是否确认成功（租约已过期并被他人领取时返回False）
+        """
+
+    @abstractmethod
+    def fail(self, task: Task, error: str, retry: bool = True) -> Optional[str]:
+        """
+        报告任务失败
+
+        Args:
+            task: 领取到的任务
+            error: 错误信息
+            retry: 是否允许重试；为False或已达 max_attempts 时标记为 dead
+
+        Returns:
+            任务的新状态（pending/dead），租约已失效时返回None
+        """
+
+    @abstractmethod
+    def extend(self, task: Task, seconds: Optional[float] = None) -> bool:
+        """
+        延长租约（长任务心跳）
+
+        Returns:
+            是否延长成功
+        """
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """各状态的任务数"""
+
+    def outstanding(self) -> int:
+        """尚未结束的任务数（等待中 + 已领取）"""
+        counts = self.counts()
+        return counts[STATE_PENDING] + counts[STATE_LEASED]
+
+    def close(self) -> None:
+        """释放连接"""
+
+    def _backoff(self, attempts: int) -> float:
+        return self.retry_delay * (2 ** max(0, attempts - 1))
+
+    def __enter__(self) -> "Frontier":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_token TEXT,
+    leased_by TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frontier_ready ON frontier (state, priority DESC, available_at);
+"""
+
+
+class SQLiteFrontier(Frontier):
+    """SQLite 队列：单机多进程/多线程共享同一个数据库文件
+
+    available_at 对等待中的任务表示最早可领取时间，对已领取的任务表示租约到期时间。
+    不要把数据库文件放在网络文件系统上；多机部署请用 RedisFrontier。
+    """
+
+    def __init__(self, path: str, **kwargs):
+        """
+        初始化 SQLite 队列
+
+        Args:
+            path: 数据库文件路径（不存在时创建）
+            **kwargs: lease_seconds/max_attempts/retry_delay
+        """
+        super().__init__(**kwargs)
+        if path == ":memory:":
+            raise ValueError("SQLiteFrontier 需要数据库文件路径（各线程/进程各自连接同一文件）")
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._conn().executescript(SQLITE_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """当前线程的连接（sqlite3 连接不跨线程共享）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """写事务：BEGIN IMMEDIATE 立即取得写锁，多个 worker 的领取互斥"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def push_many(self, tasks: Iterable[Task], refresh: bool = False) -> int:
+        now = time.time()
+        rows = [
+            (t.key, t.site, t.kind, t.url, json.dumps(t.payload, ensure_ascii=False), t.priority, now, now, now)
+            for t in tasks
+        ]
+        if not rows:
+            return 0
+        on_conflict = "DO NOTHING"
+        if refresh:
+            on_conflict = (
+                "DO UPDATE SET state='pending', attempts=0, available_at=excluded.available_at, "
+                "payload=excluded.payload, priority=excluded.priority, lease_token=NULL, leased_by=NULL, "
+                "last_error=NULL, updated_at=excluded.updated_at "
+                "WHERE frontier.state IN ('done', 'dead')"
+            )
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO frontier (key, site, kind, url, payload, priority, available_at, created_at, updated_at) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) {on_conflict}",
+                rows,
+            )
+            return conn.total_changes - before
+
+    def lease(
+        self,
+        worker: str,
+        limit: int = 1,
+        kinds: Optional[Sequence[str]] = None,
+        sites: Optional[Sequence[str]] = None,
+    ) -> List[Task]:
+        now = time.time()
+        where = "state = 'pending' AND available_at <= ?"
+        params: List[Any] = [now]
+        for column, values in (("kind", kinds), ("site", sites)):
+            if values:
+                where += f" AND {column} IN ({', '.join('?' * len(values))})"
+                params.extend(values)
+        token = uuid.uuid4().hex
+        deadline = now + self.lease_seconds
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+            rows = conn.execute(
+                "SELECT key, site, kind, url, payload, priority, attempts FROM frontier "
+                f"WHERE {where} ORDER BY priority DESC, available_at, rowid LIMIT ?",
+                params + [limit],
+            ).fetchall()
+            conn.executemany(
+                "UPDATE frontier SET state='leased', attempts=attempts+1, lease_token=?, leased_by=?, "
+                "available_at=?, updated_at=? WHERE key=?",
+                [(token, worker, deadline, now, row[0]) for row in rows],
+            )
+        return [
+            Task(
+                site=site, kind=kind, url=url, payload=json.loads(payload), priority=priority,
+                key=key, attempts=attempts + 1, lease_token=token,
+            )
+            for key, site, kind, url, payload, priority, attempts in rows
+        ]
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float) -> None:
+        """租约到期的任务重新可见；已达最大领取次数的标记为 dead"""
+        conn.execute(
+            "UPDATE frontier SET state = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END, "
+            "lease_token=NULL, last_error='lease expired', updated_at=? "
+            "WHERE state='leased' AND available_at <= ?",
+            (self.max_attempts, now, now),
+        )
+
+    def ack(self, task: Task) -> bool:
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE frontier SET state='done', lease_token=NULL, last_error=NULL, updated_at=? "
+                "WHERE key=? AND state='leased' AND lease_token=?",
+                (time.time(), task.key, task.lease_token),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, task: Task, error: str, retry: bool = True) -> Optional[str]:
+        now = time.time()
+        dead = not retry or task.attempts >= self.max_attempts
+        state = STATE_DEAD if dead else STATE_PENDING
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE frontier SET state=?, available_at=?, lease_token=NULL, last_error=?, updated_at=? "
+                "WHERE key=? AND state='leased' AND lease_token=?",
+                (state, now + (0 if dead else self._backoff(task.attempts)), error[:1000], now,
+                 task.key, task.lease_token),
+            )
+            return state if cur.rowcount == 1 else None
+
+    def extend(self, task: Task, seconds: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE frontier SET available_at=?, updated_at=? WHERE key=? AND state='leased' AND lease_token=?",
+                (now + (seconds or self.lease_seconds), now, task.key, task.lease_token),
+            )
+            return cur.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATES, 0)
+        for state, count in self._conn().execute("SELECT state, COUNT(*) FROM frontier GROUP BY state"):
+            counts[state] = count
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+# ---- Redis 后端 ----
+# 键布局（prefix 默认 frontier）：
+#   {p}:t:<key>           任务哈希（site/kind/url/payload/priority/attempts/state/token/error/queue）
+#   {p}:q:<site>:<kind>   等待队列（ZSET，score = 入队时间 - priority * 1e12，越小越先领取）
+#   {p}:queues            已出现过的 <site>:<kind> 集合
+#   {p}:delayed           退避中的任务（ZSET，score = 可领取时间）
+#   {p}:leased            已领取的任务（ZSET，score = 租约到期时间）
+#   {p}:done / {p}:dead   已完成/已放弃的任务 key 集合
+
+_REDIS_NOW = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+"""
+
+_REDIS_PUSH = _REDIS_NOW + """
+local p, key, site, kind = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local h = p .. ':t:' .. key
+local state = redis.call('HGET', h, 'state')
+if state then
+  if ARGV[8] ~= '1' or (state ~= 'done' and state ~= 'dead') then return 0 end
+  redis.call('SREM', p .. ':done', key)
+  redis.call('SREM', p .. ':dead', key)
+end
+local q = p .. ':q:' .. site .. ':' .. kind
+redis.call('HSET', h, 'site', site, 'kind', kind, 'url', ARGV[5], 'payload', ARGV[6], 'priority', ARGV[7],
+  'attempts', 0, 'state', 'pending', 'token', '', 'error', '', 'queue', q)
+redis.call('SADD', p .. ':queues', site .. ':' .. kind)
+redis.call('ZADD', q, now - tonumber(ARGV[7]) * 1e12, key)
+return 1
+"""
+
+_REDIS_LEASE = _REDIS_NOW + """
+local p, token, worker = ARGV[1], ARGV[2], ARGV[3]
+local lease_seconds, limit, max_attempts = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local function requeue(key)
+  local h = p .. ':t:' .. key
+  redis.call('ZADD', redis.call('HGET', h, 'queue'), now - tonumber(redis.call('HGET', h, 'priority')) * 1e12, key)
+end
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', p .. ':leased', '-inf', now)) do
+  redis.call('ZREM', p .. ':leased', key)
+  local h = p .. ':t:' .. key
+  if tonumber(redis.call('HGET', h, 'attempts')) >= max_attempts then
+    redis.call('HSET', h, 'state', 'dead', 'token', '', 'error', 'lease expired')
+    redis.call('SADD', p .. ':dead', key)
+  else
+    redis.call('HSET', h, 'state', 'pending', 'token', '', 'error', 'lease expired')
+    requeue(key)
+  end
+end
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', p .. ':delayed', '-inf', now)) do
+  redis.call('ZREM', p .. ':delayed', key)
+  requeue(key)
+end
+local leased = {}
+while #leased < limit do
+  local best_q, best_key, best_score = nil, nil, nil
+  for i = 7, #ARGV do
+    local head = redis.call('ZRANGE', ARGV[i], 0, 0, 'WITHSCORES')
+    if head[1] and (best_score == nil or tonumber(head[2]) < best_score) then
+      best_q, best_key, best_score = ARGV[i], head[1], tonumber(head[2])
+    end
+  end
+  if not best_key then break end
+  redis.call('ZREM', best_q, best_key)
+  local h = p .. ':t:' .. best_key
+  redis.call('HINCRBY', h, 'attempts', 1)
+  redis.call('HSET', h, 'state', 'leased', 'token', token, 'worker', worker)
+  redis.call('ZADD', p .. ':leased', now + lease_seconds, best_key)
+  leased[#leased + 1] = best_key
+end
+return leased
+"""
+
+_REDIS_ACK = """
+local p, key, token = ARGV[1], ARGV[2], ARGV[3]
+local h = p .. ':t:' .. key
+if redis.call('HGET', h, 'state') ~= 'leased' or redis.call('HGET', h, 'token') ~= token then return 0 end
+redis.call('ZREM', p .. ':leased', key)
+redis.call('HSET', h, 'state', 'done', 'token', '', 'error', '')
+redis.call('SADD', p .. ':done', key)
+return 1
+"""
+
+_REDIS_FAIL = _REDIS_NOW + """
+local p, key, token, err = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local h = p .. ':t:' .. key
+if redis.call('HGET', h, 'state') ~= 'leased' or redis.call('HGET', h, 'token') ~= token then return false end
+redis.call('ZREM', p .. ':leased', key)
+if ARGV[5] == '1' then
+  redis.call('HSET', h, 'state', 'dead', 'token', '', 'error', err)
+  redis.call('SADD', p .. ':dead', key)
+  return 'dead'
+end
+redis.call('HSET', h, 'state', 'pending', 'token', '', 'error', err)
+redis.call('ZADD', p .. ':delayed', now + tonumber(ARGV[6]), key)
+return 'pending'
+"""
+
+_REDIS_EXTEND = _REDIS_NOW + """
+local p, key, token = ARGV[1], ARGV[2], ARGV[3]
+local h = p .. ':t:' .. key
+if redis.call('HGET', h, 'state') ~= 'leased' or redis.call('HGET', h, 'token') ~= token then return 0 end
+redis.call('ZADD', p .. ':leased', now + tonumber(ARGV[4]), key)
+return 1
+"""
+
+
+class RedisFrontier(Frontier):
+    """Redis 队列：多机 worker 共享（需要 redis 包与 Redis 服务）
+
+    所有脚本在单个 Redis 实例上执行（不支持 Redis Cluster 的跨槽键）。
+    """
+
+    def __init__(self, url: str, prefix: str = "frontier", client: Any = None, **kwargs):
+        """
+        初始化 Redis 队列
+
+        Args:
+            url: Redis 连接 URL，如 redis://127.0.0.1:6379/0
+            prefix: 键前缀（同一 Redis 上区分多个队列）
+            client: 已有的 redis.Redis 客户端（提供时忽略 url）
+            **kwargs: lease_seconds/max_attempts/retry_delay
+        """
+        super().__init__(**kwargs)
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.client = client
+        self.prefix = prefix
+        self._push = client.register_script(_REDIS_PUSH)
+        self._lease = client.register_script(_REDIS_LEASE)
+        self._ack = client.register_script(_REDIS_ACK)
+        self._fail = client.register_script(_REDIS_FAIL)
+        self._extend = client.register_script(_REDIS_EXTEND)
+
+    def push_many(self, tasks: Iterable[Task], refresh: bool = False) -> int:
+        pipe = self.client.pipeline(transaction=False)
+        for t in tasks:
+            self._push(
+                args=[self.prefix, t.key, t.site, t.kind, t.url, json.dumps(t.payload, ensure_ascii=False),
+                      t.priority, "1" if refresh else "0"],
+                client=pipe,
+            )
+        return sum(int(r) for r in pipe.execute())
+
+    def lease(
+        self,
+        worker: str,
+        limit: int = 1,
+        kinds: Optional[Sequence[str]] = None,
+        sites: Optional[Sequence[str]] = None,
+    ) -> List[Task]:
+        queues = []
+        for name in sorted(self.client.smembers(f"{self.prefix}:queues")):
+            site, _, kind = name.rpartition(":")
+            if (not kinds or kind in kinds) and (not sites or site in sites):
+                queues.append(f"{self.prefix}:q:{name}")
+        token = uuid.uuid4().hex
+        keys = self._lease(
+            args=[self.prefix, token, worker, self.lease_seconds, limit, self.max_attempts, *queues]
+        )
+        if not keys:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(f"{self.prefix}:t:{key}")
+        return [
+            Task(
+                site=h["site"], kind=h["kind"], url=h["url"], payload=json.loads(h["payload"]),
+                priority=int(h["priority"]), key=key, attempts=int(h["attempts"]), lease_token=token,
+            )
+            for key, h in zip(keys, pipe.execute())
+        ]
+
+    def ack(self, task: Task) -> bool:
+        return bool(self._ack(args=[self.prefix, task.key, task.lease_token]))
+
+    def fail(self, task: Task, error: str, retry: bool = True) -> Optional[str]:
+        dead = not retry or task.attempts >= self.max_attempts
+        state = self._fail(
+            args=[self.prefix, task.key, task.lease_token, error[:1000], "1" if dead else "0",
+                  self._backoff(task.attempts)]
+        )
+        return state or None
+
+    def extend(self, task: Task, seconds: Optional[float] = None) -> bool:
+        return bool(self._extend(args=[self.prefix, task.key, task.lease_token, seconds or self.lease_seconds]))
+
+    def counts(self) -> Dict[str, int]:
+        p = self.prefix
+        pipe = self.client.pipeline(transaction=False)
+        queues = self.client.smembers(f"{p}:queues")
+        for name in queues:
+            pipe.zcard(f"{p}:q:{name}")
+        pipe.zcard(f"{p}:delayed")
+        pipe.zcard(f"{p}:leased")
+        pipe.scard(f"{p}:done")
+        pipe.scard(f"{p}:dead")
+        *pending, delayed, leased, done, dead = pipe.execute()
+        return {
+            STATE_PENDING: sum(pending) + delayed,
+            STATE_LEASED: leased,
+            STATE_DONE: done,
+            STATE_DEAD: dead,
+        }
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def open_frontier(url: Optional[str] = None, **kwargs) -> Frontier:
+    """
+    按 URL 创建队列
+
+    Args:
+        url: sqlite:///相对路径、sqlite:////绝对路径 或 redis://host:port/db；
+            默认取 settings.frontier.url
+        **kwargs: 覆盖 settings.frontier 中的 lease_seconds/max_attempts/retry_delay
+
+    Returns:
+        Frontier 实例
+
+    Raises:
+        ValueError: 不支持的 URL
+    """
+    config = get_settings().frontier
+    url = url or config.url
+    options = dict(
+        lease_seconds=config.lease_seconds,
+        max_attempts=config.max_attempts,
+        retry_delay=config.retry_delay,
+    )
+    options.update(kwargs)
+    if url.startswith("sqlite:///"):
+        return SQLiteFrontier(url[len("sqlite:///"):], **options)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisFrontier(url, **options)
+    raise ValueError(f"不支持的 frontier URL: {url}（支持 sqlite:///path 与 redis://host:port/db）")
@@ -1,11 +1,14 @@
 """HTTP工具模块"""
 
 import hashlib
+import logging
 import time
 from datetime import datetime
 from typing import Any, Callable, Optional
 from functools import wraps
 
+from .metrics import get_metrics
+
 
 def generate_hash(text: str) -> str:
     """
@@ -36,24 +39,37 @@ def format_datetime(dt: Optional[datetime] = None, format_str: str = "%Y-%m-%d %
     return dt.strftime(format_str)
 
 
-def measure_time(func: Callable) -> Callable:
+def measure_time(func: Callable = None, *, stage: Optional[str] = None) -> Callable:
     """
     测量函数执行时间的装饰器
+
+    耗时计入全局阶段指标（阶段名默认为函数限定名），并以 DEBUG 级别记录日志。
+    可直接使用 ``@measure_time``，也可指定阶段 ``@measure_time(stage=Stage.DB_INSERT)``。
     
     Args:
         func: 要测量的函数
+        stage: 阶段名称
         
     Returns:
         装饰后的函数
     """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        print(f"{func.__name__} 执行时间: {end_time - start_time:.2f}秒")
-        return result
-    return wrapper
+    def decorator(fn: Callable) -> Callable:
+        name = stage or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                get_metrics().observe(name, elapsed)
+                logging.getLogger(fn.__module__).debug(f"{fn.__name__} 执行时间: {elapsed:.2f}秒")
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 
 def retry(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
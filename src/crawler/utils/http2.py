@@ -0,0 +1,280 @@
+"""HTTP/2 传输模块（可选）
+
+基于 httpx（需安装 ``httpx[http2]``）提供与 requests.Session 接口兼容的会话，
+同一主机的多个请求在一条连接上多路复用。以下情况自动回退到 HTTP/1.1（requests）：
+
+- 未安装 httpx/h2；
+- 服务端 ALPN 未协商 h2（由 httpx 自动降级为 HTTP/1.1）；
+- 与某主机的 HTTP/2 交互出现协议错误（此后该主机固定走 HTTP/1.1）；
+- 请求要求关闭证书校验等 httpx 客户端级别才支持的选项。
+
+httpx 的网络异常会被转换为对应的 requests 异常，重试、熔断、限速逻辑保持不变。
+
+httpcore 的同步 HTTP/2 实现在多线程共享连接时存在流ID分配竞争，
+因此这里在后台事件循环中运行 httpx.AsyncClient（Http2Transport），各线程的请求提交到该循环执行，
+既保证线程安全，又能在同一连接上并发多路复用。HttpClientRegistry 持有唯一的 Http2Transport，
+爬虫与图片下载器的会话共用它，同一主机的帖子页与附件走同一条 HTTP/2 连接；
+Cookie 仍由各会话的回退 Session 持有，按请求携带并写回。
+"""
+
+import asyncio
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+from requests.cookies import get_cookie_header
+
+# HTTP/2 禁止携带的逐跳请求头
+_HOP_BY_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade",
+})
+
+
+def http2_available() -> bool:
+    """检查 httpx 与 h2 是否可用"""
+    try:
+        import httpx  # noqa: F401
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class Http2Response:
+    """将 httpx.Response 适配为 requests.Response 风格的接口"""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.reason = response.reason_phrase
+        self.http_version = response.http_version
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    @property
+    def text(self) -> str:
+        return self._response.text
+
+    @property
+    def encoding(self) -> Optional[str]:
+        return self._response.encoding
+
+    def json(self, **kwargs) -> Any:
+        return self._response.json(**kwargs)
+
+    def iter_content(self, chunk_size: int = 65536):
+        """按块迭代响应体"""
+        content = self._response.content
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP错误: {self.status_code} {self.reason}", response=self)
+
+    def close(self) -> None:
+        # 非流式请求的响应体已完整读取，连接已归还连接池
+        pass
+
+
+class _RejectCookiePolicy(DefaultCookiePolicy):
+    """共享客户端不保存也不发送 Cookie（Cookie 由各会话自己携带）"""
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+    def return_ok(self, cookie, request) -> bool:
+        return False
+
+
+class Http2Transport:
+    """共享的 HTTP/2 传输：一个后台事件循环与其上的一个 httpx.AsyncClient（需 httpx[http2]）"""
+
+    def __init__(self, max_connections: int = 10, timeout: float = 30.0, http1: bool = True):
+        """
+        初始化传输并启动事件循环线程
+
+        Args:
+            max_connections: httpx 连接池上限
+            timeout: 默认超时时间（秒）
+            http1: 是否允许 ALPN 协商为 HTTP/1.1；为False时对 http:// 使用 h2c 先验知识模式
+        """
+        import httpx
+
+        self.timeout = timeout
+        self.closed = False
+        self._h1_hosts: Set[str] = set()
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="http2-loop", daemon=True)
+        self._thread.start()
+        self.client = httpx.AsyncClient(
+            http1=http1,
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            cookies=CookieJar(policy=_RejectCookiePolicy()),
+        )
+
+    def pinned_to_http1(self, host: str) -> bool:
+        """该主机是否已固定走 HTTP/1.1"""
+        with self._lock:
+            return host in self._h1_hosts
+
+    def pin_http1(self, host: str) -> None:
+        """HTTP/2 交互异常后，该主机后续固定走 HTTP/1.1（对所有会话生效）"""
+        with self._lock:
+            self._h1_hosts.add(host)
+
+    def run(self, coro) -> Any:
+        """在事件循环中执行协程并等待结果"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        """关闭客户端，停止并关闭事件循环（重复调用无副作用）"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        try:
+            self.run(self.client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+class Http2Session:
+    """requests.Session 兼容的 HTTP/2 会话，失败时自动回退到 HTTP/1.1"""
+
+    def __init__(
+        self,
+        fallback: requests.Session,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        http1: bool = True,
+        transport: Optional[Http2Transport] = None,
+    ):
+        """
+        初始化会话
+
+        Args:
+            fallback: 回退用的 HTTP/1.1 会话（请求头、代理、Cookie 与其共享）
+            max_connections: 未提供 transport 时自建传输的 httpx 连接池上限
+            timeout: 默认超时时间（秒）
+            http1: 未提供 transport 时自建传输是否允许 ALPN 协商为 HTTP/1.1
+            transport: 共享的 HTTP/2 传输（由 HttpClientRegistry 持有并关闭）；
+                未提供且 httpx[http2] 可用时自建一个，随会话关闭
+        """
+        self.fallback = fallback
+        self.timeout = timeout
+        self._owns_transport = transport is None and http2_available()
+        if self._owns_transport:
+            transport = Http2Transport(max_connections=max_connections, timeout=timeout, http1=http1)
+        self.transport = transport
+
+    # 请求头、代理与 Cookie 直接代理到回退会话，对 session.headers/proxies 的修改对两者都生效
+    @property
+    def headers(self):
+        return self.fallback.headers
+
+    @headers.setter
+    def headers(self, value) -> None:
+        self.fallback.headers = value
+
+    @property
+    def proxies(self):
+        return self.fallback.proxies
+
+    @proxies.setter
+    def proxies(self, value) -> None:
+        self.fallback.proxies = value
+
+    @property
+    def cookies(self):
+        return self.fallback.cookies
+
+    @property
+    def enabled(self) -> bool:
+        """HTTP/2 是否可用"""
+        return self.transport is not None and not self.transport.closed
+
+    def _use_fallback(self, host: str, **kwargs) -> bool:
+        if not self.enabled or self.transport.pinned_to_http1(host):
+            return True
+        # stream=True 的请求同样走 HTTP/2，响应体会被完整缓冲
+        if kwargs.get("verify", True) is not True or kwargs.get("files"):
+            return True
+        return bool(self.proxies)
+
+    def _merge_headers(self, method: str, url: str, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        merged = dict(self.headers)
+        if headers:
+            merged.update(headers)
+        merged = {k: v for k, v in merged.items() if v is not None and k.lower() not in _HOP_BY_HOP_HEADERS}
+        # 共享客户端不带 Cookie，按回退会话的 CookieJar 为本次请求生成 Cookie 头
+        if not any(k.lower() == "cookie" for k in merged):
+            cookie = get_cookie_header(self.cookies, requests.Request(method, url).prepare())
+            if cookie:
+                merged["Cookie"] = cookie
+        return merged
+
+    def _store_cookies(self, response: Any) -> None:
+        """将响应（含重定向过程）设置的 Cookie 写回回退会话"""
+        for r in list(response.history) + [response]:
+            for cookie in r.cookies.jar:
+                self.cookies.set_cookie(cookie)
+
+    def request(self, method: str, url: str, **kwargs) -> Any:
+        """
+        发送请求（参数与 requests.Session.request 一致）
+
+        Returns:
+            Http2Response 或回退时的 requests.Response
+        """
+        host = urlparse(url).netloc.lower()
+        if self._use_fallback(host, **kwargs):
+            return self.fallback.request(method, url, **kwargs)
+
+        import httpx
+        coro = self.transport.client.request(
+            method,
+            url,
+            params=kwargs.get("params"),
+            data=kwargs.get("data"),
+            json=kwargs.get("json"),
+            headers=self._merge_headers(method, url, kwargs.get("headers")),
+            timeout=kwargs.get("timeout") or self.timeout,
+            follow_redirects=kwargs.get("allow_redirects", True),
+        )
+        try:
+            response = self.transport.run(coro)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except (httpx.RemoteProtocolError, httpx.LocalProtocolError, httpx.UnsupportedProtocol):
+            # HTTP/2 交互异常：该主机后续固定走 HTTP/1.1
+            self.transport.pin_http1(host)
+            return self.fallback.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+        self._store_cookies(response)
+        return Http2Response(response)
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> Any:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        """关闭回退会话；自建的 HTTP/2 传输随之关闭，共享传输由注册表关闭"""
+        if self._owns_transport:
+            self.transport.close()
+        self.fallback.close()
@@ -0,0 +1,276 @@
+"""HTTP客户端注册表模块
+
+集中构建调优后的 HTTPAdapter（连接池大小由 max_concurrent 推导、按主机缓存连接池），
+并让爬虫、图片下载器、翻译器共享同一组连接池：keep-alive 连接与其上的 TLS 会话
+在组件之间复用；共享连接池建立连接时经 DNS 缓存解析，避免对同一主机重复解析
+（不替换 socket.getaddrinfo，数据库、Redis 等其他库的解析不受影响）。
+各组件仍持有各自的 Session（请求头、Cookie 相互独立）；启用 HTTP/2 时各会话共用
+注册表持有的同一个 Http2Transport（一个事件循环与一个 httpx.AsyncClient）。
+"""
+
+import atexit
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from ..config.settings import get_settings
+from .http2 import Http2Session, Http2Transport, http2_available
+
+
+class DnsCache:
+    """带 TTL 与条目上限的 DNS 缓存（只供共享连接池建立连接时使用，不替换 socket.getaddrinfo）"""
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        """
+        初始化DNS缓存
+
+        Args:
+            ttl: 解析结果的缓存时间（秒）
+            max_entries: 最多缓存的条目数，超出时先清理过期条目，仍超出则淘汰最早写入的条目
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._cache: Dict[Tuple, Tuple[float, List]] = {}
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """带缓存的 getaddrinfo（未命中时调用调用时刻的 socket.getaddrinfo）"""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        result = socket.getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self.misses += 1
+            self._cache.pop(key, None)
+            if len(self._cache) >= self.max_entries:
+                self._evict(now)
+            self._cache[key] = (now + self.ttl, result)
+        return result
+
+    def _evict(self, now: float) -> None:
+        """清理过期条目；仍达到上限时按写入顺序淘汰（调用方持有锁）"""
+        for key in [key for key, (expires, _) in self._cache.items() if expires <= now]:
+            del self._cache[key]
+        while len(self._cache) >= self.max_entries:
+            del self._cache[next(iter(self._cache))]
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """
+        解析主机的 IP 地址（去重，保持解析顺序）
+
+        Raises:
+            socket.gaierror: 解析失败
+        """
+        infos = self.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+
+class _CachedDnsConnectionMixin:
+    """建立连接时通过 DnsCache 解析主机名，依次尝试各个地址
+
+    只替换 TCP 连接的目标地址（_dns_host），TLS 的 SNI 与证书校验仍使用原主机名。
+    """
+
+    dns_cache: Optional[DnsCache] = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        if self.dns_cache is None or _is_ip_address(host):
+            return super()._new_conn()
+        try:
+            addresses = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror:
+            # 解析失败交给 urllib3 重新解析并转换为对应异常
+            return super()._new_conn()
+        error: Optional[Exception] = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        if error is None:
+            return super()._new_conn()
+        raise error
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """可在多个 Session 间共享的 HTTPAdapter
+
+    Session.close() 会关闭其挂载的所有 adapter，共享连接池不能因此被清空，
+    所以 close() 为空操作，由注册表调用 shutdown() 统一释放。
+    提供 dns_cache 时，直连（不经代理）的连接池通过它解析主机名。
+    """
+
+    def __init__(self, *args, dns_cache: Optional[DnsCache] = None, **kwargs):
+        self.dns_cache = dns_cache
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        if self.dns_cache is None:
+            return
+        attrs = {"dns_cache": self.dns_cache}
+        http_conn = type("CachedDnsHTTPConnection", (_CachedDnsConnectionMixin, HTTPConnection), attrs)
+        https_conn = type("CachedDnsHTTPSConnection", (_CachedDnsConnectionMixin, HTTPSConnection), attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("CachedDnsHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+            "https": type("CachedDnsHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+        }
+
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        """真正关闭连接池"""
+        super().close()
+
+
+class HttpClientRegistry:
+    """共享HTTP客户端注册表"""
+
+    def __init__(
+        self,
+        pool_connections: int = 32,
+        pool_maxsize: int = 10,
+        dns_cache_ttl: float = 300.0,
+        http2: bool = False,
+    ):
+        """
+        初始化注册表
+
+        Args:
+            pool_connections: 缓存的主机连接池数量（每个主机一个连接池）
+            pool_maxsize: 每个主机连接池保留的最大连接数
+            dns_cache_ttl: DNS缓存时间（秒），小于等于0表示不缓存
+            http2: 默认是否创建 HTTP/2 会话（不可用时自动回退 HTTP/1.1）
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.http2 = http2
+        self.dns_cache: Optional[DnsCache] = None
+        if dns_cache_ttl and dns_cache_ttl > 0:
+            self.dns_cache = DnsCache(dns_cache_ttl)
+        self.adapter = SharedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,  # 重试由 RetryPolicy 统一负责
+            dns_cache=self.dns_cache,
+        )
+        self._http2_transport: Optional[Http2Transport] = None
+        self._lock = threading.Lock()
+
+    def create_session(self, headers: Optional[Dict[str, str]] = None, http2: Optional[bool] = None) -> Any:
+        """
+        创建挂载共享连接池的 Session
+
+        Args:
+            headers: 额外的默认请求头
+            http2: 是否包装为 HTTP/2 会话，默认取注册表配置
+
+        Returns:
+            新的 requests.Session；启用 HTTP/2 时为以其为回退的 Http2Session
+        """
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        if headers:
+            session.headers.update(headers)
+        use_http2 = self.http2 if http2 is None else http2
+        if use_http2:
+            return Http2Session(session, transport=self.http2_transport())
+        return session
+
+    def http2_transport(self) -> Optional[Http2Transport]:
+        """
+        获取共享的 HTTP/2 传输（首次调用时创建）
+
+        Returns:
+            Http2Transport；未安装 httpx[http2] 时返回None（会话走 HTTP/1.1）
+        """
+        if not http2_available():
+            return None
+        with self._lock:
+            if self._http2_transport is None or self._http2_transport.closed:
+                self._http2_transport = Http2Transport(max_connections=self.pool_maxsize)
+                # 全局注册表通常不会显式关闭，退出前关闭事件循环（重复关闭无副作用）
+                atexit.register(self._http2_transport.close)
+            return self._http2_transport
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取连接池与DNS缓存状态"""
+        pools = getattr(self.adapter.poolmanager, "pools", None)
+        hosts = [f"{key.key_scheme}://{key.key_host}:{key.key_port}" for key in list(pools.keys())] if pools else []
+        info: Dict[str, Any] = {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "hosts": hosts,
+        }
+        if self.dns_cache:
+            info["dns_cache"] = {"hits": self.dns_cache.hits, "misses": self.dns_cache.misses}
+        return info
+
+    def close(self) -> None:
+        """关闭所有共享连接（含 HTTP/2 传输的事件循环）并清空DNS缓存"""
+        self.adapter.shutdown()
+        with self._lock:
+            transport, self._http2_transport = self._http2_transport, None
+        if transport is not None:
+            transport.close()
+        if self.dns_cache:
+            self.dns_cache.clear()
+
+
+# 全局HTTP客户端注册表
+_registry: Optional[HttpClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClientRegistry:
+    """获取全局共享的HTTP客户端注册表"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            settings = get_settings()
+            cfg = settings.http_client
+            pool_maxsize = cfg.pool_maxsize or max(10, settings.crawler.max_concurrent * 2)
+            _registry = HttpClientRegistry(
+                pool_connections=cfg.pool_connections,
+                pool_maxsize=pool_maxsize,
+                dns_cache_ttl=cfg.dns_cache_ttl,
+                http2=cfg.http2,
+            )
+        return _registry
@@ -1,27 +1,48 @@
 """图片下载工具模块"""
 
 import os
+import threading
+import time
 import requests
 from datetime import datetime
 from typing import List, Optional
 from urllib.parse import urlparse
 from pathlib import Path
 
+from .circuit_breaker import CircuitBreakerRegistry, get_breaker_registry
+from .http_client import get_http_client
+from .metrics import get_metrics
+from .rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+
 
 class ImageDownloader:
     """图片下载器"""
     
-    def __init__(self, base_path: str, logger=None):
+    def __init__(
+        self,
+        base_path: str,
+        logger=None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
         """
         初始化图片下载器
         
         Args:
             base_path: 图片保存的基础路径
             logger: 日志器
+            rate_limiter: 按主机限速器，默认使用全局共享实例
+            breakers: 熔断器注册表，默认使用全局共享实例
         """
         self.base_path = base_path
         self.logger = logger
-        self.session = requests.Session()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.breakers = breakers or get_breaker_registry()
+        self.session = get_http_client().create_session()
+        self.bytes_downloaded = 0  # 累计下载字节数（用于阶段指标）
+        self._bytes_lock = threading.Lock()
+        self._local = threading.local()  # 当前线程的累计下载字节数（并发下载时按线程归属）
+        self.metrics = get_metrics()
         self._setup_session()
     
     def _setup_session(self):
@@ -56,6 +77,35 @@ class ImageDownloader:
             today = datetime.now().strftime("%Y/%m/%d")
             return f"images/boniu/{today}/{filename}"
     
+    def plan_path(self, img_url: str, save_path: str = None) -> str:
+        """
+        计算图片的本地保存路径（不下载）
+
+        Args:
+            img_url: 图片URL
+            save_path: 保存目录，如果为None则使用按日期划分的默认目录
+
+        Returns:
+            本地绝对路径
+        """
+        if not save_path:
+            # 使用默认路径并按日期创建文件夹
+            today = datetime.now().strftime("%Y/%m/%d")
+            save_path = os.path.join(self.base_path, today)
+
+        # 获取图片文件名
+        parsed_url = urlparse(img_url)
+        filename = os.path.basename(parsed_url.path)
+        if not filename or '.' not in filename:
+            # 如果没有文件名或扩展名，生成一个
+            filename = f"image_{datetime.now().strftime('%H%M%S_%f')}.jpg"
+
+        return os.path.join(save_path, filename)
+
+    def relative_path(self, local_path: str) -> str:
+        """本地路径转换为入库使用的相对路径格式（如：images/boniu/2025/9/11/image.jpg）"""
+        return self._get_relative_path(local_path)
+
     def download_image(self, img_url: str, save_path: str = None) -> Optional[str]:
         """
         下载单张图片并保存到本地
@@ -68,22 +118,27 @@ class ImageDownloader:
             相对路径格式的图片路径（如：images/boniu/2025/9/11/image.jpg），如果下载失败返回None
         """
         try:
-            if not save_path:
-                # 使用默认路径并按日期创建文件夹
-                today = datetime.now().strftime("%Y/%m/%d")
-                save_path = os.path.join(self.base_path, today)
-            
+            local_path = self.plan_path(img_url, save_path)
+        except ValueError as e:
+            if self.logger:
+                self.logger.warning(f"图片下载失败 {img_url}: {e}")
+            return None
+        return self.download_to(img_url, local_path)
+
+    def download_to(self, img_url: str, local_path: str) -> Optional[str]:
+        """
+        下载图片到指定的本地文件（已存在时跳过）
+
+        Args:
+            img_url: 图片URL
+            local_path: 本地文件路径（见 plan_path）
+
+        Returns:
+            相对路径格式的图片路径，如果下载失败返回None
+        """
+        try:
             # 确保目录存在
-            os.makedirs(save_path, exist_ok=True)
-            
-            # 获取图片文件名
-            parsed_url = urlparse(img_url)
-            filename = os.path.basename(parsed_url.path)
-            if not filename or '.' not in filename:
-                # 如果没有文件名或扩展名，生成一个
-                filename = f"image_{datetime.now().strftime('%H%M%S_%f')}.jpg"
-            
-            local_path = os.path.join(save_path, filename)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
             # 检查文件是否已存在
             if os.path.exists(local_path):
@@ -96,12 +151,36 @@ class ImageDownloader:
             if self.logger:
                 self.logger.debug(f"下载图片: {img_url} -> {local_path}")
             
-            response = self.session.get(img_url, timeout=30)
+            breaker = self.breakers.for_url(img_url)
+            probe = breaker.before_request()
+            try:
+                self.rate_limiter.acquire(img_url)
+                started = time.monotonic()
+                try:
+                    response = self.session.get(img_url, timeout=30)
+                except requests.RequestException:
+                    self.rate_limiter.record(img_url, None, time.monotonic() - started)
+                    self.metrics.record_request(img_url, None, time.monotonic() - started)
+                    breaker.record_failure()
+                    raise
+                self.rate_limiter.record(img_url, response.status_code, time.monotonic() - started)
+                self.metrics.record_request(img_url, response.status_code, time.monotonic() - started)
+                if response.status_code >= 500 or response.status_code == 429:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            finally:
+                # 限速等待等中途异常时归还半开探测名额
+                breaker.release(probe)
             response.raise_for_status()
             
             # 保存图片
             with open(local_path, 'wb') as f:
                 f.write(response.content)
+            with self._bytes_lock:
+                self.bytes_downloaded += len(response.content)
+            self._local.bytes = self.thread_bytes_downloaded + len(response.content)
+            self.metrics.add_bytes(img_url, len(response.content))
             
             if self.logger:
                 self.logger.debug(f"图片保存成功: {local_path}")
@@ -146,6 +225,11 @@ class ImageDownloader:
         
         return local_images
     
+    @property
+    def thread_bytes_downloaded(self) -> int:
+        """当前线程累计下载的字节数"""
+        return getattr(self._local, "bytes", 0)
+
     def set_base_path(self, base_path: str):
         """设置基础保存路径"""
         self.base_path = base_path
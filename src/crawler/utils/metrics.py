@@ -0,0 +1,296 @@
+"""阶段耗时与指标模块
+
+按阶段（列表抓取、列表解析、详情抓取、详情解析、图片下载、头像下载、翻译、
+入库、礼貌等待等）记录每次操作的耗时与字节数，汇总为带 p50/p95/p99 的直方图，
+用于判断一次慢运行的时间究竟花在了哪里。
+
+另按主机记录每个 HTTP 请求的状态与耗时（固定桶直方图）、下载字节数，
+以及若干瞬时值（如翻译队列深度），供 exporter 模块导出为 Prometheus 指标。
+"""
+
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class Stage:
+    """爬取流水线的阶段名称"""
+    LIST_FETCH = "list_fetch"
+    LIST_PARSE = "list_parse"
+    DETAIL_FETCH = "detail_fetch"
+    DETAIL_PARSE = "detail_parse"
+    REPLY_FETCH = "reply_fetch"
+    REPLY_PARSE = "reply_parse"
+    IMAGE_DOWNLOAD = "image_download"
+    AVATAR_DOWNLOAD = "avatar_download"
+    TRANSLATE = "translate"
+    DB_INSERT = "db_insert"
+    SINK_WRITE = "sink_write"
+    POLITENESS_SLEEP = "politeness_sleep"
+    RETRY_BACKOFF = "retry_backoff"
+
+
+def _nearest_rank(ordered: List[float], p: float) -> float:
+    """最近秩法分位数（ordered 已升序且非空）"""
+    rank = math.ceil(p / 100.0 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class Histogram:
+    """耗时直方图：精确记录计数/总和/最值，分位数基于固定容量的蓄水池采样"""
+
+    def __init__(self, max_samples: int = 10000, rng: Optional[random.Random] = None):
+        """
+        初始化直方图
+
+        Args:
+            max_samples: 参与分位数计算的最大样本数
+            rng: 随机数生成器（便于测试注入）
+        """
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.bytes = 0
+        self._samples: List[float] = []
+        self._rng = rng or random.Random()
+
+    def observe(self, value: float, nbytes: int = 0) -> None:
+        """记录一次观测值"""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.bytes += nbytes
+        if len(self._samples) < self.max_samples:
+            self._samples.append(value)
+        else:
+            index = self._rng.randrange(self.count)
+            if index < self.max_samples:
+                self._samples[index] = value
+
+    def percentile(self, p: float) -> float:
+        """
+        计算分位数（最近秩法）
+
+        Args:
+            p: 百分位（0-100）
+
+        Returns:
+            分位数值；无样本时返回0
+        """
+        if not self._samples:
+            return 0.0
+        return _nearest_rank(sorted(self._samples), p)
+
+    def summary(self) -> Dict[str, Any]:
+        """获取直方图摘要"""
+        if not self.count:
+            return {"count": 0, "total": 0.0, "bytes": 0}
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "total": round(self.total, 4),
+            "mean": round(self.total / self.count, 4),
+            "min": round(self.min, 4),
+            "p50": round(_nearest_rank(ordered, 50), 4),
+            "p95": round(_nearest_rank(ordered, 95), 4),
+            "p99": round(_nearest_rank(ordered, 99), 4),
+            "max": round(self.max, 4),
+            "bytes": self.bytes,
+        }
+
+
+# 请求耗时直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class BucketHistogram:
+    """固定桶的累积直方图（Prometheus histogram 语义）"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """记录一次观测值"""
+        self.count += 1
+        self.total += value
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """返回 (桶上界, 累积计数) 列表，不含 +Inf 桶"""
+        result, running = [], 0
+        for upper, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((upper, running))
+        return result
+
+
+class _Timing:
+    """timer() 产出的计时句柄，可在代码块内补充字节数"""
+
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+class StageMetrics:
+    """按阶段汇总的耗时指标（线程安全）"""
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        初始化指标
+
+        Args:
+            clock: 计时函数（便于测试注入）
+        """
+        self._clock = clock
+        self._histograms: Dict[str, Histogram] = {}
+        self._requests: Dict[Tuple[str, str], int] = {}
+        self._host_latency: Dict[str, BucketHistogram] = {}
+        self._host_bytes: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started = clock()
+
+    def observe(self, stage: str, seconds: float, nbytes: int = 0) -> None:
+        """
+        记录一次阶段耗时
+
+        Args:
+            stage: 阶段名称（见 Stage）
+            seconds: 耗时（秒）
+            nbytes: 本次处理的字节数
+        """
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds, nbytes)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[_Timing]:
+        """
+        计时上下文；代码块内可设置 ``timing.bytes``，异常时同样记录耗时
+
+        Args:
+            stage: 阶段名称
+        """
+        timing = _Timing()
+        started = self._clock()
+        try:
+            yield timing
+        finally:
+            self.observe(stage, self._clock() - started, timing.bytes)
+
+    def record_request(self, url: str, status_code: Optional[int], elapsed: float) -> None:
+        """
+        记录一次 HTTP 请求
+
+        Args:
+            url: 请求URL（按主机聚合）
+            status_code: 状态码；网络错误时为None
+            elapsed: 请求耗时（秒）
+        """
+        host = urlparse(url).netloc.lower() or url
+        status = str(status_code) if status_code is not None else "error"
+        with self._lock:
+            self._requests[(host, status)] = self._requests.get((host, status), 0) + 1
+            histogram = self._host_latency.get(host)
+            if histogram is None:
+                histogram = self._host_latency[host] = BucketHistogram()
+            histogram.observe(elapsed)
+
+    def add_bytes(self, url: str, nbytes: int) -> None:
+        """累加某主机的下载字节数"""
+        host = urlparse(url).netloc.lower() or url
+        with self._lock:
+            self._host_bytes[host] = self._host_bytes.get(host, 0) + nbytes
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """设置瞬时值（如 translation_queue_depth）"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def requests_snapshot(self) -> Dict[str, Any]:
+        """
+        获取按主机聚合的请求指标
+
+        Returns:
+            {"requests": {(主机, 状态): 次数}, "latency": {主机: BucketHistogram 副本},
+             "bytes": {主机: 字节数}, "gauges": {名称: 值}, "elapsed": 运行总秒数}
+        """
+        with self._lock:
+            latency = {}
+            for host, h in self._host_latency.items():
+                copy = BucketHistogram(h.buckets)
+                copy.counts, copy.count, copy.total = list(h.counts), h.count, h.total
+                latency[host] = copy
+            return {
+                "requests": dict(self._requests),
+                "latency": latency,
+                "bytes": dict(self._host_bytes),
+                "gauges": dict(self._gauges),
+                "elapsed": self._clock() - self._started,
+            }
+
+    def histogram(self, stage: str) -> Optional[Histogram]:
+        """获取指定阶段的直方图"""
+        with self._lock:
+            return self._histograms.get(stage)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        获取所有阶段的摘要
+
+        Returns:
+            {"elapsed": 运行总秒数, "stages": {阶段: 直方图摘要}}
+        """
+        with self._lock:
+            stages = {name: h.summary() for name, h in self._histograms.items()}
+        return {"elapsed": round(self._clock() - self._started, 4), "stages": stages}
+
+    def format_summary(self) -> List[str]:
+        """按总耗时降序格式化为日志行"""
+        rows = sorted(self.summary()["stages"].items(), key=lambda item: item[1]["total"], reverse=True)
+        return [
+            f"{name}: 次数={s['count']} 总计={s['total']:.2f}s p50={s['p50']:.3f}s "
+            f"p95={s['p95']:.3f}s p99={s['p99']:.3f}s 字节={s['bytes']}"
+            for name, s in rows if s["count"]
+        ]
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._host_latency.clear()
+            self._host_bytes.clear()
+            self._gauges.clear()
+            self._started = self._clock()
+
+
+# 全局阶段指标（进程内共享，一次 CLI 运行对应一份）
+_metrics: Optional[StageMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> StageMetrics:
+    """获取全局阶段指标"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = StageMetrics()
+        return _metrics
@@ -0,0 +1,95 @@
+"""HTML 解析进程池模块
+
+BeautifulSoup 解析是 CPU 密集型的，同一进程内的多个抓取线程会被 GIL 串行化。
+配置 ``crawler.parse_workers``（CRAWLER__PARSE_WORKERS）大于 0 时，HTML -> 记录的
+解析交给进程池执行：抓取线程把 HTML 文本发给子进程，取回精简的 dict/tuple，
+多个线程（detail_workers > 1、多站点、frontier worker 的 concurrency）的解析
+即可同时占用多个 CPU 核。
+
+任务函数必须是模块级函数，参数与返回值可 pickle（见 sites/boniu/extract.py）。
+子进程以 spawn 方式启动（抓取进程是多线程的，fork 不安全），首次使用时创建，
+进程内的站点规格等缓存在子进程中各自只初始化一次。
+"""
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from ..config.settings import get_settings
+
+
+class ParsePool:
+    """解析进程池（线程安全）"""
+
+    def __init__(self, workers: int):
+        """
+        初始化进程池
+
+        Args:
+            workers: 子进程数
+        """
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在子进程中执行 func(*args) 并等待结果
+
+        Raises:
+            Exception: func 抛出的异常（在子进程中抛出后原样传回）
+        """
+        return self._get_executor().submit(func, *args).result()
+
+    def map(self, func: Callable[..., Any], *iterables: Iterable[Any], chunksize: int = 1) -> Iterator[Any]:
+        """
+        在子进程中并行执行 func，按输入顺序返回结果（批量解析时用 chunksize 减少进程间往返）
+
+        Raises:
+            Exception: func 抛出的异常（迭代到对应结果时抛出）
+        """
+        return self._get_executor().map(func, *iterables, chunksize=chunksize)
+
+    def close(self) -> None:
+        """关闭子进程"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# 全局解析进程池
+_parse_pool: Optional[ParsePool] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ParsePool]:
+    """获取全局解析进程池；crawler.parse_workers 为 0 时返回None（在调用线程中解析）"""
+    global _parse_pool
+    workers = get_settings().crawler.parse_workers
+    if workers <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ParsePool(workers)
+            atexit.register(close_parse_pool)
+        return _parse_pool
+
+
+def close_parse_pool() -> None:
+    """关闭并丢弃全局解析进程池（下次 get_parse_pool 时按当前配置重新创建）"""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.close()
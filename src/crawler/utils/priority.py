@@ -0,0 +1,180 @@
+"""详情抓取优先级调度模块
+
+按新鲜度、是否精华、回复数与版块权重为帖子打分，详情抓取按分数从高到低进行；
+配合每次运行的时间/请求预算（CrawlBudget），预算耗尽时停止派发新的详情抓取，
+未抓取的帖子不入库，下次运行会重新发现并按分数排队。
+"""
+
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config.settings import ScheduleConfig
+
+# 列表页时间的常见格式（extract.normalize_datetime 的输出以及原始的日期/分钟精度）
+_TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """解析帖子时间字段（datetime 或字符串），无法识别时返回 None"""
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    text = str(value).strip()
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def score_post(post: Dict[str, Any], config: ScheduleConfig, now: Optional[datetime] = None) -> float:
+    """
+    计算帖子详情抓取的优先级分数（越大越先抓取）
+
+    各项归一到 [0, 1] 后按权重相加，再乘以版块权重：
+    新鲜度按最后回复时间（没有时用发帖时间）以半衰期指数衰减，无法解析时间时记 0；
+    回复数按 log(1+n)/log(1+饱和值) 计，超过饱和值记 1；精华帖记 1。
+
+    Args:
+        post: 列表页解析出的帖子字典（last_reply_time/publish_time/is_essence/reply_count/fid）
+        config: 调度配置
+        now: 当前时间（便于测试注入）
+
+    Returns:
+        非负的优先级分数
+    """
+    freshness = 0.0
+    stamp = _parse_time(post.get('last_reply_time')) or _parse_time(post.get('publish_time'))
+    if stamp is not None and config.freshness_half_life > 0:
+        age_hours = max(0.0, ((now or datetime.now()) - stamp).total_seconds() / 3600)
+        freshness = 0.5 ** (age_hours / config.freshness_half_life)
+
+    replies = 0.0
+    reply_count = int(post.get('reply_count') or 0)
+    if reply_count > 0 and config.reply_saturation > 0:
+        replies = min(1.0, math.log1p(reply_count) / math.log1p(config.reply_saturation))
+
+    essence = 1.0 if post.get('is_essence') else 0.0
+    score = (
+        config.freshness_weight * freshness
+        + config.essence_weight * essence
+        + config.reply_weight * replies
+    )
+    return max(0.0, score * config.fid_weights.get(str(post.get('fid') or ''), 1.0))
+
+
+def priority_bucket(score: float, config: ScheduleConfig, buckets: int = 10) -> int:
+    """
+    将分数映射到 [0, buckets) 的整数档位（供 frontier 的整数优先级使用）
+
+    Args:
+        score: score_post 的结果
+        config: 调度配置（用于计算不含版块权重时的最高分）
+        buckets: 档位数
+
+    Returns:
+        档位，分数越高档位越高
+    """
+    top = max(config.freshness_weight, 0) + max(config.essence_weight, 0) + max(config.reply_weight, 0)
+    if top <= 0:
+        return 0
+    return max(0, min(buckets - 1, int(score / top * buckets)))
+
+
+class DetailQueue:
+    """详情抓取优先队列：分数高者先出，同分按入队顺序"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+
+    def push(self, post: Dict[str, Any], score: float, kind: str) -> None:
+        """
+        入队一个帖子
+
+        Args:
+            post: 帖子字典
+            score: 优先级分数
+            kind: 任务类型（由调用方约定，如新帖/刷新）
+        """
+        heapq.heappush(self._heap, (-score, next(self._seq), kind, post))
+
+    def pop_batch(self, size: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        取出分数最高的至多 size 个帖子
+
+        Returns:
+            [(kind, post), ...]，按分数从高到低
+        """
+        batch = []
+        while self._heap and len(batch) < size:
+            _, _, kind, post = heapq.heappop(self._heap)
+            batch.append((kind, post))
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class CrawlBudget:
+    """单次运行的时间/请求预算（0 表示不限）"""
+
+    def __init__(
+        self,
+        time_budget: float = 0,
+        request_budget: int = 0,
+        requests: Optional[Callable[[], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化预算（从创建时开始计时）
+
+        Args:
+            time_budget: 运行时长上限（秒）
+            request_budget: 页面请求数上限
+            requests: 返回本次运行已发出请求数的函数（设置了请求预算时必填）
+            clock: 单调时钟函数（便于测试注入）
+        """
+        if request_budget > 0 and requests is None:
+            raise ValueError("设置请求预算时需要提供请求计数函数")
+        self.time_budget = time_budget
+        self.request_budget = request_budget
+        self._requests = requests
+        self._clock = clock
+        self._start = clock()
+        self._base = requests() if requests else 0
+
+    @property
+    def limited(self) -> bool:
+        """是否设置了任一预算"""
+        return self.time_budget > 0 or self.request_budget > 0
+
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return self._clock() - self._start
+
+    def used_requests(self) -> int:
+        """已用请求数"""
+        return self._requests() - self._base if self._requests else 0
+
+    def exhausted(self, share: float = 1.0) -> Optional[str]:
+        """
+        检查预算（的前 share 部分）是否耗尽
+
+        Args:
+            share: 按预算的多少比例判断（如翻列表页只允许使用一部分预算，其余留给详情抓取）
+
+        Returns:
+            耗尽的预算名称（"time"/"requests"），未耗尽返回 None
+        """
+        if self.time_budget > 0 and self.elapsed() >= self.time_budget * share:
+            return "time"
+        if self.request_budget > 0 and self.used_requests() >= self.request_budget * share:
+            return "requests"
+        return None
@@ -0,0 +1,205 @@
+"""性能剖析模块
+
+为 CLI 提供内置的剖析模式（``--profile``），两种剖析器：
+
+- sampling（默认）：后台线程按固定间隔采样所有线程的调用栈（墙钟时间，
+  网络等待、限速等待同样可见），输出折叠栈文件（``.collapsed``，可直接交给
+  flamegraph.pl / speedscope 生成火焰图）与热点函数 Top-N 报告；
+- cprofile：确定性剖析（仅主线程，CPU 开销较大），输出 ``.prof``
+  （可用 snakeviz 查看）与 pstats Top-N 报告。
+
+输出文件与按日日志放在一起：``logs/YYYY/MM/DD_<名称>_<时分秒>.*``。
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+PROFILE_MODES = ("sampling", "cprofile")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    name = getattr(code, "co_qualname", code.co_name)
+    # 折叠栈格式以 ';' 分隔帧、以空格分隔计数
+    return f"{module}:{name}".replace(";", ":").replace(" ", "_")
+
+
+class SamplingProfiler:
+    """基于 sys._current_frames() 的采样剖析器"""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        """
+        初始化采样剖析器
+
+        Args:
+            interval: 采样间隔（秒）
+            max_depth: 单个调用栈记录的最大深度
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample_once(self) -> None:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            labels: List[str] = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            thread_name = names.get(thread_id, str(thread_id)).replace(";", ":").replace(" ", "_")
+            labels.append(thread_name)
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample_once()
+
+    def start(self) -> None:
+        """开始采样"""
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止采样"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.started_at is not None:
+            self.elapsed = time.perf_counter() - self.started_at
+
+    def collapsed(self) -> str:
+        """折叠栈文本（每行 ``帧1;帧2;... 次数``）"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def hot_functions(self, top_n: int = 30) -> Dict[str, List]:
+        """
+        统计热点函数
+
+        Returns:
+            {"self": [(函数, 样本数)], "inclusive": [(函数, 样本数)]}；
+            self 为位于栈顶的样本数，inclusive 为出现在栈中的样本数
+        """
+        self_counts: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # 去掉线程名
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+        return {"self": self_counts.most_common(top_n), "inclusive": inclusive.most_common(top_n)}
+
+    def report(self, top_n: int = 30) -> str:
+        """生成 Top-N 热点函数报告"""
+        total = sum(self.stacks.values()) or 1
+        hot = self.hot_functions(top_n)
+        lines = [
+            f"采样剖析报告: 时长 {self.elapsed:.2f}秒, 采样 {self.samples} 次, 间隔 {self.interval * 1000:.1f}ms, "
+            f"线程栈样本 {total} 个",
+            "",
+            f"== 自身耗时 Top {top_n}（位于栈顶的样本占比）==",
+        ]
+        lines.extend(f"{count / total * 100:6.2f}%  {count:8d}  {label}" for label, count in hot["self"])
+        lines.extend(["", f"== 累计耗时 Top {top_n}（出现在调用栈中的样本占比）=="])
+        lines.extend(f"{count / total * 100:6.2f}%  {count:8d}  {label}" for label, count in hot["inclusive"])
+        return "\n".join(lines) + "\n"
+
+
+def default_output_prefix(name: str, logs_root: Optional[str] = None) -> str:
+    """
+    生成与按日日志同目录的输出文件前缀
+
+    Args:
+        name: 剖析名称（如 crawl、translate）
+        logs_root: 日志根目录，默认为 ./logs
+
+    Returns:
+        形如 logs/YYYY/MM/DD_crawl_HHMMSS 的路径前缀
+    """
+    now = datetime.now()
+    root = logs_root or os.path.join(os.getcwd(), "logs")
+    month_dir = os.path.join(root, now.strftime("%Y"), now.strftime("%m"))
+    os.makedirs(month_dir, exist_ok=True)
+    return os.path.join(month_dir, f"{now.strftime('%d')}_{name}_{now.strftime('%H%M%S')}")
+
+
+@contextmanager
+def profile_session(
+    name: str,
+    mode: str = "sampling",
+    output_prefix: Optional[str] = None,
+    top_n: int = 30,
+    interval: float = 0.005,
+) -> Iterator[Dict[str, str]]:
+    """
+    剖析上下文：退出时写出剖析结果
+
+    Args:
+        name: 剖析名称
+        mode: sampling 或 cprofile
+        output_prefix: 输出路径前缀，默认写入 logs/YYYY/MM/
+        top_n: 报告中列出的函数数
+        interval: 采样间隔（秒，仅 sampling）
+
+    Yields:
+        输出文件字典（退出后填充），如 {"collapsed": ..., "report": ...}
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"不支持的剖析模式: {mode}（可选 {', '.join(PROFILE_MODES)}）")
+    prefix = output_prefix or default_output_prefix(name)
+    outputs: Dict[str, str] = {}
+
+    if mode == "sampling":
+        profiler = SamplingProfiler(interval=interval)
+        profiler.start()
+        try:
+            yield outputs
+        finally:
+            profiler.stop()
+            outputs["collapsed"] = f"{prefix}.collapsed"
+            outputs["report"] = f"{prefix}_top.txt"
+            with open(outputs["collapsed"], "w", encoding="utf-8") as f:
+                f.write(profiler.collapsed())
+            with open(outputs["report"], "w", encoding="utf-8") as f:
+                f.write(profiler.report(top_n))
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield outputs
+        finally:
+            profiler.disable()
+            outputs["profile"] = f"{prefix}.prof"
+            outputs["report"] = f"{prefix}_top.txt"
+            profiler.dump_stats(outputs["profile"])
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stream.write(f"cProfile 剖析报告（仅主线程）: {name}\n\n== 累计耗时 Top {top_n} ==\n")
+            stats.sort_stats("cumulative").print_stats(top_n)
+            stream.write(f"\n== 自身耗时 Top {top_n} ==\n")
+            stats.sort_stats("tottime").print_stats(top_n)
+            with open(outputs["report"], "w", encoding="utf-8") as f:
+                f.write(stream.getvalue())
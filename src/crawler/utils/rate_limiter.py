@@ -0,0 +1,227 @@
+"""自适应限速模块
+
+按主机维护请求速率，采用 AIMD（加性增、乘性减）策略：
+站点响应快且正常时逐步提高速率，遇到 429/5xx/超时/慢响应时成倍降低速率。
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from ..config.settings import get_settings
+
+
+@dataclass
+class HostRateState:
+    """单个主机的限速状态"""
+    rate: float
+    next_allowed: float = 0.0
+    successes: int = 0
+    backoffs: int = 0
+    last_latency: Optional[float] = None
+
+
+class AdaptiveRateLimiter:
+    """按主机划分的 AIMD 自适应限速器（线程安全）"""
+
+    def __init__(
+        self,
+        initial_rate: float = 0.5,
+        min_rate: float = 0.1,
+        max_rate: float = 2.0,
+        increase_step: float = 0.05,
+        decrease_factor: float = 0.5,
+        slow_threshold: float = 5.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        初始化限速器
+
+        Args:
+            initial_rate: 每个主机的初始速率（请求/秒）
+            min_rate: 最低速率（请求/秒）
+            max_rate: 最高速率（请求/秒）
+            increase_step: 每次正常响应后增加的速率
+            decrease_factor: 异常响应后速率的乘数（0~1）
+            slow_threshold: 慢响应阈值（秒），超过视为站点压力过大
+            jitter: 请求间隔的随机抖动比例，避免固定节奏
+            clock: 单调时钟函数（便于测试注入）
+            sleep: 休眠函数（便于测试注入）
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.slow_threshold = slow_threshold
+        self.jitter = jitter
+        self._clock = clock
+        self._sleep = sleep
+        self._hosts: Dict[str, HostRateState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """提取URL中的主机名"""
+        return urlparse(url).netloc.lower() or url
+
+    def _state(self, host: str) -> HostRateState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostRateState(rate=self.initial_rate)
+            self._hosts[host] = state
+        return state
+
+    def reserve(self, url: str) -> float:
+        """
+        为一次请求预留发送时间
+
+        Args:
+            url: 即将请求的URL
+
+        Returns:
+            调用方在发送请求前需要等待的秒数
+        """
+        host = self.host_of(url)
+        with self._lock:
+            state = self._state(host)
+            now = self._clock()
+            start = max(now, state.next_allowed)
+            interval = 1.0 / state.rate
+            if self.jitter:
+                interval *= 1 + random.uniform(-self.jitter, self.jitter)
+            state.next_allowed = start + interval
+            return start - now
+
+    def acquire(self, url: str) -> float:
+        """
+        阻塞直到允许向该主机发送请求
+
+        Args:
+            url: 即将请求的URL
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def record(
+        self,
+        url: str,
+        status_code: Optional[int],
+        elapsed: Optional[float] = None,
+        retry_after: Optional[float] = None,
+    ) -> float:
+        """
+        根据响应结果调整该主机的速率
+
+        Args:
+            url: 请求的URL
+            status_code: HTTP状态码，网络异常（超时/连接失败）时为None
+            elapsed: 请求耗时（秒）
+            retry_after: 服务端返回的 Retry-After 秒数
+
+        Returns:
+            调整后的速率（请求/秒）
+        """
+        host = self.host_of(url)
+        with self._lock:
+            state = self._state(host)
+            state.last_latency = elapsed
+            overloaded = (
+                status_code is None
+                or status_code == 429
+                or status_code >= 500
+                or (elapsed is not None and elapsed > self.slow_threshold)
+            )
+            if overloaded:
+                state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+                state.backoffs += 1
+                # 退避后立即拉开下一次请求的时间
+                state.next_allowed = max(state.next_allowed, self._clock() + 1.0 / state.rate)
+            else:
+                state.rate = min(self.max_rate, state.rate + self.increase_step)
+                state.successes += 1
+            if retry_after:
+                state.next_allowed = max(state.next_allowed, self._clock() + retry_after)
+            return state.rate
+
+    def get_rate(self, url_or_host: str) -> float:
+        """获取主机当前速率（请求/秒）"""
+        host = self.host_of(url_or_host) if "://" in url_or_host else url_or_host.lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            return state.rate if state else self.initial_rate
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """获取所有主机的限速状态"""
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(state.rate, 4),
+                    "interval": round(1.0 / state.rate, 4),
+                    "successes": state.successes,
+                    "backoffs": state.backoffs,
+                    "last_latency": state.last_latency,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+# 全局限速器实例（所有爬虫组件共享）
+_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """获取全局共享的限速器实例"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            cfg = get_settings().rate_limit
+            _rate_limiter = AdaptiveRateLimiter(
+                initial_rate=cfg.initial_rate,
+                min_rate=cfg.min_rate,
+                max_rate=cfg.max_rate,
+                increase_step=cfg.increase_step,
+                decrease_factor=cfg.decrease_factor,
+                slow_threshold=cfg.slow_threshold,
+                jitter=cfg.jitter,
+            )
+        return _rate_limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 响应头的值（秒数或HTTP日期）
+
+    Returns:
+        需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        from datetime import datetime, timezone
+        dt = parsedate_to_datetime(value)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
@@ -0,0 +1,126 @@
+"""重试策略模块
+
+统一的HTTP重试策略：区分可重试错误（连接错误、超时、5xx、429），
+使用带完全抖动（full jitter）的指数退避，并通过每次运行的重试预算
+限制站点降级时的总重试次数，避免运行时间成倍增长。
+"""
+
+import random
+import threading
+from typing import Optional
+
+import requests
+
+# 可重试的HTTP状态码（501 Not Implemented 重试无意义，不包含在内）
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 520, 521, 522, 523, 524})
+
+
+class RetryBudget:
+    """每次运行的重试预算（线程安全）"""
+
+    def __init__(self, max_retries: int = 50):
+        """
+        初始化重试预算
+
+        Args:
+            max_retries: 本次运行允许的最大重试总次数，小于0表示不限制
+        """
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """尝试消耗一次重试额度，额度耗尽时返回False"""
+        with self._lock:
+            if 0 <= self.max_retries <= self.used:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """剩余重试次数，不限制时返回None"""
+        if self.max_retries < 0:
+            return None
+        return max(0, self.max_retries - self.used)
+
+    def reset(self) -> None:
+        """重置预算（新一次运行开始时调用）"""
+        with self._lock:
+            self.used = 0
+
+
+class RetryPolicy:
+    """指数退避 + 完全抖动的重试策略"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 单个请求的最大尝试次数（含首次请求）
+            base_delay: 退避基准延迟（秒）
+            max_delay: 单次退避的最大延迟（秒），Retry-After 超过该值时放弃重试
+            budget: 重试预算，为None时不限制总次数
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    @staticmethod
+    def is_retryable_exception(error: BaseException) -> bool:
+        """判断异常是否可重试（连接错误、超时、响应中断）"""
+        return isinstance(
+            error,
+            (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ),
+        )
+
+    @staticmethod
+    def is_retryable_status(status_code: Optional[int]) -> bool:
+        """判断HTTP状态码是否可重试"""
+        return status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        计算第 attempt 次失败后的等待时间
+
+        Args:
+            attempt: 已失败的尝试次数（从1开始）
+            retry_after: 服务端要求的等待秒数（Retry-After）
+
+        Returns:
+            等待秒数；Retry-After 超过最大延迟时返回None表示不应重试
+        """
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            return retry_after
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def should_retry(self, attempt: int) -> bool:
+        """
+        判断是否还可以进行下一次尝试（会消耗预算）
+
+        Args:
+            attempt: 已完成的尝试次数
+
+        Returns:
+            是否重试
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if self.budget is not None and not self.budget.try_acquire():
+            return False
+        return True
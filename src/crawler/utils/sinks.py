@@ -0,0 +1,385 @@
+"""存储输出（Sink）模块
+
+爬取流水线通过统一的 Sink 接口输出记录：``write(records)`` 先写入缓冲区，
+缓冲达到 ``batch_size`` 时同步落盘/入库（生产者在此阻塞，形成天然的背压，
+内存中最多只保留一个批次），``flush()`` 写出剩余记录，``close()`` 释放资源。
+批次写出失败时记录留在缓冲区，异常抛给调用方，之后的 ``flush()``/``close()`` 会重试
+（至少一次语义：失败前已部分写出的记录可能重复写出）。
+
+BaseSink 定义对外接口，Sink 实现缓冲与分批写出，具体输出只需实现 ``_write_batch``。
+
+内置实现：
+
+- MySQLSink：``INSERT ... ON DUPLICATE KEY UPDATE`` 批量入库；
+- JsonlSink：追加写入 JSON Lines（storage.JsonlWriter，周期性 fsync）；
+- CsvSink：追加写入 CSV（列表/字典字段序列化为 JSON 字符串）；
+- ParquetSink：每批写为一个 row group（storage.ParquetWriter，需要 pyarrow）；
+- MultiSink：同时写入多个 Sink（组合，不自行缓冲）。
+
+``create_sink("jsonl:data/posts.jsonl")`` 按规格字符串创建 Sink。
+"""
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .metrics import Stage, StageMetrics
+from .storage import JsonlWriter, ParquetWriter, flatten_record
+
+Record = Dict[str, Any]
+
+DEFAULT_BATCH_SIZE = 50
+
+
+class BaseSink(ABC):
+    """输出目标接口"""
+
+    def __init__(self):
+        self.records_written = 0
+        self.closed = False
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    @property
+    @abstractmethod
+    def pending(self) -> int:
+        """尚未写出的记录数"""
+
+    @abstractmethod
+    def write(self, records: Iterable[Record]) -> int:
+        """写入记录，返回接收的记录数"""
+
+    @abstractmethod
+    def flush(self) -> None:
+        """写出全部缓冲的记录"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """写出剩余记录并释放资源"""
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError(f"{self.name} 已关闭")
+
+    def __enter__(self) -> "BaseSink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Sink(BaseSink):
+    """缓冲并分批写出的 Sink 基类"""
+
+    # 写出耗时记录到的阶段名称
+    stage = Stage.SINK_WRITE
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, metrics: Optional[StageMetrics] = None):
+        """
+        初始化 Sink
+
+        Args:
+            batch_size: 缓冲多少条记录后写出一次
+            metrics: 阶段指标，提供时记录每次写出的耗时与字节数
+        """
+        super().__init__()
+        self.batch_size = max(1, batch_size)
+        self.metrics = metrics
+        self.batches_written = 0
+        self._buffer: List[Record] = []
+
+    @property
+    def pending(self) -> int:
+        """缓冲区中尚未写出的记录数"""
+        return len(self._buffer)
+
+    def write(self, records: Iterable[Record]) -> int:
+        """
+        写入记录（缓冲满时同步写出一个批次）
+
+        Args:
+            records: 记录（字典）序列
+
+        Returns:
+            接收的记录数
+
+        Raises:
+            Exception: 批次写出失败（记录保留在缓冲区，可重试）
+        """
+        self._check_open()
+        count = 0
+        for record in records:
+            self._buffer.append(record)
+            count += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush_buffer()
+        return count
+
+    def flush(self) -> None:
+        """写出缓冲区中的全部记录"""
+        if self._buffer:
+            self._flush_buffer()
+
+    def close(self) -> None:
+        """写出剩余记录并释放资源；写出失败时保持打开，可再次 close() 重试"""
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self._close()
+
+    def _flush_buffer(self) -> None:
+        # 写出成功后才移出缓冲区，失败时整批保留
+        batch = list(self._buffer)
+        if self.metrics is not None:
+            with self.metrics.timer(self.stage) as timing:
+                timing.bytes = self._write_batch(batch) or 0
+        else:
+            self._write_batch(batch)
+        del self._buffer[:len(batch)]
+        self.records_written += len(batch)
+        self.batches_written += 1
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Record]) -> Optional[int]:
+        """
+        写出一个批次
+
+        Returns:
+            写出的字节数（未知时返回None）
+        """
+
+    def _close(self) -> None:
+        """释放资源（子类按需覆盖）"""
+
+
+class MySQLSink(Sink):
+    """MySQL 批量入库（INSERT ... ON DUPLICATE KEY UPDATE）"""
+
+    stage = Stage.DB_INSERT
+
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        key: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: Optional[StageMetrics] = None,
+        executemany: Optional[Callable[[str, Sequence[tuple]], int]] = None,
+    ):
+        """
+        初始化 MySQL Sink
+
+        Args:
+            table: 表名
+            columns: 写入的列（记录中缺失的列写入NULL）
+            key: 唯一键列，冲突时更新其余列
+            batch_size: 每批行数
+            metrics: 阶段指标
+            executemany: 执行函数，默认使用 utils.db.executemany
+        """
+        super().__init__(batch_size, metrics)
+        self.table = table
+        self.columns = list(columns)
+        self.key = key
+        self.affected_rows = 0
+        self._executemany = executemany
+        column_list = ",".join(f"`{c}`" for c in self.columns)
+        placeholders = ",".join(["%s"] * len(self.columns))
+        updates = ",".join(f"`{c}`=VALUES(`{c}`)" for c in self.columns if c != key)
+        self.sql = (
+            f"INSERT INTO `{table}` ({column_list}) VALUES ({placeholders}) "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    def _write_batch(self, batch: List[Record]) -> Optional[int]:
+        if self._executemany is None:
+            from .db import executemany
+            self._executemany = executemany
+        rows = [tuple(record.get(c) for c in self.columns) for record in batch]
+        self.affected_rows += self._executemany(self.sql, rows) or 0
+        return None
+
+
+class JsonlSink(Sink):
+    """追加写入 JSON Lines 文件"""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE, metrics: Optional[StageMetrics] = None):
+        """
+        初始化 JSONL Sink
+
+        Args:
+            path: 输出文件路径（追加写入，fsync 策略见 settings.storage）
+            batch_size: 每批记录数
+            metrics: 阶段指标
+        """
+        super().__init__(batch_size, metrics)
+        self.path = path
+        self._writer = JsonlWriter(path)
+
+    def _write_batch(self, batch: List[Record]) -> Optional[int]:
+        nbytes = self._writer.write_many(batch)
+        self._writer.flush()
+        return nbytes
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class CsvSink(Sink):
+    """追加写入 CSV 文件"""
+
+    def __init__(
+        self,
+        path: str,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        metrics: Optional[StageMetrics] = None,
+    ):
+        """
+        初始化 CSV Sink
+
+        Args:
+            path: 输出文件路径；文件为空时写入表头
+            columns: 列顺序，默认取第一条记录的键
+            batch_size: 每批记录数
+            metrics: 阶段指标
+        """
+        super().__init__(batch_size, metrics)
+        self.path = path
+        self.columns = list(columns) if columns else None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write_batch(self, batch: List[Record]) -> Optional[int]:
+        if self._writer is None:
+            self.columns = self.columns or list(batch[0].keys())
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+        start = self._file.tell()
+        for record in batch:
+            self._writer.writerow(flatten_record(record))
+        self._file.flush()
+        return self._file.tell() - start
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(Sink):
+    """Parquet 输出：每个批次写为一个 row group（需要 pyarrow）"""
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 1000,
+        compression: Optional[str] = None,
+        metrics: Optional[StageMetrics] = None,
+    ):
+        """
+        初始化 Parquet Sink
+
+        Args:
+            path: 输出文件路径（覆盖写入）
+            batch_size: 每个 row group 的行数
+            compression: 压缩算法，默认取 settings.storage.parquet_compression
+            metrics: 阶段指标
+
+        Raises:
+            ImportError: 未安装 pyarrow
+        """
+        super().__init__(batch_size, metrics)
+        self.path = path
+        self._writer = ParquetWriter(path, row_group_size=batch_size, compression=compression)
+
+    def _write_batch(self, batch: List[Record]) -> Optional[int]:
+        return self._writer.write_row_group(batch)
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class MultiSink(BaseSink):
+    """同时写入多个 Sink（各自按自己的批大小写出）"""
+
+    def __init__(self, sinks: Sequence[BaseSink]):
+        super().__init__()
+        self.sinks = list(sinks)
+
+    @property
+    def name(self) -> str:
+        return "+".join(s.name for s in self.sinks)
+
+    @property
+    def pending(self) -> int:
+        return max((s.pending for s in self.sinks), default=0)
+
+    def write(self, records: Iterable[Record]) -> int:
+        self._check_open()
+        records = list(records)
+        self._each(lambda sink: sink.write(records))
+        self.records_written += len(records)
+        return len(records)
+
+    def flush(self) -> None:
+        self._each(lambda sink: sink.flush())
+
+    def close(self) -> None:
+        """关闭全部 Sink；有 Sink 写出失败时保持打开（已关闭的不再重复关闭），可再次 close() 重试"""
+        if self.closed:
+            return
+        self._each(lambda sink: sink.close())
+        self.closed = True
+
+    def _each(self, action: Callable[[BaseSink], Any]) -> None:
+        """对每个 Sink 执行操作，一个失败不影响其余，最后抛出第一个异常"""
+        errors = []
+        for sink in self.sinks:
+            try:
+                action(sink)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+
+# 规格字符串前缀到 Sink 类的映射
+SINK_TYPES = {
+    "jsonl": JsonlSink,
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+}
+
+
+def create_sink(spec: str, batch_size: Optional[int] = None, metrics: Optional[StageMetrics] = None) -> Sink:
+    """
+    按规格字符串创建文件 Sink
+
+    Args:
+        spec: ``<类型>:<路径>``，如 ``jsonl:data/posts.jsonl``；省略类型时按扩展名推断
+        batch_size: 每批记录数，默认使用各 Sink 的默认值
+        metrics: 阶段指标
+
+    Returns:
+        Sink 实例
+
+    Raises:
+        ValueError: 无法识别的类型
+    """
+    kind, sep, path = spec.partition(":")
+    if not sep or kind not in SINK_TYPES:
+        path = spec
+        kind = os.path.splitext(spec)[1].lstrip(".").lower()
+        if kind == "json":
+            kind = "jsonl"
+    if kind not in SINK_TYPES:
+        raise ValueError(f"不支持的输出类型: {spec}（可选 {', '.join(SINK_TYPES)}）")
+    kwargs: Dict[str, Any] = {"metrics": metrics}
+    if batch_size:
+        kwargs["batch_size"] = batch_size
+    return SINK_TYPES[kind](path, **kwargs)
@@ -1,11 +1,21 @@
-"""存储工具模块"""
+"""存储工具模块
+
+除整文件读写的 save_data/load_data 外，提供流式读写：
+
+- JsonlWriter：追加写入 JSON Lines，按记录数/时间间隔周期性 fsync；
+- ParquetWriter：按 row group 写入列式 Parquet（需要 pyarrow，支持压缩）；
+- iter_jsonl/iter_parquet/iter_csv/iter_records：惰性逐条读取。
+
+导出、回填几十万条帖子时内存占用与数据量无关。
+"""
 
 import json
 import csv
+import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, List
-import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, Optional, List
 
 from ..config.settings import get_settings
 
@@ -58,8 +68,15 @@ def save_data(data: Any, filename: str, output_dir: Optional[str] = None) -> str
     if filename.endswith('.json'):
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+    elif filename.endswith('.jsonl'):
+        with JsonlWriter(str(file_path), append=False) as writer:
+            writer.write_many(data)
+    elif filename.endswith('.parquet'):
+        with ParquetWriter(str(file_path)) as writer:
+            writer.write_many(data)
     elif filename.endswith('.csv'):
         if isinstance(data, list) and data:
+            import pandas as pd  # 仅 CSV 需要，避免拖慢导入
             df = pd.DataFrame(data)
             df.to_csv(file_path, index=False, encoding='utf-8')
         else:
@@ -99,7 +116,12 @@ def load_data(filename: str, output_dir: Optional[str] = None) -> Any:
     if filename.endswith('.json'):
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
+    elif filename.endswith('.jsonl'):
+        return list(iter_jsonl(str(file_path)))
+    elif filename.endswith('.parquet'):
+        return list(iter_parquet(str(file_path)))
     elif filename.endswith('.csv'):
+        import pandas as pd
         return pd.read_csv(file_path, encoding='utf-8').to_dict('records')
     elif filename.endswith('.txt'):
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -109,6 +131,307 @@ def load_data(filename: str, output_dir: Optional[str] = None) -> Any:
             return f.read()
 
 
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class JsonlWriter:
+    """JSON Lines 流式写入器（逐条追加，周期性 fsync）"""
+
+    def __init__(
+        self,
+        path: str,
+        append: bool = True,
+        fsync_every: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+    ):
+        """
+        初始化写入器
+
+        Args:
+            path: 文件路径
+            append: 是否追加写入（False 时覆盖）
+            fsync_every: 每写入多少条记录 fsync 一次，默认取 settings.storage.fsync_every，0 表示不按条数
+            fsync_interval: 距上次 fsync 超过多少秒时 fsync，默认取 settings.storage.fsync_interval，0 表示不按时间
+        """
+        cfg = get_settings().storage
+        self.path = path
+        self.fsync_every = cfg.fsync_every if fsync_every is None else fsync_every
+        self.fsync_interval = cfg.fsync_interval if fsync_interval is None else fsync_interval
+        self.records_written = 0
+        self.bytes_written = 0
+        ensure_dir(Path(path).parent)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write(self, record: Dict[str, Any]) -> int:
+        """
+        写入一条记录
+
+        Returns:
+            写入的字节数
+        """
+        line = json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+        self._file.write(line)
+        nbytes = len(line.encode('utf-8'))
+        self.records_written += 1
+        self.bytes_written += nbytes
+        self._unsynced += 1
+        self._maybe_fsync()
+        return nbytes
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        写入多条记录
+
+        Returns:
+            写入的字节数
+        """
+        return sum(self.write(record) for record in records)
+
+    def _maybe_fsync(self) -> None:
+        if not self._unsynced:
+            return
+        if (self.fsync_every and self._unsynced >= self.fsync_every) or \
+                (self.fsync_interval and time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.fsync()
+
+    def flush(self) -> None:
+        """将缓冲写入操作系统"""
+        self._file.flush()
+
+    def fsync(self) -> None:
+        """落盘（flush + os.fsync）"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """落盘并关闭文件"""
+        if self._file.closed:
+            return
+        try:
+            self.fsync()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet 读写需要安装 pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """将列表/字典字段序列化为 JSON 字符串，便于写入列式/表格格式"""
+    return {
+        k: json.dumps(v, ensure_ascii=False, default=_json_default) if isinstance(v, (list, dict)) else v
+        for k, v in record.items()
+    }
+
+
+class ParquetWriter:
+    """Parquet 流式写入器（缓冲满一个 row group 后写出）"""
+
+    def __init__(
+        self,
+        path: str,
+        row_group_size: Optional[int] = None,
+        compression: Optional[str] = None,
+    ):
+        """
+        初始化写入器
+
+        Args:
+            path: 文件路径（覆盖写入）
+            row_group_size: 每个 row group 的行数，默认取 settings.storage.parquet_row_group_size
+            compression: 压缩算法（zstd/snappy/gzip/none），默认取 settings.storage.parquet_compression
+
+        Raises:
+            ImportError: 未安装 pyarrow
+        """
+        _require_pyarrow()
+        cfg = get_settings().storage
+        self.path = path
+        self.row_group_size = row_group_size or cfg.parquet_row_group_size
+        self.compression = compression or cfg.parquet_compression
+        self.records_written = 0
+        self.row_groups = 0
+        ensure_dir(Path(path).parent)
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """写入一条记录"""
+        self._buffer.append(record)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """写入多条记录"""
+        for record in records:
+            self.write(record)
+
+    def write_row_group(self, records: List[Dict[str, Any]]) -> int:
+        """
+        将一批记录直接写为一个 row group
+
+        Returns:
+            该 row group 的内存字节数
+        """
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        rows = [flatten_record(r) for r in records]
+        if self._writer is None:
+            table = pa.Table.from_pylist(rows)
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        else:
+            table = pa.Table.from_pylist(rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self.records_written += len(rows)
+        self.row_groups += 1
+        return table.nbytes
+
+    def flush(self) -> None:
+        """写出缓冲中的记录"""
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self.write_row_group(batch)
+
+    def close(self) -> None:
+        """写出剩余记录并关闭文件"""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ParquetWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取 JSON Lines
+
+    末尾未写完的一行（进程中途退出时可能出现）会被忽略。
+
+    Args:
+        path: 文件路径
+
+    Yields:
+        记录字典
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return
+
+
+def iter_parquet(path: str, batch_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取 Parquet（按批解码，内存只保留一个批次）
+
+    Args:
+        path: 文件路径
+        batch_size: 每次解码的行数
+
+    Yields:
+        记录字典
+    """
+    _require_pyarrow()
+    import pyarrow.parquet as pq  # type: ignore
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def iter_csv(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐条读取 CSV（值均为字符串）
+
+    Args:
+        path: 文件路径
+
+    Yields:
+        记录字典
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    按扩展名逐条读取记录（.jsonl/.parquet/.csv/.json）
+
+    Args:
+        path: 文件路径
+
+    Yields:
+        记录字典
+
+    Raises:
+        ValueError: 不支持的扩展名
+    """
+    if path.endswith('.jsonl'):
+        return iter_jsonl(path)
+    if path.endswith('.parquet'):
+        return iter_parquet(path)
+    if path.endswith('.csv'):
+        return iter_csv(path)
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return iter(data if isinstance(data, list) else [data])
+    raise ValueError(f"不支持的文件类型: {path}")
+
+
+def jsonl_to_json(src: str, dst: str) -> int:
+    """
+    将 JSON Lines 流式转换为 JSON 数组文件（逐条写出，不整体载入内存）
+
+    Args:
+        src: JSONL 文件路径
+        dst: JSON 文件路径
+
+    Returns:
+        转换的记录数
+    """
+    count = 0
+    ensure_dir(Path(dst).parent)
+    with open(dst, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in iter_jsonl(src):
+            f.write(',\n' if count else '\n')
+            f.write(json.dumps(record, ensure_ascii=False, default=_json_default))
+            count += 1
+        f.write('\n]\n' if count else ']\n')
+    return count
+
+
 def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
     """
     将列表分块
@@ -6,15 +6,102 @@
 
 import hashlib
 import random
+import threading
 import time
 import requests
 import json
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Callable, Optional, Dict, Any, Tuple
 from urllib.parse import quote
 import logging
 
+from .circuit_breaker import CircuitOpenError, get_breaker_registry
+from .http_client import get_http_client
+from .metrics import get_metrics
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_SIZE = 10000
+
+# 百度翻译以 HTTP 200 + error_code 返回的接口级故障（计入熔断）：
+# 52001 请求超时、52002 系统错误、54003 访问频率受限、54004 账户余额不足、54005 长 query 请求频繁
+BAIDU_OUTAGE_ERROR_CODES = frozenset({"52001", "52002", "54003", "54004", "54005"})
+
+
+def _baidu_outage(response: requests.Response) -> bool:
+    """百度翻译响应是否为接口级故障（签名错误等请求本身的问题不算）"""
+    try:
+        result = response.json()
+    except ValueError:
+        return False
+    return isinstance(result, dict) and str(result.get('error_code', '')) in BAIDU_OUTAGE_ERROR_CODES
+
+
+class TranslationCache:
+    """翻译结果缓存（LRU，线程安全）
+
+    进程内所有站点共用一个实例：相同的标题、分类、签名等文本只请求一次翻译接口。
+    只缓存翻译接口正常返回的结果，失败时返回的原文不会进入缓存。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的条数，小于等于0表示不缓存
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, str, str, str], value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def snapshot(self) -> Dict[str, int]:
+        """获取缓存命中情况"""
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+# 全局翻译缓存
+_translation_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """获取全局共享的翻译缓存（大小取 translator.yaml 的 settings.cache_size）"""
+    global _translation_cache
+    with _cache_lock:
+        if _translation_cache is None:
+            try:
+                from .translator_config import get_config
+                size = int(get_config().get_settings().get("cache_size", DEFAULT_CACHE_SIZE))
+            except Exception:
+                size = DEFAULT_CACHE_SIZE
+            _translation_cache = TranslationCache(size)
+        return _translation_cache
+
 
 class Translator:
     """翻译工具类"""
@@ -29,6 +116,10 @@ class Translator:
         """
         self.provider = provider.lower()
         self.config = kwargs
+        self.breakers = get_breaker_registry()
+        self.session = get_http_client().create_session(http2=False)
+        self.metrics = get_metrics()
+        self.cache = get_translation_cache()
         
         if self.provider == "baidu":
             self._init_baidu()
@@ -69,15 +160,64 @@ class Translator:
         if not text.strip():
             return text
         
+        key = (self.provider, from_lang, to_lang, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
             if self.provider == "baidu":
-                return self._translate_baidu(text, from_lang, to_lang)
+                result = self._translate_baidu(text, from_lang, to_lang)
             elif self.provider == "google":
-                return self._translate_google(text, from_lang, to_lang)
+                result = self._translate_google(text, from_lang, to_lang)
+            else:
+                return text
+            self.cache.put(key, result)
+            return result
+        except CircuitOpenError as e:
+            logger.warning(f"翻译接口不可用，跳过翻译: {e}")
+            return text
         except Exception as e:
             logger.error(f"翻译失败: {e}")
             return text  # 翻译失败时返回原文
     
+    def _send(
+        self, method: str, url: str, api_failed: Optional[Callable[[requests.Response], bool]] = None, **kwargs
+    ) -> requests.Response:
+        """
+        发送翻译接口请求（经过熔断器）
+        
+        Args:
+            method: 请求方法
+            url: 接口地址
+            api_failed: 判断状态码正常的响应是否为接口级故障（计入熔断失败）
+            **kwargs: 传给 session.request 的参数
+        
+        Raises:
+            CircuitOpenError: 翻译接口熔断中
+        """
+        breaker = self.breakers.for_url(url)
+        probe = breaker.before_request()
+        try:
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self.metrics.record_request(url, None, time.monotonic() - started)
+                breaker.record_failure()
+                raise
+            self.metrics.record_request(url, response.status_code, time.monotonic() - started)
+            if response.status_code >= 500 or response.status_code == 429 or (
+                api_failed is not None and api_failed(response)
+            ):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+        finally:
+            # 非 requests 异常退出时归还半开探测名额（已记录结果时无操作）
+            breaker.release(probe)
+    
     def _translate_baidu(self, text: str, from_lang: str, to_lang: str) -> str:
         """百度翻译实现"""
         # 生成签名
@@ -95,7 +235,7 @@ class Translator:
         }
         
         try:
-            response = requests.get(self.api_url, params=params, timeout=10)
+            response = self._send("GET", self.api_url, api_failed=_baidu_outage, params=params, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -125,7 +265,7 @@ class Translator:
         }
         
         try:
-            response = requests.post(self.api_url, params=params, timeout=10)
+            response = self._send("POST", self.api_url, params=params, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -200,7 +340,8 @@ class Translator:
                 'q': text
             }
             
-            response = requests.post(
+            response = self._send(
+                "POST",
                 "https://translation.googleapis.com/language/translate/v2/detect",
                 params=params,
                 timeout=10
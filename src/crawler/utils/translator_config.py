@@ -4,6 +4,7 @@
 
 import yaml
 import os
+import threading
 from typing import Dict, Any, Optional
 from pathlib import Path
 
@@ -96,14 +97,16 @@ class TranslatorConfig:
 
 # 全局配置实例
 _config_instance = None
+_config_lock = threading.Lock()
 
 
 def get_config() -> TranslatorConfig:
     """获取全局配置实例"""
     global _config_instance
-    if _config_instance is None:
-        _config_instance = TranslatorConfig()
-    return _config_instance
+    with _config_lock:
+        if _config_instance is None:
+            _config_instance = TranslatorConfig()
+        return _config_instance
 
 
 def create_translator_from_config(provider: Optional[str] = None):
@@ -126,3 +129,22 @@ def create_translator_from_config(provider: Optional[str] = None):
     provider_config = config.get_provider_config(provider)
     
     return Translator(provider, **provider_config)
+
+
+# 全局共享翻译器（各站点爬虫共用会话、熔断器与翻译缓存）
+_translator_instance = None
+_translator_lock = threading.Lock()
+
+
+def get_translator():
+    """
+    获取全局共享的翻译器（按默认配置创建一次）
+    
+    Returns:
+        翻译器实例
+    """
+    global _translator_instance
+    with _translator_lock:
+        if _translator_instance is None:
+            _translator_instance = create_translator_from_config()
+        return _translator_instance
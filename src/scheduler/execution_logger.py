@@ -21,8 +21,17 @@ class ExecutionLogger:
         self.execution_type = execution_type  # 'scheduled' or 'manual'
         self.execution_id: Optional[int] = None
         self.execution_ended: bool = False  # 标记是否已经结束执行
+        self.metrics = None  # 本次运行的阶段指标（StageMetrics）
         self.logger = logging.getLogger(__name__)
     
+    def attach_metrics(self, metrics) -> None:
+        """关联阶段指标，结束执行时将其摘要写入日志表的 metrics 字段
+        
+        Args:
+            metrics: StageMetrics 实例
+        """
+        self.metrics = metrics
+    
     def start_execution(self, pages: int = 2, command: str = None, parameters: Dict[str, Any] = None) -> int:
         """记录任务开始执行
         
@@ -74,18 +83,38 @@ class ExecutionLogger:
             self.logger.warning("执行已经结束，跳过重复记录")
             return
             
+        metrics_json = None
+        if self.metrics is not None:
+            metrics_json = json.dumps(self.metrics.summary(), ensure_ascii=False)
+            
         try:
             conn = connect()
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    UPDATE ims_mdkeji_im_boniu_crawler_log 
-                    SET end_time = NOW(), 
-                        status = %s, 
-                        message = %s, 
-                        posts_count = %s,
-                        updated_at = NOW()
-                    WHERE id = %s
-                """, (status, message, posts_count, self.execution_id))
+                try:
+                    cursor.execute("""
+                        UPDATE ims_mdkeji_im_boniu_crawler_log 
+                        SET end_time = NOW(), 
+                            status = %s, 
+                            message = %s, 
+                            posts_count = %s,
+                            metrics = %s,
+                            updated_at = NOW()
+                        WHERE id = %s
+                    """, (status, message, posts_count, metrics_json, self.execution_id))
+                except Exception as e:
+                    # 日志表尚未执行 metrics 字段迁移时，退回不带指标的更新
+                    if 'metrics' not in str(e):
+                        raise
+                    self.logger.warning("日志表缺少 metrics 字段，跳过指标记录（请执行 scripts/2026_10_19_add_crawler_log_metrics.sql）")
+                    cursor.execute("""
+                        UPDATE ims_mdkeji_im_boniu_crawler_log 
+                        SET end_time = NOW(), 
+                            status = %s, 
+                            message = %s, 
+                            posts_count = %s,
+                            updated_at = NOW()
+                        WHERE id = %s
+                    """, (status, message, posts_count, self.execution_id))
                 conn.commit()
                 
                 self.execution_ended = True  # 标记执行已结束
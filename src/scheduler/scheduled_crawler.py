@@ -4,8 +4,10 @@
 每两天晚上11点执行一次爬虫任务
 """
 
+import argparse
 import os
 import sys
+import time
 import logging
 import subprocess
 from datetime import datetime
@@ -16,6 +18,9 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.crawler.utils.db import connect
+from src.crawler.utils.exporter import MetricsExporter
+from src.crawler.utils.metrics import StageMetrics
+from src.crawler.utils.profiling import PROFILE_MODES
 from src.scheduler.execution_logger import get_execution_logger
 
 
@@ -46,8 +51,29 @@ def setup_logging():
 # 移除旧的记录函数，使用新的ExecutionLogger
 
 
-def run_crawler():
-    """执行爬虫任务"""
+def export_run_metrics(success: bool, duration: float) -> None:
+    """将本次定时任务结果写入 textfile（settings.metrics.textfile_dir 未配置时跳过）
+    
+    Args:
+        success: 是否执行成功
+        duration: 执行耗时（秒）
+    """
+    metrics = StageMetrics()
+    metrics.set_gauge("scheduler_last_run_timestamp_seconds", time.time())
+    metrics.set_gauge("scheduler_last_run_duration_seconds", duration)
+    metrics.set_gauge("scheduler_last_run_success", 1 if success else 0)
+    try:
+        MetricsExporter.from_settings("boniu_scheduler", metrics=metrics).write_textfile()
+    except OSError as e:
+        logging.getLogger(__name__).error(f"写入调度指标失败: {e}")
+
+
+def run_crawler(profile: str = None):
+    """执行爬虫任务
+    
+    Args:
+        profile: 剖析模式（sampling/cprofile），透传给 main.py crawl --profile
+    """
     logger = logging.getLogger(__name__)
     
     # 构建执行命令和参数
@@ -59,6 +85,8 @@ def run_crawler():
         "--pages", "2",  # 爬取2页
         "--mode", "db"   # 直接入库模式
     ]
+    if profile:
+        cmd += ["--profile", profile]  # 剖析结果写入 logs/YYYY/MM/
     
     command = " ".join(cmd)
     
@@ -108,8 +136,23 @@ def run_crawler():
         return False
 
 
+def parse_args(argv=None):
+    """解析命令行参数（--profile 也可通过环境变量 CRAWLER_PROFILE 设置）"""
+    parser = argparse.ArgumentParser(description="博牛社区爬虫定时任务")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sampling",
+        choices=PROFILE_MODES,
+        default=os.getenv("CRAWLER_PROFILE") or None,
+        help="以剖析模式运行爬虫：sampling（默认）或 cprofile",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """主函数"""
+    args = parse_args()
     logger = setup_logging()
     
     logger.info("=" * 50)
@@ -118,7 +161,9 @@ def main():
     logger.info("=" * 50)
     
     try:
-        success = run_crawler()
+        started = time.monotonic()
+        success = run_crawler(args.profile)
+        export_run_metrics(success, time.monotonic() - started)
         
         if success:
             logger.info("定时任务执行成功")
@@ -8,6 +8,90 @@ from pathlib import Path
 src_path = Path(__file__).parent.parent / "src"
 sys.path.insert(0, str(src_path))
 
+from benchmarks.crawl_bench import configure
+from benchmarks.discuz_server import DiscuzFixtures, DiscuzStandInServer
+from benchmarks.sqlite_db import SQLiteStandIn
+from src.crawler.config import settings as settings_module
+from src.crawler.sites.boniu import crawler as crawler_module
+from src.crawler.utils import (
+    archive,
+    circuit_breaker,
+    http_client,
+    metrics,
+    parse_pool,
+    rate_limiter,
+    translator_config,
+)
+
+# standin 默认的替身站点规模，测试可用 indirect 参数覆盖其中任意项
+STANDIN_FIXTURES = dict(pages=1, threads_per_page=3, images_per_thread=0, content_kb=1, image_kb=1)
+
+
+class FakeClock:
+    """可手动推进的时钟（sleep 推进时间并记录每次休眠时长）"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def reset_singletons():
+    """关闭并丢弃进程级共享组件，重新加载设置（下次获取时按当前配置重新创建）"""
+    settings_module.reload_settings()
+    rate_limiter._rate_limiter = None
+    circuit_breaker._registry = None
+    metrics._metrics = None
+    registry, http_client._registry = http_client._registry, None
+    if registry is not None:
+        registry.close()
+    parse_pool.close_parse_pool()
+    archive.close_page_archives()
+    translator_config._config_instance = None
+    translator_config._translator_instance = None
+
+
+@pytest.fixture
+def clock():
+    """可手动推进的时钟"""
+    return FakeClock()
+
+
+@pytest.fixture
+def restore_globals():
+    """测试结束后重置进程级共享组件"""
+    yield
+    reset_singletons()
+
+
+@pytest.fixture
+def standin(request, monkeypatch, tmp_path, restore_globals):
+    """
+    本地 Discuz 替身站点 + SQLite 替身库，返回 (server, store)
+
+    全局设置指向替身站点（不限速、不退避），爬虫模块的 fetch_all/executemany
+    改用 SQLite 替身；结束后重置全部进程级共享组件。站点规模默认 STANDIN_FIXTURES，
+    可通过 @pytest.mark.parametrize("standin", [{...}], indirect=True) 覆盖。
+    """
+    monkeypatch.setenv("BONIU_IMG_BASE_PATH", str(tmp_path / "images"))
+    fixtures = DiscuzFixtures(**{**STANDIN_FIXTURES, **getattr(request, "param", {})})
+    store = SQLiteStandIn()
+    monkeypatch.setattr(crawler_module, "fetch_all", store.fetch_all)
+    monkeypatch.setattr(crawler_module, "executemany", store.executemany)
+    reset_singletons()
+    try:
+        with DiscuzStandInServer(fixtures) as server:
+            configure(server.url, rate=1000, retry_delay=0.0)
+            yield server, store
+    finally:
+        store.close()
+
 
 @pytest.fixture
 def sample_html():
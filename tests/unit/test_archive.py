@@ -0,0 +1,187 @@
+"""原始响应归档与重新解析单元测试"""
+
+import json
+import os
+
+import pytest
+
+from src.crawler.config import settings as settings_module
+from src.crawler.sites.boniu import crawler as crawler_module
+from src.crawler.utils.archive import (
+    CODEC_ZLIB,
+    CODEC_ZSTD,
+    INDEX_LOG,
+    INDEX_MAP,
+    PageArchive,
+    default_codec,
+    get_page_archive,
+)
+from src.crawler.utils.sinks import JsonlSink
+from src.crawler.utils.storage import iter_jsonl
+
+CODECS = [CODEC_ZLIB] + ([CODEC_ZSTD] if default_codec() == CODEC_ZSTD else [])
+
+
+def _url(n):
+    return f"https://example.com/thread-{n}-1-1.html"
+
+
+class TestPageArchive:
+    """归档读写"""
+
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_roundtrip(self, tmp_path, codec):
+        with PageArchive(str(tmp_path), codec=codec) as archive:
+            archive.put(_url(1), "<html>一</html>".encode("gbk"), key="1", status=200, elapsed=0.25,
+                        headers={"Content-Type": "text/html; charset=gbk", "Content-Encoding": "gzip"})
+            archive.put(_url(2), "<html>二</html>")
+            record = archive.get("1")
+            assert record.url == _url(1) and record.status == 200 and record.elapsed == 0.25
+            assert record.text == "<html>一</html>"
+            # 响应体已解压，不保留传输编码
+            assert record.headers == {"content-type": "text/html; charset=gbk"}
+            assert archive.get(_url(2)).text == "<html>二</html>" and archive.get(_url(2)).key is None
+            assert archive.get("3") is None
+            assert _url(2) in archive and len(archive) == 2
+
+    def test_latest_wins_and_reopen(self, tmp_path):
+        with PageArchive(str(tmp_path), segment_bytes=1) as archive:
+            for n in range(5):
+                archive.put(_url(n % 2), f"<p>{n}</p>" * 20, key=str(n % 2))
+        # 每条超过段上限，各写一个段文件
+        assert len([f for f in os.listdir(tmp_path) if f.endswith(".seg")]) == 5
+        with PageArchive(str(tmp_path)) as archive:
+            assert archive.get("0").text == "<p>4</p>" * 20
+            assert [r.key for r in archive.records()] == ["1", "0"]
+            assert len(list(archive.records(latest=False))) == 5
+
+    def test_read_growing_segment_without_pread(self, tmp_path, monkeypatch):
+        # Windows 没有 os.pread；正在写入的段在读取之后继续追加
+        monkeypatch.delattr(os, "pread", raising=False)
+        with PageArchive(str(tmp_path)) as archive:
+            archive.put(_url(1), "<p>1</p>", key="1")
+            assert archive.get("1").text == "<p>1</p>"
+            archive.put(_url(2), "<p>2</p>", key="2")
+            assert archive.get("2").text == "<p>2</p>" and archive.get("1").text == "<p>1</p>"
+            assert [r.text for r in archive.records()] == ["<p>1</p>", "<p>2</p>"]
+
+    def test_mmap_index_with_tail(self, tmp_path):
+        with PageArchive(str(tmp_path)) as archive:
+            for n in range(100):
+                archive.put(_url(n), f"v1-{n}", key=str(n))
+            assert archive.reindex() == 100
+            # 重建索引之后追加的记录从日志补充
+            archive.put(_url(7), "v2-7", key="7")
+            archive.put(_url(100), "v1-100", key="100")
+            assert (archive.get("7").text, archive.get(_url(100)).text) == ("v2-7", "v1-100")
+        assert os.path.exists(tmp_path / INDEX_MAP)
+        with PageArchive(str(tmp_path)) as archive:
+            assert len(archive) == 101
+            assert all(archive.get(str(n)).text.endswith(f"-{n}") for n in range(101))
+            assert archive.get("7").text == "v2-7"
+            latest = [r.text for r in archive.records(keyed=True)]
+            assert len(latest) == 101 and "v1-7" not in latest
+
+    def test_reindex_on_close(self, tmp_path):
+        with PageArchive(str(tmp_path), reindex_threshold=10) as archive:
+            for n in range(10):
+                archive.put(_url(n), "x", key=str(n))
+        assert os.path.exists(tmp_path / INDEX_MAP)
+
+    def test_mixed_codecs(self, tmp_path):
+        with PageArchive(str(tmp_path), codec=CODEC_ZLIB) as archive:
+            archive.put(_url(1), "a")
+        with PageArchive(str(tmp_path), codec=default_codec()) as archive:
+            archive.put(_url(2), "b")
+            archive.reindex()
+            assert (archive.get(_url(1)).text, archive.get(_url(2)).text) == ("a", "b")
+
+    def test_sees_other_writers(self, tmp_path):
+        with PageArchive(str(tmp_path)) as reader, PageArchive(str(tmp_path)) as writer:
+            writer.put(_url(1), "x", key="1")
+            assert reader.get("1").text == "x"
+
+    def test_partial_index_line_skipped(self, tmp_path):
+        with PageArchive(str(tmp_path)) as archive:
+            archive.put(_url(1), "x")
+        with open(tmp_path / INDEX_LOG, "ab") as f:
+            f.write(b'{"url": "u", "segm')
+        with PageArchive(str(tmp_path)) as archive:
+            assert len(archive) == 1 and archive.get(_url(1)).text == "x"
+
+    def test_global_archive_disabled_by_default(self):
+        assert get_page_archive("boniu") is None
+
+
+class FakeTable:
+    """替代数据库：fetch_all 按ID返回记录，executemany 记录 UPDATE 的行"""
+
+    def __init__(self, records):
+        self.rows = {int(r["forum_post_id"]): dict(r) for r in records}
+        self.updates = []
+
+    def fetch_all(self, sql, params=None):
+        return [self.rows[int(pid)] for pid in params or () if int(pid) in self.rows]
+
+    def executemany(self, sql, rows):
+        assert sql.startswith("UPDATE")
+        self.updates.extend(rows)
+        return len(rows)
+
+
+@pytest.mark.parametrize("standin", [dict(threads_per_page=4, images_per_thread=2)], indirect=True)
+class TestReextract:
+    """抓取时归档详情页，之后从归档重新解析并只更新有变化的帖子"""
+
+    @pytest.fixture(autouse=True)
+    def archive_enabled(self, standin, tmp_path):
+        settings = settings_module.get_settings()
+        settings.archive.enabled = True
+        settings.archive.root = str(tmp_path / "archive")
+
+    def _crawl(self, server, tmp_path):
+        output = str(tmp_path / "out.jsonl")
+        crawler = crawler_module.BoniuCrawler(use_db=False)
+        crawler.enable_translation = False
+        crawler.fids = [89]
+        with JsonlSink(output) as sink:
+            crawler.set_sinks([sink])
+            crawler.crawl_paginated_and_store(max_pages=1, existing_ids=set())
+        return crawler, list(iter_jsonl(output))
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_updates_only_changed_rows(self, standin, tmp_path, monkeypatch, workers):
+        server, _ = standin
+        crawler, records = self._crawl(server, tmp_path)
+        # 首页、列表页与 4 个详情页
+        assert len(crawler.archive) == 6
+        assert len(list(crawler.archive.records(keyed=True))) == 4
+        table = FakeTable(records)
+        first, second = sorted(table.rows)[:2]
+        # 模拟旧规则的结果：一条正文不同，一条少了一张图片
+        table.rows[first]["content"] = "旧正文"
+        table.rows[second]["images"] = json.dumps(json.loads(table.rows[second]["images"])[:1])
+        del table.rows[sorted(table.rows)[-1]]
+        monkeypatch.setattr(crawler_module, "fetch_all", table.fetch_all)
+        monkeypatch.setattr(crawler_module, "executemany", table.executemany)
+
+        requests_before = server.requests
+        stats = crawler.reextract(crawler.archive, workers=workers)
+
+        assert stats == {"scanned": 4, "missing": 1, "changed": 2, "updated": 2}
+        # 不重新抓取页面，已下载的图片沿用原路径
+        assert server.requests == requests_before
+        updated = {row[-1]: row for row in table.updates}
+        original = {int(r["forum_post_id"]): r for r in records}
+        assert updated[first][1] == original[first]["content"]
+        assert updated[second][2] == original[second]["images"]
+
+    def test_dry_run(self, standin, tmp_path, monkeypatch):
+        server, _ = standin
+        crawler, records = self._crawl(server, tmp_path)
+        table = FakeTable(records)
+        table.rows[min(table.rows)]["content"] = "旧正文"
+        monkeypatch.setattr(crawler_module, "fetch_all", table.fetch_all)
+        monkeypatch.setattr(crawler_module, "executemany", table.executemany)
+        stats = crawler.reextract(crawler.archive, dry_run=True)
+        assert (stats["changed"], stats["updated"], table.updates) == (1, 0, [])
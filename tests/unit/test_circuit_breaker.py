@@ -0,0 +1,116 @@
+"""熔断器单元测试"""
+
+import pytest
+
+from src.crawler.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+)
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("bbs.example.com", failure_threshold=3, recovery_timeout=60, clock=clock)
+
+
+class TestCircuitBreaker:
+    """熔断器测试"""
+
+    def test_opens_after_threshold(self, breaker):
+        """测试连续失败达到阈值后熔断并快速失败"""
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_success_resets_failures(self, breaker):
+        """测试成功请求清零失败计数"""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probe_closes(self, breaker, clock):
+        """测试冷却后半开放行一个探测请求，成功则恢复"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 61
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_probe_failure_reopens(self, breaker, clock):
+        """测试探测失败重新熔断"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 61
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.retry_in() == pytest.approx(60)
+
+    def test_release_returns_unrecorded_probe(self, breaker, clock):
+        """测试探测请求未记录结果就异常退出时归还名额"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 61
+        probe = breaker.before_request()
+        assert probe is not None and not breaker.allow_request()
+        breaker.release(probe)
+        probe = breaker.before_request()
+        breaker.record_success()
+        # 已记录结果的探测 release 无操作
+        breaker.release(probe)
+        assert breaker.state == CircuitState.CLOSED and breaker.before_request() is None
+
+    def test_release_after_failure_is_noop(self, breaker, clock):
+        """测试探测失败重新熔断后，下一轮半开不受上一轮 release 影响"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 61
+        probe = breaker.before_request()
+        breaker.record_failure()
+        clock.now = 122
+        assert breaker.allow_request()
+        breaker.release(probe)
+        assert not breaker.allow_request()
+
+    def test_stuck_probe_expires(self, breaker, clock):
+        """测试超过冷却时间仍未记录结果的探测名额作废"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 61
+        assert breaker.allow_request()
+        clock.now = 100
+        assert not breaker.allow_request()
+        clock.now = 121
+        assert breaker.state == CircuitState.HALF_OPEN and breaker.allow_request()
+
+
+class TestCircuitBreakerRegistry:
+    """熔断器注册表测试"""
+
+    def test_breakers_are_per_host(self):
+        """测试按主机区分熔断器"""
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        registry.for_url("https://a.com/x").record_failure()
+        assert registry.for_url("https://a.com/y").state == CircuitState.OPEN
+        assert registry.for_url("https://b.com/").state == CircuitState.CLOSED
+        assert set(registry.snapshot()) == {"a.com", "b.com"}
+
+    def test_disabled_never_opens(self):
+        """测试关闭熔断时不会打开"""
+        registry = CircuitBreakerRegistry(failure_threshold=1, enabled=False)
+        breaker = registry.get("a.com")
+        for _ in range(10):
+            breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
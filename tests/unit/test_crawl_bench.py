@@ -0,0 +1,59 @@
+"""离线爬取基准（Discuz 替身 + SQLite 替身）单元测试"""
+
+from benchmarks.crawl_bench import run_benchmark
+from benchmarks.sqlite_db import SQLiteStandIn, translate_sql
+
+
+class TestTranslateSql:
+    """MySQL 方言改写测试"""
+
+    def test_upsert(self):
+        sql = "INSERT INTO `t` (`a`,`b`) VALUES (%s,%s) ON DUPLICATE KEY UPDATE `b`=VALUES(`b`)"
+        assert translate_sql(sql, "a") == (
+            "INSERT INTO t (a,b) VALUES (?,?) ON CONFLICT(a) DO UPDATE SET b=excluded.b"
+        )
+
+    def test_now(self):
+        assert translate_sql("UPDATE `t` SET `x`=%s, `updated_at`=NOW()") == (
+            "UPDATE t SET x=?, updated_at=CURRENT_TIMESTAMP"
+        )
+
+    def test_upsert_updates_existing_row(self):
+        store = SQLiteStandIn()
+        sql = (
+            "INSERT INTO `ims_mdkeji_im_boniu_forum_post` (`forum_post_id`,`title`) VALUES (%s,%s) "
+            "ON DUPLICATE KEY UPDATE `title`=VALUES(`title`)"
+        )
+        store.executemany(sql, [("1", "旧标题")])
+        store.executemany(sql, [("1", "新标题")])
+        rows = store.fetch_all("SELECT title FROM `ims_mdkeji_im_boniu_forum_post`")
+        assert rows == [{"title": "新标题"}]
+        store.close()
+
+
+class TestCrawlBenchmark:
+    """端到端基准测试"""
+
+    def test_end_to_end(self, restore_globals):
+        result = run_benchmark(pages=2, threads_per_page=3, images_per_thread=1, content_kb=1, image_kb=1)
+        assert result["posts"] == 6
+        assert result["stored"] == 6
+        assert result["requests"] == result["server_requests"]
+        # 每页：主页 + 列表页；每帖：详情 + 图片 + 头像；最后一页为空页
+        assert result["requests"] == 3 * 2 + 6 * 3
+        assert result["stages"]["detail_fetch"]["count"] == 6
+        assert result["peak_rss_mb"] > 0
+
+    def test_parse_pool(self, restore_globals):
+        result = run_benchmark(
+            pages=1, threads_per_page=4, images_per_thread=1, content_kb=1, image_kb=1,
+            detail_workers=2, parse_workers=2,
+        )
+        assert result["posts"] == result["stored"] == 4
+        assert result["stages"]["detail_parse"]["count"] == 4
+
+    def test_retries_injected_errors(self, restore_globals):
+        result = run_benchmark(pages=1, threads_per_page=5, images_per_thread=0, content_kb=1,
+                               error_rate=0.2, seed=3, retry_delay=0.0)
+        assert result["server_errors"] > 0
+        assert result["stored"] == result["posts"]
@@ -0,0 +1,54 @@
+"""数据库连接池单元测试（使用假连接，不需要 MySQL）"""
+
+import pytest
+
+from src.crawler.utils.db import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.closed = False
+
+    def ping(self, reconnect=True):
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool:
+    """连接池测试"""
+
+    def test_reuses_idle_connection(self):
+        pool = ConnectionPool(FakeConnection, max_idle=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+        assert (pool.created, pool.reused, pool.idle) == (1, 1, 1)
+
+    def test_dead_connection_replaced(self):
+        pool = ConnectionPool(FakeConnection, max_idle=2)
+        with pool.connection() as conn:
+            conn.alive = False
+        with pool.connection() as fresh:
+            assert fresh is not conn
+        assert conn.closed
+        assert pool.created == 2
+
+    def test_error_closes_connection(self):
+        pool = ConnectionPool(FakeConnection)
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                raise RuntimeError("query failed")
+        assert conn.closed and pool.idle == 0
+
+    def test_max_idle_and_close(self):
+        pool = ConnectionPool(FakeConnection, max_idle=1)
+        with pool.connection() as a, pool.connection() as b:
+            pass
+        assert pool.idle == 1 and a.closed and not b.closed
+        pool.close()
+        assert b.closed and pool.idle == 0
@@ -0,0 +1,114 @@
+"""响应解码单元测试"""
+
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.crawler.utils.decoding import (
+    decode_body,
+    detect_charset,
+    make_decompressor,
+    read_body,
+    response_text,
+)
+
+GBK_PAGE = '<html><head><meta charset="gbk"><title>博牛</title></head><body>帖子内容</body></html>'.encode("gbk")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = gzip.compress(GBK_PAGE)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestCharsetDetection:
+    """字符集识别测试"""
+
+    def test_header_wins_over_meta(self):
+        """测试 Content-Type 字符集优先于 meta"""
+        assert detect_charset("text/html; charset=UTF-8", b'<meta charset="gbk">') == "utf-8"
+
+    def test_meta_sniff(self):
+        """测试从 meta 标签嗅探字符集"""
+        head = b'<meta http-equiv="Content-Type" content="text/html; charset=gb2312">'
+        assert detect_charset("text/html", head) == "gb18030"
+
+    def test_default(self):
+        """测试无法识别时使用默认编码"""
+        assert detect_charset(None, b"<html>", default="utf-8") == "utf-8"
+        assert detect_charset("text/html; charset=bogus", b"") == "utf-8"
+
+    def test_decode_body(self):
+        """测试按嗅探结果一次性解码"""
+        assert "帖子内容" in decode_body(GBK_PAGE, "text/html")
+
+
+class TestDecompression:
+    """增量解压测试"""
+
+    @pytest.mark.parametrize("encoding,compress", [
+        ("gzip", gzip.compress),
+        ("deflate", zlib.compress),
+        ("deflate", lambda data: zlib.compress(data)[2:-4]),  # 裸 deflate
+    ])
+    def test_chunked_decompress(self, encoding, compress):
+        """测试分块解压结果与原文一致"""
+        payload = b"x" * 100000 + GBK_PAGE
+        compressed = compress(payload)
+        decompressor = make_decompressor(encoding)
+        out = bytearray()
+        for i in range(0, len(compressed), 1000):
+            out += decompressor.decompress(compressed[i:i + 1000])
+        out += decompressor.flush()
+        assert bytes(out) == payload
+
+    def test_identity(self):
+        """测试未压缩时不创建解压器"""
+        assert make_decompressor("") is None
+        assert make_decompressor("identity") is None
+
+    def test_unknown_encoding(self):
+        """测试不支持的编码"""
+        with pytest.raises(ValueError):
+            make_decompressor("compress")
+
+
+class TestResponseText:
+    """响应读取测试"""
+
+    def test_streamed_response(self, server_url):
+        """测试流式响应增量解压并按 meta 解码"""
+        resp = requests.get(f"{server_url}/thread-1-1-1.html", stream=True, timeout=5)
+        text = response_text(resp)
+        assert "帖子内容" in text
+        # 回填后 content 仍可访问
+        assert bytes(resp.content) == GBK_PAGE
+        resp.close()
+
+    def test_buffered_response(self, server_url):
+        """测试已读取的响应直接使用 content"""
+        resp = requests.get(f"{server_url}/thread-1-1-1.html", timeout=5)
+        assert read_body(resp) == GBK_PAGE
+        assert "博牛" in response_text(resp)
@@ -0,0 +1,97 @@
+"""Prometheus 指标导出单元测试"""
+
+import urllib.request
+
+from src.crawler.core.base import CrawlerStats
+from src.crawler.utils.circuit_breaker import CircuitBreakerRegistry
+from src.crawler.utils.exporter import MetricsExporter
+from src.crawler.utils.metrics import Stage, StageMetrics
+from src.crawler.utils.rate_limiter import AdaptiveRateLimiter
+from src.crawler.utils.retry import RetryBudget, RetryPolicy
+
+
+class FakeCrawler:
+    """仅提供导出器需要的属性"""
+
+    def __init__(self):
+        self.stats = CrawlerStats(total=3, success=2, failed=1, retries=4)
+        self.retry_policy = RetryPolicy(budget=RetryBudget(10))
+        self.breakers = CircuitBreakerRegistry(failure_threshold=1)
+        self.rate_limiter = AdaptiveRateLimiter(initial_rate=0.5, jitter=0, sleep=lambda s: None)
+
+
+def _lines(text):
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+class TestMetricsExporter:
+    """导出器测试"""
+
+    def test_render_request_and_stage_metrics(self):
+        """测试按主机的请求计数、耗时直方图、字节数与阶段摘要"""
+        metrics = StageMetrics()
+        metrics.record_request("https://bbs.example.com/a", 200, 0.2)
+        metrics.record_request("https://bbs.example.com/b", 200, 3.0)
+        metrics.record_request("https://bbs.example.com/c", None, 0.01)
+        metrics.add_bytes("https://bbs.example.com/a", 2048)
+        metrics.observe(Stage.DB_INSERT, 0.5)
+        metrics.set_gauge("translation_queue_depth", 7)
+
+        lines = _lines(MetricsExporter(metrics).render())
+        assert 'boniu_http_requests_total{host="bbs.example.com",status="200"} 2' in lines
+        assert 'boniu_http_requests_total{host="bbs.example.com",status="error"} 1' in lines
+        assert 'boniu_http_request_duration_seconds_bucket{host="bbs.example.com",le="0.25"} 2' in lines
+        assert 'boniu_http_request_duration_seconds_bucket{host="bbs.example.com",le="+Inf"} 3' in lines
+        assert 'boniu_http_request_duration_seconds_count{host="bbs.example.com"} 3' in lines
+        assert 'boniu_http_response_bytes_total{host="bbs.example.com"} 2048' in lines
+        assert 'boniu_stage_duration_seconds{stage="db_insert",quantile="0.99"} 0.5' in lines
+        assert 'boniu_stage_duration_seconds_count{stage="db_insert"} 1' in lines
+        assert "boniu_translation_queue_depth 7" in lines
+
+    def test_render_crawler_state(self):
+        """测试 CrawlerStats、熔断器与限速器状态"""
+        crawler = FakeCrawler()
+        crawler.breakers.for_url("https://img.example.com/x.jpg").record_failure()
+        crawler.rate_limiter.acquire("https://bbs.example.com/")
+        exporter = MetricsExporter(StageMetrics())
+        exporter.bind_crawler(crawler)
+
+        lines = _lines(exporter.render())
+        assert 'boniu_crawler_results_total{result="success"} 2' in lines
+        assert "boniu_crawler_retries_total 4" in lines
+        assert "boniu_crawler_retry_budget_remaining 10" in lines
+        assert 'boniu_circuit_breaker_state{name="img.example.com"} 2' in lines
+        assert 'boniu_rate_limit_requests_per_second{host="bbs.example.com"} 0.5' in lines
+
+    def test_label_escaping(self):
+        """测试标签值转义"""
+        metrics = StageMetrics()
+        metrics.observe('we"ird\nstage', 1.0)
+        text = MetricsExporter(metrics).render()
+        assert 'stage="we\\"ird\\nstage"' in text
+
+    def test_write_textfile(self, tmp_path):
+        """测试原子写入 textfile"""
+        metrics = StageMetrics()
+        metrics.set_gauge("scheduler_last_run_success", 1)
+        path = MetricsExporter(metrics, textfile_path=str(tmp_path / "prom" / "boniu.prom")).write_textfile()
+        content = (tmp_path / "prom" / "boniu.prom").read_text(encoding="utf-8")
+        assert path.endswith("boniu.prom")
+        assert "boniu_scheduler_last_run_success 1" in content
+        assert list((tmp_path / "prom").iterdir()) == [tmp_path / "prom" / "boniu.prom"]
+
+    def test_write_textfile_without_path(self):
+        """测试未配置路径时不写文件"""
+        assert MetricsExporter(StageMetrics()).write_textfile() is None
+
+    def test_http_endpoint(self):
+        """测试 /metrics HTTP 端点"""
+        metrics = StageMetrics()
+        metrics.set_gauge("translation_queue_depth", 3)
+        exporter = MetricsExporter(metrics, http_port=0)
+        with exporter:
+            port = exporter.start_http_server()
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+                assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "boniu_translation_queue_depth 3" in body
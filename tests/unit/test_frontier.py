@@ -0,0 +1,272 @@
+"""持久化抓取队列与 worker 单元测试
+
+SQLite 后端始终运行；设置 FRONTIER_TEST_REDIS_URL（如 redis://127.0.0.1:6379/15）
+时同样的用例也在 Redis 后端上运行（会清空该库）。
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from src.crawler.sites.worker import FrontierWorker
+from src.crawler.utils.frontier import (
+    STATE_DEAD,
+    STATE_PENDING,
+    TASK_IMAGE,
+    TASK_LIST,
+    TASK_THREAD,
+    SQLiteFrontier,
+    Task,
+    open_frontier,
+)
+from src.crawler.utils.sinks import JsonlSink
+from src.crawler.utils.storage import iter_jsonl
+
+REDIS_URL = os.getenv("FRONTIER_TEST_REDIS_URL")
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_frontier(request, tmp_path):
+    """按参数创建队列（工厂可多次调用，模拟多个 worker 连接同一队列）"""
+    if request.param == "redis":
+        if not REDIS_URL:
+            pytest.skip("未设置 FRONTIER_TEST_REDIS_URL")
+        import redis
+
+        redis.Redis.from_url(REDIS_URL).flushdb()
+        url = REDIS_URL
+    else:
+        url = f"sqlite:///{tmp_path / 'frontier.db'}"
+    opened = []
+
+    def factory(**kwargs):
+        kwargs.setdefault("retry_delay", 0.0)
+        frontier = open_frontier(url, **kwargs)
+        opened.append(frontier)
+        return frontier
+
+    yield factory
+    for frontier in opened:
+        frontier.close()
+
+
+def _task(n, kind=TASK_THREAD, priority=0):
+    return Task("boniu", kind, f"https://example.com/thread-{n}-1-1.html", {"id": n}, priority=priority)
+
+
+class TestFrontier:
+    """队列行为测试（各后端一致）"""
+
+    def test_dedup_on_enqueue(self, make_frontier):
+        frontier = make_frontier()
+        assert frontier.push_many([_task(1), _task(2), _task(1)]) == 2
+        assert not frontier.push(_task(2))
+        assert frontier.counts()[STATE_PENDING] == 2
+
+    def test_priority_then_fifo(self, make_frontier):
+        frontier = make_frontier()
+        frontier.push_many([_task(1), _task(2, TASK_LIST), _task(3, priority=5), _task(4)])
+        order = [t.payload["id"] for t in frontier.lease("w", limit=10)]
+        assert order == [3, 1, 2, 4]
+
+    def test_kind_and_site_filters(self, make_frontier):
+        frontier = make_frontier()
+        frontier.push_many([_task(1, TASK_LIST), _task(2, TASK_IMAGE), Task("other", TASK_LIST, "u")])
+        assert [t.payload["id"] for t in frontier.lease("w", kinds=[TASK_IMAGE])] == [2]
+        assert frontier.lease("w", sites=["missing"]) == []
+        assert [t.site for t in frontier.lease("w", limit=5, sites=["boniu"])] == ["boniu"]
+
+    def test_leased_task_invisible_until_ack(self, make_frontier):
+        frontier = make_frontier()
+        frontier.push(_task(1))
+        (task,) = frontier.lease("a")
+        assert task.attempts == 1 and task.lease_token
+        assert frontier.lease("b") == []
+        assert frontier.ack(task)
+        assert not frontier.ack(task)
+        assert frontier.counts() == {"pending": 0, "leased": 0, "done": 1, "dead": 0}
+        # 已完成的任务不会重复入队，refresh 时重新入队
+        assert not frontier.push(_task(1))
+        assert frontier.push(_task(1), refresh=True)
+        assert frontier.lease("a")[0].attempts == 1
+
+    def test_lease_expiry_makes_task_visible(self, make_frontier):
+        frontier = make_frontier(lease_seconds=0.2)
+        frontier.push(_task(1))
+        (first,) = frontier.lease("crashed")
+        time.sleep(0.3)
+        (second,) = frontier.lease("b")
+        assert second.attempts == 2
+        # 过期租约的持有者不能再确认
+        assert not frontier.ack(first)
+        assert frontier.ack(second)
+
+    def test_retry_then_dead(self, make_frontier):
+        frontier = make_frontier(max_attempts=2)
+        frontier.push(_task(1))
+        (task,) = frontier.lease("w")
+        assert frontier.fail(task, "boom") == STATE_PENDING
+        (task,) = frontier.lease("w")
+        assert frontier.fail(task, "boom") == STATE_DEAD
+        assert frontier.lease("w") == []
+        assert frontier.counts()["dead"] == 1
+        assert frontier.outstanding() == 0
+
+    def test_retry_backoff(self, make_frontier):
+        frontier = make_frontier(retry_delay=60.0)
+        frontier.push(_task(1))
+        (task,) = frontier.lease("w")
+        frontier.fail(task, "boom")
+        assert frontier.lease("w") == []
+        assert frontier.outstanding() == 1
+
+    def test_extend(self, make_frontier):
+        frontier = make_frontier(lease_seconds=0.2)
+        frontier.push(_task(1))
+        (task,) = frontier.lease("w")
+        assert frontier.extend(task, 60)
+        time.sleep(0.3)
+        assert frontier.lease("b") == []
+
+    def test_workers_share_queue(self, make_frontier):
+        frontier = make_frontier()
+        frontier.push_many([_task(n) for n in range(20)])
+        other = make_frontier()
+        seen = []
+        while True:
+            batch = frontier.lease("a", limit=3) + other.lease("b", limit=2)
+            if not batch:
+                break
+            seen.extend(t.payload["id"] for t in batch)
+        assert sorted(seen) == list(range(20))
+
+
+def _lease_all(path, queue):
+    frontier = SQLiteFrontier(path)
+    leased = []
+    while True:
+        tasks = frontier.lease(f"proc-{os.getpid()}", limit=2)
+        if not tasks:
+            break
+        for task in tasks:
+            leased.append(task.payload["id"])
+            frontier.ack(task)
+    frontier.close()
+    queue.put(leased)
+
+
+class TestSQLiteFrontier:
+    """SQLite 后端：多进程共享"""
+
+    def test_processes_never_lease_same_task(self, tmp_path):
+        path = str(tmp_path / "frontier.db")
+        frontier = SQLiteFrontier(path)
+        frontier.push_many([_task(n) for n in range(200)])
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        procs = [ctx.Process(target=_lease_all, args=(path, queue)) for _ in range(3)]
+        for proc in procs:
+            proc.start()
+        results = [queue.get(timeout=60) for _ in procs]
+        for proc in procs:
+            proc.join(timeout=60)
+        leased = [n for result in results for n in result]
+        assert sorted(leased) == list(range(200))
+        assert frontier.counts()["done"] == 200
+
+    def test_open_frontier_rejects_unknown_url(self):
+        with pytest.raises(ValueError):
+            open_frontier("ftp://example.com/queue")
+
+
+def _crawler(server, sink):
+    from src.crawler.sites.boniu.crawler import BoniuCrawler
+
+    crawler = BoniuCrawler(use_db=False)
+    crawler.base_url = server.url.rstrip("/")
+    crawler.enable_translation = False
+    crawler.fids = [89]
+    crawler.set_sinks([sink])
+    return crawler
+
+
+@pytest.mark.parametrize("standin", [dict(pages=2, images_per_thread=2)], indirect=True)
+class TestFrontierWorker:
+    """worker 端到端测试：本地 Discuz 替身站点 + SQLite 队列"""
+
+    def test_two_workers_drain_queue(self, standin, tmp_path):
+        server, _ = standin
+        path = f"sqlite:///{tmp_path / 'frontier.db'}"
+        outputs = [str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")]
+        with open_frontier(path) as frontier, JsonlSink(outputs[0], batch_size=2) as sink_a, \
+                JsonlSink(outputs[1], batch_size=2) as sink_b:
+            first = _crawler(server, sink_a)
+            assert first.seed_frontier(frontier, max_pages=5) == 1
+            workers = [
+                FrontierWorker(frontier, {"boniu": first}, worker_id="a", poll_interval=0.05, concurrency=2),
+                FrontierWorker(open_frontier(path), {"boniu": _crawler(server, sink_b)}, worker_id="b",
+                               poll_interval=0.05),
+            ]
+            threads = [threading.Thread(target=w.run) for w in workers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=120)
+            counts = frontier.counts()
+
+        # 2 个列表页 + 6 个帖子 + 每帖 2 张图片与 1 个头像（头像按 URL 去重）
+        assert counts["pending"] == counts["leased"] == counts["dead"] == 0
+        records = [r for path in outputs for r in iter_jsonl(path)]
+        assert sorted(r["forum_post_id"] for r in records) == sorted(
+            server.fixtures.thread_id(89, page, i) for page in (1, 2) for i in range(3)
+        )
+        assert all(r["content"] for r in records)
+        images = [p for r in records for p in json.loads(r["images"])]
+        assert len(images) == 12
+        for rel in images:
+            assert (tmp_path / rel.replace("images/boniu/", "images/", 1)).exists()
+        assert sum(w.stats.done for w in workers) == counts["done"]
+
+    def test_failed_image_task_retried_then_dead(self, standin, tmp_path):
+        server, _ = standin
+        path = f"sqlite:///{tmp_path / 'frontier.db'}"
+        with open_frontier(path, max_attempts=2, retry_delay=0.0) as frontier, \
+                JsonlSink(str(tmp_path / "out.jsonl")) as sink:
+            frontier.push(Task("boniu", TASK_IMAGE, f"{server.url}/missing.jpg", {"path": "x/missing.jpg"}))
+            stats = FrontierWorker(frontier, {"boniu": _crawler(server, sink)}, poll_interval=0.01).run()
+        assert (stats.retried, stats.dead) == (1, 1)
+        # 两次领取都真正请求了替身站点（404），而不是 URL 解析失败
+        assert server.paths["/missing.jpg"] == 2
+
+    def test_translation_outside_write_lock(self, standin, tmp_path):
+        # 翻译请求可能阻塞，期间不能占用写锁（worker 确认任务时要取同一把锁）
+        server, _ = standin
+        path = f"sqlite:///{tmp_path / 'frontier.db'}"
+        held = []
+        with open_frontier(path) as frontier, JsonlSink(str(tmp_path / "out.jsonl")) as sink:
+            crawler = _crawler(server, sink)
+            crawler.enable_translation = True
+            crawler._translate_text = lambda text, *args: held.append(crawler._write_lock.locked()) or text
+            crawler.seed_frontier(frontier, max_pages=1)
+            stats = FrontierWorker(frontier, {"boniu": crawler}, poll_interval=0.01).run()
+        assert stats.done > 0
+        assert held and not any(held)
+
+    def test_reseed_skips_known_threads(self, standin, tmp_path):
+        server, _ = standin
+        path = f"sqlite:///{tmp_path / 'frontier.db'}"
+        with open_frontier(path) as frontier, JsonlSink(str(tmp_path / "out.jsonl")) as sink:
+            crawler = _crawler(server, sink)
+            crawler.seed_frontier(frontier, max_pages=1)
+            FrontierWorker(frontier, {"boniu": crawler}, poll_interval=0.01).run()
+            done = frontier.counts()["done"]
+            # 第二次运行：列表页重新入队，帖子已完成不再入队
+            assert crawler.seed_frontier(frontier, max_pages=1) == 1
+            stats = FrontierWorker(frontier, {"boniu": crawler}, poll_interval=0.01).run()
+        assert stats.done == 1
+        assert len(list(iter_jsonl(str(tmp_path / "out.jsonl")))) == 3
+        assert frontier.counts()["done"] == done
@@ -0,0 +1,140 @@
+"""HTTP/2 传输单元测试"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.crawler.utils import http2 as http2_module
+from src.crawler.utils.http2 import Http2Session, Http2Transport
+from src.crawler.utils.http_client import HttpClientRegistry
+
+
+class _H1Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"h1"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def h1_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _H1Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class TestHttp2Session:
+    """HTTP/2 会话测试"""
+
+    def test_falls_back_without_httpx(self, monkeypatch, h1_url):
+        """测试未安装 httpx[http2] 时走 HTTP/1.1"""
+        monkeypatch.setattr(http2_module, "http2_available", lambda: False)
+        session = Http2Session(requests.Session())
+        assert not session.enabled
+        resp = session.get(f"{h1_url}/a", timeout=5)
+        assert isinstance(resp, requests.Response)
+        assert resp.text == "h1"
+
+    def test_headers_shared_with_fallback(self):
+        """测试请求头与回退会话共享"""
+        fallback = requests.Session()
+        session = Http2Session(fallback)
+        session.headers.update({"Referer": "https://bbs.example.com"})
+        assert fallback.headers["Referer"] == "https://bbs.example.com"
+        session.close()
+
+    def test_multiplexed_h2c(self):
+        """测试 h2c 请求走 HTTP/2"""
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        from benchmarks.h2_server import H2TestServer
+
+        with H2TestServer(b"<html>ok</html>", latency=0.01) as server:
+            session = Http2Session(requests.Session(), max_connections=1, http1=False)
+            try:
+                resp = session.get(f"{server.url}/thread-1-1-1.html", timeout=5)
+                assert resp.http_version == "HTTP/2"
+                assert resp.status_code == 200
+                assert resp.text == "<html>ok</html>"
+            finally:
+                session.close()
+
+    def test_sessions_share_one_connection(self):
+        """测试共用同一传输的会话在一条 HTTP/2 连接上多路复用"""
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        from benchmarks.h2_server import H2TestServer
+
+        with H2TestServer(b"<html>ok</html>", latency=0.05) as server:
+            transport = Http2Transport(max_connections=1, http1=False)
+            pages = Http2Session(requests.Session(), transport=transport)
+            images = Http2Session(requests.Session(), transport=transport)
+            try:
+                urls = [(pages, f"{server.url}/thread-{i}-1-1.html") for i in range(4)]
+                urls += [(images, f"{server.url}/data/attachment/{i}.jpg") for i in range(4)]
+                with ThreadPoolExecutor(8) as pool:
+                    responses = list(pool.map(lambda item: item[0].get(item[1], timeout=5), urls))
+                assert all(r.http_version == "HTTP/2" for r in responses)
+                assert server.connections == 1
+                # 关闭单个会话不影响共享传输
+                pages.close()
+                assert images.get(f"{server.url}/a.jpg", timeout=5).status_code == 200
+            finally:
+                transport.close()
+        assert transport._loop.is_closed() and not transport._thread.is_alive()
+        assert not images.enabled
+
+    def test_registry_owns_transport(self):
+        """测试注册表创建的会话共用一个传输，注册表关闭时关闭事件循环"""
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        registry = HttpClientRegistry(dns_cache_ttl=0, http2=True)
+        a, b = registry.create_session(), registry.create_session()
+        assert a.transport is b.transport is not None
+        a.close()
+        assert not a.transport.closed
+        registry.close()
+        assert a.transport.closed and a.transport._loop.is_closed()
+
+    def test_cookies_stay_per_session(self):
+        """测试 Cookie 由各会话携带，不经共享客户端串到其他会话"""
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        import httpx
+
+        transport = Http2Transport()
+        a = Http2Session(requests.Session(), transport=transport)
+        b = Http2Session(requests.Session(), transport=transport)
+        try:
+            a.cookies.set("sid", "1", domain="bbs.example.com")
+            assert a._merge_headers("GET", "https://bbs.example.com/x", None)["Cookie"] == "sid=1"
+            assert "Cookie" not in b._merge_headers("GET", "https://bbs.example.com/x", None)
+            request = httpx.Request("GET", "https://bbs.example.com/x")
+            b._store_cookies(httpx.Response(200, headers={"Set-Cookie": "token=2; Path=/"}, request=request))
+            assert b.cookies.get("token") == "2" and "token" not in a.cookies
+            assert len(transport.client.cookies.jar) == 0
+        finally:
+            transport.close()
+
+    def test_protocol_error_pins_host_to_http1(self, h1_url):
+        """测试 HTTP/2 协议失败后该主机回退 HTTP/1.1"""
+        pytest.importorskip("h2")
+        pytest.importorskip("httpx")
+        session = Http2Session(requests.Session(), http1=False)
+        try:
+            resp = session.get(f"{h1_url}/a", timeout=5)
+            assert resp.text == "h1"
+            assert session.transport.pinned_to_http1(h1_url.split("//")[1])
+        finally:
+            session.close()
@@ -0,0 +1,105 @@
+"""共享HTTP客户端注册表单元测试"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.crawler.utils.http_client import DnsCache, HttpClientRegistry
+
+
+class TestHttpClientRegistry:
+    """HTTP客户端注册表测试"""
+
+    def test_sessions_share_adapter(self):
+        """测试不同会话共享同一连接池且请求头互相独立"""
+        registry = HttpClientRegistry(pool_connections=4, pool_maxsize=6, dns_cache_ttl=0)
+        a = registry.create_session({"X-A": "1"})
+        b = registry.create_session()
+        assert a.get_adapter("https://x.com/") is b.get_adapter("https://x.com/")
+        assert "X-A" not in b.headers
+        assert registry.adapter._pool_maxsize == 6
+
+    def test_session_close_keeps_pool(self):
+        """测试关闭单个会话不会清空共享连接池"""
+        registry = HttpClientRegistry(dns_cache_ttl=0)
+        session = registry.create_session()
+        poolmanager = registry.adapter.poolmanager
+        poolmanager.connection_from_url("http://example.com/")
+        session.close()
+        assert len(poolmanager.pools) == 1
+        registry.close()
+        assert len(poolmanager.pools) == 0
+
+
+class TestDnsCache:
+    """DNS缓存测试"""
+
+    def test_caches_lookups(self, monkeypatch):
+        """测试同一主机只解析一次，且不替换 socket.getaddrinfo"""
+        calls = []
+
+        def fake_getaddrinfo(host, port, *args):
+            calls.append(host)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))] * 2
+
+        monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+        cache = DnsCache(ttl=60)
+        assert cache.resolve("bbs.example.com", 443) == ["10.0.0.1"]
+        assert cache.resolve("bbs.example.com", 443) == ["10.0.0.1"]
+        assert calls == ["bbs.example.com"]
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert socket.getaddrinfo is fake_getaddrinfo
+
+    def test_entry_cap(self, monkeypatch):
+        """测试超过条目上限时淘汰最早写入的条目"""
+        monkeypatch.setattr(socket, "getaddrinfo", lambda host, port, *args: [(0, 0, 0, "", (host, port))])
+        cache = DnsCache(ttl=60, max_entries=3)
+        for i in range(5):
+            cache.getaddrinfo(f"h{i}", 80)
+        assert len(cache) == 3
+        cache.getaddrinfo("h4", 80)
+        cache.getaddrinfo("h0", 80)
+        assert (cache.hits, cache.misses) == (1, 6)
+
+    def test_used_by_shared_adapter_only(self, monkeypatch):
+        """测试共享连接池新建连接时经缓存解析，请求仍使用原主机名"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _CloseHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        original = socket.getaddrinfo
+        lookups = []
+
+        def counting_getaddrinfo(host, *args, **kwargs):
+            lookups.append(host)
+            return original("127.0.0.1" if host == "crawler.test" else host, *args, **kwargs)
+
+        monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+        registry = HttpClientRegistry(dns_cache_ttl=60)
+        try:
+            a, b = registry.create_session(), registry.create_session()
+            host = f"crawler.test:{server.server_address[1]}"
+            # 服务端每次关闭连接，3 次请求各自新建连接
+            assert [session.get(f"http://{host}/x", timeout=5).text for session in (a, b, a)] == [host] * 3
+            assert lookups.count("crawler.test") == 1
+            assert registry.snapshot()["dns_cache"] == {"hits": 2, "misses": 1}
+            assert socket.getaddrinfo is counting_getaddrinfo
+        finally:
+            registry.close()
+            server.shutdown()
+
+
+class _CloseHandler(BaseHTTPRequestHandler):
+    """回显 Host 头并关闭连接"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.headers["Host"].encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
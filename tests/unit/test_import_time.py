@@ -0,0 +1,81 @@
+"""导入耗时预算测试
+
+CLI 短命令（--help、translate --stats）与调度器每次冷启动都要付出导入成本，
+这里在子进程中导入，确认重依赖只在真正用到时才加载。
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 只应在抓取/导出 CSV 时加载的依赖
+HEAVY_MODULES = ("pandas", "bs4", "fake_useragent", "pymysql", "yaml", "requests", "brotli")
+
+# src.cli.main 的累计导入耗时预算（微秒）；懒加载后实测约 20ms，预算留足余量
+CLI_IMPORT_BUDGET_US = 500_000
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def _loaded_heavy_modules(module: str) -> list:
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = _run(code)
+    assert result.returncode == 0, result.stderr
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+class TestLazyImports:
+    """懒加载测试"""
+
+    def test_cli_does_not_load_crawler_dependencies(self):
+        assert _loaded_heavy_modules("src.cli.main") == []
+
+    def test_storage_does_not_load_pandas(self):
+        assert "pandas" not in _loaded_heavy_modules("src.crawler.utils.storage")
+
+    def test_utils_submodule_does_not_load_siblings(self):
+        """测试导入单个工具子模块不会经由包 __init__ 加载 bs4/fake_useragent"""
+        assert _loaded_heavy_modules("src.crawler.utils.metrics") == []
+
+    def test_lazy_exports_still_resolve(self):
+        from src.crawler import BoniuCrawler
+        from src.crawler.core import RequestsCrawler
+        from src.crawler.sites.boniu.crawler import BoniuCrawler as Direct
+        from src.crawler.utils import clean_text, save_data
+
+        assert BoniuCrawler is Direct
+        assert issubclass(BoniuCrawler, RequestsCrawler)
+        assert clean_text("  a  b ") == "a b"
+        assert callable(save_data)
+
+
+class TestImportBudget:
+    """导入耗时预算测试"""
+
+    def test_cli_import_time_budget(self):
+        result = _run("import src.cli.main", "-X", "importtime")
+        assert result.returncode == 0, result.stderr
+        match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| src\.cli\.main$", result.stderr, re.M)
+        assert match, result.stderr[-2000:]
+        assert int(match.group(1)) < CLI_IMPORT_BUDGET_US
+
+    def test_help_exits_quickly(self):
+        result = subprocess.run(
+            [sys.executable, "main.py", "--help"], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0
+        assert "crawl" in result.stdout
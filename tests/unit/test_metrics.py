@@ -0,0 +1,100 @@
+"""阶段耗时指标单元测试"""
+
+import pytest
+
+from src.crawler.utils.http import measure_time
+from src.crawler.utils.metrics import Histogram, Stage, StageMetrics
+
+
+class TestHistogram:
+    """直方图测试"""
+
+    def test_percentiles(self):
+        """测试最近秩分位数"""
+        h = Histogram()
+        for i in range(1, 101):
+            h.observe(i / 100.0)
+        assert h.percentile(50) == pytest.approx(0.50)
+        assert h.percentile(95) == pytest.approx(0.95)
+        assert h.percentile(99) == pytest.approx(0.99)
+        summary = h.summary()
+        assert summary["count"] == 100
+        assert summary["min"] == pytest.approx(0.01)
+        assert summary["max"] == pytest.approx(1.0)
+
+    def test_reservoir_bounded(self):
+        """测试样本数受上限约束，计数与总和仍精确"""
+        h = Histogram(max_samples=10)
+        for _ in range(1000):
+            h.observe(1.0, nbytes=2)
+        assert len(h._samples) == 10
+        assert h.count == 1000
+        assert h.total == pytest.approx(1000.0)
+        assert h.bytes == 2000
+
+    def test_empty(self):
+        """测试空直方图"""
+        assert Histogram().summary() == {"count": 0, "total": 0.0, "bytes": 0}
+
+
+class TestStageMetrics:
+    """阶段指标测试"""
+
+    def test_timer_records_duration_and_bytes(self, clock):
+        """测试计时上下文记录耗时与字节数"""
+        metrics = StageMetrics(clock=clock)
+        with metrics.timer(Stage.DETAIL_PARSE) as timing:
+            clock.now += 0.25
+            timing.bytes = 1024
+        stage = metrics.summary()["stages"][Stage.DETAIL_PARSE]
+        assert stage["count"] == 1
+        assert stage["total"] == pytest.approx(0.25)
+        assert stage["bytes"] == 1024
+
+    def test_timer_records_on_exception(self, clock):
+        """测试代码块抛异常时仍记录耗时"""
+        metrics = StageMetrics(clock=clock)
+        with pytest.raises(ValueError):
+            with metrics.timer(Stage.DB_INSERT):
+                clock.now += 1.0
+                raise ValueError("boom")
+        assert metrics.histogram(Stage.DB_INSERT).count == 1
+
+    def test_format_summary_sorted_by_total(self):
+        """测试日志行按总耗时降序"""
+        metrics = StageMetrics()
+        metrics.observe(Stage.TRANSLATE, 0.1)
+        metrics.observe(Stage.DETAIL_FETCH, 2.0)
+        lines = metrics.format_summary()
+        assert lines[0].startswith(Stage.DETAIL_FETCH)
+        assert lines[1].startswith(Stage.TRANSLATE)
+
+    def test_reset(self):
+        """测试清空指标"""
+        metrics = StageMetrics()
+        metrics.observe(Stage.LIST_FETCH, 0.5)
+        metrics.reset()
+        assert metrics.summary()["stages"] == {}
+
+
+class TestMeasureTime:
+    """measure_time 装饰器测试"""
+
+    def test_records_into_global_metrics(self, monkeypatch):
+        """测试耗时计入全局指标"""
+        from src.crawler.utils import metrics as metrics_module
+        metrics = StageMetrics()
+        monkeypatch.setattr(metrics_module, "_metrics", metrics)
+
+        @measure_time(stage="custom_stage")
+        def work():
+            return 42
+
+        @measure_time
+        def plain():
+            return 1
+
+        assert work() == 42
+        assert plain() == 1
+        assert metrics.histogram("custom_stage").count == 1
+        assert metrics.histogram(plain.__qualname__).count == 1
@@ -0,0 +1,63 @@
+"""解析进程池与纯解析函数单元测试"""
+
+import pytest
+
+from benchmarks.discuz_server import DiscuzFixtures
+from src.crawler.config import settings as settings_module
+from src.crawler.sites.boniu.extract import extract_detail, extract_list, parse_detail, parse_list
+from src.crawler.sites.spec import load_site_spec
+from src.crawler.utils.parse_pool import ParsePool, close_parse_pool, get_parse_pool
+
+BASE_URL = "https://bbs.boniu123.cc"
+LIST_URL = f"{BASE_URL}/forum.php?mod=forumdisplay&fid=89&page=1"
+
+
+def _without_crawl_time(posts):
+    return [{k: v for k, v in post.items() if k != "crawl_time"} for post in posts]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(2)
+    yield pool
+    pool.close()
+
+
+class TestParsePool:
+    """子进程解析结果与当前进程一致"""
+
+    def test_list_page(self, pool):
+        html = DiscuzFixtures(pages=1, threads_per_page=5).list_page(89, 1)
+        expected = parse_list(load_site_spec("boniu"), html, BASE_URL, LIST_URL)
+        result = pool.run(extract_list, "boniu", html, BASE_URL, LIST_URL)
+        assert len(result) == 5
+        assert _without_crawl_time(result) == _without_crawl_time(expected)
+        assert {p["fid"] for p in result} == {"89"}
+
+    def test_detail_page(self, pool):
+        fixtures = DiscuzFixtures(pages=1, threads_per_page=1, images_per_thread=3)
+        html = fixtures.thread_page(fixtures.thread_id(89, 1, 0))
+        content, images = pool.run(extract_detail, "boniu", html, BASE_URL)
+        assert (content, images) == parse_detail(load_site_spec("boniu"), html, BASE_URL)
+        assert content and len(images) == 3
+
+    def test_errors_propagate(self, pool):
+        with pytest.raises(FileNotFoundError):
+            pool.run(extract_detail, "no-such-site", "<html></html>", BASE_URL)
+
+
+class TestGetParsePool:
+    """全局进程池按配置创建"""
+
+    def test_disabled_by_default(self):
+        assert get_parse_pool() is None
+
+    def test_enabled(self):
+        settings_module.get_settings().crawler.parse_workers = 2
+        try:
+            pool = get_parse_pool()
+            assert pool is get_parse_pool()
+            assert pool.workers == 2
+        finally:
+            close_parse_pool()
+            settings_module.reload_settings()
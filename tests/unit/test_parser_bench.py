@@ -0,0 +1,62 @@
+"""解析热点微基准单元测试"""
+
+from benchmarks.parsers import build_cases, compare, load_fixtures, measure, run_suite
+from src.crawler.utils.archive import PageArchive
+
+
+class TestFixtures:
+    """夹具加载测试"""
+
+    def test_synthetic_when_no_recordings(self, tmp_path):
+        fixtures = load_fixtures(str(tmp_path))
+        assert fixtures["source"] == "synthetic"
+        assert fixtures["list_pages"] and fixtures["thread_pages"]
+
+    def test_recorded_pages(self, tmp_path):
+        (tmp_path / "list_fid89_p1_20261019_120000.html").write_text("<table></table>", encoding="utf-8")
+        (tmp_path / "thread_1_20261019_120000.html").write_text("<td class='t_f'>x</td>", encoding="utf-8")
+        fixtures = load_fixtures(str(tmp_path))
+        assert fixtures["source"] == "recorded"
+        assert len(fixtures["list_pages"]) == 1
+
+    def test_archived_pages(self, tmp_path):
+        base = "https://bbs.boniu123.cc"
+        with PageArchive(str(tmp_path)) as archive:
+            archive.put(f"{base}/", "<html>home</html>")
+            archive.put(f"{base}/forum.php?mod=forumdisplay&fid=89&page=1", "<table></table>")
+            archive.put(f"{base}/thread-1-1-1.html", "<td class='t_f'>x</td>", key="1")
+            archive.put(f"{base}/thread-2-1-1.html", "Not Found", key="2", status=404)
+        fixtures = load_fixtures(str(tmp_path))
+        assert fixtures["source"] == "recorded"
+        assert (fixtures["list_pages"], fixtures["thread_pages"]) == (["<table></table>"], ["<td class='t_f'>x</td>"])
+
+    def test_cases_parse_synthetic_pages(self, tmp_path):
+        """测试合成页面能被真实解析逻辑识别（避免基准测的是空操作）"""
+        cases = build_cases(load_fixtures(str(tmp_path)))
+        posts = [p for p in cases["parse_post_row"]() if p]
+        assert len(posts) == 30
+        for content, images in cases["fetch_post_content"]():
+            assert content
+            assert len(images) == 3
+
+
+class TestMeasure:
+    """测量与基线比较测试"""
+
+    def test_measure(self):
+        result = measure(lambda: [0] * 1000, min_time=0.001, rounds=2)
+        assert result["ops_per_sec"] > 0
+        assert result["alloc_peak_bytes"] >= 8000
+
+    def test_run_suite_only(self, tmp_path):
+        result = run_suite(load_fixtures(str(tmp_path)), min_time=0.001, rounds=1, only=["clean_text"])
+        assert list(result["cases"]) == ["clean_text"]
+
+    def test_compare(self):
+        baseline = {"cases": {"a": {"ops_per_sec": 100.0, "alloc_peak_bytes": 1000}}}
+        ok = {"cases": {"a": {"ops_per_sec": 90.0, "alloc_peak_bytes": 1100}}}
+        slow = {"cases": {"a": {"ops_per_sec": 50.0, "alloc_peak_bytes": 5000}, "new": {"ops_per_sec": 1.0}}}
+        assert compare(ok, baseline, 0.25) == []
+        regressions = compare(slow, baseline, 0.25)
+        assert len(regressions) == 2
+        assert regressions[0].startswith("a: 吞吐")
@@ -0,0 +1,156 @@
+"""详情抓取优先级与运行预算单元测试"""
+
+from datetime import datetime
+
+import pytest
+
+from benchmarks.sqlite_db import BONIU_POST_TABLE
+from src.crawler.config import settings as settings_module
+from src.crawler.config.settings import ScheduleConfig
+from src.crawler.sites.boniu import crawler as crawler_module
+from src.crawler.utils.priority import CrawlBudget, DetailQueue, priority_bucket, score_post
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _post(**fields):
+    post = {'fid': '89', 'reply_count': 0, 'is_essence': False, 'last_reply_time': None, 'publish_time': None}
+    post.update(fields)
+    return post
+
+
+class TestScorePost:
+    """新鲜度、精华、回复数与版块权重"""
+
+    def test_freshness_half_life(self):
+        config = ScheduleConfig(freshness_half_life=24)
+        assert score_post(_post(last_reply_time="2026-10-19 12:00:00"), config, NOW) == pytest.approx(1.0)
+        assert score_post(_post(last_reply_time="2026-10-18 12:00:00"), config, NOW) == pytest.approx(0.5)
+        # 没有最后回复时间时用发帖时间，无法解析的时间不计新鲜度
+        assert score_post(_post(publish_time="2026-10-17 12:00"), config, NOW) == pytest.approx(0.25)
+        assert score_post(_post(publish_time="昨天 12:00"), config, NOW) == 0.0
+
+    def test_essence_and_replies(self):
+        config = ScheduleConfig(freshness_weight=0, reply_saturation=99)
+        assert score_post(_post(is_essence=True), config, NOW) == pytest.approx(1.0)
+        assert score_post(_post(reply_count=9), config, NOW) == pytest.approx(0.5)
+        assert score_post(_post(reply_count=10000), config, NOW) == pytest.approx(1.0)
+
+    def test_fid_weight(self):
+        config = ScheduleConfig(freshness_weight=0, fid_weights={"734": 3.0, "89": 0})
+        assert score_post(_post(fid="734", is_essence=True), config, NOW) == pytest.approx(3.0)
+        assert score_post(_post(fid="89", is_essence=True), config, NOW) == 0.0
+
+    def test_bucket(self):
+        config = ScheduleConfig()
+        assert [priority_bucket(score, config) for score in (0, 1.5, 3, 9)] == [0, 5, 9, 9]
+
+
+class TestDetailQueue:
+    """高分先出，同分按入队顺序"""
+
+    def test_order(self):
+        queue = DetailQueue()
+        for name, score in [("a", 1), ("b", 3), ("c", 1), ("d", 2)]:
+            queue.push({'id': name}, score, "new")
+        assert [post['id'] for _, post in queue.pop_batch(3)] == ["b", "d", "a"]
+        assert len(queue) == 1 and queue.pop_batch(5) == [("new", {'id': "c"})]
+
+
+class TestCrawlBudget:
+    """时间与请求预算"""
+
+    def test_limits(self):
+        now, requests = [100.0], [7]
+        budget = CrawlBudget(10, 5, requests=lambda: requests[0], clock=lambda: now[0])
+        assert budget.limited and budget.exhausted() is None
+        requests[0] = 12
+        assert budget.used_requests() == 5 and budget.exhausted() == "requests"
+        requests[0] = 7
+        now[0] = 110.0
+        assert budget.exhausted() == "time"
+
+    def test_share(self):
+        now, requests = [100.0], [0]
+        budget = CrawlBudget(10, 10, requests=lambda: requests[0], clock=lambda: now[0])
+        requests[0] = 5
+        assert budget.exhausted(0.5) == "requests" and budget.exhausted() is None
+        requests[0] = 0
+        now[0] = 105.0
+        assert budget.exhausted(0.5) == "time" and budget.exhausted() is None
+
+    def test_unlimited(self):
+        budget = CrawlBudget()
+        assert not budget.limited and budget.exhausted() is None
+
+    def test_request_budget_needs_counter(self):
+        with pytest.raises(ValueError):
+            CrawlBudget(request_budget=1)
+
+
+def _crawl(refresh=False, max_pages=1):
+    crawler = crawler_module.BoniuCrawler()
+    crawler.enable_translation = False
+    crawler.fids = [89]
+    return crawler.crawl_paginated_and_store(max_pages=max_pages, refresh=refresh)
+
+
+def _stored(store):
+    return {int(row["forum_post_id"]) for row in store.fetch_all(f"SELECT forum_post_id FROM {BONIU_POST_TABLE}")}
+
+
+@pytest.mark.parametrize("standin", [dict(pages=4, threads_per_page=6)], indirect=True)
+class TestScheduledCrawl:
+    """设置运行预算时按分数抓取详情，预算耗尽后停止，未抓取的帖子下次运行补抓"""
+
+    def test_request_budget_fetches_best_first(self, standin):
+        server, store = standin
+        fixtures = server.fixtures
+        tids = [fixtures.thread_id(89, 1, i) for i in range(6)]
+        fixtures.set_essence(tids[1])
+        fixtures.set_essence(tids[4])
+        # 首页 + 列表页 + 2 个详情页（每批 1 条）
+        settings_module.get_settings().schedule.request_budget = 4
+        stats = _crawl()
+
+        assert _stored(store) == {tids[1], tids[4]}
+        assert stats["total_posts"] == 2 and stats["fid_stats"] == {89: 2}
+        assert stats["schedule"] == {
+            "queued": 6, "skipped": 4, "stopped": "requests", "requests": 4, "elapsed": stats["schedule"]["elapsed"],
+        }
+
+        settings_module.get_settings().schedule.request_budget = 0
+        assert _crawl()["total_posts"] == 4
+        assert _stored(store) == set(tids)
+
+    def test_budget_reserved_for_details(self, standin):
+        server, store = standin
+        fixtures = server.fixtures
+        tids = [fixtures.thread_id(89, 1, i) for i in range(6)]
+        fixtures.set_essence(tids[2])
+        fixtures.set_essence(tids[5])
+        # 4 页列表就会用完预算；翻页最多用一半（首页 + 第 1 页），剩余预算抓取分数最高的 2 个详情
+        settings_module.get_settings().schedule.request_budget = 4
+        stats = _crawl(max_pages=4)
+
+        assert _stored(store) == {tids[2], tids[5]}
+        assert stats["schedule"]["queued"] == 6 and stats["schedule"]["stopped"] == "requests"
+        assert server.paths.get("/forum.php") == 1
+
+    def test_refresh_goes_through_queue(self, standin):
+        server, store = standin
+        tid = server.fixtures.thread_id(89, 1, 0)
+        _crawl()
+        server.fixtures.add_reply(tid, 60)
+        # 首页 + 列表页 + 1 个待刷新的详情页，刚好用完预算
+        settings_module.get_settings().schedule.request_budget = 3
+        stats = _crawl(refresh=True)
+        assert stats["refresh"]["checked"] == 1 and stats["refresh"]["unchanged"] == 1
+        assert (stats["schedule"]["queued"], stats["schedule"]["skipped"], stats["schedule"]["stopped"]) == (1, 0, None)
+
+    def test_time_budget_stops_before_listing(self, standin):
+        server, store = standin
+        settings_module.get_settings().schedule.time_budget = 1e-9
+        stats = _crawl()
+        assert stats["total_posts"] == 0 and stats["schedule"]["stopped"] == "time"
+        assert server.requests == 0 and _stored(store) == set()
@@ -0,0 +1,89 @@
+"""性能剖析单元测试"""
+
+import sys
+import time
+
+import pytest
+
+from src.crawler.utils.profiling import SamplingProfiler, profile_session
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class TestSamplingProfiler:
+    """采样剖析器测试"""
+
+    def test_collects_hot_function(self):
+        """测试采样到忙循环函数"""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy_loop(0.2)
+        profiler.stop()
+
+        assert profiler.samples > 0
+        collapsed = profiler.collapsed()
+        assert "busy_loop" in collapsed
+        # 折叠栈每行为 "帧;帧;... 次数"，首帧为线程名
+        line = next(l for l in collapsed.splitlines() if "busy_loop" in l)
+        stack, count = line.rsplit(" ", 1)
+        assert stack.split(";")[0] == "MainThread"
+        assert int(count) > 0
+        inclusive = dict(profiler.hot_functions(top_n=1000)["inclusive"])
+        assert any("busy_loop" in label for label in inclusive)
+
+    def test_report(self):
+        """测试报告包含两个 Top-N 区块"""
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy_loop(0.05)
+        profiler.stop()
+        report = profiler.report(top_n=5)
+        assert "自身耗时 Top 5" in report
+        assert "累计耗时 Top 5" in report
+
+
+class TestProfileSession:
+    """剖析上下文测试"""
+
+    def test_sampling_outputs(self, tmp_path):
+        """测试采样模式写出折叠栈与报告"""
+        prefix = str(tmp_path / "19_crawl_230000")
+        with profile_session("crawl", "sampling", output_prefix=prefix, interval=0.001) as outputs:
+            busy_loop(0.05)
+        assert outputs["collapsed"].endswith(".collapsed")
+        assert "busy_loop" in open(outputs["collapsed"], encoding="utf-8").read()
+        assert open(outputs["report"], encoding="utf-8").read()
+
+    def test_cprofile_outputs(self, tmp_path):
+        """测试 cProfile 模式写出 .prof 与报告"""
+        prefix = str(tmp_path / "19_translate_230000")
+        with profile_session("translate", "cprofile", output_prefix=prefix) as outputs:
+            busy_loop(0.02)
+        assert outputs["profile"].endswith(".prof")
+        assert "busy_loop" in open(outputs["report"], encoding="utf-8").read()
+
+    def test_invalid_mode(self, tmp_path):
+        """测试不支持的剖析模式"""
+        with pytest.raises(ValueError):
+            with profile_session("crawl", "perf", output_prefix=str(tmp_path / "x")):
+                pass
+
+
+class TestCliProfileArgs:
+    """CLI 剖析参数测试"""
+
+    def test_script_args_drop_env_and_profile(self, monkeypatch):
+        """测试传给翻译脚本的参数中去掉 --env 与 --profile"""
+        from src.cli.main import _script_args
+        monkeypatch.setattr(sys, "argv", [
+            "main.py", "translate", "--env", "dev", "--profile", "cprofile", "--batch-size", "5",
+        ])
+        assert _script_args() == ["--batch-size", "5"]
+        monkeypatch.setattr(sys, "argv", ["main.py", "translate", "--profile", "--auto"])
+        assert _script_args() == ["--auto"]
@@ -0,0 +1,57 @@
+"""自适应限速器单元测试"""
+
+import pytest
+from src.crawler.utils.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+@pytest.fixture
+def limiter(clock):
+    return AdaptiveRateLimiter(
+        initial_rate=1.0, min_rate=0.1, max_rate=2.0,
+        increase_step=0.5, decrease_factor=0.5, slow_threshold=5.0,
+        jitter=0, clock=clock, sleep=clock.sleep,
+    )
+
+
+class TestAdaptiveRateLimiter:
+    """自适应限速器测试"""
+
+    def test_reserve_spaces_requests_per_host(self, limiter):
+        """测试同一主机的请求按速率间隔"""
+        assert limiter.reserve("https://a.com/1") == 0
+        assert limiter.reserve("https://a.com/2") == pytest.approx(1.0)
+        # 不同主机互不影响
+        assert limiter.reserve("https://b.com/1") == 0
+
+    def test_acquire_sleeps(self, limiter, clock):
+        """测试 acquire 实际休眠"""
+        limiter.acquire("https://a.com/1")
+        limiter.acquire("https://a.com/2")
+        assert clock.slept == [pytest.approx(1.0)]
+
+    def test_additive_increase(self, limiter):
+        """测试正常响应后速率加性增长且不超过上限"""
+        limiter.record("https://a.com/", 200, 0.3)
+        assert limiter.get_rate("a.com") == pytest.approx(1.5)
+        for _ in range(5):
+            limiter.record("https://a.com/", 200, 0.3)
+        assert limiter.get_rate("https://a.com/x") == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("status,elapsed", [(429, 0.1), (503, 0.1), (None, 1.0), (200, 8.0)])
+    def test_multiplicative_decrease(self, limiter, status, elapsed):
+        """测试 429/5xx/网络异常/慢响应时速率减半"""
+        limiter.record("https://a.com/", status, elapsed)
+        assert limiter.get_rate("a.com") == pytest.approx(0.5)
+        assert limiter.snapshot()["a.com"]["backoffs"] == 1
+
+    def test_retry_after_pushes_next_request(self, limiter):
+        """测试 Retry-After 推迟下一次请求"""
+        limiter.record("https://a.com/", 429, 0.1, retry_after=30)
+        assert limiter.reserve("https://a.com/") == pytest.approx(30)
+
+    def test_parse_retry_after(self):
+        """测试 Retry-After 解析"""
+        assert parse_retry_after("12") == 12.0
+        assert parse_retry_after("") is None
+        assert parse_retry_after("not-a-date") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,131 @@
+"""增量刷新单元测试：本地 Discuz 替身站点 + SQLite 替身库"""
+
+import pytest
+
+from benchmarks.sqlite_db import BONIU_POST_TABLE
+from src.crawler.sites.boniu import crawler as crawler_module
+from src.crawler.sites.boniu.extract import content_hash, normalize_datetime, parse_count
+
+
+def _crawl(refresh=True):
+    crawler = crawler_module.BoniuCrawler()
+    crawler.enable_translation = False
+    crawler.fids = [89]
+    return crawler.crawl_paginated_and_store(max_pages=1, refresh=refresh)
+
+
+def _thread_fetches(server, before):
+    return {
+        path: count - before.get(path, 0)
+        for path, count in server.paths.items()
+        if path.startswith("/thread-") and count > before.get(path, 0)
+    }
+
+
+def _rows(store):
+    rows = store.fetch_all(
+        f"SELECT forum_post_id, reply_count, view_count, last_reply_time, content, content_hash, images "
+        f"FROM {BONIU_POST_TABLE}"
+    )
+    return {int(row["forum_post_id"]): row for row in rows}
+
+
+class TestNormalizeDatetime:
+    """列表页时间规范化"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("2026-10-19 12:05", "2026-10-19 12:05:00"),
+        ("发表于 2026-1-9 8:05:30", "2026-01-09 08:05:30"),
+        ("2026-10-19", "2026-10-19 00:00:00"),
+        ("昨天 12:05", None),
+        (None, None),
+    ])
+    def test_formats(self, text, expected):
+        assert normalize_datetime(text) == expected
+
+
+class TestParseCount:
+    """列表页回复/浏览数"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("128", 128),
+        ("1,024", 1024),
+        ("1.2万", 12000),
+        ("3k", 3000),
+        ("", 0),
+        (None, 0),
+    ])
+    def test_formats(self, text, expected):
+        assert parse_count(text) == expected
+
+
+@pytest.mark.parametrize("standin", [dict(threads_per_page=4, images_per_thread=1)], indirect=True)
+class TestIncrementalRefresh:
+    """只重新抓取列表页信号有变化的帖子，正文未变时只更新回复信号"""
+
+    def test_refetches_only_changed_threads(self, standin):
+        server, store = standin
+        fixtures = server.fixtures
+        assert _crawl()["total_posts"] == 4
+        initial = _rows(store)
+        tids = sorted(initial)
+        assert all(row["content_hash"] == content_hash(row["content"]) for row in initial.values())
+        assert initial[tids[0]]["reply_count"] == fixtures.reply_count(tids[0])
+        assert initial[tids[0]]["view_count"] == fixtures.view_count(tids[0])
+        assert initial[tids[0]]["last_reply_time"] == "2026-10-19 12:00:00"
+
+        # 没有变化：只请求列表页
+        before = dict(server.paths)
+        stats = _crawl()
+        assert _thread_fetches(server, before) == {}
+        assert stats["total_posts"] == 0 and stats["refresh"]["checked"] == 0
+
+        # t0 新回复（正文不变）；t1 新回复且主楼被编辑；t2 只编辑（列表页无信号，不会发现）
+        fixtures.add_reply(tids[0], 2)
+        fixtures.add_reply(tids[1])
+        fixtures.edit(tids[1])
+        fixtures.edit(tids[2])
+        before = dict(server.paths)
+        statements = store.statements
+        stats = _crawl()
+
+        assert sorted(_thread_fetches(server, before)) == [f"/thread-{tid}-1-1.html" for tid in tids[:2]]
+        assert stats["refresh"] == {"checked": 2, "changed": 1, "unchanged": 1, "failed": 0, "counts": 0}
+        # 历史头像 + 加载信号 + 读取两条旧记录 + 信号 UPDATE + 正文 UPDATE
+        assert store.statements - statements == 5
+
+        rows = _rows(store)
+        assert rows[tids[0]]["reply_count"] == fixtures.reply_count(tids[0])
+        assert rows[tids[0]]["view_count"] == fixtures.view_count(tids[0])
+        assert rows[tids[0]]["last_reply_time"] == "2026-10-19 12:02:00"
+        assert rows[tids[0]]["content"] == initial[tids[0]]["content"]
+        assert "本帖最后修订（第 1 次）" in rows[tids[1]]["content"]
+        assert rows[tids[1]]["content_hash"] == content_hash(rows[tids[1]]["content"])
+        assert rows[tids[1]]["reply_count"] == fixtures.reply_count(tids[1])
+        # 图片文件名未变，沿用已下载的本地路径
+        assert rows[tids[1]]["images"] == initial[tids[1]]["images"]
+        assert rows[tids[2]] == initial[tids[2]]
+
+    def test_missing_hash_computed_from_content(self, standin):
+        server, store = standin
+        _crawl(refresh=False)
+        tid = min(_rows(store))
+        store.executemany(f"UPDATE {BONIU_POST_TABLE} SET content_hash=NULL", [()])
+        server.fixtures.add_reply(tid)
+        stats = _crawl()
+        assert stats["refresh"]["unchanged"] == 1
+        assert _rows(store)[tid]["content_hash"] is None
+
+    def test_view_only_changes_update_counts(self, standin):
+        server, store = standin
+        _crawl()
+        tid = max(_rows(store))
+        server.fixtures.add_views(tid, 40)
+        before = dict(server.paths)
+        stats = _crawl()
+        # 浏览数变化不打开详情页，也不视为本页有变化（仍停止翻页）
+        assert _thread_fetches(server, before) == {}
+        assert stats["refresh"]["counts"] == 1 and stats["refresh"]["checked"] == 0
+        row = _rows(store)[tid]
+        assert row["view_count"] == server.fixtures.view_count(tid)
+        assert row["last_reply_time"] == "2026-10-19 12:00:00"
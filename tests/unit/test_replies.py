@@ -0,0 +1,117 @@
+"""帖子回复分页抓取单元测试：本地 Discuz 替身站点 + SQLite 替身库"""
+
+import pytest
+
+from benchmarks.discuz_server import DiscuzFixtures
+from benchmarks.sqlite_db import BONIU_REPLY_TABLE
+from src.crawler.config import settings as settings_module
+from src.crawler.sites.boniu import crawler as crawler_module
+from src.crawler.sites.boniu.extract import parse_replies, parse_thread
+from src.crawler.sites.spec import load_site_spec
+
+BASE_URL = "https://bbs.boniu123.cc"
+
+
+class TestParseReplies:
+    """回复页解析"""
+
+    def test_first_page_excludes_main_post(self):
+        fixtures = DiscuzFixtures(content_kb=1, images_per_thread=1)
+        tid = fixtures.thread_id(89, 1, 27)
+        content, images, replies, pages, per_page = parse_thread(
+            load_site_spec("boniu"), fixtures.thread_page(tid), BASE_URL
+        )
+        assert "第 2 楼回复" not in content and len(images) == 1
+        assert (pages, per_page) == (fixtures.thread_pages(tid), 10)
+        assert [r["floor"] for r in replies] == list(range(2, 11))
+        assert replies[0] == {
+            "id": str(tid * 1000 + 2),
+            "floor": 2,
+            "username": "用户2002",
+            "user_id": "2002",
+            "publish_time": "2026-10-19 12:01:00",
+            "content": f"第 2 楼回复（{tid}）",
+        }
+
+    def test_later_page_floors(self):
+        fixtures = DiscuzFixtures()
+        tid = fixtures.thread_id(89, 1, 27)
+        replies, pages, floors = parse_replies(load_site_spec("boniu"), fixtures.thread_page(tid, 2), 2, 10)
+        assert pages == 2 and floors == len(replies)
+        assert [r["floor"] for r in replies] == list(range(11, fixtures.reply_count(tid) + 2))
+
+    def test_single_page_thread(self):
+        replies, pages, floors = parse_replies(load_site_spec("boniu"), "<html><body></body></html>", 1, 0)
+        assert (replies, pages, floors) == ([], 1, 0)
+
+
+def _crawl(refresh=False):
+    crawler = crawler_module.BoniuCrawler()
+    crawler.enable_translation = False
+    crawler.fids = [89]
+    return crawler.crawl_paginated_and_store(max_pages=1, refresh=refresh)
+
+
+def _floors(store, tid):
+    rows = store.fetch_all(f"SELECT floor FROM {BONIU_REPLY_TABLE} WHERE forum_post_id = %s ORDER BY floor", [tid])
+    return [row["floor"] for row in rows]
+
+
+def _reply_page_fetches(server, before):
+    return sorted(
+        path for path, count in server.paths.items()
+        if path.startswith("/thread-") and not path.endswith("-1-1.html") and count > before.get(path, 0)
+    )
+
+
+class TestReplyCrawl:
+    """发现回复页、并发抓取并按批写入回复表"""
+
+    @pytest.fixture(autouse=True)
+    def replies_enabled(self, standin):
+        settings = settings_module.get_settings()
+        settings.replies.enabled = True
+        settings.replies.workers = 3
+        settings.storage.batch_size = 7
+
+    def test_all_reply_pages_stored(self, standin):
+        server, store = standin
+        fixtures = server.fixtures
+        tids = [fixtures.thread_id(89, 1, i) for i in range(3)]
+        _crawl()
+        for tid in tids:
+            assert _floors(store, tid) == list(range(2, fixtures.reply_count(tid) + 2))
+        assert store.count(BONIU_REPLY_TABLE) == sum(fixtures.reply_count(tid) for tid in tids)
+        assert _reply_page_fetches(server, {}) == sorted(
+            f"/thread-{tid}-{page}-1.html" for tid in tids for page in range(2, fixtures.thread_pages(tid) + 1)
+        )
+
+    def test_max_pages(self, standin):
+        server, store = standin
+        settings_module.get_settings().replies.max_pages = 1
+        _crawl()
+        assert _reply_page_fetches(server, {}) == []
+        tid = server.fixtures.thread_id(89, 1, 0)
+        assert _floors(store, tid) == list(range(2, 11))
+
+    def test_refresh_fetches_only_pages_with_new_replies(self, standin):
+        server, store = standin
+        fixtures = server.fixtures
+        _crawl(refresh=True)
+        tid = fixtures.thread_id(89, 1, 0)
+        old_count = fixtures.reply_count(tid)
+        fixtures.add_reply(tid, 12)
+        before = dict(server.paths)
+        statements = store.statements
+        stats = _crawl(refresh=True)
+
+        assert stats["refresh"]["checked"] == 1
+        # 新楼层所在页起抓取，之前的回复页不再请求
+        first_new_page = (old_count + 1) // 10 + 1
+        assert _reply_page_fetches(server, before) == sorted(
+            f"/thread-{tid}-{page}-1.html"
+            for page in range(max(2, first_new_page), fixtures.thread_pages(tid) + 1)
+        )
+        # 历史头像 + 加载信号 + 读取旧记录 + 信号 UPDATE + 12 条新回复按每批 7 条写出的 2 条 INSERT
+        assert store.statements - statements == 4 + 2
+        assert _floors(store, tid) == list(range(2, fixtures.reply_count(tid) + 2))
@@ -0,0 +1,145 @@
+"""重试策略单元测试"""
+
+import pytest
+import requests
+
+from src.crawler.core import requests_impl
+from src.crawler.core.requests_impl import RequestsCrawler
+from src.crawler.utils.circuit_breaker import CircuitBreakerRegistry
+from src.crawler.utils.metrics import Stage, StageMetrics
+from src.crawler.utils.rate_limiter import AdaptiveRateLimiter
+from src.crawler.utils.retry import RetryBudget, RetryPolicy
+
+
+class FakeResponse:
+    """最小化的响应对象"""
+
+    def __init__(self, status_code, headers=None, text="ok"):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.reason = "test"
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.encoding = "utf-8"
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """按顺序返回预设结果的会话"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    monkeypatch.setattr(requests_impl.time, "sleep", lambda s: None)
+    c = RequestsCrawler()
+    c.rate_limiter = AdaptiveRateLimiter(jitter=0, sleep=lambda s: None)
+    c.breakers = CircuitBreakerRegistry(failure_threshold=5)
+    c.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=1.0, budget=RetryBudget(10))
+    return c
+
+
+class TestRetryPolicy:
+    """重试策略测试"""
+
+    def test_classification(self):
+        """测试可重试错误分类"""
+        assert RetryPolicy.is_retryable_exception(requests.ConnectionError())
+        assert RetryPolicy.is_retryable_exception(requests.Timeout())
+        assert not RetryPolicy.is_retryable_exception(ValueError())
+        assert RetryPolicy.is_retryable_status(429)
+        assert RetryPolicy.is_retryable_status(503)
+        assert not RetryPolicy.is_retryable_status(404)
+        assert not RetryPolicy.is_retryable_status(501)
+
+    def test_full_jitter_backoff_is_capped(self):
+        """测试退避时间落在 [0, min(max_delay, base*2^n)] 内"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt in range(1, 8):
+            delay = policy.backoff(attempt)
+            assert 0 <= delay <= min(5.0, 2 ** (attempt - 1))
+
+    def test_retry_after(self):
+        """测试 Retry-After 优先，超过上限时放弃"""
+        policy = RetryPolicy(max_delay=10.0)
+        assert policy.backoff(1, retry_after=3) == 3
+        assert policy.backoff(1, retry_after=60) is None
+
+    def test_budget_limits_total_retries(self):
+        """测试重试预算耗尽后不再重试"""
+        policy = RetryPolicy(max_attempts=5, budget=RetryBudget(2))
+        assert policy.should_retry(1)
+        assert policy.should_retry(1)
+        assert not policy.should_retry(1)
+        assert policy.budget.remaining == 0
+
+
+class TestRequestsCrawlerRetry:
+    """HTTP层重试集成测试"""
+
+    def test_retries_until_success(self, crawler):
+        """测试 5xx 与连接错误后重试成功，并记录重试次数"""
+        crawler.session = FakeSession([
+            FakeResponse(502),
+            requests.ConnectionError("boom"),
+            FakeResponse(200, {"content-type": "text/html"}, "hello"),
+        ])
+        result = crawler.crawl_url("https://example.com/")
+        assert result.error is None
+        assert result.data == "hello"
+        assert crawler.session.calls == 3
+        assert crawler.stats.retries == 2
+
+    def test_stage_metrics_exclude_backoff(self, crawler):
+        """测试抓取阶段耗时记录字节数，退避等待单独计入 retry_backoff"""
+        crawler.metrics = StageMetrics()
+        crawler.session = FakeSession([
+            FakeResponse(503),
+            FakeResponse(200, {"content-type": "text/html"}, "hello"),
+        ])
+        crawler.crawl_url("https://example.com/", stage=Stage.DETAIL_FETCH)
+        summary = crawler.metrics.summary()["stages"]
+        assert summary[Stage.DETAIL_FETCH]["count"] == 1
+        assert summary[Stage.DETAIL_FETCH]["bytes"] == 5
+        assert summary[Stage.RETRY_BACKOFF]["count"] == 1
+
+    def test_non_retryable_status_fails_fast(self, crawler):
+        """测试 404 不重试"""
+        crawler.session = FakeSession([FakeResponse(404)])
+        result = crawler.crawl_url("https://example.com/")
+        assert result.error
+        assert crawler.session.calls == 1
+        assert crawler.stats.retries == 0
+
+    def test_gives_up_after_max_attempts(self, crawler):
+        """测试达到最大尝试次数后返回错误"""
+        crawler.session = FakeSession([requests.Timeout("timed out")] * 3)
+        result = crawler.crawl_url("https://example.com/")
+        assert result.error
+        assert crawler.session.calls == 3
+        assert crawler.stats.retries == 2
+        assert crawler.stats.failed == 1
+
+    def test_open_circuit_fails_fast(self, crawler):
+        """测试主机熔断后不再发出请求"""
+        crawler.breakers = CircuitBreakerRegistry(failure_threshold=2)
+        crawler.session = FakeSession([requests.ConnectionError("down")] * 2)
+        result = crawler.crawl_url("https://example.com/")
+        assert "熔断" in result.error
+        assert crawler.session.calls == 2
+        assert crawler.get_status()["breakers"]["example.com"]["state"] == "open"
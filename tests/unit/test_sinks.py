@@ -0,0 +1,210 @@
+"""存储输出（Sink）单元测试"""
+
+import csv
+import json
+
+import pytest
+
+from src.crawler.utils.metrics import Stage, StageMetrics
+from src.crawler.utils.sinks import (
+    CsvSink,
+    JsonlSink,
+    MultiSink,
+    MySQLSink,
+    ParquetSink,
+    Sink,
+    create_sink,
+)
+from src.crawler.utils.storage import iter_jsonl
+
+
+class ListSink(Sink):
+    """测试用 Sink：记录每个批次；fail 大于 0 时接下来的 fail 次写出失败"""
+
+    def __init__(self, batch_size=2, metrics=None):
+        super().__init__(batch_size, metrics)
+        self.batches = []
+        self.fail = 0
+        self.released = False
+
+    def _write_batch(self, batch):
+        if self.fail > 0:
+            self.fail -= 1
+            raise IOError("写出失败")
+        self.batches.append([r["id"] for r in batch])
+        return 10
+
+    def _close(self):
+        self.released = True
+
+
+class TestSink:
+    """Sink 基类测试"""
+
+    def test_batching(self):
+        """测试缓冲满时按批写出，flush 写出剩余记录"""
+        sink = ListSink(batch_size=2)
+        sink.write({"id": i} for i in range(5))
+        assert sink.batches == [[0, 1], [2, 3]]
+        assert sink.pending == 1
+        sink.flush()
+        assert sink.batches[-1] == [4]
+        assert sink.records_written == 5
+        assert sink.batches_written == 3
+
+    def test_close_flushes_and_rejects_writes(self):
+        sink = ListSink(batch_size=10)
+        with sink:
+            sink.write([{"id": 1}])
+        assert sink.batches == [[1]]
+        with pytest.raises(ValueError):
+            sink.write([{"id": 2}])
+
+    def test_failed_batch_kept_for_retry(self):
+        """测试写出失败时批次留在缓冲区，flush/close 重试"""
+        sink = ListSink(batch_size=2)
+        sink.fail = 1
+        with pytest.raises(IOError):
+            sink.write([{"id": 1}, {"id": 2}])
+        assert sink.pending == 2 and sink.records_written == 0
+        # 下一次写出带上之前失败的记录
+        sink.write([{"id": 3}])
+        assert sink.batches == [[1, 2, 3]] and sink.pending == 0
+        sink.write([{"id": 4}])
+        sink.fail = 1
+        with pytest.raises(IOError):
+            sink.close()
+        assert not sink.closed and not sink.released and sink.pending == 1
+        sink.close()
+        assert sink.batches == [[1, 2, 3], [4]] and sink.records_written == 4
+        assert sink.closed and sink.released
+
+    def test_metrics(self):
+        metrics = StageMetrics()
+        sink = ListSink(batch_size=1, metrics=metrics)
+        sink.write([{"id": 1}, {"id": 2}])
+        summary = metrics.summary()["stages"][Stage.SINK_WRITE]
+        assert summary["count"] == 2
+        assert summary["bytes"] == 20
+
+
+class TestMySQLSink:
+    """MySQL Sink 测试"""
+
+    def test_upsert_rows(self):
+        calls = []
+        sink = MySQLSink("t", ["pid", "title"], key="pid", batch_size=2,
+                         executemany=lambda sql, rows: calls.append((sql, rows)) or len(rows))
+        sink.write([{"pid": 1, "title": "a"}, {"pid": 2}])
+        assert calls[0][1] == [(1, "a"), (2, None)]
+        assert calls[0][0] == (
+            "INSERT INTO `t` (`pid`,`title`) VALUES (%s,%s) ON DUPLICATE KEY UPDATE `title`=VALUES(`title`)"
+        )
+        assert sink.affected_rows == 2
+
+
+class TestFileSinks:
+    """文件 Sink 测试"""
+
+    def test_jsonl_append(self, tmp_path):
+        path = tmp_path / "out" / "posts.jsonl"
+        with JsonlSink(str(path), batch_size=2) as sink:
+            sink.write([{"id": 1, "images": ["a.jpg"]}, {"id": 2, "title": "标题"}, {"id": 3}])
+        with JsonlSink(str(path)) as sink:
+            sink.write([{"id": 4}])
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2, 3, 4]
+        assert "标题" in lines[1]
+
+    def test_csv_header_once(self, tmp_path):
+        path = tmp_path / "posts.csv"
+        with CsvSink(str(path)) as sink:
+            sink.write([{"id": 1, "images": ["a.jpg"]}])
+        with CsvSink(str(path)) as sink:
+            sink.write([{"id": 2, "images": []}])
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [r["id"] for r in rows] == ["1", "2"]
+        assert json.loads(rows[0]["images"]) == ["a.jpg"]
+
+    def test_parquet(self, tmp_path):
+        """测试 Parquet 每批一个 row group；未安装 pyarrow 时给出明确错误"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with pytest.raises(ImportError):
+                ParquetSink(str(tmp_path / "posts.parquet"))
+            return
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "posts.parquet"
+        with ParquetSink(str(path), batch_size=2) as sink:
+            sink.write([{"id": i, "images": ["x"]} for i in range(5)])
+        parquet_file = pq.ParquetFile(str(path))
+        assert parquet_file.metadata.num_row_groups == 3
+        assert parquet_file.metadata.num_rows == 5
+
+
+class TestMultiSinkAndFactory:
+    """MultiSink 与 create_sink 测试"""
+
+    def test_multi_sink(self):
+        a, b = ListSink(batch_size=1), ListSink(batch_size=3)
+        multi = MultiSink([a, b])
+        multi.write([{"id": 1}, {"id": 2}])
+        assert a.batches == [[1], [2]]
+        assert b.batches == []
+        multi.close()
+        assert b.batches == [[1, 2]]
+        assert multi.records_written == 2
+
+    def test_multi_sink_failure_isolated(self):
+        """测试一个 Sink 写出失败不影响其余，重试 close 时只重试未关闭的"""
+        a, b = ListSink(batch_size=5), ListSink(batch_size=5)
+        multi = MultiSink([a, b])
+        multi.write([{"id": 1}])
+        a.fail = 1
+        with pytest.raises(IOError):
+            multi.close()
+        assert not multi.closed and not a.closed and b.closed
+        multi.close()
+        assert multi.closed and a.batches == b.batches == [[1]]
+
+    def test_create_sink(self, tmp_path):
+        sink = create_sink(f"jsonl:{tmp_path / 'a.jsonl'}", batch_size=5)
+        assert isinstance(sink, JsonlSink) and sink.batch_size == 5
+        sink.close()
+        sink = create_sink(str(tmp_path / "a.csv"))
+        assert isinstance(sink, CsvSink)
+        sink.close()
+        with pytest.raises(ValueError):
+            create_sink(str(tmp_path / "a.xlsx"))
+
+
+class TestCrawlerFileOutput:
+    """爬虫写入文件 Sink（--mode json 的流程）测试"""
+
+    @pytest.mark.parametrize("standin", [dict(pages=2, images_per_thread=1)], indirect=True)
+    def test_paginated_crawl_to_jsonl_and_resume(self, standin, tmp_path):
+        from src.crawler.sites.boniu.crawler import BoniuCrawler
+
+        path = str(tmp_path / "posts.jsonl")
+        crawler = BoniuCrawler(use_db=False)
+        crawler.enable_translation = False
+        crawler.fids = [89]
+        with JsonlSink(path, batch_size=4) as sink:
+            crawler.set_sinks([sink])
+            stats = crawler.crawl_paginated_and_store(max_pages=5, existing_ids=set())
+        records = list(iter_jsonl(path))
+        assert stats["total_posts"] == 6
+        assert len(records) == 6
+        assert records[0]["content"]
+        assert json.loads(records[0]["images"])
+
+        # 续爬：已有ID全部存在时第一页即停止
+        with JsonlSink(path) as sink:
+            crawler.set_sinks([sink])
+            stats = crawler.crawl_paginated_and_store(
+                max_pages=5, existing_ids={r["forum_post_id"] for r in records}
+            )
+        assert stats["total_posts"] == 0
+        assert len(list(iter_jsonl(path))) == 6
@@ -0,0 +1,94 @@
+"""站点规格（site spec）单元测试"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from benchmarks.discuz_server import DiscuzFixtures
+from benchmarks.parsers import offline_crawler
+from src.crawler.sites.spec import compile_site_spec, load_site_spec
+
+ROW = (
+    '<table><tbody id="normalthread_42"><tr>'
+    '<th><em>[<a href="#">其他</a>]</em> <em>[<a href="#">云服务</a>]</em>'
+    '<a href="thread-42-1-1.html" class="xst s">标题</a></th>'
+    '<td class="by"><cite><a href="space-uid-7.html">作者</a></cite>'
+    '<em><span>发表于 2026-10-19</span></em></td>'
+    '</tr></tbody></table>'
+)
+
+
+def _row(html: str = ROW):
+    return BeautifulSoup(html, "html.parser").find("tr")
+
+
+class TestCompile:
+    """编译测试"""
+
+    def test_rules_in_order(self):
+        spec = compile_site_spec({
+            "selectors": {
+                "link": ["a.missing", {"css": "a[href]", "attr": "href", "pattern": r"thread-\d+"}],
+                "time": {"css": "span", "pattern": r"\d{4}-\d{2}-\d{2}"},
+            },
+        })
+        row = _row()
+        assert spec.field("link").first(row).get_text() == "标题"
+        assert spec.field("link").value(row) == "thread-42-1-1.html"
+        assert spec.field("time").value(row) == "发表于 2026-10-19"
+
+    def test_patterns(self):
+        spec = compile_site_spec({
+            "patterns": {
+                "id": [r"thread-(\d+)", r"tid=(\d+)"],
+                "image": {"any": [r"\.jpg$"], "ignore_case": True},
+            },
+        })
+        assert spec.group("id", "forum.php?tid=9") == "9"
+        assert spec.group("id", None, default="") == ""
+        assert spec.search("image", "A.JPG")
+        with pytest.raises(KeyError):
+            spec.search("missing", "x")
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            compile_site_spec({"selectors": {"bad": "a[["}})
+        with pytest.raises(ValueError):
+            compile_site_spec({"patterns": {"bad": "("}})
+        with pytest.raises(ValueError):
+            compile_site_spec({"selectors": {"bad": {"attr": "href"}}})
+
+    def test_load_is_cached(self, tmp_path):
+        assert load_site_spec("boniu") is load_site_spec("boniu")
+        with pytest.raises(FileNotFoundError):
+            load_site_spec(path=str(tmp_path / "none.yaml"))
+
+
+class TestBoniuSpec:
+    """博牛站点配置驱动的解析测试"""
+
+    def test_parse_post_row(self):
+        item = offline_crawler()._parse_post_row(_row())
+        assert item["id"] == "42"
+        assert item["title"] == "标题"
+        assert item["username"] == "作者"
+        assert item["publish_time"] == "发表于 2026-10-19"
+        assert item["category"] == "云服务"
+
+    def test_sticky_and_non_post_rows_skipped(self):
+        crawler = offline_crawler()
+        sticky = ROW.replace("<th>", '<th><img src="static/image/common/pin_1.gif" />')
+        assert crawler._parse_post_row(_row(sticky)) is None
+        assert crawler._parse_post_row(_row("<table><tr><td>表头</td></tr></table>")) is None
+
+    def test_synthetic_list_page(self):
+        fixtures = DiscuzFixtures(pages=1, threads_per_page=3)
+        crawler = offline_crawler()
+        soup = BeautifulSoup(fixtures.list_page(89, 1), "html.parser")
+        posts = [crawler._parse_post_row(row) for row in crawler.spec.field("post_row").select(soup)]
+        assert [p["id"] for p in posts] == [str(fixtures.thread_id(89, 1, i)) for i in range(3)]
+        assert all(p["avatar_url"].endswith("_avatar_small.jpg") for p in posts)
+        assert all(p["category"] == "支付渠道" for p in posts)
+
+    def test_headers(self):
+        headers = load_site_spec("boniu").headers
+        assert "br" not in headers["Accept-Encoding"]
@@ -0,0 +1,119 @@
+"""站点注册表与多站点运行器单元测试"""
+
+import threading
+
+import pytest
+
+from benchmarks.discuz_server import DiscuzStandInServer
+from src.crawler.config import settings as settings_module
+from src.crawler.sites.registry import SitePlugin, SiteRegistry, get_site_registry
+from src.crawler.sites.runner import SiteRunner, close_crawler
+from src.crawler.utils import circuit_breaker, metrics, rate_limiter
+from src.crawler.utils.sinks import JsonlSink
+from src.crawler.utils.storage import iter_jsonl
+
+
+class TestSiteRegistry:
+    """站点注册表测试"""
+
+    def test_discovers_boniu(self):
+        registry = get_site_registry()
+        assert "boniu" in registry.names()
+        assert registry.get("boniu").description == "博牛社区"
+
+    def test_select_and_errors(self):
+        registry = SiteRegistry()
+        a = SitePlugin("a", factory=dict)
+        registry.register(a)
+        registry.register(a)  # 同一插件重复注册无影响
+        with pytest.raises(ValueError):
+            registry.register(SitePlugin("a", factory=list))
+        assert registry.select() == [a]
+        with pytest.raises(KeyError):
+            registry.select(["missing"])
+
+
+class TestSiteRunner:
+    """多站点运行器测试"""
+
+    def test_failure_is_isolated(self):
+        def task(plugin):
+            if plugin.name == "bad":
+                raise RuntimeError("down")
+            return {"total_posts": 3}
+
+        results = SiteRunner([SitePlugin("good", dict), SitePlugin("bad", dict)], max_parallel=2).run(task)
+        assert [r.name for r in results] == ["good", "bad"]
+        assert results[0].ok and results[0].total_posts == 3
+        assert not results[1].ok and "down" in results[1].error
+
+    def test_shared_singletons_created_once(self, monkeypatch):
+        # 各站点爬虫在运行器线程中并发创建，共享组件只能各有一个实例
+        monkeypatch.setattr(rate_limiter, "_rate_limiter", None)
+        monkeypatch.setattr(circuit_breaker, "_registry", None)
+        monkeypatch.setattr(metrics, "_metrics", None)
+        barrier = threading.Barrier(8)
+
+        def task(plugin):
+            barrier.wait()
+            return {"instances": (
+                id(rate_limiter.get_rate_limiter()),
+                id(circuit_breaker.get_breaker_registry()),
+                id(metrics.get_metrics()),
+            )}
+
+        plugins = [SitePlugin(f"s{i}", dict) for i in range(8)]
+        results = SiteRunner(plugins, max_parallel=8).run(task)
+        assert all(r.ok for r in results)
+        assert len({r.stats["instances"] for r in results}) == 1
+
+
+@pytest.fixture
+def two_sites(standin):
+    """两个本地 Discuz 替身站点（不同端口即不同主机，限速互不影响）"""
+    first, _ = standin
+    with DiscuzStandInServer(first.fixtures) as second:
+        yield first, second
+
+
+def _plugin(name, server):
+    def factory(**kwargs):
+        from src.crawler.sites.boniu.crawler import BoniuCrawler
+
+        crawler = BoniuCrawler(**kwargs)
+        crawler.base_url = server.url.rstrip("/")
+        crawler.enable_translation = False
+        crawler.fids = [89]
+        return crawler
+
+    return SitePlugin(name, factory)
+
+
+@pytest.mark.parametrize("standin", [dict(pages=2, images_per_thread=1)], indirect=True)
+class TestMultiSiteCrawl:
+    """多站点并发抓取测试"""
+
+    def test_sites_share_process_and_write_own_output(self, two_sites, tmp_path):
+        first, second = two_sites
+        settings_module.get_settings().sites.detail_workers = 3
+
+        def task(plugin):
+            crawler = plugin.create(use_db=False)
+            assert crawler.detail_workers == 3
+            try:
+                with JsonlSink(str(tmp_path / f"{plugin.name}.jsonl")) as sink:
+                    crawler.set_sinks([sink])
+                    return crawler.crawl_paginated_and_store(max_pages=5, existing_ids=set())
+            finally:
+                close_crawler(crawler)
+
+        results = SiteRunner([_plugin("a", first), _plugin("b", second)], max_parallel=2).run(task)
+        assert all(r.ok for r in results), [r.error for r in results]
+        assert [r.total_posts for r in results] == [6, 6]
+        for name in ("a", "b"):
+            records = list(iter_jsonl(str(tmp_path / f"{name}.jsonl")))
+            assert len(records) == 6
+            assert all(r["content"] for r in records)
+        # 两个站点各自收到列表页与全部详情页请求
+        assert first.requests >= 2 + 6
+        assert second.requests >= 2 + 6
@@ -0,0 +1,99 @@
+"""翻译缓存单元测试（不访问翻译接口）"""
+
+import json
+
+import requests
+
+from src.crawler.utils.circuit_breaker import CircuitBreakerRegistry, CircuitState
+from src.crawler.utils.translator import TranslationCache, Translator
+
+
+class TestTranslationCache:
+    """LRU 翻译缓存测试"""
+
+    def test_lru_eviction(self):
+        cache = TranslationCache(max_entries=2)
+        cache.put(("baidu", "en", "zh", "a"), "甲")
+        cache.put(("baidu", "en", "zh", "b"), "乙")
+        assert cache.get(("baidu", "en", "zh", "a")) == "甲"
+        cache.put(("baidu", "en", "zh", "c"), "丙")
+        assert cache.get(("baidu", "en", "zh", "b")) is None
+        assert len(cache) == 2
+        assert cache.snapshot() == {"size": 2, "hits": 1, "misses": 1}
+
+    def test_disabled(self):
+        cache = TranslationCache(max_entries=0)
+        cache.put(("baidu", "en", "zh", "a"), "甲")
+        assert len(cache) == 0
+
+
+class TestTranslatorCaching:
+    """Translator 只缓存成功的翻译结果"""
+
+    def _translator(self, monkeypatch, outcomes):
+        translator = Translator("baidu", app_id="id", secret_key="key")
+        translator.cache = TranslationCache()
+        calls = []
+
+        def fake(text, from_lang, to_lang):
+            calls.append(text)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(translator, "_translate_baidu", fake)
+        return translator, calls
+
+    def test_repeated_text_hits_cache(self, monkeypatch):
+        translator, calls = self._translator(monkeypatch, ["你好"])
+        assert translator.translate("Hello", "en", "zh") == "你好"
+        assert translator.translate("Hello", "en", "zh") == "你好"
+        assert calls == ["Hello"]
+
+    def test_failure_not_cached(self, monkeypatch):
+        translator, calls = self._translator(monkeypatch, [RuntimeError("boom"), "你好"])
+        assert translator.translate("Hello", "en", "zh") == "Hello"
+        assert translator.translate("Hello", "en", "zh") == "你好"
+        assert len(calls) == 2
+
+
+class FakeSession:
+    """按顺序返回预设 JSON 的翻译接口（状态码均为 200）"""
+
+    def __init__(self, payloads):
+        self.payloads = list(payloads)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.payloads.pop(0)).encode("utf-8")
+        return response
+
+
+class TestTranslatorBreaker:
+    """百度以 200 + error_code 返回的接口故障计入熔断"""
+
+    def _translator(self, payloads):
+        translator = Translator("baidu", app_id="id", secret_key="key")
+        translator.cache = TranslationCache()
+        translator.breakers = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=60)
+        translator.session = FakeSession(payloads)
+        return translator
+
+    def test_outage_error_code_opens_circuit(self):
+        busy = {"error_code": "54003", "error_msg": "Invalid Access Limit"}
+        translator = self._translator([busy, busy])
+        assert [translator.translate(t, "en", "zh") for t in ("a", "b", "c")] == ["a", "b", "c"]
+        # 两次接口故障后熔断，第三次不再请求
+        assert translator.session.calls == 2
+        assert translator.breakers.for_url(translator.api_url).state == CircuitState.OPEN
+
+    def test_request_errors_do_not_count(self):
+        sign_error = {"error_code": "54001", "error_msg": "Invalid Sign"}
+        ok = {"trans_result": [{"src": "c", "dst": "丙"}]}
+        translator = self._translator([sign_error, sign_error, ok])
+        assert [translator.translate(t, "en", "zh") for t in ("a", "b", "c")] == ["a", "b", "丙"]
+        assert translator.breakers.for_url(translator.api_url).state == CircuitState.CLOSED
@@ -2,7 +2,19 @@
 
 import pytest
 from src.crawler.utils.parser import clean_text, extract_number, extract_url, is_valid_url
-from src.crawler.utils.storage import generate_filename, chunk_list, remove_duplicates
+from src.crawler.utils.storage import (
+    JsonlWriter,
+    ParquetWriter,
+    chunk_list,
+    generate_filename,
+    iter_jsonl,
+    iter_parquet,
+    iter_records,
+    jsonl_to_json,
+    load_data,
+    remove_duplicates,
+    save_data,
+)
 
 
 class TestParserUtils:
@@ -72,3 +84,62 @@ class TestStorageUtils:
         assert len(result) == 2
         assert result[0]["id"] == 1
         assert result[1]["id"] == 2
+
+
+class TestStreamingStorage:
+    """流式存储测试"""
+
+    def test_jsonl_round_trip(self, tmp_path):
+        """测试 JSONL 追加写入与惰性读取"""
+        path = str(tmp_path / "posts.jsonl")
+        with JsonlWriter(path, fsync_every=2, fsync_interval=0) as writer:
+            writer.write_many({"id": i, "title": f"帖子{i}"} for i in range(3))
+        with JsonlWriter(path) as writer:
+            writer.write({"id": 3})
+        records = iter_jsonl(path)
+        assert next(records) == {"id": 0, "title": "帖子0"}
+        assert [r["id"] for r in records] == [1, 2, 3]
+
+    def test_jsonl_fsync_every(self, tmp_path, monkeypatch):
+        """测试按条数周期性 fsync"""
+        synced = []
+        monkeypatch.setattr("src.crawler.utils.storage.os.fsync", lambda fd: synced.append(fd))
+        writer = JsonlWriter(str(tmp_path / "a.jsonl"), fsync_every=2, fsync_interval=0)
+        writer.write_many({"id": i} for i in range(5))
+        assert len(synced) == 2
+        writer.close()
+        assert len(synced) == 3
+
+    def test_jsonl_ignores_truncated_tail(self, tmp_path):
+        """测试忽略进程中途退出留下的半行"""
+        path = tmp_path / "a.jsonl"
+        path.write_text('{"id": 1}\n{"id": 2}\n{"id": ', encoding="utf-8")
+        assert [r["id"] for r in iter_jsonl(str(path))] == [1, 2]
+
+    def test_save_and_load_jsonl(self, tmp_path):
+        file_path = save_data([{"id": 1}, {"id": 2}], "posts.jsonl", output_dir=str(tmp_path))
+        assert file_path.endswith("posts.jsonl")
+        assert load_data("posts.jsonl", output_dir=str(tmp_path)) == [{"id": 1}, {"id": 2}]
+        assert [r["id"] for r in iter_records(file_path)] == [1, 2]
+
+    def test_jsonl_to_json(self, tmp_path):
+        """测试 JSONL 流式导出为 JSON 数组"""
+        src = str(tmp_path / "a.jsonl")
+        with JsonlWriter(src) as writer:
+            writer.write_many([{"id": 1}, {"id": 2}])
+        assert jsonl_to_json(src, str(tmp_path / "a.json")) == 2
+        assert load_data("a.json", output_dir=str(tmp_path)) == [{"id": 1}, {"id": 2}]
+        open(str(tmp_path / "empty.jsonl"), "w").close()
+        assert jsonl_to_json(str(tmp_path / "empty.jsonl"), str(tmp_path / "empty.json")) == 0
+        assert load_data("empty.json", output_dir=str(tmp_path)) == []
+
+    def test_parquet_round_trip(self, tmp_path):
+        """测试 Parquet 按 row group 写入与按批读取"""
+        pytest.importorskip("pyarrow")
+        path = str(tmp_path / "posts.parquet")
+        with ParquetWriter(path, row_group_size=2, compression="snappy") as writer:
+            writer.write_many({"id": i, "images": ["a.jpg"]} for i in range(5))
+        assert writer.row_groups == 3
+        records = list(iter_parquet(path, batch_size=2))
+        assert [r["id"] for r in records] == [0, 1, 2, 3, 4]
+        assert records[0]["images"] == '["a.jpg"]'